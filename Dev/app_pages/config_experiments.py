@@ -11,6 +11,7 @@ import pandas as pd
 from src.core.auto_config import AutoTradingConfig, load_auto_config, save_auto_config
 from src.utils.instrument_profiles import get_profile, set_instrument_sessions
 from src.utils.database import db
+from src.analysis.gate_replay import GateReplay, GateVariant
 from app_pages.shared import snapshot_configs, update_auto_trading_experiment
 
 QUICK_TUNING_PRESETS = {
@@ -205,6 +206,16 @@ def _get_cfg_rows(cfg, base_cfg) -> list[dict]:
     return rows
 
 
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def _preset_replay(marker: tuple, variants: list[GateVariant], days: int = 30) -> tuple[list[dict], int, int]:
+    """Replay scores for the variants; cached until the database is written (marker)."""
+    replay = GateReplay.from_database(db, days=days)
+    scores = [score.to_dict() for score in replay.evaluate(variants)]
+    for score in scores:
+        score["gates"] = ", ".join(score["gates"])
+    return scores, replay.size, replay.matched_trades
+
+
 def render() -> None:
     st.title("Config & Experiments")
     cfg = load_auto_config()
@@ -365,6 +376,17 @@ def render() -> None:
             rows.append(row)
         st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
 
+    with st.expander("Preset Replay (recorded setup labels, last 30 days)", expanded=False):
+        st.caption(
+            "Replays each preset's gates and thresholds over logged setup labels. "
+            "P&L covers labels that became trades; AI validation is not replayed."
+        )
+        variants = [GateVariant.from_config(cfg.smc_v2)]
+        variants += [GateVariant.from_preset(name.title(), values) for name, values in QUICK_TUNING_PRESETS.items()]
+        scores, labels, matched = _preset_replay(db.get_last_write_marker(), variants)
+        st.caption(f"{labels} labels, {matched} matched closed trades")
+        st.dataframe(pd.DataFrame(scores), width="stretch", hide_index=True)
+
     q1, q2, q3 = st.columns(3)
     with q1:
         q_a_plus_only = st.checkbox(
@@ -9,6 +9,7 @@ from pathlib import Path
 import streamlit as st
 import pandas as pd
 
+from components.data_service import data_service
 from src.utils.database import db
 from src.core.auto_config import load_auto_config, save_auto_config
 from app_pages.shared import (
@@ -115,7 +116,7 @@ def render() -> None:
     k3.metric("Win Rate (All)", f"{snap['perf'].get('win_rate', 0):.1f}%")
     k4.metric("30d Max DD", f"{snap['drawdown'].get('max_drawdown_pct', 0):.2f}%")
 
-    pending_recon = db.get_pending_recon_count(days=7)
+    pending_recon = data_service.get_pending_recon_count(days=7)
     if pending_recon > 0:
         st.warning(f"Pending MT5 Recon (7d): {pending_recon} closed trade(s) awaiting MT5 PnL confirmation.")
     c_sync1, c_sync2 = st.columns([1, 3])
@@ -135,7 +136,7 @@ def render() -> None:
                 st.error(f"MT5 sync failed: {sync_res.get('error', 'unknown error')}")
 
     st.subheader("Last 10 Closed Trades")
-    recent_closed = db.get_recent_trades(days=30)
+    recent_closed = data_service.get_recent_trades(days=30)
     if recent_closed:
         closed_df = pd.DataFrame(recent_closed)
         closed_df = closed_df.sort_values("closed_at", ascending=False).head(10)
@@ -209,7 +210,7 @@ def render() -> None:
         st.info("No block reasons yet.")
 
     st.subheader("Last Runtime Events")
-    activities = db.get_recent_activities(limit=15)
+    activities = data_service.get_recent_activities(limit=15)
     rows = []
     for a in activities:
         rows.append(
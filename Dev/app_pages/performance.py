@@ -5,7 +5,7 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from src.utils.database import db
+from components.data_service import data_service
 from app_pages.shared import fast_sync_with_mt5
 
 
@@ -13,9 +13,9 @@ def render() -> None:
     fast_sync_with_mt5()
     st.title("Performance")
 
-    perf = db.get_performance_stats(days=30)
-    dd = db.get_drawdown_stats(days=30)
-    auto_stats = db.get_auto_trading_stats(days=30)
+    perf = data_service.get_performance_stats(days=30)
+    dd = data_service.get_drawdown_stats(days=30)
+    auto_stats = data_service.get_auto_trading_stats(days=30)
 
     c1, c2, c3, c4, c5 = st.columns(5)
     c1.metric("Total Trades", perf.get("total_trades", 0))
@@ -32,7 +32,7 @@ def render() -> None:
     a4.metric("Execution Rate", f"{auto_stats.get('execution_rate', 0):.1f}%")
 
     st.subheader("By Instrument (Auto, 30d)")
-    by_inst = db.get_auto_trades_by_instrument(days=30)
+    by_inst = data_service.get_auto_trades_by_instrument(days=30)
     if by_inst:
         rows = []
         for inst, data in by_inst.items():
@@ -45,7 +45,7 @@ def render() -> None:
         st.info("No auto-trade instrument stats yet.")
 
     st.subheader("Recent Closed Trades")
-    trades = db.get_recent_trades(days=30)
+    trades = data_service.get_recent_trades(days=30)
     if trades:
         df = pd.DataFrame(trades)
         keep_cols = [c for c in [
@@ -5,7 +5,7 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from src.utils.database import db
+from components.data_service import data_service
 from app_pages.shared import fast_sync_with_mt5
 
 
@@ -42,7 +42,7 @@ def render() -> None:
     st.title("Runtime Audit")
     st.caption("Structured runtime validation view based on setup labels and gate telemetry.")
 
-    labels = db.get_recent_setup_labels(limit=500)
+    labels = data_service.get_recent_setup_labels(limit=500)
     rows = [_extract_eval_fields(x) for x in labels]
     if not rows:
         st.info("No SMC v2 setup labels yet.")
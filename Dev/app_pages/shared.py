@@ -13,6 +13,7 @@ from typing import Any
 
 import streamlit as st
 
+from components.data_service import data_service
 from src.core.auto_config import load_auto_config, save_auto_config
 from src.utils.database import db
 from src.trading.mt5_client import MT5Client
@@ -35,14 +36,9 @@ def ensure_session_state() -> None:
 def get_mt5_client() -> MT5Client | None:
     ensure_session_state()
     if st.session_state.mt5_client is None:
-        try:
-            client = MT5Client()
-            if client.is_connected():
-                st.session_state.mt5_client = client
-                st.session_state.connected = True
-        except Exception:
-            st.session_state.mt5_client = None
-            st.session_state.connected = False
+        client = data_service.get_mt5_client()
+        st.session_state.mt5_client = client
+        st.session_state.connected = client is not None
     return st.session_state.mt5_client
 
 
@@ -69,7 +65,7 @@ def get_account_summary() -> dict[str, Any]:
 def get_service_status() -> dict[str, Any]:
     """Infer runtime status from recent activity timestamps."""
     now = datetime.now(timezone.utc)
-    activities = db.get_recent_activities(limit=1)
+    activities = data_service.get_recent_activities(limit=1)
     if not activities:
         return {"running": False, "last_activity": None, "state": "STOPPED"}
     ts = activities[0].get("timestamp")
@@ -100,16 +96,16 @@ def get_ops_snapshot() -> dict[str, Any]:
     fast_sync_with_mt5()
 
     auto_cfg = load_auto_config()
-    day_stats = db.get_auto_trading_stats(days=1)
-    perf = db.get_performance_stats(days=30)
-    drawdown = db.get_drawdown_stats(days=30)
+    day_stats = data_service.get_auto_trading_stats(days=1)
+    perf = data_service.get_performance_stats(days=30)
+    drawdown = data_service.get_drawdown_stats(days=30)
     # Ops dashboard tracks bot performance; scope PnL to AUTO_* trades only.
-    daily_pnl = db.get_daily_pnl(auto_only=True)
-    weekly_pnl = db.get_weekly_pnl(auto_only=True)
+    daily_pnl = data_service.get_daily_pnl(auto_only=True)
+    weekly_pnl = data_service.get_weekly_pnl(auto_only=True)
     service = get_service_status()
     account = get_account_summary()
-    smc_shadow = db.get_smc_v2_shadow_stats(hours=24)
-    gate_stats = db.get_smc_v2_gate_stats(hours=24)
+    smc_shadow = data_service.get_smc_v2_shadow_stats(hours=24)
+    gate_stats = data_service.get_smc_v2_gate_stats(hours=24)
     return {
         "auto_cfg": auto_cfg,
         "day_stats": day_stats,
@@ -125,16 +121,11 @@ def get_ops_snapshot() -> dict[str, Any]:
 
 
 def fast_sync_with_mt5() -> None:
-    """Best-effort dashboard-side sync so displayed metrics track MT5 state."""
-    try:
-        client = get_mt5_client()
-        if client and client.is_connected():
-            mt5_positions = client.get_positions()
-            mt5_history = client.get_history(days=30)
-            db.sync_trades_with_mt5(mt5_positions, mt5_history, mt5_client=client)
-    except Exception:
-        # Dashboard must remain resilient even if sync fails.
-        pass
+    """Best-effort dashboard-side sync so displayed metrics track MT5 state.
+
+    Throttled process-wide, so open tabs/reruns don't each write to the DB.
+    """
+    data_service.throttled_mt5_sync()
 
 
 def run_manual_mt5_sync(days: int = 30) -> dict[str, Any]:
@@ -162,7 +153,7 @@ def get_open_trades_snapshot() -> list[dict[str, Any]]:
     Return current open trades/positions merged from DB and MT5 with sync status.
     """
     rows: list[dict[str, Any]] = []
-    db_open = db.get_open_trades()
+    db_open = data_service.get_open_trades()
     db_map = {str(t.get("trade_id")): t for t in db_open if t.get("trade_id") is not None}
 
     mt5_positions = []
@@ -0,0 +1,33 @@
+"""
+Benchmarks for SMC analysis and backtest hot paths.
+
+Run via run_benchmarks.py at the project root (offline, no MT5 needed).
+"""
+
+from .fixtures import CandleFixture, synthetic_fixture, default_fixtures
+from .suite import (
+    Benchmark,
+    BenchmarkResult,
+    ComparisonReport,
+    run_suite,
+    save_baseline,
+    load_baseline,
+    compare,
+    format_report,
+)
+
+__all__ = [
+    # Fixtures
+    "CandleFixture",
+    "synthetic_fixture",
+    "default_fixtures",
+    # Suite
+    "Benchmark",
+    "BenchmarkResult",
+    "ComparisonReport",
+    "run_suite",
+    "save_baseline",
+    "load_baseline",
+    "compare",
+    "format_report",
+]
@@ -0,0 +1,282 @@
+"""
+Candle fixtures for benchmarks.
+
+Two sources:
+- Synthetic: seeded random walk with trend regimes, session volatility,
+  impulse legs (FVGs/displacement) and liquidity sweeps. Pure-Python
+  random.Random so the series is identical on every machine and numpy
+  version. H1/H4 are aggregated from the same M5 series so timeframes
+  line up exactly like MT5 data.
+- Recorded: gzip JSON captured from MT5 with `run_benchmarks.py record`
+  (benchmarks/data/<name>.json.gz). Picked up automatically when present.
+"""
+
+import gzip
+import hashlib
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Fixed start (Monday 00:00 UTC) - never derive fixtures from "now"
+SYNTHETIC_START = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+# instrument -> (start price, price digits, typical M5 range in price units)
+SYNTHETIC_INSTRUMENTS = {
+    "EUR_USD": (1.08500, 5, 0.00040),
+    "GBP_USD": (1.27000, 5, 0.00055),
+    "XAU_USD": (2050.00, 2, 1.20),
+}
+
+TIMEFRAME_MINUTES = {"M5": 5, "H1": 60, "H4": 240}
+
+
+@dataclass
+class CandleFixture:
+    """Multi-timeframe candle set for one instrument."""
+    name: str
+    instrument: str
+    source: str  # "synthetic" or "recorded"
+    m5: List[Dict] = field(default_factory=list)
+    h1: List[Dict] = field(default_factory=list)
+    h4: List[Dict] = field(default_factory=list)
+
+    @property
+    def digest(self) -> str:
+        """Short content hash - baselines are only comparable on equal data."""
+        h = hashlib.sha256()
+        for tf in (self.h4, self.h1, self.m5):
+            for c in tf:
+                h.update(f"{c['timestamp']}|{c['open']}|{c['high']}|{c['low']}|{c['close']}\n".encode())
+        return h.hexdigest()[:16]
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "instrument": self.instrument,
+            "source": self.source,
+            "M5": self.m5,
+            "H1": self.h1,
+            "H4": self.h4,
+        }
+
+
+def _candle(ts: datetime, o: float, h: float, l: float, c: float, volume: int, digits: int) -> Dict:
+    """Candle dict in the same shape DataLoader/MT5Client return."""
+    return {
+        "time": ts.isoformat(),
+        "timestamp": int(ts.timestamp()),
+        "open": round(o, digits),
+        "high": round(h, digits),
+        "low": round(l, digits),
+        "close": round(c, digits),
+        "volume": volume,
+        "complete": True,
+    }
+
+
+def _session_vol(hour: int) -> float:
+    """Relative volatility by UTC hour (Asia quiet, London/NY active)."""
+    if 7 <= hour < 10 or 13 <= hour < 16:
+        return 1.6
+    if 10 <= hour < 13 or 16 <= hour < 19:
+        return 1.1
+    return 0.55
+
+
+def generate_m5(instrument: str, bars: int, seed: int = 42) -> List[Dict]:
+    """
+    Generate a deterministic M5 series (weekends skipped).
+
+    Args:
+        instrument: Key of SYNTHETIC_INSTRUMENTS
+        bars: Number of M5 candles
+        seed: RNG seed
+
+    Returns:
+        List of candle dicts, oldest first
+    """
+    start_price, digits, unit = SYNTHETIC_INSTRUMENTS[instrument]
+    rng = random.Random(f"{instrument}:{seed}")
+
+    candles = []
+    ts = SYNTHETIC_START
+    price = start_price
+    drift = 0.0
+    regime_left = 0
+    impulse_left = 0
+    impulse_dir = 0
+    vol_cluster = 1.0
+
+    while len(candles) < bars:
+        if ts.weekday() >= 5:
+            ts += timedelta(minutes=5)
+            continue
+
+        # Trend regimes: bull / bear / range, a few hundred bars each
+        if regime_left <= 0:
+            drift = rng.choice((-1, 0, 0, 1)) * unit * rng.uniform(0.03, 0.12)
+            regime_left = rng.randint(150, 600)
+        regime_left -= 1
+
+        # Volatility clustering around the session profile
+        vol_cluster = 0.9 * vol_cluster + 0.1 * rng.uniform(0.5, 1.8)
+        sigma = unit * _session_vol(ts.hour) * vol_cluster
+
+        # Occasional impulse legs leave FVGs and displacement candles
+        if impulse_left <= 0 and rng.random() < 0.012:
+            impulse_left = rng.randint(2, 5)
+            impulse_dir = rng.choice((-1, 1))
+        move = drift + rng.gauss(0, sigma * 0.5)
+        if impulse_left > 0:
+            move += impulse_dir * sigma * rng.uniform(1.5, 3.0)
+            impulse_left -= 1
+
+        o = price
+        c = max(o + move, unit)
+        wick_up = abs(rng.gauss(0, sigma * 0.35))
+        wick_dn = abs(rng.gauss(0, sigma * 0.35))
+
+        # Liquidity sweeps: wick through the recent extreme, close back inside
+        if len(candles) >= 20 and rng.random() < 0.01:
+            recent = candles[-20:]
+            if rng.random() < 0.5:
+                wick_up = max(wick_up, max(x["high"] for x in recent) - max(o, c) + sigma * 0.3)
+            else:
+                wick_dn = max(wick_dn, min(o, c) - min(x["low"] for x in recent) + sigma * 0.3)
+
+        h = max(o, c) + wick_up
+        l = max(min(o, c) - wick_dn, unit * 0.5)
+        volume = int(100 + 400 * _session_vol(ts.hour) * vol_cluster * rng.uniform(0.6, 1.4))
+        candles.append(_candle(ts, o, h, l, c, volume, digits))
+        price = c
+        ts += timedelta(minutes=5)
+
+    return candles
+
+
+def aggregate(m5: List[Dict], timeframe: str, digits: int = 5) -> List[Dict]:
+    """
+    Aggregate M5 candles into a higher timeframe (UTC-aligned buckets).
+
+    Args:
+        m5: M5 candles, oldest first
+        timeframe: "H1" or "H4"
+        digits: Price rounding
+
+    Returns:
+        Higher-timeframe candles stamped with their bucket open time
+    """
+    bucket_seconds = TIMEFRAME_MINUTES[timeframe] * 60
+    out: List[Dict] = []
+    current: Optional[Dict] = None
+    for c in m5:
+        bucket = c["timestamp"] - c["timestamp"] % bucket_seconds
+        if current is None or current["timestamp"] != bucket:
+            if current is not None:
+                out.append(current)
+            ts = datetime.fromtimestamp(bucket, tz=timezone.utc)
+            current = _candle(ts, c["open"], c["high"], c["low"], c["close"], c["volume"], digits)
+        else:
+            current["high"] = max(current["high"], c["high"])
+            current["low"] = min(current["low"], c["low"])
+            current["close"] = c["close"]
+            current["volume"] += c["volume"]
+    if current is not None:
+        out.append(current)
+    return out
+
+
+def synthetic_fixture(instrument: str = "EUR_USD", m5_bars: int = 12_000, seed: int = 42) -> CandleFixture:
+    """Build a synthetic multi-timeframe fixture."""
+    digits = SYNTHETIC_INSTRUMENTS[instrument][1]
+    m5 = generate_m5(instrument, m5_bars, seed)
+    return CandleFixture(
+        name=f"synthetic_{instrument}_{m5_bars}",
+        instrument=instrument,
+        source="synthetic",
+        m5=m5,
+        h1=aggregate(m5, "H1", digits),
+        h4=aggregate(m5, "H4", digits),
+    )
+
+
+# =============================================================================
+# Recorded fixtures
+# =============================================================================
+
+def save_recorded(fixture: CandleFixture, data_dir: Path = DATA_DIR) -> Path:
+    """Write a fixture to <data_dir>/<name>.json.gz."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / f"{fixture.name}.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(fixture.to_dict(), f, separators=(",", ":"))
+    return path
+
+
+def load_recorded(path: Path) -> CandleFixture:
+    """Load a fixture written by save_recorded()."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    return CandleFixture(
+        name=data["name"],
+        instrument=data["instrument"],
+        source="recorded",
+        m5=data["M5"],
+        h1=data["H1"],
+        h4=data["H4"],
+    )
+
+
+def list_recorded(data_dir: Path = DATA_DIR) -> List[Path]:
+    if not data_dir.exists():
+        return []
+    return sorted(data_dir.glob("*.json.gz"))
+
+
+def record_from_mt5(instrument: str, days: int, name: Optional[str] = None) -> CandleFixture:
+    """
+    Capture a fixture from MT5 (Windows with terminal running).
+
+    Args:
+        instrument: OANDA-style symbol (EUR_USD)
+        days: History length ending now
+        name: Fixture name (default recorded_<instrument>_<days>d)
+
+    Returns:
+        CandleFixture with M5/H1/H4 candles
+    """
+    from src.backtesting.data_loader import DataLoader
+
+    loader = DataLoader()
+    end = datetime.now(timezone.utc).replace(second=0, microsecond=0, tzinfo=None)
+    start = end - timedelta(days=days)
+    # HTF needs history before the first M5 bar analyzed
+    htf_start = start - timedelta(days=max(30, days))
+
+    data = {
+        "M5": loader.load_simple(instrument, "M5", start, end).candles,
+        "H1": loader.load_simple(instrument, "H1", htf_start, end).candles,
+        "H4": loader.load_simple(instrument, "H4", htf_start, end).candles,
+    }
+    return CandleFixture(
+        name=name or f"recorded_{instrument}_{days}d",
+        instrument=instrument,
+        source="recorded",
+        m5=data["M5"],
+        h1=data["H1"],
+        h4=data["H4"],
+    )
+
+
+def default_fixtures(quick: bool = False) -> List[CandleFixture]:
+    """Synthetic fixtures plus any recorded ones on disk."""
+    m5_bars = 4_000 if quick else 12_000
+    fixtures = [synthetic_fixture("EUR_USD", m5_bars), synthetic_fixture("XAU_USD", m5_bars)]
+    fixtures.extend(load_recorded(p) for p in list_recorded())
+    return fixtures
@@ -0,0 +1,355 @@
+"""
+Benchmark suite for SMC and backtest hot paths.
+
+Each benchmark times one callable against one fixture and reports
+throughput in bars/second (candles processed per second of wall time).
+Results are stored as JSON baselines and compared with a relative
+threshold so throughput regressions fail loudly.
+
+Usage:
+    from benchmarks.suite import run_suite, save_baseline, load_baseline, compare
+
+    results = run_suite(quick=True)
+    report = compare(results, load_baseline("default"), threshold=0.15)
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from benchmarks.fixtures import CandleFixture, default_fixtures
+
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+DEFAULT_THRESHOLD = 0.15   # Fail when throughput drops more than 15%
+MIN_TIME_SECONDS = 0.5     # Keep repeating a benchmark until this much time is spent
+MIN_REPEATS = 3
+MAX_REPEATS = 200
+
+HTF_LOOKBACK = 100
+LTF_LOOKBACK = 100
+E2E_M5_BARS = 1_500
+E2E_M5_BARS_QUICK = 300
+DETECTOR_BARS = 2_000        # Detectors run on a slice (detect_fvg is superlinear)
+
+
+@dataclass
+class Benchmark:
+    """One timed callable. setup() runs once, untimed, and returns the callable."""
+    name: str
+    setup: Callable[[CandleFixture], Callable[[], object]]
+    bars: Callable[[CandleFixture], int]
+    warmup: bool = True             # Untimed first call (skip for multi-second runs)
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing of one benchmark on one fixture."""
+    name: str
+    fixture: str
+    bars: int
+    repeats: int = 0
+    median_s: float = 0.0
+    min_s: float = 0.0
+    bars_per_sec: float = 0.0
+    status: str = "ok"  # ok, error
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.fixture}]"
+
+
+@dataclass
+class Comparison:
+    """Current vs baseline throughput for one benchmark key."""
+    key: str
+    status: str  # ok, improved, regression, error, new, missing, fixture_changed
+    baseline_bps: Optional[float] = None
+    current_bps: Optional[float] = None
+    change: Optional[float] = None  # Relative change, -0.2 = 20% slower
+
+
+@dataclass
+class ComparisonReport:
+    threshold: float
+    rows: List[Comparison] = field(default_factory=list)
+    machine_mismatch: bool = False
+
+    @property
+    def failed(self) -> bool:
+        return any(r.status in ("regression", "error") for r in self.rows)
+
+
+# =============================================================================
+# Benchmark definitions
+# =============================================================================
+
+def _swing_points(fx: CandleFixture):
+    from src.smc.structure import detect_swing_points
+    m5 = fx.m5[-DETECTOR_BARS:]
+    return lambda: detect_swing_points(m5, left_bars=5, right_bars=2)
+
+
+def _fvg(fx: CandleFixture):
+    from src.smc.zones import detect_fvg
+    m5 = fx.m5[-DETECTOR_BARS:]
+    return lambda: detect_fvg(m5)
+
+
+def _analyze_htf(fx: CandleFixture):
+    from src.smc.smc_analyzer import SMCAnalyzer
+    analyzer = SMCAnalyzer()
+    h4, h1 = fx.h4[-HTF_LOOKBACK:], fx.h1[-HTF_LOOKBACK:]
+    return lambda: analyzer.analyze_htf(h4, h1, fx.instrument)
+
+
+def _analyze_ltf(fx: CandleFixture):
+    from src.smc.smc_analyzer import SMCAnalyzer
+    analyzer = SMCAnalyzer()
+    htf_result = analyzer.analyze_htf(fx.h4[-HTF_LOOKBACK:], fx.h1[-HTF_LOOKBACK:], fx.instrument)
+    m5 = fx.m5[-LTF_LOOKBACK:]
+    return lambda: analyzer.analyze_ltf(m5, htf_result, fx.instrument)
+
+
+def _technical(fx: CandleFixture):
+    from src.market.indicators import TechnicalAnalyzer
+    analyzer = TechnicalAnalyzer()
+    m5 = fx.m5[-LTF_LOOKBACK:]
+    return lambda: analyzer.analyze(m5, fx.instrument)
+
+
+def _e2e_bars(fx: CandleFixture, quick: bool) -> int:
+    return min(len(fx.m5), E2E_M5_BARS_QUICK if quick else E2E_M5_BARS)
+
+
+def _backtest_run(quick: bool):
+    def setup(fx: CandleFixture):
+        from src.backtesting.engine import SMCBacktestEngine, BacktestConfig
+
+        m5 = fx.m5[-_e2e_bars(fx, quick):]
+        first_ts = m5[0]["timestamp"]
+        # HTF history up to the window, like a DataLoader request with warmup
+        h4 = [c for c in fx.h4 if c["timestamp"] <= m5[-1]["timestamp"]]
+        h1 = [c for c in fx.h1 if c["timestamp"] <= m5[-1]["timestamp"]]
+        config = BacktestConfig(
+            instrument=fx.instrument,
+            timeframe="M5",
+            start_date=datetime.fromtimestamp(first_ts, tz=timezone.utc),
+            end_date=datetime.fromtimestamp(m5[-1]["timestamp"], tz=timezone.utc),
+            htf_lookback=HTF_LOOKBACK,
+            ltf_lookback=LTF_LOOKBACK,
+        )
+        engine = SMCBacktestEngine()
+        return lambda: engine.run(h4, h1, m5, config)
+
+    def bars(fx: CandleFixture) -> int:
+        # Bars actually simulated (the engine skips the LTF warmup)
+        return _e2e_bars(fx, quick) - max(LTF_LOOKBACK, 30)
+
+    return setup, bars
+
+
+def get_benchmarks(quick: bool = False) -> List[Benchmark]:
+    """All benchmarks, per-function first, end-to-end last."""
+    e2e_setup, e2e_bars = _backtest_run(quick)
+    return [
+        Benchmark("smc.detect_swing_points", _swing_points, lambda fx: len(fx.m5[-DETECTOR_BARS:])),
+        Benchmark("smc.detect_fvg", _fvg, lambda fx: len(fx.m5[-DETECTOR_BARS:])),
+        Benchmark(
+            "smc.analyze_htf", _analyze_htf,
+            lambda fx: len(fx.h4[-HTF_LOOKBACK:]) + len(fx.h1[-HTF_LOOKBACK:]),
+        ),
+        Benchmark("smc.analyze_ltf", _analyze_ltf, lambda fx: len(fx.m5[-LTF_LOOKBACK:])),
+        Benchmark("technical.analyze", _technical, lambda fx: len(fx.m5[-LTF_LOOKBACK:])),
+        Benchmark("backtest.run", e2e_setup, e2e_bars, warmup=False),
+    ]
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def measure(fn: Callable[[], object], min_time: float = MIN_TIME_SECONDS,
+            min_repeats: int = MIN_REPEATS, max_repeats: int = MAX_REPEATS,
+            warmup: bool = True) -> List[float]:
+    """
+    Time fn() repeatedly, by default after one untimed warmup call.
+
+    Returns:
+        Per-call durations in seconds
+    """
+    if warmup:
+        fn()  # Imports, caches, lazy config loads
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_repeats:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= min_repeats and time.perf_counter() - started >= min_time:
+            break
+    return samples
+
+
+def run_benchmark(bench: Benchmark, fixture: CandleFixture, min_time: float = MIN_TIME_SECONDS) -> BenchmarkResult:
+    result = BenchmarkResult(name=bench.name, fixture=fixture.name, bars=bench.bars(fixture))
+    try:
+        samples = measure(bench.setup(fixture), min_time=min_time, warmup=bench.warmup)
+    except Exception as e:
+        result.status = "error"
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    result.repeats = len(samples)
+    result.median_s = statistics.median(samples)
+    result.min_s = min(samples)
+    result.bars_per_sec = result.bars / result.median_s if result.median_s > 0 else 0.0
+    return result
+
+
+def machine_info() -> dict:
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(quick: bool = False, only: Optional[List[str]] = None,
+              fixtures: Optional[List[CandleFixture]] = None,
+              min_time: float = MIN_TIME_SECONDS,
+              progress: Optional[Callable[[BenchmarkResult], None]] = None) -> dict:
+    """
+    Run every benchmark on every fixture.
+
+    Args:
+        quick: Smaller fixtures and end-to-end window (CI / pre-commit)
+        only: Benchmark name prefixes to run (e.g. ["smc."])
+        fixtures: Override fixtures (default: synthetic + recorded on disk)
+        min_time: Minimum timed seconds per benchmark
+        progress: Optional callback(result) after each benchmark
+
+    Returns:
+        Run document: {created, quick, machine, fixtures, results}
+    """
+    fixtures = fixtures if fixtures is not None else default_fixtures(quick)
+    benchmarks = [
+        b for b in get_benchmarks(quick)
+        if not only or any(b.name.startswith(prefix) for prefix in only)
+    ]
+
+    results = {}
+    for fixture in fixtures:
+        for bench in benchmarks:
+            result = run_benchmark(bench, fixture, min_time=min_time)
+            results[result.key] = asdict(result)
+            if progress:
+                progress(result)
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "quick": quick,
+        "machine": machine_info(),
+        "fixtures": {fx.name: fx.digest for fx in fixtures},
+        "results": results,
+    }
+
+
+# =============================================================================
+# Baselines
+# =============================================================================
+
+def baseline_path(name: str, baseline_dir: Path = BASELINE_DIR) -> Path:
+    return baseline_dir / f"{name}.json"
+
+
+def save_baseline(run: dict, name: str = "default", baseline_dir: Path = BASELINE_DIR) -> Path:
+    baseline_dir.mkdir(parents=True, exist_ok=True)
+    path = baseline_path(name, baseline_dir)
+    path.write_text(json.dumps(run, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def load_baseline(name: str = "default", baseline_dir: Path = BASELINE_DIR) -> Optional[dict]:
+    path = baseline_path(name, baseline_dir)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> ComparisonReport:
+    """
+    Compare a run against a baseline.
+
+    A benchmark regresses when its bars/sec drops by more than
+    `threshold` (relative). Benchmarks whose fixture data changed are
+    reported but not judged - their numbers are not comparable.
+
+    Args:
+        current: Run document from run_suite()
+        baseline: Stored baseline run document
+        threshold: Allowed relative slowdown (0.15 = 15%)
+
+    Returns:
+        ComparisonReport (report.failed -> non-zero exit)
+    """
+    report = ComparisonReport(threshold=threshold)
+    report.machine_mismatch = current.get("machine") != baseline.get("machine")
+
+    base_results = baseline.get("results", {})
+    cur_results = current.get("results", {})
+    base_fixtures = baseline.get("fixtures", {})
+    cur_fixtures = current.get("fixtures", {})
+
+    for key in sorted(set(base_results) | set(cur_results)):
+        base = base_results.get(key)
+        cur = cur_results.get(key)
+
+        if cur is None:
+            report.rows.append(Comparison(key, "missing", baseline_bps=base.get("bars_per_sec")))
+            continue
+        if base is None or base.get("status") != "ok":
+            status = cur["status"] if cur["status"] != "ok" else "new"
+            report.rows.append(Comparison(key, status, current_bps=cur.get("bars_per_sec")))
+            continue
+
+        row = Comparison(key, "ok", baseline_bps=base["bars_per_sec"], current_bps=cur.get("bars_per_sec"))
+        if cur["status"] != "ok":
+            # Worked in the baseline, broken now
+            row.status = "error"
+        elif base_fixtures.get(cur["fixture"]) != cur_fixtures.get(cur["fixture"]):
+            row.status = "fixture_changed"
+        elif base["bars_per_sec"] > 0:
+            row.change = cur["bars_per_sec"] / base["bars_per_sec"] - 1.0
+            if row.change < -threshold:
+                row.status = "regression"
+            elif row.change > threshold:
+                row.status = "improved"
+        report.rows.append(row)
+
+    return report
+
+
+def format_report(report: ComparisonReport) -> str:
+    lines = []
+    if report.machine_mismatch:
+        lines.append("WARNING: baseline was recorded on a different machine/Python - numbers may not be comparable")
+    lines.append(f"{'benchmark':<58} {'baseline':>12} {'current':>12} {'change':>8}  status")
+    for r in report.rows:
+        base = f"{r.baseline_bps:,.0f}" if r.baseline_bps else "-"
+        cur = f"{r.current_bps:,.0f}" if r.current_bps else "-"
+        change = f"{r.change:+.1%}" if r.change is not None else "-"
+        lines.append(f"{r.key:<58} {base:>12} {cur:>12} {change:>8}  {r.status.upper()}")
+    verdict = "FAILED" if report.failed else "PASSED"
+    lines.append(f"\n{verdict} (threshold {report.threshold:.0%} bars/sec drop)")
+    return "\n".join(lines)
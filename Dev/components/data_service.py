@@ -0,0 +1,292 @@
+"""
+Cached dashboard data service.
+
+Read-side layer between dashboard pages and the trading database:
+- Query results are cached with st.cache_data, shared by every session
+  and tab of the Streamlit process
+- Cache keys include the database's last-write marker, so reruns are
+  served from memory until the trading daemon actually writes something;
+  the TTL only bounds staleness of time-windowed queries ("today", "24h")
+- The activity feed is tailed incrementally by row id instead of
+  re-reading the newest N rows on every rerun
+- One MT5 client is shared by all sessions (MetaTrader5 is process-global)
+- One event-stream subscriber per process receives the trading service's
+  pushed state (status, scans, executions, positions, heartbeat); pages
+  render live views from memory and rerun only when something happened
+
+Usage:
+    from components.data_service import data_service as ds
+
+    stats = ds.get_performance_stats(days=30)
+    activities = ds.get_recent_activities(limit=15)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+import streamlit as st
+
+from src.utils.database import db, Database
+from src.services.event_stream import EventSubscriber
+from src.utils.logger import logger
+
+
+QUERY_TTL_SECONDS = 10       # Max staleness for time-windowed queries
+MAX_CACHED_RESULTS = 256     # Bound on cached (query, args, marker) entries
+ACTIVITY_FEED_SIZE = 500     # Rows kept in the shared activity tail
+MT5_SYNC_MIN_INTERVAL = 60   # Seconds between dashboard-side MT5 syncs
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS, max_entries=MAX_CACHED_RESULTS, show_spinner=False)
+def _cached_query(method: str, marker: tuple, kwargs: tuple) -> Any:
+    """Run a Database read method; cached per (method, marker, kwargs)."""
+    return getattr(db, method)(**dict(kwargs))
+
+
+class ActivityFeed:
+    """
+    Process-wide incremental tail of activity_log.
+
+    Each refresh fetches only rows with id > last seen id, and only when
+    the database write marker has changed since the previous refresh.
+    """
+
+    def __init__(self, database: Database, maxlen: int = ACTIVITY_FEED_SIZE):
+        self._db = database
+        self._rows: deque = deque(maxlen=maxlen)
+        self._last_id = 0
+        self._marker: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def refresh(self) -> int:
+        """
+        Pull new rows since the last refresh.
+
+        Returns:
+            Number of new rows appended
+        """
+        marker = self._db.get_last_write_marker()
+        with self._lock:
+            if marker == self._marker:
+                return 0
+
+            maxlen = self._rows.maxlen
+            if self._last_id == 0:
+                rows = sorted(
+                    self._db.get_recent_activities(limit=maxlen),
+                    key=lambda r: r.get("id", 0),
+                )
+            else:
+                rows = []
+                while True:
+                    batch = self._db.get_activities_since(self._last_id, limit=maxlen)
+                    rows.extend(batch)
+                    if batch:
+                        self._last_id = batch[-1]["id"]
+                    if len(batch) < maxlen:
+                        break
+
+            self._rows.extend(rows)
+            if rows:
+                self._last_id = max(self._last_id, rows[-1].get("id", 0))
+            self._marker = marker
+            return len(rows)
+
+    def latest(self, limit: int = 50, activity_types: Optional[list] = None) -> list[dict]:
+        """
+        Get newest activities first (rows are shared - treat as read-only).
+
+        Args:
+            limit: Max number of activities
+            activity_types: Filter by types (optional)
+        """
+        self.refresh()
+        with self._lock:
+            rows = list(self._rows)
+
+        result = []
+        for row in reversed(rows):
+            if activity_types and row.get("activity_type") not in activity_types:
+                continue
+            result.append(row)
+            if len(result) >= limit:
+                break
+        return result
+
+
+@st.cache_resource(show_spinner=False)
+def _activity_feed() -> ActivityFeed:
+    return ActivityFeed(db)
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_mt5_client():
+    """Single MT5 client per dashboard process (failures are not cached)."""
+    from src.trading.mt5_client import MT5Client
+    client = MT5Client()
+    if not client.is_connected():
+        raise ConnectionError("MT5 terminal not connected")
+    return client
+
+
+@st.cache_resource(show_spinner=False)
+def _event_subscriber() -> EventSubscriber:
+    """Single event-stream subscriber per dashboard process."""
+    subscriber = EventSubscriber()
+    subscriber.start()
+    return subscriber
+
+
+class DashboardDataService:
+    """Cached read API used by dashboard pages."""
+
+    def __init__(self):
+        self._sync_lock = threading.Lock()
+        self._last_mt5_sync = 0.0
+
+    # ===================
+    # Infrastructure
+    # ===================
+
+    def _query(self, method: str, **kwargs) -> Any:
+        return _cached_query(method, db.get_last_write_marker(), tuple(sorted(kwargs.items())))
+
+    def get_mt5_client(self):
+        """Shared MT5 client, or None if the terminal is unavailable."""
+        try:
+            return _shared_mt5_client()
+        except Exception as e:
+            logger.debug(f"Dashboard MT5 client unavailable: {e}")
+            return None
+
+    def reset_mt5_client(self) -> None:
+        """Drop the shared client so the next call reconnects."""
+        _shared_mt5_client.clear()
+
+    def throttled_mt5_sync(self, min_interval_seconds: int = MT5_SYNC_MIN_INTERVAL) -> bool:
+        """
+        Best-effort DB<->MT5 sync, at most once per interval per process.
+
+        Returns:
+            True if a sync ran on this call
+        """
+        now = time.monotonic()
+        if not self._sync_lock.acquire(blocking=False):
+            return False
+        try:
+            if now - self._last_mt5_sync < min_interval_seconds:
+                return False
+            self._last_mt5_sync = now
+            client = self.get_mt5_client()
+            if client and client.is_connected():
+                mt5_positions = client.get_positions()
+                mt5_history = client.get_history(days=30)
+                db.sync_trades_with_mt5(mt5_positions, mt5_history, mt5_client=client)
+            return True
+        except Exception as e:
+            # Dashboard must remain resilient even if sync fails.
+            logger.debug(f"Dashboard MT5 sync failed: {e}")
+            return False
+        finally:
+            self._sync_lock.release()
+
+    def clear(self) -> None:
+        """Drop all cached query results (e.g. after a manual action)."""
+        _cached_query.clear()
+
+    # ===================
+    # Live events (pushed by the trading service)
+    # ===================
+
+    def get_event_subscriber(self) -> EventSubscriber:
+        return _event_subscriber()
+
+    def get_live_state(self) -> Optional[dict]:
+        """Latest pushed service state, or None while no service is streaming."""
+        subscriber = _event_subscriber()
+        if not subscriber.connected:
+            return None
+        return subscriber.snapshot()
+
+    # ===================
+    # Activity log
+    # ===================
+
+    def get_recent_activities(self, limit: int = 100, activity_types: Optional[list] = None) -> list[dict]:
+        """Newest activities first, served from the shared incremental feed."""
+        if limit > ACTIVITY_FEED_SIZE:
+            return self._query("get_recent_activities", limit=limit, activity_types=activity_types)
+        if activity_types:
+            # Rare types may be older than the feed window - use indexed query
+            return self._query("get_recent_activities", limit=limit, activity_types=tuple(activity_types))
+        return _activity_feed().latest(limit=limit)
+
+    def get_activity_stats(self, hours: int = 24) -> dict:
+        return self._query("get_activity_stats", hours=hours)
+
+    # ===================
+    # Trades / performance
+    # ===================
+
+    def get_performance_stats(self, days: int = 30) -> dict:
+        return self._query("get_performance_stats", days=days)
+
+    def get_drawdown_stats(self, days: int = 30) -> dict:
+        return self._query("get_drawdown_stats", days=days)
+
+    def get_daily_pnl(self, auto_only: bool = False) -> float:
+        return self._query("get_daily_pnl", auto_only=auto_only)
+
+    def get_weekly_pnl(self, auto_only: bool = False) -> float:
+        return self._query("get_weekly_pnl", auto_only=auto_only)
+
+    def get_recent_trades(self, days: int = 30) -> list[dict]:
+        return self._query("get_recent_trades", days=days)
+
+    def get_open_trades(self) -> list[dict]:
+        return self._query("get_open_trades")
+
+    def get_pending_recon_count(self, days: int = 7) -> int:
+        return self._query("get_pending_recon_count", days=days)
+
+    def get_recent_llm_decisions(self, limit: int = 20) -> list[dict]:
+        return self._query("get_recent_llm_decisions", limit=limit)
+
+    # ===================
+    # Auto-trading
+    # ===================
+
+    def get_auto_trading_stats(self, days: int = 7) -> dict:
+        return self._query("get_auto_trading_stats", days=days)
+
+    def get_auto_trades_by_instrument(self, days: int = 7) -> dict:
+        return self._query("get_auto_trades_by_instrument", days=days)
+
+    def get_recent_auto_signals(self, limit: int = 50) -> list[dict]:
+        return self._query("get_recent_auto_signals", limit=limit)
+
+    # ===================
+    # SMC v2 shadow
+    # ===================
+
+    def get_smc_v2_shadow_stats(self, hours: int = 24) -> dict:
+        return self._query("get_smc_v2_shadow_stats", hours=hours)
+
+    def get_smc_v2_gate_stats(self, hours: int = 24) -> dict:
+        return self._query("get_smc_v2_gate_stats", hours=hours)
+
+    def get_smc_v2_by_instrument(self, hours: int = 24) -> list[dict]:
+        return self._query("get_smc_v2_by_instrument", hours=hours)
+
+    def get_recent_setup_labels(self, limit: int = 50) -> list[dict]:
+        return self._query("get_recent_setup_labels", limit=limit)
+
+
+# Singleton instance
+data_service = DashboardDataService()
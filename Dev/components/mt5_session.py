@@ -2,6 +2,8 @@
 Shared MT5 session management for AI Trader dashboard.
 
 Provides centralized MT5 client initialization and connection handling.
+The underlying client is shared by all dashboard sessions (see
+components.data_service); session state only tracks this session's view.
 """
 
 import streamlit as st
@@ -27,9 +29,9 @@ def get_client():
     # Try to connect if not already connected
     if st.session_state.mt5_client is None:
         try:
-            from src.trading.mt5_client import MT5Client, MT5Error
-            client = MT5Client()
-            if client.is_connected():
+            from components.data_service import data_service
+            client = data_service.get_mt5_client()
+            if client is not None:
                 st.session_state.mt5_client = client
                 st.session_state.connected = True
         except ImportError as e:
@@ -52,6 +54,8 @@ def is_connected() -> bool:
 
 def reset_connection():
     """Reset MT5 connection state, forcing a reconnection on next get_client() call."""
+    from components.data_service import data_service
+    data_service.reset_mt5_client()
     st.session_state.mt5_client = None
     st.session_state.connected = False
 
@@ -44,33 +44,39 @@ st.set_page_config(page_title="Performance - AI Trader", page_icon="", layout="w
 # =============================================================================
 
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_closed_trades(write_marker: tuple) -> list:
+    """Closed trades; re-queried only when the database has been written."""
+    with db._connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                trade_id,
+                timestamp,
+                closed_at,
+                instrument,
+                direction,
+                entry_price,
+                exit_price,
+                units,
+                pnl,
+                pnl_percent,
+                confidence_score,
+                close_reason,
+                status,
+                risk_amount,
+                risk_percent
+            FROM trades
+            WHERE status = 'CLOSED'
+            ORDER BY closed_at ASC
+        """)
+        return [dict(row) for row in cursor.fetchall()]
+
+
 def get_all_trades() -> list:
     """Fetch all closed trades from database."""
     try:
-        with db._connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT
-                    trade_id,
-                    timestamp,
-                    closed_at,
-                    instrument,
-                    direction,
-                    entry_price,
-                    exit_price,
-                    units,
-                    pnl,
-                    pnl_percent,
-                    confidence_score,
-                    close_reason,
-                    status,
-                    risk_amount,
-                    risk_percent
-                FROM trades
-                WHERE status = 'CLOSED'
-                ORDER BY closed_at ASC
-            """)
-            return [dict(row) for row in cursor.fetchall()]
+        return _load_closed_trades(db.get_last_write_marker())
     except Exception as e:
         st.error(f"Error fetching trades: {e}")
         return []
@@ -22,8 +22,12 @@ from src.utils.monitoring import (
     AlertManager,
     AlertLevel,
     ErrorCategory,
-    check_system_health
+    check_system_health,
+    get_error_tracker,
+    get_alert_manager,
 )
+from src.utils.database import db
+from src.utils.latency import merge_exported, EXPORT_INTERVAL_SECONDS
 from components.tooltips import ICONS, metric_with_tooltip
 from components.status_bar import render_status_bar, get_status_bar_data
 from components.mt5_session import get_client, is_connected
@@ -136,7 +140,7 @@ def render_recent_errors(tracker: ErrorTracker):
     """Render recent errors table."""
     st.subheader(f"{ICONS['list']} Recent Errors")
 
-    errors = tracker.get_recent_errors(hours=24)
+    errors = tracker.get_recent_errors(hours=24, limit=500)
 
     if not errors:
         st.info("No errors in the last 24 hours")
@@ -155,6 +159,7 @@ def render_recent_errors(tracker: ErrorTracker):
             "Time": time_str,
             "Category": e.category,
             "Message": e.message[:100] + "..." if len(e.message) > 100 else e.message,
+            "Count": e.occurrences,
             "Resolved": ICONS['success'] if e.resolved else ICONS['pending'],
             "Timestamp": e.timestamp
         })
@@ -177,9 +182,8 @@ def render_recent_errors(tracker: ErrorTracker):
         col1, col2 = st.columns([1, 3])
         with col1:
             if st.button("Resolve All", type="secondary"):
-                for e in unresolved:
-                    tracker.resolve_error(e.timestamp)
-                st.success(f"Resolved {len(unresolved)} errors")
+                count = tracker.resolve_all()
+                st.success(f"Resolved {count} errors")
                 st.rerun()
 
 
@@ -187,7 +191,7 @@ def render_alerts(manager: AlertManager):
     """Render alerts section."""
     st.subheader(f"{ICONS['alert']} Alerts")
 
-    alerts = manager.get_recent_alerts(hours=24)
+    alerts = manager.get_recent_alerts(hours=24, limit=200)
     unacked = manager.get_unacknowledged()
 
     col1, col2 = st.columns([3, 1])
@@ -220,6 +224,8 @@ def render_alerts(manager: AlertManager):
         # Choose display based on level
         level = alert.level
         ack_icon = ICONS['success'] if alert.acknowledged else ""
+        if alert.occurrences > 1:
+            ack_icon = f"(x{alert.occurrences}) {ack_icon}".rstrip()
 
         if level == "critical":
             st.error(f"**{time_str}** [{alert.source}] {alert.message} {ack_icon}")
@@ -254,7 +260,7 @@ def render_error_timeline(tracker: ErrorTracker):
             daily_data[date_str] = {}
 
         cat = e.category
-        daily_data[date_str][cat] = daily_data[date_str].get(cat, 0) + 1
+        daily_data[date_str][cat] = daily_data[date_str].get(cat, 0) + e.occurrences
 
     if not daily_data:
         st.info("No data to display")
@@ -294,12 +300,86 @@ def render_error_timeline(tracker: ErrorTracker):
     st.plotly_chart(fig, use_container_width=True)
 
 
+def render_stage_latency():
+    """Render per-stage latency percentiles from exported histograms."""
+    st.subheader(f"{ICONS['chart']} Pipeline Latency")
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        hours = st.selectbox(
+            "Period", [1, 6, 24, 168], index=2,
+            format_func=lambda h: f"{h}h" if h < 168 else "7d",
+            key="latency_period",
+        )
+
+    try:
+        rows = db.get_stage_latency(hours=hours)
+    except Exception as e:
+        st.error(f"Could not load latency data: {e}")
+        return
+
+    if not rows:
+        st.info(
+            f"No latency data yet - the trading service exports stage timings "
+            f"every {EXPORT_INTERVAL_SECONDS // 60} min."
+        )
+        return
+
+    merged = merge_exported(rows)
+    groups = sorted({stage.split(".")[0] for stage in merged})
+    with col2:
+        selected = st.multiselect("Components", groups, default=groups, key="latency_groups")
+
+    table = []
+    for stage, hist in merged.items():
+        if stage.split(".")[0] not in selected:
+            continue
+        summary = hist.summary()
+        table.append({
+            "Stage": stage,
+            "Calls": summary["count"],
+            "p50 (ms)": summary["p50_ms"],
+            "p95 (ms)": summary["p95_ms"],
+            "p99 (ms)": summary["p99_ms"],
+            "Max (ms)": summary["max_ms"],
+            "Mean (ms)": summary["mean_ms"],
+            "Total (s)": round(summary["total_ms"] / 1000, 2),
+        })
+
+    if not table:
+        st.info("No stages selected")
+        return
+
+    df = pd.DataFrame(table).sort_values("Total (s)", ascending=False)
+    st.caption("Percentiles are bucket upper bounds (within ~20%). Sorted by total time spent.")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    # Where a single scan spends its time
+    scan_stages = df[df["Stage"].str.startswith("scan.") & ~df["Stage"].isin(["scan.instrument", "scan.cycle"])]
+    if not scan_stages.empty:
+        fig = px.bar(
+            scan_stages.sort_values("p95 (ms)"),
+            x="p95 (ms)",
+            y="Stage",
+            orientation="h",
+        )
+        fig.update_layout(
+            height=max(250, 22 * len(scan_stages)),
+            margin=dict(l=20, r=20, t=20, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font_color='white',
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
 def main():
     st.title(f"{ICONS['monitor']} System Monitoring")
 
     client = get_client()
-    tracker = ErrorTracker()
-    alert_manager = AlertManager()
+    # Process-wide instances, so repeated health checks are aggregated
+    tracker = get_error_tracker()
+    alert_manager = get_alert_manager()
 
     # Refresh button
     col1, col2, col3 = st.columns([1, 1, 4])
@@ -317,7 +397,7 @@ def main():
                     if alerts:
                         st.warning(f"Generated {len(alerts)} alert(s)")
                     else:
-                        st.success("No critical conditions found")
+                        st.success("No new critical conditions found")
                 except Exception as e:
                     st.error(f"Health check failed: {e}")
             else:
@@ -347,6 +427,11 @@ def main():
 
     st.divider()
 
+    # Per-stage latency (scanner, SMC, technical, execution)
+    render_stage_latency()
+
+    st.divider()
+
     # Recent errors table
     render_recent_errors(tracker)
 
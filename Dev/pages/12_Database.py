@@ -18,11 +18,19 @@ if str(DEV_DIR) not in sys.path:
 from components.tooltips import ICONS
 from components.status_bar import render_status_bar, get_status_bar_data
 from src.utils.config import config
+from src.utils.table_browser import (
+    TableBrowser,
+    ColumnFilter,
+    FILTER_OPERATORS,
+    MAX_PAGE_SIZE,
+    parquet_available,
+)
 
 st.set_page_config(page_title="Database - AI Trader", page_icon="", layout="wide")
 
 # Database path
 DB_PATH = DEV_DIR / "data" / "trades.db"
+browser = TableBrowser(DB_PATH)
 
 
 def get_connection():
@@ -30,68 +38,49 @@ def get_connection():
     return sqlite3.connect(DB_PATH)
 
 
-def get_tables():
-    """Get list of all tables in database."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-    tables = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return tables
+# Custom/quick query results are capped so one query can't flood the process
+MAX_QUERY_ROWS = 10_000
+# Exports larger than this are left on disk instead of offered for download
+MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+EXPORT_DIR = DEV_DIR / "data" / "exports"
 
 
-def get_table_info(table_name: str):
-    """Get column info for a table."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = cursor.fetchall()
-    conn.close()
-    return columns
-
-
-def get_table_count(table_name: str) -> int:
-    """Get row count for a table."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+def get_tables():
+    """Get list of all tables in database."""
+    return browser.get_tables()
 
 
-def get_table_data(table_name: str, limit: int = 100, offset: int = 0, order_by: str = None, order_desc: bool = True):
-    """Get data from a table."""
-    conn = get_connection()
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_count(table_name: str, filters: tuple, write_marker: tuple) -> int:
+    """Row count, re-run only after the database has been written."""
+    return browser.count_rows(table_name, list(filters))
 
-    query = f"SELECT * FROM {table_name}"
-    if order_by:
-        direction = "DESC" if order_desc else "ASC"
-        query += f" ORDER BY {order_by} {direction}"
-    query += f" LIMIT {limit} OFFSET {offset}"
 
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+def get_table_count(table_name: str, filters: tuple = ()) -> int:
+    """Get (filtered) row count for a table."""
+    return _cached_count(table_name, filters, browser.get_write_marker())
 
 
 def execute_query(query: str):
-    """Execute a custom SQL query."""
+    """Execute a custom SQL query (result capped at MAX_QUERY_ROWS)."""
     conn = get_connection()
     try:
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        cursor = conn.execute(query)
+        if cursor.description is None:
+            return pd.DataFrame(), None
+        columns = [d[0] for d in cursor.description]
+        rows = cursor.fetchmany(MAX_QUERY_ROWS + 1)
+        df = pd.DataFrame.from_records(rows[:MAX_QUERY_ROWS], columns=columns)
+        df.attrs["truncated"] = len(rows) > MAX_QUERY_ROWS
         return df, None
     except Exception as e:
-        conn.close()
         return None, str(e)
+    finally:
+        conn.close()
 
 
 def get_database_stats():
     """Get overall database statistics."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
     stats = {
         "file_size": 0,
         "tables": [],
@@ -103,17 +92,89 @@ def get_database_stats():
         stats["file_size"] = DB_PATH.stat().st_size / 1024  # KB
 
     # Table stats
-    tables = get_tables()
-    for table in tables:
-        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-        count = cursor.fetchone()[0]
+    for table in get_tables():
+        count = get_table_count(table)
         stats["tables"].append({"name": table, "count": count})
         stats["total_records"] += count
 
-    conn.close()
     return stats
 
 
+def _coerce_filter_value(raw: str, declared_type: str):
+    """Convert filter text to the column's type so SQLite can use the index."""
+    t = declared_type.upper()
+    try:
+        if "INT" in t:
+            return int(raw)
+        if any(k in t for k in ("REAL", "FLOA", "DOUB")):
+            return float(raw)
+    except ValueError:
+        pass
+    return raw
+
+
+def _render_filter(columns_info: list, indexed_columns: list) -> tuple:
+    """Filter controls (indexed columns only). Returns tuple of ColumnFilter."""
+    with st.expander("Filter", expanded=False):
+        col1, col2, col3 = st.columns([2, 1, 2])
+        with col1:
+            column = st.selectbox("Column", ["(none)"] + indexed_columns, key="db_filter_column")
+        with col2:
+            operator = st.selectbox("Operator", list(FILTER_OPERATORS), key="db_filter_op")
+        with col3:
+            raw = st.text_input("Value", key="db_filter_value", help="Use % as wildcard with LIKE")
+
+    if column == "(none)":
+        return ()
+    if FILTER_OPERATORS[operator] == 0:
+        return (ColumnFilter(column, operator),)
+    if raw == "":
+        return ()
+    declared = {c["name"]: c["type"] for c in columns_info}
+    return (ColumnFilter(column, operator, _coerce_filter_value(raw, declared.get(column, ""))),)
+
+
+def _render_export(selected_table: str, query: dict):
+    """Stream the current view (filter, sort, columns) to a file on disk."""
+    formats = ["CSV"] + (["Parquet"] if parquet_available() else [])
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        fmt = st.radio("Export format", formats, horizontal=True, key="db_export_format")
+    with col2:
+        run_export = st.button(f"{ICONS['arrow_down']} Export", help="Exports all matching rows, not just this page")
+
+    if not run_export:
+        return
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    suffix = "parquet" if fmt == "Parquet" else "csv"
+    path = EXPORT_DIR / f"{selected_table}_{stamp}.{suffix}"
+
+    try:
+        with st.spinner("Exporting..."):
+            if fmt == "Parquet":
+                total = browser.export_parquet(path, selected_table, **query)
+            else:
+                total = browser.export_csv(path, selected_table, **query)
+    except Exception as e:
+        st.error(f"Export failed: {e}")
+        return
+
+    size = path.stat().st_size
+    st.success(f"Exported {total:,} rows to `{path}` ({size / 1024:.1f} KB)")
+    if size <= MAX_DOWNLOAD_BYTES:
+        with open(path, "rb") as f:
+            st.download_button(
+                label=f"{ICONS['arrow_down']} Download {fmt}",
+                data=f,
+                file_name=path.name,
+                mime="application/octet-stream" if fmt == "Parquet" else "text/csv",
+            )
+    else:
+        st.info("File is too large to download through the browser - open it from the path above.")
+
+
 def render_table_browser():
     """Render table browser section."""
     st.subheader(f"{ICONS['list']} Table Browser")
@@ -125,35 +186,75 @@ def render_table_browser():
         return
 
     # Table selector
-    col1, col2, col3 = st.columns([2, 1, 1])
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
 
     with col1:
         selected_table = st.selectbox("Select Table", tables)
 
+    columns_info = browser.get_columns(selected_table)
+    column_names = [col["name"] for col in columns_info]
+    # Sorting/filtering only on indexed columns keeps every page an index range scan
+    indexed_columns = browser.get_indexed_columns(selected_table)
+
     with col2:
-        limit = st.number_input("Rows per page", min_value=10, max_value=500, value=50)
+        limit = st.number_input("Rows per page", min_value=10, max_value=MAX_PAGE_SIZE, value=50)
 
     with col3:
-        # Get columns for ordering
-        columns_info = get_table_info(selected_table)
-        column_names = [col[1] for col in columns_info]
-        order_by = st.selectbox("Order by", ["(default)"] + column_names)
+        order_by = st.selectbox("Order by", ["(default)"] + indexed_columns, help="Indexed columns only")
+
+    with col4:
+        order_desc = st.selectbox("Direction", ["Newest first", "Oldest first"]) == "Newest first"
+
+    selected_columns = st.multiselect(
+        "Columns", column_names, default=column_names,
+        help="Only selected columns are read from the database",
+    )
+    filters = _render_filter(columns_info, indexed_columns)
+
+    query = {
+        "columns": selected_columns or None,
+        "sort_column": None if order_by == "(default)" else order_by,
+        "descending": order_desc,
+        "filters": list(filters),
+    }
 
-    # Pagination
-    total_rows = get_table_count(selected_table)
-    total_pages = max(1, (total_rows + limit - 1) // limit)
+    # Keyset pagination: keep a stack of page cursors, reset when the view changes
+    view_key = (selected_table, query["sort_column"], order_desc, filters, int(limit))
+    if st.session_state.get("db_browser_view") != view_key:
+        st.session_state.db_browser_view = view_key
+        st.session_state.db_browser_cursors = [None]
+    cursors = st.session_state.db_browser_cursors
 
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
+    try:
+        page = browser.fetch_page(selected_table, after=cursors[-1], page_size=int(limit), **query)
+        total_rows = get_table_count(selected_table, filters)
+    except Exception as e:
+        st.error(f"Query error: {e}")
+        return
 
-    offset = (page - 1) * limit
+    page_number = len(cursors)
+    first_row = (page_number - 1) * int(limit)
 
-    st.caption(f"Showing rows {offset + 1} - {min(offset + limit, total_rows)} of {total_rows}")
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
+    with col1:
+        if st.button("First", disabled=page_number == 1, use_container_width=True):
+            st.session_state.db_browser_cursors = [None]
+            st.rerun()
+    with col2:
+        if st.button("Previous", disabled=page_number == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col3:
+        if st.button("Next", disabled=not page.has_more, use_container_width=True):
+            cursors.append(page.next_cursor)
+            st.rerun()
+    with col4:
+        st.caption(
+            f"Page {page_number} - showing rows {first_row + 1 if len(page.rows) else 0} - "
+            f"{first_row + len(page.rows)} of {total_rows:,}"
+        )
 
-    # Get and display data
-    order_col = None if order_by == "(default)" else order_by
-    df = get_table_data(selected_table, limit=limit, offset=offset, order_by=order_col)
+    df = page.rows
 
     if df.empty:
         st.info("No data in this table")
@@ -163,27 +264,20 @@ def render_table_browser():
             schema_data = []
             for col in columns_info:
                 schema_data.append({
-                    "Column": col[1],
-                    "Type": col[2],
-                    "Not Null": "Yes" if col[3] else "No",
-                    "Default": col[4] if col[4] else "-",
-                    "Primary Key": "Yes" if col[5] else "No"
+                    "Column": col["name"],
+                    "Type": col["type"],
+                    "Not Null": "Yes" if col["notnull"] else "No",
+                    "Default": col["default"] if col["default"] else "-",
+                    "Primary Key": "Yes" if col["pk"] else "No",
+                    "Indexed": "Yes" if col["name"] in indexed_columns else "No",
                 })
             st.dataframe(pd.DataFrame(schema_data), use_container_width=True, hide_index=True)
 
         # Display data
         st.dataframe(df, use_container_width=True, hide_index=True)
 
-        # Export button
-        col1, col2, col3 = st.columns([1, 1, 2])
-        with col1:
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label=f"{ICONS['arrow_down']} Download CSV",
-                data=csv,
-                file_name=f"{selected_table}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+        # Export (streams every matching row to disk in chunks)
+        _render_export(selected_table, query)
 
 
 def render_query_editor():
@@ -213,6 +307,8 @@ def render_query_editor():
                 st.error(f"Query error: {error}")
             elif df is not None:
                 st.success(f"Query returned {len(df)} rows")
+                if df.attrs.get("truncated"):
+                    st.warning(f"Result truncated to {MAX_QUERY_ROWS:,} rows - add a LIMIT or use Browse Tables export")
                 st.dataframe(df, use_container_width=True, hide_index=True)
 
                 # Export
@@ -273,6 +369,8 @@ def render_quick_queries():
         if error:
             st.error(f"Error: {error}")
         elif df is not None:
+            if df.attrs.get("truncated"):
+                st.warning(f"Result truncated to {MAX_QUERY_ROWS:,} rows")
             st.dataframe(df, use_container_width=True, hide_index=True)
 
 
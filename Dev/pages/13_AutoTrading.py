@@ -26,12 +26,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.core.auto_config import load_auto_config, save_auto_config, AutoTradingConfig, HardLimits, LearningModeConfig
 from src.trading.emergency import emergency_controller, is_emergency_stopped
 from src.utils.database import db
+from components.data_service import data_service
+
+
+LIVE_REFRESH_SECONDS = 2                             # Live panel redraw (memory only)
+PAGE_REFRESH_EVENTS = ("scan", "execution", "position")  # Events that change DB-backed panels
 
 
 def get_service_status():
-    """Get auto-trading service status by checking recent activity."""
+    """Get auto-trading service status (pushed by the service, else from activity)."""
     from datetime import datetime, timedelta
 
+    live = data_service.get_live_state()
+    if live and "status" in live["latest"]:
+        return dict(live["latest"]["status"]["data"])
+
     try:
         # Check activity_log for recent scans (more reliable than singleton)
         with db._connection() as conn:
@@ -508,8 +517,8 @@ def render_today_stats():
     """Render today's performance stats."""
     st.subheader("Today's Performance")
 
-    stats = db.get_auto_trading_stats(days=1)
-    daily_pnl = db.get_daily_pnl()
+    stats = data_service.get_auto_trading_stats(days=1)
+    daily_pnl = data_service.get_daily_pnl()
 
     col1, col2, col3, col4 = st.columns(4)
 
@@ -915,7 +924,7 @@ def render_ai_thinking_panel():
     st.subheader("AI Thinking - Live View")
 
     # Get recent activities
-    activities = db.get_recent_activities(limit=15)
+    activities = data_service.get_recent_activities(limit=15)
 
     if not activities:
         st.info("No AI activity yet. Enable auto-trading to see AI thinking in real-time.")
@@ -1065,7 +1074,7 @@ def render_decision_trail():
     st.caption("Detailed breakdown of AI analysis for each instrument")
 
     # Get analyzing activities
-    activities = db.get_recent_activities(limit=50, activity_types=[
+    activities = data_service.get_recent_activities(limit=50, activity_types=[
         "ANALYZING", "SIGNAL_GENERATED", "SIGNAL_REJECTED", "TRADE_EXECUTED", "TRADE_SKIPPED"
     ])
 
@@ -1133,7 +1142,7 @@ def render_recent_signals():
     """Render recent signals log."""
     st.subheader("Recent Signals")
 
-    signals = db.get_recent_auto_signals(limit=20)
+    signals = data_service.get_recent_auto_signals(limit=20)
 
     if not signals:
         st.info("No signals recorded yet. Enable auto-trading to start scanning.")
@@ -1165,15 +1174,76 @@ def render_recent_signals():
                 st.caption(signal.get("skip_reason", ""))
 
 
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_feed():
+    """
+    Render the service's pushed state without touching the database.
+
+    Runs as a fragment: only this panel redraws every few seconds. With
+    auto-refresh on, the full page reruns only when the service reported
+    a scan, execution or position change since the last full render.
+    """
+    live = data_service.get_live_state()
+    if not live:
+        st.caption("Live stream: not connected (no service streaming events)")
+        return
+
+    latest = live["latest"]
+    status = latest.get("status", {}).get("data", {})
+    heartbeat = latest.get("heartbeat", {}).get("data", {})
+    scans = live["history"]["scan"]
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("State", status.get("state") or heartbeat.get("state", "UNKNOWN"))
+    with col2:
+        st.metric("Scans Today", heartbeat.get("scans_today", status.get("scans_today", 0)))
+    with col3:
+        st.metric("Trades Today", heartbeat.get("trades_today", status.get("trades_executed_today", 0)))
+    with col4:
+        uptime = heartbeat.get("uptime_seconds", 0)
+        st.metric("Uptime", f"{uptime / 3600:.1f}h")
+
+    if scans:
+        last = scans[-1]
+        signals = last["data"].get("signals", [])
+        found = ", ".join(f"{s['instrument']} {s['direction']} {s['confidence']}%" for s in signals)
+        st.caption(
+            f"Last scan {last['time'][11:19]} UTC: {len(last['data'].get('instruments', []))} instruments, "
+            f"{found or 'no signals'}"
+        )
+
+    recent = sorted(
+        live["history"]["execution"] + live["history"]["position"],
+        key=lambda e: e["seq"], reverse=True,
+    )[:5]
+    for event in recent:
+        data = event["data"]
+        if event["type"] == "execution":
+            outcome = "EXECUTED" if data.get("executed") else f"SKIPPED ({data.get('skip_reason')})"
+        else:
+            outcome = data.get("type", "")
+        st.caption(f"{event['time'][11:19]} {data.get('instrument')} {data.get('direction')} - {outcome}")
+
+    if st.session_state.get("auto_refresh_enabled"):
+        if "live_page_seq" not in st.session_state:
+            st.session_state["live_page_seq"] = (live["epoch"], live["last_seq"])
+        epoch, seq = st.session_state["live_page_seq"]
+        subscriber = data_service.get_event_subscriber()
+        if subscriber.events_since(seq, PAGE_REFRESH_EVENTS, epoch=epoch):
+            st.session_state["live_page_seq"] = (live["epoch"], live["last_seq"])
+            st.rerun()
+
+
 def render_smc_v2_shadow():
     """Render SMC v2 shadow evaluation stats and recent labels."""
     st.subheader("SMC v2 Shadow")
 
-    shadow_stats = db.get_smc_v2_shadow_stats(hours=24)
-    gate_stats = db.get_smc_v2_gate_stats(hours=24)
-    by_instrument = db.get_smc_v2_by_instrument(hours=24)
-    labels = db.get_recent_setup_labels(limit=20)
-    export_labels = db.get_recent_setup_labels(limit=1000)
+    shadow_stats = data_service.get_smc_v2_shadow_stats(hours=24)
+    gate_stats = data_service.get_smc_v2_gate_stats(hours=24)
+    by_instrument = data_service.get_smc_v2_by_instrument(hours=24)
+    labels = data_service.get_recent_setup_labels(limit=20)
+    export_labels = data_service.get_recent_setup_labels(limit=1000)
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -1347,14 +1417,15 @@ def main():
     # Auto-refresh option
     col_refresh, col_interval, _ = st.columns([1, 1, 3])
     with col_refresh:
-        auto_refresh = st.checkbox("Auto-refresh", value=False, help="Automatically refresh every few seconds", key="auto_refresh_checkbox")
+        auto_refresh = st.checkbox(
+            "Auto-refresh", value=False, key="auto_refresh_checkbox",
+            help="Refresh when the service reports activity (polls every few seconds if it isn't streaming)",
+        )
         st.session_state["auto_refresh_enabled"] = auto_refresh
     with col_interval:
+        refresh_interval = None
         if auto_refresh:
             refresh_interval = st.selectbox("Interval", [5, 10, 30, 60], index=1, format_func=lambda x: f"{x}s")
-            import time
-            time.sleep(refresh_interval)
-            st.rerun()
 
     # Load config
     config = load_auto_config()
@@ -1380,6 +1451,9 @@ def main():
     # Today's stats
     render_today_stats()
 
+    # Live service state (pushed events)
+    render_live_feed()
+
     st.divider()
 
     # Tabs for different sections
@@ -1419,7 +1493,7 @@ def main():
     status = get_service_status()
 
     # Activity stats
-    activity_stats = db.get_activity_stats(hours=24)
+    activity_stats = data_service.get_activity_stats(hours=24)
     scans = activity_stats.get("SCAN_COMPLETE", 0)
     signals = activity_stats.get("SIGNAL_GENERATED", 0)
     trades = activity_stats.get("TRADE_EXECUTED", 0)
@@ -1438,6 +1512,14 @@ def main():
         state = status.get('state', 'STOPPED')
         st.caption(f"State: {state}")
 
+    # Rerun only after the page has rendered (sleeping before rendering
+    # left the page blank for the whole interval). While the service is
+    # streaming, render_live_feed() triggers reruns on events instead.
+    if refresh_interval and not data_service.get_live_state():
+        import time
+        time.sleep(refresh_interval)
+        st.rerun()
+
 
 if __name__ == "__main__":
     main()
@@ -13,7 +13,6 @@ if str(DEV_DIR) not in sys.path:
     sys.path.insert(0, str(DEV_DIR))
 
 from src.utils.config import config
-from src.utils.database import db
 from src.trading.mt5_client import MT5Client, MT5Error
 from src.analysis.llm_engine import LLMEngine
 from components.tooltips import metric_with_tooltip, simple_explanation_section, ICONS, tooltip_text
@@ -21,6 +20,7 @@ from components.suggested_actions import is_forex_market_open, get_market_sessio
 from components.status_bar import render_status_bar, get_status_bar_data
 from components.notifications import check_notifications, render_notifications
 from components.mt5_session import get_client, reset_connection
+from components.data_service import data_service
 from src.core.auto_config import load_auto_config
 from src.trading.emergency import is_emergency_stopped
 
@@ -31,7 +31,7 @@ def render_auto_trading_status():
     """Render auto-trading status indicator with stats."""
     try:
         auto_config = load_auto_config()
-        auto_stats = db.get_auto_trading_stats(days=1)
+        auto_stats = data_service.get_auto_trading_stats(days=1)
 
         col1, col2, col3, col4 = st.columns(4)
 
@@ -56,7 +56,7 @@ def render_auto_trading_status():
             pnl = auto_stats.get("auto_pnl", 0)
             st.metric("Auto P/L", f"{pnl:+.2f}")
 
-        shadow = db.get_smc_v2_shadow_stats(hours=24)
+        shadow = data_service.get_smc_v2_shadow_stats(hours=24)
         if shadow.get("total", 0) > 0:
             st.caption(
                 f"SMC v2 shadow (24h): eval={shadow.get('total', 0)} | "
@@ -74,7 +74,7 @@ def render_ai_activity_feed(limit: int = 10):
     st.subheader("AI Activity Feed")
 
     try:
-        activities = db.get_recent_activities(limit=limit)
+        activities = data_service.get_recent_activities(limit=limit)
 
         if not activities:
             st.info("No AI activity yet. Start auto-trading to see activity.")
@@ -156,8 +156,8 @@ def main():
 
     try:
         account = client.get_account()
-        daily_pnl = db.get_daily_pnl()
-        stats = db.get_performance_stats()
+        daily_pnl = data_service.get_daily_pnl()
+        stats = data_service.get_performance_stats()
         mode = "DEMO" if config.is_demo() else "LIVE"
 
         # Get positions for notifications
@@ -200,7 +200,7 @@ def main():
 
         # Profit-focused KPI row (last 30d)
         st.subheader("Profit Focus (30d)")
-        dd_stats = db.get_drawdown_stats(days=30)
+        dd_stats = data_service.get_drawdown_stats(days=30)
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -301,7 +301,7 @@ def main():
         # Decision Log (last 5 LLM decisions)
         st.divider()
         st.subheader("LLM Decision Log (Last 5)")
-        decisions = db.get_recent_llm_decisions(limit=5)
+        decisions = data_service.get_recent_llm_decisions(limit=5)
         if not decisions:
             st.info("No LLM decisions logged yet.")
         else:
@@ -2,6 +2,11 @@
 AI Trader - Backtest Page
 
 Walk-forward backtesting simulation using historical data.
+
+Backtests run as background jobs (src/backtesting/jobs.py): the page only
+submits and polls, so reruns, refreshes and other tabs pick up the same job.
+Finished runs are browsed and compared through the result catalog
+(src/backtesting/catalog.py).
 """
 
 import streamlit as st
@@ -9,6 +14,7 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import sys
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -16,14 +22,7 @@ DEV_DIR = Path(__file__).parent.parent
 if str(DEV_DIR) not in sys.path:
     sys.path.insert(0, str(DEV_DIR))
 
-from src.backtesting import (
-    DataLoader,
-    HistoricalDataRequest,
-    BacktestEngine,
-    BacktestConfig,
-    ReportGenerator,
-    MetricsCalculator,
-)
+from src.backtesting import BacktestReport, BacktestJobQueue, BacktestJobRunner, ResultCatalog
 from components.tooltips import (
     metric_with_tooltip,
     simple_explanation_section,
@@ -35,6 +34,24 @@ from components.status_bar import render_compact_status_bar
 
 st.set_page_config(page_title="Backtest - AI Trader", page_icon="", layout="wide")
 
+JOB_POLL_SECONDS = 2
+RUN_HISTORY_LIMIT = 200
+RUN_SORT_OPTIONS = {
+    "Newest": ("created_at", True),
+    "Return %": ("total_return_pct", True),
+    "Sharpe": ("sharpe_ratio", True),
+    "Profit Factor": ("profit_factor", True),
+    "Win Rate": ("win_rate", True),
+    "Max Drawdown": ("max_drawdown_pct", False),
+    "Trades": ("total_trades", True),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_runner() -> BacktestJobRunner:
+    """One job runner per dashboard process, shared by every session."""
+    return BacktestJobRunner(BacktestJobQueue()).start()
+
 
 def format_number(value: float, decimals: int = 2, prefix: str = "", suffix: str = "") -> str:
     """Format number with optional prefix/suffix."""
@@ -263,7 +280,7 @@ def main():
     # Configuration section
     st.subheader("Configuration")
 
-    col1, col2, col3 = st.columns(3)
+    col1, col2 = st.columns(2)
 
     with col1:
         pairs = ["EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD", "USD_CHF",
@@ -273,12 +290,9 @@ def main():
             pairs,
             format_func=lambda x: x.replace("_", "/")
         )
+        st.caption("SMC engine: H4/H1 context, M5 entries")
 
     with col2:
-        timeframes = ["M5", "M15", "M30", "H1", "H4", "D"]
-        timeframe = st.selectbox("Timeframe", timeframes, index=3)
-
-    with col3:
         initial_capital = st.number_input(
             "Initial Capital ($)",
             min_value=1000,
@@ -309,52 +323,25 @@ def main():
 
     # Advanced options
     with st.expander("Advanced Options"):
-        col1, col2, col3 = st.columns(3)
+        col1, col2 = st.columns(2)
 
         with col1:
             min_confidence = st.slider(
                 "Minimum Confidence",
                 min_value=30,
                 max_value=90,
-                value=50,
-                step=5,
+                value=68,
+                step=1,
                 help="Only trade when confidence score is above this threshold"
             )
 
         with col2:
-            use_adversarial = st.checkbox(
-                "Use Adversarial Analysis",
-                value=True,
-                help="Enable bull/bear debate for signal confirmation"
-            )
-
-        with col3:
             lookback_bars = st.number_input(
                 "Lookback Bars",
-                min_value=20,
+                min_value=30,
                 max_value=200,
-                value=50,
-                help="Number of bars used for analysis"
-            )
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            atr_sl_mult = st.number_input(
-                "Stop Loss (ATR multiplier)",
-                min_value=1.0,
-                max_value=5.0,
-                value=2.0,
-                step=0.5
-            )
-
-        with col2:
-            atr_tp_mult = st.number_input(
-                "Take Profit (ATR multiplier)",
-                min_value=1.0,
-                max_value=10.0,
-                value=4.0,
-                step=0.5
+                value=100,
+                help="M5 bars used for LTF analysis"
             )
 
         st.divider()
@@ -411,11 +398,6 @@ def main():
             default=["London (07-16)", "New York (12-21)"]
         )
 
-        allow_weekends = st.checkbox(
-            "Allow weekend entries",
-            value=False
-        )
-
     # Validate dates
     if start_date >= end_date:
         st.error("Start date must be before end date")
@@ -437,130 +419,179 @@ def main():
     st.divider()
 
     if st.button("Run Backtest", type="primary", use_container_width=True):
-        run_backtest(
+        session_hours = None
+        if limit_sessions:
+            session_hours = [session_options[label] for label in selected_sessions]
+        job = submit_backtest(
             instrument=instrument,
-            timeframe=timeframe,
             start_date=datetime.combine(start_date, datetime.min.time()),
-            end_date=datetime.combine(end_date, datetime.max.time()),
+            end_date=datetime.combine(end_date, datetime.max.time().replace(microsecond=0)),
             initial_capital=initial_capital,
             min_confidence=min_confidence,
-            use_adversarial=use_adversarial,
-            lookback_bars=lookback_bars,
-            atr_sl_mult=atr_sl_mult,
-            atr_tp_mult=atr_tp_mult,
+            ltf_lookback=int(lookback_bars),
             spread_pips=spread_pips,
             slippage_pips=slippage_pips,
             commission_per_lot=commission_per_lot,
-            limit_sessions=limit_sessions,
-            selected_sessions=selected_sessions,
-            session_options=session_options,
-            allow_weekends=allow_weekends
+            check_session=limit_sessions,
+            session_hours=session_hours,
         )
+        st.session_state.backtest_job_id = job.id
+
+    render_recent_jobs()
+    render_run_history()
+
+    job_id = st.session_state.get("backtest_job_id")
+    run_id = st.session_state.get("backtest_run_id")
+    if job_id is not None:
+        render_job(job_id)
+    elif run_id is not None:
+        show_report(load_run_report(run_id))
+
+
+def submit_backtest(**config):
+    """Queue a backtest (identical configs share one job)."""
+    get_job_runner()
+    params = {
+        "config": {"timeframe": "M5", **config},
+        "label": f"{config['instrument']} {config['start_date']:%Y-%m-%d}..{config['end_date']:%Y-%m-%d}",
+    }
+    return BacktestJobQueue().submit(
+        "backtest", params, label=params["label"], submitted_by="dashboard"
+    )
 
-    # Display results if available
-    if "backtest_report" in st.session_state and st.session_state.backtest_report:
-        display_results(st.session_state.backtest_report)
-
-
-def run_backtest(**params):
-    """Execute backtest with given parameters."""
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    try:
-        # Step 1: Load data
-        status_text.text("Loading historical data...")
-        progress_bar.progress(10)
-
-        loader = DataLoader()
 
-        def data_progress(current, total):
-            progress_bar.progress(10 + int((current / total) * 30))
-            status_text.text(f"Loading data chunk {current}/{total}...")
+def load_run_report(run_id: str) -> BacktestReport:
+    """Load a catalogued run once per session."""
+    cache = st.session_state.setdefault("backtest_reports", {})
+    if run_id not in cache:
+        cache[run_id] = ResultCatalog().load_report(run_id)
+    return cache[run_id]
 
-        historical_data = loader.load_simple(
-            instrument=params["instrument"],
-            timeframe=params["timeframe"],
-            start_date=params["start_date"],
-            end_date=params["end_date"],
-            progress_callback=data_progress
-        )
 
-        if historical_data.total_bars < params["lookback_bars"] + 10:
-            st.error(f"Not enough data: {historical_data.total_bars} bars loaded, need at least {params['lookback_bars'] + 10}")
-            return
+def show_report(report: BacktestReport):
+    st.session_state.backtest_report = report
+    st.session_state.backtest_result = report.result
+    display_results(report)
 
-        status_text.text(f"Loaded {historical_data.total_bars} bars")
-        progress_bar.progress(40)
 
-        # Step 2: Run backtest
-        status_text.text("Running backtest simulation...")
+def render_job(job_id: int):
+    """Show progress of the session's job, or its results once done."""
+    get_job_runner()
+    queue = BacktestJobQueue()
+    job = queue.get(job_id)
+    if job is None:
+        st.session_state.pop("backtest_job_id", None)
+        return
 
-        session_hours = None
-        if params.get("limit_sessions"):
-            session_hours = []
-            for label in params.get("selected_sessions", []):
-                if label in params.get("session_options", {}):
-                    session_hours.append(params["session_options"][label])
-
-        config = BacktestConfig(
-            instrument=params["instrument"],
-            timeframe=params["timeframe"],
-            start_date=params["start_date"],
-            end_date=params["end_date"],
-            initial_capital=params["initial_capital"],
-            min_confidence=params["min_confidence"],
-            use_adversarial=params["use_adversarial"],
-            lookback_bars=params["lookback_bars"],
-            atr_sl_multiplier=params["atr_sl_mult"],
-            atr_tp_multiplier=params["atr_tp_mult"],
-            spread_pips=params.get("spread_pips", 1.2),
-            slippage_pips=params.get("slippage_pips", 0.2),
-            commission_per_lot=params.get("commission_per_lot", 7.0),
-            session_hours=session_hours,
-            allow_weekends=params.get("allow_weekends", False)
+    if job.is_active:
+        st.divider()
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.progress(job.progress, text=f"Job {job.id} [{job.status}] {job.message or ''}")
+        with col2:
+            if st.button("Cancel", key=f"cancel_job_{job.id}", disabled=job.cancel_requested):
+                queue.cancel(job.id)
+                st.rerun()
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+    elif job.status == "DONE" and (job.summary or {}).get("run_id"):
+        st.success(
+            f"Backtest completed! {job.summary.get('trades', 0)} trades executed "
+            f"in {job.summary.get('run_time', 0):.1f}s"
         )
+        show_report(load_run_report(job.summary["run_id"]))
+    elif job.status == "CANCELLED":
+        st.warning(f"Backtest job {job.id} was cancelled")
+    else:
+        st.error(f"Backtest failed: {(job.error or 'unknown error').splitlines()[0]}")
+        with st.expander("Error Details"):
+            st.code(job.error or "")
 
-        engine = BacktestEngine()
-
-        def backtest_progress(current, total, message):
-            progress_bar.progress(40 + int((current / total) * 50))
-            status_text.text(message)
 
-        result = engine.run(
-            candles=historical_data.candles,
-            config=config,
-            progress_callback=backtest_progress
+def render_recent_jobs():
+    """Jobs from every session/script; open any finished one."""
+    jobs = BacktestJobQueue().list_jobs(limit=20)
+    if not jobs:
+        return
+    with st.expander(f"Backtest Jobs ({sum(j.is_active for j in jobs)} active)"):
+        for job in jobs:
+            col1, col2, col3 = st.columns([4, 2, 1])
+            with col1:
+                st.text(f"#{job.id} {job.label or job.kind}")
+            with col2:
+                st.text(f"{job.status} {job.progress:.0%}" if job.is_active else job.status)
+            with col3:
+                if job.kind == "backtest" and (job.is_active or job.status == "DONE"):
+                    if st.button("Open", key=f"open_job_{job.id}"):
+                        st.session_state.backtest_job_id = job.id
+                        st.session_state.pop("backtest_run_id", None)
+                        st.rerun()
+
+
+def render_run_history():
+    """Browse, open and compare catalogued runs (metadata only until opened)."""
+    catalog = ResultCatalog()
+    total = catalog.count_runs()
+    if not total:
+        return
+    with st.expander(f"Run History ({total} runs)"):
+        col1, col2, col3 = st.columns([2, 2, 3])
+        with col1:
+            instruments = ["All"] + sorted({r["instrument"] for r in catalog.list_runs(limit=RUN_HISTORY_LIMIT) if r["instrument"]})
+            instrument = st.selectbox("Instrument", instruments, key="run_history_instrument")
+        with col2:
+            sort_label = st.selectbox("Sort by", list(RUN_SORT_OPTIONS), key="run_history_sort")
+        with col3:
+            search = st.text_input("Search label", key="run_history_search")
+
+        order_by, descending = RUN_SORT_OPTIONS[sort_label]
+        runs = catalog.list_runs(
+            order_by=order_by,
+            descending=descending,
+            limit=RUN_HISTORY_LIMIT,
+            instrument=None if instrument == "All" else instrument,
+            search=search or None,
         )
+        if not runs:
+            st.info("No runs match")
+            return
 
-        progress_bar.progress(90)
-        status_text.text("Generating report...")
-
-        # Step 3: Generate report
-        report_gen = ReportGenerator()
-        report = report_gen.generate(result)
+        df = pd.DataFrame(runs)[[
+            "run_id", "created_at", "source", "label", "instrument", "total_trades", "win_rate",
+            "total_return_pct", "profit_factor", "max_drawdown_pct", "sharpe_ratio",
+        ]]
+        st.dataframe(df, use_container_width=True, hide_index=True)
 
-        progress_bar.progress(100)
-        status_text.text("Backtest complete!")
+        run_ids = [r["run_id"] for r in runs]
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            selected = st.selectbox("Run", run_ids, key="run_history_open")
+        with col2:
+            st.write("")
+            if st.button("Open Run"):
+                st.session_state.backtest_run_id = selected
+                st.session_state.pop("backtest_job_id", None)
+                st.rerun()
 
-        # Store in session
-        st.session_state.backtest_report = report
-        st.session_state.backtest_result = result
+        compare_ids = st.multiselect("Compare runs", run_ids, max_selections=4, key="run_history_compare")
+        if len(compare_ids) >= 2:
+            render_run_comparison(catalog.compare(compare_ids))
 
-        # Clear progress indicators
-        progress_bar.empty()
-        status_text.empty()
 
-        st.success(f"Backtest completed! {len(result.trades)} trades executed in {result.run_time_seconds:.1f}s")
-        st.rerun()
-
-    except Exception as e:
-        progress_bar.empty()
-        status_text.empty()
-        st.error(f"Backtest failed: {str(e)}")
-        import traceback
-        with st.expander("Error Details"):
-            st.code(traceback.format_exc())
+def render_run_comparison(comparison: dict):
+    """Metrics table and overlaid equity curves for selected runs."""
+    st.dataframe(pd.DataFrame(comparison["metrics"]).T, use_container_width=True)
+    fig = go.Figure()
+    for run_id, series in comparison["equity"].items():
+        fig.add_trace(go.Scatter(x=series["x"], y=series["y"], mode="lines", name=run_id))
+    fig.update_layout(
+        title="Equity Curves",
+        xaxis_title="Time",
+        yaxis_title="Equity ($)",
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20),
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
 
 def display_results(report):
@@ -783,7 +814,7 @@ def display_results(report):
         st.subheader("Trade List")
         result = st.session_state.get('backtest_result')
         if result:
-            render_trades_table(result.trades)
+            render_trades_table(result.trades if hasattr(result, "trades") else result.get("trades", []))
 
     with tab4:
         render_monthly_returns(report.monthly_returns)
@@ -3,6 +3,9 @@ SMC Backtest Suite - Optimized Parameter Grid
 
 Reduced grid (16 configs vs 256) + multiprocessing for fast execution.
 Tests: 2 instruments x 8 configs = 16 total, target <5 min.
+
+With --queue, configs run as background jobs (src/backtesting/jobs.py)
+shared with the dashboard Backtest page.
 """
 
 import sys
@@ -32,6 +35,9 @@ def run_single_backtest(args):
     # Import inside worker (each process needs its own)
     from src.backtesting.engine import SMCBacktestEngine, BacktestConfig
     from src.backtesting.metrics import MetricsCalculator
+    from src.backtesting.catalog import ResultCatalog
+    from src.backtesting.jobs import summarize_backtest
+    from src.utils.database import db  # Bound to trades.db before the ISI override below
 
     # ISI DB isolation: use temp DB per worker
     isi_enabled = (
@@ -49,7 +55,6 @@ def run_single_backtest(args):
     try:
         config = BacktestConfig(**config_dict)
         engine = SMCBacktestEngine()
-        calc = MetricsCalculator()
 
         t0 = time.time()
         try:
@@ -61,77 +66,12 @@ def run_single_backtest(args):
             return {"label": label, "error": str(e)}
 
         elapsed = time.time() - t0
-
-        if result.trades:
-            metrics = calc.calculate(result)
-        else:
-            metrics = None
-
-        # Trade breakdown
-        winners = [t for t in result.trades if t.pnl > 0]
-        losers = [t for t in result.trades if t.pnl <= 0]
-
-        # Grade distribution
-        grades = {}
-        for t in result.trades:
-            g = t.setup_grade
-            grades[g] = grades.get(g, 0) + 1
-
-        # Direction distribution
-        longs = sum(1 for t in result.trades if t.direction.value == "LONG")
-        shorts = len(result.trades) - longs
-
-        # Top skip reasons
-        top_skips = sorted(result.skip_reasons.items(), key=lambda x: -x[1])[:5]
-
-        # ISI metadata summary
-        isi_phases = {}
-        total_seq_mod = 0
-        total_div_mod = 0
-        for t in result.trades:
-            if t.sequence_phase_name:
-                isi_phases[t.sequence_phase_name] = isi_phases.get(t.sequence_phase_name, 0) + 1
-            total_seq_mod += t.sequence_modifier
-            total_div_mod += t.divergence_modifier
-
-        summary = {
-            "label": label,
-            "instrument": config.instrument,
-            "min_confidence": config.min_confidence,
-            "target_rr": config.target_rr,
-            "check_regime": config.check_regime,
-            "check_session": config.check_session,
-            "session_hours": config.session_hours,
-            "isi_enabled": isi_enabled,
-            "trades": len(result.trades),
-            "signals_generated": result.signals_generated,
-            "signals_skipped": result.signals_skipped,
-            "winners": len(winners),
-            "losers": len(losers),
-            "win_rate": (len(winners) / len(result.trades) * 100) if result.trades else 0,
-            "return_pct": metrics.total_return_pct if metrics else 0,
-            "return_abs": metrics.total_return_abs if metrics else 0,
-            "max_dd_pct": metrics.max_drawdown_pct if metrics else 0,
-            "sharpe": metrics.sharpe_ratio if metrics else None,
-            "profit_factor": metrics.profit_factor if metrics else None,
-            "expectancy": metrics.expectancy if metrics else 0,
-            "avg_win": metrics.avg_win if metrics else 0,
-            "avg_loss": metrics.avg_loss if metrics else 0,
-            "largest_win": metrics.largest_win if metrics else 0,
-            "largest_loss": metrics.largest_loss if metrics else 0,
-            "max_consec_wins": metrics.max_consecutive_wins if metrics else 0,
-            "max_consec_losses": metrics.max_consecutive_losses if metrics else 0,
-            "longs": longs,
-            "shorts": shorts,
-            "grades": grades,
-            "top_skips": top_skips,
-            "run_time": elapsed,
-            "final_equity": result.final_equity,
-            # ISI summary
-            "isi_phases": isi_phases if isi_phases else None,
-            "avg_seq_modifier": (total_seq_mod / len(result.trades)) if result.trades else 0,
-            "avg_div_modifier": (total_div_mod / len(result.trades)) if result.trades else 0,
-        }
+        metrics = MetricsCalculator().calculate(result)
+        summary = summarize_backtest(label, config, result, elapsed, isi_enabled, metrics=metrics)
+        # Trades/equity go to the result catalog; the suite file keeps summaries only
+        summary["run_id"] = ResultCatalog(db).add_result(
+            result, source="suite", label=label, summary=summary, metrics=metrics,
+        )
         return summary
 
     finally:
@@ -148,6 +88,57 @@ def run_single_backtest(args):
                     pass
 
 
+def run_via_queue(jobs, data_instruments, max_workers, reuse_completed=True):
+    """
+    Submit suite configs to the background job queue and wait for them.
+
+    Workers load their own data. Configs that are already queued, running
+    or finished (e.g. submitted from the dashboard) are shared, not rerun.
+    """
+    from src.backtesting.jobs import BacktestJobQueue, BacktestJobRunner, DONE
+
+    queue = BacktestJobQueue()
+    submitted = []
+    for label, inst, _h4, _h1, _m5, config_dict, _xa in jobs:
+        params = {"config": config_dict, "label": label}
+        if config_dict.get("isi_cross_asset"):
+            params["cross_asset"] = list(data_instruments)
+        job = queue.submit("backtest", params, label=label, submitted_by="suite",
+                           reuse_completed=reuse_completed)
+        submitted.append((label, job.id))
+        print(f"  {label}: job {job.id} ({job.status})")
+
+    def on_update(job):
+        if job.status == DONE and job.summary:
+            print(
+                f"  job {job.id} {job.label}: {job.summary['trades']} trades, "
+                f"WR={job.summary['win_rate']:.0f}%, "
+                f"Ret={job.summary['return_pct']:+.2f}%"
+            )
+        elif not job.is_active:
+            print(f"  job {job.id} {job.label}: {job.status}")
+
+    runner = BacktestJobRunner(queue, max_workers=max_workers).start()
+    job_ids = sorted({job_id for _, job_id in submitted})
+    try:
+        final = queue.wait(job_ids, on_update=on_update)
+    except KeyboardInterrupt:
+        for job_id in job_ids:
+            queue.cancel(job_id)
+        runner.stop(terminate_workers=True)
+        raise
+    runner.stop()
+
+    results = []
+    for label, job_id in submitted:
+        job = final[job_id]
+        if job.status == DONE and job.summary:
+            results.append({**job.summary, "label": label})
+        else:
+            results.append({"label": label, "error": (job.error or job.status).splitlines()[0]})
+    return results
+
+
 def print_summary_table(results):
     """Print comparison table of all results."""
     print("\n" + "=" * 130)
@@ -312,6 +303,10 @@ def print_skip_analysis(results):
 def main():
     parser = argparse.ArgumentParser(description="Run SMC backtest suite.")
     parser.add_argument("--workers", type=int, default=6, help="Process workers for suite (default: 6)")
+    parser.add_argument("--queue", action="store_true",
+                        help="Run through the background job queue (shared with the dashboard)")
+    parser.add_argument("--rerun", action="store_true",
+                        help="With --queue: rerun configs that already have a finished job")
     args = parser.parse_args()
     max_workers = max(1, int(args.workers))
 
@@ -358,33 +353,36 @@ def main():
     print(f"Total Configurations: {total_configs}")
     print(f"Signal interval: 6 (every 30 min)")
     print(f"Max workers: {max_workers}")
+    if args.queue:
+        print("Mode: background job queue")
 
-    # --- Load Data (main process only, MT5 singleton) ---
-    print("\n--- LOADING DATA ---")
-    from src.backtesting.data_loader import DataLoader
-    loader = DataLoader()
     data = {}
+    if not args.queue:
+        # --- Load Data (main process only, MT5 singleton) ---
+        print("\n--- LOADING DATA ---")
+        from src.backtesting.data_loader import DataLoader
+        loader = DataLoader()
+
+        for inst in instruments + cross_asset_instruments:
+            print(f"\n{inst}:")
+            try:
+                print(f"  Loading H4...", end=" ", flush=True)
+                h4 = loader.load_simple(inst, "H4", start_date, end_date)
+                print(f"{h4.total_bars} bars")
 
-    for inst in instruments + cross_asset_instruments:
-        print(f"\n{inst}:")
-        try:
-            print(f"  Loading H4...", end=" ", flush=True)
-            h4 = loader.load_simple(inst, "H4", start_date, end_date)
-            print(f"{h4.total_bars} bars")
-
-            print(f"  Loading H1...", end=" ", flush=True)
-            h1 = loader.load_simple(inst, "H1", start_date, end_date)
-            print(f"{h1.total_bars} bars")
+                print(f"  Loading H1...", end=" ", flush=True)
+                h1 = loader.load_simple(inst, "H1", start_date, end_date)
+                print(f"{h1.total_bars} bars")
 
-            print(f"  Loading M5...", end=" ", flush=True)
-            m5 = loader.load_simple(inst, "M5", start_date, end_date)
-            print(f"{m5.total_bars} bars")
+                print(f"  Loading M5...", end=" ", flush=True)
+                m5 = loader.load_simple(inst, "M5", start_date, end_date)
+                print(f"{m5.total_bars} bars")
 
-            data[inst] = (h4.candles, h1.candles, m5.candles)
-        except Exception as e:
-            print(f"  ERROR: {e}")
+                data[inst] = (h4.candles, h1.candles, m5.candles)
+            except Exception as e:
+                print(f"  ERROR: {e}")
 
-    if not any(inst in data for inst in instruments):
+    if not args.queue and not any(inst in data for inst in instruments):
         print("\nNo trading instrument data loaded! Exiting.")
         return
 
@@ -396,10 +394,10 @@ def main():
     # --- Build job list ---
     jobs = []
     for inst in instruments:
-        if inst not in data:
+        if inst not in data and not args.queue:
             continue
 
-        h4_candles, h1_candles, m5_candles = data[inst]
+        h4_candles, h1_candles, m5_candles = data.get(inst, (None, None, None))
         inst_short = inst.replace("_USD", "").replace("_", "")
 
         # Cross-asset data for this instrument (exclude self)
@@ -459,19 +457,45 @@ def main():
     suite_start = time.time()
     results = []
     used_sequential_fallback = False
-    try:
-        if max_workers == 1:
-            raise PermissionError("Sequential mode requested (workers=1).")
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            future_to_label = {}
+    if args.queue:
+        results = run_via_queue(
+            jobs, instruments + cross_asset_instruments, max_workers,
+            reuse_completed=not args.rerun,
+        )
+    else:
+        try:
+            if max_workers == 1:
+                raise PermissionError("Sequential mode requested (workers=1).")
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                future_to_label = {}
+                for job in jobs:
+                    future = executor.submit(run_single_backtest, job)
+                    future_to_label[future] = job[0]  # label
+
+                for future in as_completed(future_to_label):
+                    label = future_to_label[future]
+                    try:
+                        summary = future.result()
+                        results.append(summary)
+                        if "error" in summary:
+                            print(f"  {label}: ERROR - {summary['error']}")
+                        else:
+                            print(
+                                f"  {label}: {summary['trades']} trades, "
+                                f"WR={summary['win_rate']:.0f}%, "
+                                f"Ret={summary['return_pct']:+.2f}%, "
+                                f"{summary['run_time']:.0f}s"
+                            )
+                    except Exception as e:
+                        print(f"  {label}: WORKER ERROR - {e}")
+                        results.append({"label": label, "error": str(e)})
+        except PermissionError:
+            used_sequential_fallback = True
+            print("  ProcessPool unavailable -> running sequential fallback...")
             for job in jobs:
-                future = executor.submit(run_single_backtest, job)
-                future_to_label[future] = job[0]  # label
-
-            for future in as_completed(future_to_label):
-                label = future_to_label[future]
+                label = job[0]
                 try:
-                    summary = future.result()
+                    summary = run_single_backtest(job)
                     results.append(summary)
                     if "error" in summary:
                         print(f"  {label}: ERROR - {summary['error']}")
@@ -485,26 +509,6 @@ def main():
                 except Exception as e:
                     print(f"  {label}: WORKER ERROR - {e}")
                     results.append({"label": label, "error": str(e)})
-    except PermissionError:
-        used_sequential_fallback = True
-        print("  ProcessPool unavailable -> running sequential fallback...")
-        for job in jobs:
-            label = job[0]
-            try:
-                summary = run_single_backtest(job)
-                results.append(summary)
-                if "error" in summary:
-                    print(f"  {label}: ERROR - {summary['error']}")
-                else:
-                    print(
-                        f"  {label}: {summary['trades']} trades, "
-                        f"WR={summary['win_rate']:.0f}%, "
-                        f"Ret={summary['return_pct']:+.2f}%, "
-                        f"{summary['run_time']:.0f}s"
-                    )
-            except Exception as e:
-                print(f"  {label}: WORKER ERROR - {e}")
-                results.append({"label": label, "error": str(e)})
 
     suite_elapsed = time.time() - suite_start
     print(f"\nAll backtests completed in {suite_elapsed:.1f}s")
@@ -0,0 +1,148 @@
+"""
+SMC / Backtest Benchmark Runner
+
+Times the SMC detectors, SMCAnalyzer, TechnicalAnalyzer and the full
+SMCBacktestEngine on deterministic candle fixtures and reports bars/sec.
+Runs offline - no MT5 terminal or network needed.
+
+Usage:
+    python run_benchmarks.py run                      # Print results
+    python run_benchmarks.py baseline                 # Store benchmarks/baselines/default.json
+    python run_benchmarks.py compare --threshold 0.15 # Exit 1 on >15% throughput drop
+    python run_benchmarks.py record EUR_USD --days 30 # Capture MT5 fixture (Windows)
+
+Add --quick for smaller fixtures (CI), --only smc. to filter by prefix.
+Baselines are machine-specific: record them on the machine that compares.
+"""
+
+import sys
+import os
+import json
+import argparse
+from pathlib import Path
+
+# Ensure project root is on path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.logger import logger
+from benchmarks.fixtures import record_from_mt5, save_recorded
+from benchmarks.suite import (
+    DEFAULT_THRESHOLD,
+    MIN_TIME_SECONDS,
+    run_suite,
+    save_baseline,
+    load_baseline,
+    baseline_path,
+    compare,
+    format_report,
+)
+
+
+def print_result(result):
+    if result.status == "ok":
+        print(
+            f"  {result.key:<58} {result.bars_per_sec:>12,.0f} bars/s  "
+            f"(median {result.median_s * 1000:.2f}ms, n={result.repeats})"
+        )
+    else:
+        print(f"  {result.key:<58} {result.status.upper():>12}  {result.error}")
+
+
+def _run(args) -> dict:
+    print(f"\nRunning benchmarks ({'quick' if args.quick else 'full'})...\n")
+    return run_suite(
+        quick=args.quick,
+        only=args.only,
+        min_time=args.min_time,
+        progress=print_result,
+    )
+
+
+def cmd_run(args) -> int:
+    run = _run(args)
+    if args.output:
+        Path(args.output).write_text(json.dumps(run, indent=2), encoding="utf-8")
+        print(f"\nSaved: {args.output}")
+    return 0
+
+
+def cmd_baseline(args) -> int:
+    run = _run(args)
+    errors = [k for k, r in run["results"].items() if r["status"] == "error"]
+    if errors:
+        print(f"\nRefusing to store baseline with failing benchmarks: {', '.join(errors)}")
+        return 1
+    path = save_baseline(run, args.name)
+    print(f"\nBaseline saved: {path}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    baseline = load_baseline(args.name)
+    if baseline is None:
+        print(f"No baseline at {baseline_path(args.name)} - run 'python run_benchmarks.py baseline' first")
+        return 2
+    if baseline.get("quick") != args.quick:
+        print("Baseline was recorded with a different --quick setting; fixtures will not match")
+
+    run = _run(args)
+    report = compare(run, baseline, threshold=args.threshold)
+    print()
+    print(format_report(report))
+    return 1 if report.failed else 0
+
+
+def cmd_record(args) -> int:
+    fixture = record_from_mt5(args.instrument, args.days, name=args.fixture_name)
+    path = save_recorded(fixture)
+    print(
+        f"Recorded {fixture.name}: {len(fixture.m5)} M5, {len(fixture.h1)} H1, "
+        f"{len(fixture.h4)} H4 -> {path}"
+    )
+    print("Note: stored baselines no longer cover this fixture - re-run 'baseline'.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SMC / backtest micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_args(p):
+        p.add_argument("--quick", action="store_true", help="Smaller fixtures (CI)")
+        p.add_argument("--only", nargs="+", help="Benchmark name prefixes, e.g. smc. backtest.")
+        p.add_argument("--min-time", type=float, default=MIN_TIME_SECONDS,
+                       help="Minimum timed seconds per benchmark")
+        p.add_argument("--verbose", action="store_true", help="Keep application logging on")
+
+    p_run = sub.add_parser("run", help="Run and print results")
+    add_run_args(p_run)
+    p_run.add_argument("--output", help="Write the run document to this JSON file")
+    p_run.set_defaults(func=cmd_run)
+
+    p_base = sub.add_parser("baseline", help="Run and store as baseline")
+    add_run_args(p_base)
+    p_base.add_argument("--name", default="default", help="Baseline name")
+    p_base.set_defaults(func=cmd_baseline)
+
+    p_cmp = sub.add_parser("compare", help="Run and compare against a baseline")
+    add_run_args(p_cmp)
+    p_cmp.add_argument("--name", default="default", help="Baseline name")
+    p_cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="Allowed relative bars/sec drop (0.15 = 15%%)")
+    p_cmp.set_defaults(func=cmd_compare)
+
+    p_rec = sub.add_parser("record", help="Capture a recorded fixture from MT5")
+    p_rec.add_argument("instrument", help="e.g. EUR_USD")
+    p_rec.add_argument("--days", type=int, default=30)
+    p_rec.add_argument("--fixture-name", default=None)
+    p_rec.set_defaults(func=cmd_record, verbose=True)
+
+    args = parser.parse_args()
+    if not args.verbose:
+        # Per-bar engine logging would dominate both output and timings
+        logger.disable("src")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
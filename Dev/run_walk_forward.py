@@ -7,12 +7,14 @@ Compares ISI vs noISI configurations with Monte Carlo simulation.
 Usage:
     cd Dev
     python run_walk_forward.py
+    python run_walk_forward.py --queue   # Background jobs shared with the dashboard
 """
 
 import sys
 import os
 import json
 import time
+import argparse
 from datetime import datetime, timedelta
 
 # Ensure project root is on path
@@ -36,19 +38,15 @@ def load_data_for_instrument(loader, instrument, start, end):
     return h4.candles, h1.candles, m5.candles
 
 
-def run_wf_for_instrument(
-    instrument, h4, h1, m5, cross_asset_data, isi_enabled, wf_params
-):
-    """Run walk-forward for one instrument + ISI configuration."""
-    from src.backtesting.walk_forward import WalkForwardValidator, WalkForwardConfig
-
+def wf_config_kwargs(instrument, isi_enabled, wf_params):
+    """WalkForwardConfig fields for one instrument + ISI configuration."""
     spread = 1.2
     if "GBP" in instrument:
         spread = 1.8
     if "XAU" in instrument:
         spread = 3.0
 
-    wf_config = WalkForwardConfig(
+    return dict(
         instrument=instrument,
         train_days=wf_params["train_days"],
         test_days=wf_params["test_days"],
@@ -73,12 +71,74 @@ def run_wf_for_instrument(
         monte_carlo_seed=42,
     )
 
+
+def run_wf_for_instrument(
+    instrument, h4, h1, m5, cross_asset_data, isi_enabled, wf_params
+):
+    """Run walk-forward for one instrument + ISI configuration."""
+    from src.backtesting.walk_forward import WalkForwardValidator, WalkForwardConfig
+
+    wf_config = WalkForwardConfig(**wf_config_kwargs(instrument, isi_enabled, wf_params))
+
     xa = cross_asset_data if isi_enabled else None
 
     validator = WalkForwardValidator()
     return validator.run(wf_config, h4, h1, m5, xa)
 
 
+def run_via_queue(instruments, data_instruments, wf_params, start_date, end_date,
+                  max_workers, reuse_completed=True):
+    """
+    Run every instrument x ISI configuration as a background job.
+
+    Returns:
+        {key: WalkForwardResult dict} for finished jobs
+    """
+    from src.backtesting.jobs import BacktestJobQueue, BacktestJobRunner, DONE
+
+    queue = BacktestJobQueue()
+    submitted = []
+    for inst in instruments:
+        for isi_enabled, tag in ((False, "noISI"), (True, "ISI")):
+            key = f"{inst}_{tag}"
+            params = {
+                "wf_config": wf_config_kwargs(inst, isi_enabled, wf_params),
+                "start_date": start_date,
+                "end_date": end_date,
+                "cross_asset": list(data_instruments),
+                "label": key,
+            }
+            job = queue.submit("walk_forward", params, label=key, submitted_by="walk_forward",
+                               reuse_completed=reuse_completed)
+            submitted.append((key, job.id))
+            print(f"  {key}: job {job.id} ({job.status})")
+
+    def on_update(job):
+        if not job.is_active:
+            print(f"  job {job.id} {job.label}: {job.status}")
+
+    runner = BacktestJobRunner(queue, max_workers=max_workers).start()
+    job_ids = [job_id for _, job_id in submitted]
+    try:
+        final = queue.wait(job_ids, on_update=on_update)
+    except KeyboardInterrupt:
+        for job_id in job_ids:
+            queue.cancel(job_id)
+        runner.stop(terminate_workers=True)
+        raise
+    runner.stop()
+
+    results = {}
+    for key, job_id in submitted:
+        job = final[job_id]
+        if job.status != DONE:
+            print(f"  {key}: {job.status} {(job.error or '').splitlines()[0] if job.error else ''}")
+            continue
+        with open(job.result_path) as f:
+            results[key] = json.load(f)
+    return results
+
+
 def print_window_details(result):
     """Print per-window details."""
     for w in result.windows:
@@ -93,6 +153,14 @@ def print_window_details(result):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run walk-forward validation.")
+    parser.add_argument("--queue", action="store_true",
+                        help="Run through the background job queue (shared with the dashboard)")
+    parser.add_argument("--workers", type=int, default=2, help="Job workers with --queue (default: 2)")
+    parser.add_argument("--rerun", action="store_true",
+                        help="With --queue: rerun configurations that already have a finished job")
+    args = parser.parse_args()
+
     print("=" * 80)
     print("WALK-FORWARD VALIDATION RUNNER")
     print("=" * 80)
@@ -120,78 +188,88 @@ def main():
     print(f"Instruments: {instruments}")
     print(f"Monte Carlo: 1000 iterations")
 
-    # --- Load Data ---
-    print("\n--- LOADING DATA ---")
-    from src.backtesting.data_loader import DataLoader
-    loader = DataLoader()
-    data = {}
-
-    all_instruments = list(set(instruments + cross_asset_ref))
-    for inst in all_instruments:
-        print(f"\n{inst}:")
-        try:
-            h4, h1, m5 = load_data_for_instrument(loader, inst, start_date, end_date)
-            data[inst] = (h4, h1, m5)
-        except Exception as e:
-            print(f"  ERROR: {e}")
-
-    # Build cross-asset M5 data
-    all_m5 = {}
-    for inst in data:
-        all_m5[inst] = data[inst][2]  # m5 candles
-
-    # --- Run Walk-Forward ---
-    print("\n--- RUNNING WALK-FORWARD VALIDATION ---")
-    all_results = {}
-    total_start = time.time()
-
-    for inst in instruments:
-        if inst not in data:
-            print(f"\nSkipping {inst} - no data loaded")
-            continue
-
-        h4, h1, m5 = data[inst]
-        cross_asset_for_inst = {k: v for k, v in all_m5.items() if k != inst}
-
-        # Run without ISI
-        print(f"\n{'='*60}")
-        print(f"{inst} - noISI")
-        print(f"{'='*60}")
-        t0 = time.time()
-        try:
-            result_no_isi = run_wf_for_instrument(
-                inst, h4, h1, m5, cross_asset_for_inst, False, wf_params
-            )
-            elapsed = time.time() - t0
-            print_window_details(result_no_isi)
-            print(result_no_isi.format_summary())
-            print(f"  Time: {elapsed:.1f}s")
-            all_results[f"{inst}_noISI"] = result_no_isi
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-
-        # Run with ISI
-        print(f"\n{'='*60}")
-        print(f"{inst} - ISI (Seq+XA+Cal)")
-        print(f"{'='*60}")
-        t0 = time.time()
-        try:
-            result_isi = run_wf_for_instrument(
-                inst, h4, h1, m5, cross_asset_for_inst, True, wf_params
-            )
-            elapsed = time.time() - t0
-            print_window_details(result_isi)
-            print(result_isi.format_summary())
-            print(f"  Time: {elapsed:.1f}s")
-            all_results[f"{inst}_ISI"] = result_isi
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-
-    total_elapsed = time.time() - total_start
+    if args.queue:
+        print("\n--- RUNNING WALK-FORWARD VALIDATION (job queue) ---")
+        total_start = time.time()
+        all_results = run_via_queue(
+            instruments, list(set(instruments + cross_asset_ref)), wf_params,
+            start_date, end_date, args.workers, reuse_completed=not args.rerun,
+        )
+        total_elapsed = time.time() - total_start
+    else:
+        # --- Load Data ---
+        print("\n--- LOADING DATA ---")
+        from src.backtesting.data_loader import DataLoader
+        loader = DataLoader()
+        data = {}
+
+        all_instruments = list(set(instruments + cross_asset_ref))
+        for inst in all_instruments:
+            print(f"\n{inst}:")
+            try:
+                h4, h1, m5 = load_data_for_instrument(loader, inst, start_date, end_date)
+                data[inst] = (h4, h1, m5)
+            except Exception as e:
+                print(f"  ERROR: {e}")
+
+        # Build cross-asset M5 data
+        all_m5 = {}
+        for inst in data:
+            all_m5[inst] = data[inst][2]  # m5 candles
+
+        # --- Run Walk-Forward ---
+        print("\n--- RUNNING WALK-FORWARD VALIDATION ---")
+        all_results = {}
+        total_start = time.time()
+
+        for inst in instruments:
+            if inst not in data:
+                print(f"\nSkipping {inst} - no data loaded")
+                continue
+
+            h4, h1, m5 = data[inst]
+            cross_asset_for_inst = {k: v for k, v in all_m5.items() if k != inst}
+
+            # Run without ISI
+            print(f"\n{'='*60}")
+            print(f"{inst} - noISI")
+            print(f"{'='*60}")
+            t0 = time.time()
+            try:
+                result_no_isi = run_wf_for_instrument(
+                    inst, h4, h1, m5, cross_asset_for_inst, False, wf_params
+                )
+                elapsed = time.time() - t0
+                print_window_details(result_no_isi)
+                print(result_no_isi.format_summary())
+                print(f"  Time: {elapsed:.1f}s")
+                all_results[f"{inst}_noISI"] = result_no_isi
+            except Exception as e:
+                print(f"  ERROR: {e}")
+                import traceback
+                traceback.print_exc()
+
+            # Run with ISI
+            print(f"\n{'='*60}")
+            print(f"{inst} - ISI (Seq+XA+Cal)")
+            print(f"{'='*60}")
+            t0 = time.time()
+            try:
+                result_isi = run_wf_for_instrument(
+                    inst, h4, h1, m5, cross_asset_for_inst, True, wf_params
+                )
+                elapsed = time.time() - t0
+                print_window_details(result_isi)
+                print(result_isi.format_summary())
+                print(f"  Time: {elapsed:.1f}s")
+                all_results[f"{inst}_ISI"] = result_isi
+            except Exception as e:
+                print(f"  ERROR: {e}")
+                import traceback
+                traceback.print_exc()
+
+        total_elapsed = time.time() - total_start
+        all_results = {key: result.to_dict() for key, result in all_results.items()}
 
     # --- Comparison Summary ---
     print("\n" + "=" * 80)
@@ -206,14 +284,15 @@ def main():
     print("-" * 80)
 
     for key, result in sorted(all_results.items()):
-        mc_prob = f"{result.monte_carlo.prob_profit:.0%}" if result.monte_carlo else "N/A"
+        mc = result.get("monte_carlo")
+        mc_prob = f"{mc['prob_profit']:.0%}" if mc else "N/A"
         row = (
             f"{key:<25} "
-            f"{result.avg_test_win_rate:>7.1f}% "
-            f"{result.total_test_pnl:>+9.2f} "
-            f"{result.avg_test_sharpe:>9.2f} "
-            f"{result.consistency_score:>7.0f}% "
-            f"{result.robustness_score:>7.0f} "
+            f"{result['avg_test_win_rate']:>7.1f}% "
+            f"{result['total_test_pnl']:>+9.2f} "
+            f"{result['avg_test_sharpe']:>9.2f} "
+            f"{result['consistency_score']:>7.0f}% "
+            f"{result['robustness_score']:>7.0f} "
             f"{mc_prob:>10}"
         )
         print(row)
@@ -235,7 +314,7 @@ def main():
         "results": {},
     }
     for key, result in all_results.items():
-        save_data["results"][key] = result.to_dict()
+        save_data["results"][key] = result
 
     with open(output_file, "w") as f:
         json.dump(save_data, f, indent=2, default=str)
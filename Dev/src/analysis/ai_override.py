@@ -28,6 +28,7 @@ from src.core.tuning_config import (
     OverrideContext,
     OverrideAdjustment,
 )
+from src.core.settings_manager import settings_manager
 from src.utils.logger import logger
 from src.utils.database import db
 
@@ -91,6 +92,9 @@ class AIOverrideConfig:
         "disable_setting_after_losses": 3,  # Disable setting override after N consecutive losses
     })
 
+    # Approximate token cap for knowledge chunks in the prompt (0 = none)
+    knowledge_token_budget: int = 600
+
     @classmethod
     def from_dict(cls, data: dict) -> "AIOverrideConfig":
         """Create config from dictionary."""
@@ -101,6 +105,7 @@ class AIOverrideConfig:
             cooldown_after_loss_minutes=data.get("cooldown_after_loss_minutes", 30),
             adjustable_settings=data.get("adjustable_settings", cls().adjustable_settings),
             learning=data.get("learning", cls().learning),
+            knowledge_token_budget=data.get("knowledge_token_budget", 600),
         )
 
 
@@ -241,6 +246,16 @@ SETTING TO ADJUST: {setting_to_adjust}
 - Default value: {bounds.default_value}
 """
 
+        knowledge_info = ""
+        if self.config.knowledge_token_budget > 0:
+            knowledge = settings_manager.get_relevant_knowledge(
+                f"{context.instrument} {context.direction} {context.skip_reason} "
+                f"{signal_data.get('m5_trend', '')} {signal_data.get('h1_trend', '')}",
+                token_budget=self.config.knowledge_token_budget,
+            )
+            if knowledge:
+                knowledge_info = f"\nRELEVANT KNOWLEDGE:\n{knowledge}\n"
+
         prompt = f"""You are an AI trading override evaluator. A signal was REJECTED by technical filters.
 Your job is to decide if this rejection should be OVERRIDDEN.
 
@@ -264,7 +279,7 @@ CONFIDENCE BREAKDOWN:
 - Technical: {signal_data.get('tech_score', 'N/A')}%
 - Sentiment: {signal_data.get('sentiment_score', 'N/A')}
 - Adversarial: {signal_data.get('adv_score', 'N/A')}%
-{setting_info}
+{setting_info}{knowledge_info}
 OVERRIDE RULES:
 1. Override ONLY if you believe the trade is likely profitable despite the rejection reason
 2. For MTF conflict: Override only if HTF opposition is weak (<75%) and LTF setup is strong
@@ -8,9 +8,23 @@ Formula: P(win) = 1 / (1 + exp(-(A * raw_score + B)))
 
 Where A, B are fitted from historical trade outcomes via logistic regression.
 Brier score < 0.25 indicates good calibration.
+
+Online mode: instead of refitting on the full history, each closed trade
+takes one Newton step using the accumulated curvature (the 2x2 Hessian of
+the log-loss), so the cost per trade is constant. Parameters are written to
+calibration_params only when they drift more than drift_tolerance from the
+last saved row.
+
+Usage:
+    from src.analysis.confidence_calibrator import get_calibrator
+
+    calibrator = get_calibrator()             # Shared online instance
+    calibrated = calibrator.calibrate(raw)
+    calibrator.update(confidence_score, pnl)  # On every closed trade
 """
 
 import math
+import threading
 from datetime import datetime
 from typing import Optional
 
@@ -20,14 +34,24 @@ from src.utils.logger import logger
 class ConfidenceCalibrator:
     """Platt Scaling calibration of confidence scores."""
 
-    def __init__(self, db):
+    def __init__(self, db, online: bool = False):
         self.db = db
+        self.online = online
         self.param_a = -1.0  # Default (no scaling)
         self.param_b = 0.0
         self.is_fitted = False
         self.min_trades_to_fit = 30
         self.refit_interval = 50  # Refit every 50 new trades
+        self.drift_tolerance = 1.0  # Persist when calibrated output moves this many points
+        self.prior_strength = 0.01  # Ridge on the Hessian, bounds early steps
         self._last_trade_count = 0
+        # Online state: log-loss Hessian [aa, ab, bb], running win/Brier sums
+        self._hessian: Optional[list] = None
+        self._wins = 0.0
+        self._brier_sum = 0.0
+        self._saved_a = self.param_a
+        self._saved_b = self.param_b
+        self._lock = threading.Lock()
         self._load_params()
 
     def calibrate(self, raw_confidence: int) -> int:
@@ -96,13 +120,18 @@ class ConfidenceCalibrator:
         # Calculate Brier score for quality assessment
         brier = self._brier_score(X, Y, a, b)
         win_rate = sum(Y) / len(Y)
+        hessian = self._batch_hessian(X, a, b)
 
         # Save params
-        self.param_a = a
-        self.param_b = b
-        self.is_fitted = True
-        self._last_trade_count = len(trades)
-        self._save_params(a, b, len(trades), win_rate, brier)
+        with self._lock:
+            self.param_a = a
+            self.param_b = b
+            self.is_fitted = True
+            self._last_trade_count = len(trades)
+            self._hessian = hessian
+            self._wins = float(sum(Y))
+            self._brier_sum = brier * len(Y)
+            self._save_params(a, b, len(trades), win_rate, brier, hessian)
 
         logger.info(
             f"Calibrator fitted: A={a:.4f}, B={b:.4f}, "
@@ -118,8 +147,82 @@ class ConfidenceCalibrator:
             "brier_score": round(brier, 4),
         }
 
+    def update(self, raw_confidence: int, pnl: float) -> dict:
+        """
+        Online update from one closed trade (streaming Newton step).
+
+        Adds the trade's curvature p(1-p)*[x, 1][x, 1]^T to the running
+        Hessian, then steps A, B by H^-1 * gradient. Cost does not depend on
+        history size. Parameters are persisted only once fitted and when
+        the calibrated output drifts more than drift_tolerance points from
+        the last saved params (A and B are strongly correlated, so small
+        moves along their ridge barely change calibrated scores).
+
+        Args:
+            raw_confidence: Confidence score the trade was taken with (0-100)
+            pnl: Realized P/L (win if > 0)
+
+        Returns:
+            Dict with updated params, trade count and whether they were saved
+        """
+        x = raw_confidence / 100.0
+        y = 1 if (pnl or 0) > 0 else 0
+
+        with self._lock:
+            if self._hessian is None:
+                self._hessian = self._initial_hessian()
+
+            p = self._sigmoid(self.param_a * x + self.param_b)
+            self._brier_sum += (p - y) ** 2  # Prequential: scored before the step
+            self._wins += y
+            self._last_trade_count += 1
+
+            # Gradient and curvature of the log-loss for this trade
+            err = p - y
+            grad_a, grad_b = err * x, err
+            w = p * (1 - p)
+            h_aa, h_ab, h_bb = self._hessian
+            h_aa += w * x * x
+            h_ab += w * x
+            h_bb += w
+            self._hessian = [h_aa, h_ab, h_bb]
+
+            # Newton step: solve the 2x2 system H * delta = gradient
+            det = h_aa * h_bb - h_ab * h_ab
+            if det > 1e-12:
+                self.param_a -= (h_bb * grad_a - h_ab * grad_b) / det
+                self.param_b -= (h_aa * grad_b - h_ab * grad_a) / det
+                self.param_a = max(-20.0, min(20.0, self.param_a))
+                self.param_b = max(-20.0, min(20.0, self.param_b))
+
+            trades = self._last_trade_count
+            if trades >= self.min_trades_to_fit:
+                self.is_fitted = True
+
+            drift = self._drift()
+            persisted = self.is_fitted and drift > self.drift_tolerance
+            if persisted:
+                self._save_params(
+                    self.param_a, self.param_b, trades,
+                    self._wins / trades, self._brier_sum / trades, self._hessian,
+                )
+                logger.info(
+                    f"Calibrator updated online: A={self.param_a:.4f}, "
+                    f"B={self.param_b:.4f}, trades={trades}"
+                )
+
+            return {
+                "param_a": self.param_a,
+                "param_b": self.param_b,
+                "training_trades": trades,
+                "is_fitted": self.is_fitted,
+                "persisted": persisted,
+            }
+
     def should_refit(self) -> bool:
-        """Check if we need to refit (every refit_interval new trades)."""
+        """Check if we need to refit (every refit_interval new trades; never when online)."""
+        if self.online:
+            return False
         current_count = self._count_closed_trades()
         return current_count - self._last_trade_count >= self.refit_interval
 
@@ -132,6 +235,8 @@ class ConfidenceCalibrator:
             "last_trade_count": self._last_trade_count,
             "min_trades_to_fit": self.min_trades_to_fit,
             "refit_interval": self.refit_interval,
+            "online": self.online,
+            "drift_tolerance": self.drift_tolerance,
         }
 
     # === Private methods ===
@@ -181,6 +286,45 @@ class ConfidenceCalibrator:
 
         return a, b
 
+    @staticmethod
+    def _sigmoid(z: float) -> float:
+        z = max(-20.0, min(20.0, z))
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def _drift(self) -> float:
+        """Largest calibrated-score change (0-100 points) vs the saved params."""
+        drift = 0.0
+        for raw in range(0, 101, 10):
+            x = raw / 100.0
+            current = self._sigmoid(self.param_a * x + self.param_b)
+            saved = self._sigmoid(self._saved_a * x + self._saved_b)
+            drift = max(drift, abs(current - saved) * 100)
+        return drift
+
+    def _batch_hessian(self, X, a, b) -> list:
+        """Log-loss Hessian [aa, ab, bb] at (a, b), plus the ridge prior."""
+        h_aa = h_ab = h_bb = 0.0
+        for x in X:
+            p = self._sigmoid(a * x + b)
+            w = p * (1 - p)
+            h_aa += w * x * x
+            h_ab += w * x
+            h_bb += w
+        return [h_aa + self.prior_strength, h_ab, h_bb + self.prior_strength]
+
+    def _initial_hessian(self) -> list:
+        """
+        Starting curvature for online updates.
+
+        Params saved before the Hessian columns existed get it rebuilt once
+        from the trade history; an unfitted calibrator starts from the prior.
+        """
+        if self.is_fitted:
+            X = [t["confidence_score"] / 100.0 for t in self._get_training_data()]
+            if X:
+                return self._batch_hessian(X, self.param_a, self.param_b)
+        return [self.prior_strength, 0.0, self.prior_strength]
+
     def _brier_score(self, X, Y, a, b) -> float:
         """Calculate Brier score (lower is better, <0.25 is good)."""
         total = 0.0
@@ -217,8 +361,8 @@ class ConfidenceCalibrator:
             """)
             return cursor.fetchone()[0]
 
-    def _save_params(self, a, b, trades, win_rate, brier):
-        """Save fitted parameters to DB."""
+    def _save_params(self, a, b, trades, win_rate, brier, hessian=None):
+        """Save fitted parameters (and online curvature) to DB."""
         with self.db._connection() as conn:
             cursor = conn.cursor()
             # Deactivate old params
@@ -229,12 +373,15 @@ class ConfidenceCalibrator:
             cursor.execute("""
                 INSERT INTO calibration_params (
                     timestamp, param_a, param_b,
-                    training_trades, training_win_rate, brier_score, active
-                ) VALUES (?, ?, ?, ?, ?, ?, 1)
+                    training_trades, training_win_rate, brier_score, active,
+                    hessian_aa, hessian_ab, hessian_bb
+                ) VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?, ?)
             """, (
                 datetime.now().isoformat(),
-                a, b, trades, win_rate, brier
+                a, b, trades, win_rate, brier,
+                *(hessian or (None, None, None))
             ))
+        self._saved_a, self._saved_b = a, b
 
     def _load_params(self):
         """Load active parameters from DB."""
@@ -242,7 +389,8 @@ class ConfidenceCalibrator:
             with self.db._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT param_a, param_b, training_trades
+                    SELECT param_a, param_b, training_trades, training_win_rate,
+                           brier_score, hessian_aa, hessian_ab, hessian_bb
                     FROM calibration_params
                     WHERE active = 1
                     ORDER BY id DESC LIMIT 1
@@ -253,9 +401,28 @@ class ConfidenceCalibrator:
                     self.param_b = row["param_b"]
                     self._last_trade_count = row["training_trades"]
                     self.is_fitted = True
+                    self._saved_a, self._saved_b = self.param_a, self.param_b
+                    trades = self._last_trade_count or 0
+                    self._wins = (row["training_win_rate"] or 0) * trades
+                    self._brier_sum = (row["brier_score"] or 0) * trades
+                    if row["hessian_aa"] is not None:
+                        self._hessian = [row["hessian_aa"], row["hessian_ab"], row["hessian_bb"]]
                     logger.info(
                         f"Calibrator loaded: A={self.param_a:.4f}, B={self.param_b:.4f}"
                     )
         except Exception:
             # Table might not exist yet
             pass
+
+
+# Shared online instance (scanner and trade lifecycle), initialized lazily
+_calibrator: Optional[ConfidenceCalibrator] = None
+
+
+def get_calibrator() -> ConfidenceCalibrator:
+    """Get or create the online calibrator singleton on the main database."""
+    global _calibrator
+    if _calibrator is None:
+        from src.utils.database import db
+        _calibrator = ConfidenceCalibrator(db, online=True)
+    return _calibrator
@@ -11,12 +11,24 @@ Example:
   → Stronger signal for EUR/USD LONG
 
 Confidence modifiers: -10 to +15 based on divergence strength.
+
+Matrix mode (matrix_mode=True) keeps one rolling correlation matrix of all
+instruments, aligned on candle timestamps, instead of correlating each pair
+separately:
+
+    detector = CrossAssetDetector(client, db, instruments=config.instruments, matrix_mode=True)
+    detector.get_confidence_modifier("EUR_USD", "LONG")
+    detector.matrix.correlation("EUR_USD", "GBP_USD")
 """
 
 import math
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from src.utils.logger import logger
 
@@ -56,18 +68,175 @@ CORRELATION_PAIRS = {
 
 DIVERGENCE_THRESHOLD_SIGMA = 1.5  # Min sigma for a signal
 CORRELATION_WINDOW = 30  # 30 bars for rolling correlation
+MIN_CORRELATION_BARS = 10  # Fewer aligned closes -> no correlation
+
+MATRIX_REFRESH_SECONDS = 300  # One M5 bar
+MATRIX_RESYNC_UPDATES = 500   # Recompute sums from scratch to bound float drift
+
+
+def align_closes(
+    candles_by_instrument: Dict[str, List[Dict]],
+    length: int,
+) -> Tuple[List[str], List[Optional[str]], np.ndarray]:
+    """
+    Align close prices of several instruments on common candle timestamps.
+
+    Candles without a "time" key are aligned by position (last bars).
+
+    Returns:
+        (instruments, times, closes) with closes shaped (bars, instruments)
+    """
+    instruments = [i for i, candles in candles_by_instrument.items() if candles]
+    if not instruments:
+        return [], [], np.empty((0, 0))
+
+    if all("time" in c for i in instruments for c in candles_by_instrument[i]):
+        series = [{c["time"]: c["close"] for c in candles_by_instrument[i]} for i in instruments]
+        common = set(series[0]).intersection(*series[1:])
+        times = sorted(common)[-length:]
+        closes = np.array([[s[t] for s in series] for t in times], dtype=float)
+    else:
+        n = min(min(len(candles_by_instrument[i]) for i in instruments), length)
+        times = [None] * n
+        closes = np.array(
+            [[c["close"] for c in candles_by_instrument[i][-n:]] for i in instruments],
+            dtype=float,
+        ).T
+
+    return instruments, times, closes.reshape(len(times), len(instruments))
+
+
+class CorrelationMatrix:
+    """
+    Rolling Pearson correlation of close-to-close returns for many instruments.
+
+    Keeps running sums of the returns and of their outer products over the
+    window, so a new bar updates the whole matrix in O(instruments^2)
+    instead of recomputing every pair over the window.
+    """
+
+    def __init__(self, window: int = CORRELATION_WINDOW):
+        self.window = window
+        self.instruments: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._returns: deque = deque(maxlen=window - 1)
+        self._sum = np.zeros(0)
+        self._cross = np.zeros((0, 0))
+        self._last_close = np.zeros(0)
+        self.last_time: Optional[str] = None
+        self._updates = 0
+        self._matrix: Optional[np.ndarray] = None
+
+    def load(self, candles_by_instrument: Dict[str, List[Dict]]) -> None:
+        """Rebuild from candles (instruments without candles are left out)."""
+        instruments, times, closes = align_closes(candles_by_instrument, self.window)
+        self.instruments = instruments
+        self._index = {inst: i for i, inst in enumerate(instruments)}
+        self._returns.clear()
+        if len(times) >= 2:
+            self._returns.extend(closes[1:] / closes[:-1] - 1)
+        self._last_close = closes[-1] if len(times) else np.zeros(len(instruments))
+        self.last_time = times[-1] if times else None
+        self._resum()
+
+    def update(self, time: Optional[str], closes: np.ndarray) -> None:
+        """Add one aligned bar (closes in self.instruments order)."""
+        row = closes / self._last_close - 1
+        if len(self._returns) == self._returns.maxlen:
+            old = self._returns[0]
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+        self._returns.append(row)
+        self._sum += row
+        self._cross += np.outer(row, row)
+        self._last_close = closes
+        self.last_time = time
+        self._matrix = None
+
+        self._updates += 1
+        if self._updates % MATRIX_RESYNC_UPDATES == 0:
+            self._resum()
+
+    def sync(self, candles_by_instrument: Dict[str, List[Dict]]) -> int:
+        """
+        Bring the matrix up to date with freshly fetched candles.
+
+        Bars newer than the last aligned bar are applied one at a time; a
+        changed instrument set, a gap or untimed candles trigger a rebuild.
+
+        Returns:
+            Bars applied incrementally (-1 if the matrix was rebuilt)
+        """
+        instruments, times, closes = align_closes(candles_by_instrument, self.window)
+        if (
+            instruments != self.instruments
+            or self.last_time is None
+            or None in times
+            or self.last_time not in times
+        ):
+            self.load(candles_by_instrument)
+            return -1
+
+        start = times.index(self.last_time) + 1
+        for i in range(start, len(times)):
+            self.update(times[i], closes[i])
+        return len(times) - start
+
+    def _resum(self) -> None:
+        rows = np.array(self._returns).reshape(len(self._returns), len(self.instruments))
+        self._sum = rows.sum(axis=0)
+        self._cross = rows.T @ rows
+        self._matrix = None
+
+    def matrix(self) -> Optional[np.ndarray]:
+        """Correlation matrix (NaN where an instrument had no movement), None if too few bars."""
+        n = len(self._returns)
+        if n + 1 < MIN_CORRELATION_BARS:
+            return None
+        if self._matrix is None:
+            mean = self._sum / n
+            cov = self._cross / n - np.outer(mean, mean)
+            var = np.diag(cov).copy()
+            # Sums of tiny returns leave rounding residue where the variance is really zero
+            flat = var <= 1e-12 * np.diag(self._cross) / n
+            std = np.sqrt(np.where(flat, np.nan, var))
+            self._matrix = cov / np.outer(std, std)
+        return self._matrix
+
+    def correlation(self, instrument1: str, instrument2: str) -> Optional[float]:
+        """Current correlation of two instruments, None if unavailable."""
+        i, j = self._index.get(instrument1), self._index.get(instrument2)
+        matrix = self.matrix()
+        if i is None or j is None or matrix is None or np.isnan(matrix[i, j]):
+            return None
+        return float(matrix[i, j])
 
 
 class CrossAssetDetector:
     """Detects divergences between correlated instruments."""
 
-    def __init__(self, client, db):
+    def __init__(self, client, db, instruments: Optional[List[str]] = None, matrix_mode: bool = False):
+        """
+        Args:
+            client: Broker client (get_candles)
+            db: Database for correlation snapshots
+            instruments: Extra instruments for the correlation matrix
+            matrix_mode: Use one rolling correlation matrix instead of per-pair correlation
+        """
         self.client = client
         self.db = db
         self._correlation_cache: Dict[str, float] = {}
         self._cache_expiry: Optional[datetime] = None
         self.cache_duration_minutes = 30
 
+        self.matrix_mode = matrix_mode
+        self.matrix_instruments = sorted(
+            {inst for pair in CORRELATION_PAIRS for inst in pair} | set(instruments or [])
+        )
+        self.matrix = CorrelationMatrix()
+        self._matrix_expiry: Optional[datetime] = None
+        self._matrix_lock = threading.Lock()
+
     def analyze(
         self,
         target_instrument: str,
@@ -84,6 +253,10 @@ class CrossAssetDetector:
             List of DivergenceSignal for all correlated pairs
         """
         signals = []
+        snapshots = []
+
+        if self.matrix_mode and any(target_instrument in pair for pair in CORRELATION_PAIRS):
+            self.refresh_matrix()
 
         for (pair1, pair2), config in CORRELATION_PAIRS.items():
             # Check if target is in this pair
@@ -93,17 +266,7 @@ class CrossAssetDetector:
             other = pair2 if target_instrument == pair1 else pair1
 
             try:
-                # Get candles for both instruments
-                target_candles = self._get_candles_cached(target_instrument)
-                other_candles = self._get_candles_cached(other)
-
-                if not target_candles or not other_candles:
-                    continue
-
-                # Calculate rolling correlation
-                current_corr = self._calculate_rolling_correlation(
-                    target_candles, other_candles
-                )
+                current_corr = self._current_correlation(target_instrument, other)
 
                 if current_corr is None:
                     continue
@@ -126,19 +289,60 @@ class CrossAssetDetector:
                     target_direction, divergence_sigma,
                 )
                 signals.append(signal)
-
-                # Log to DB
-                self._log_snapshot(
+                snapshots.append((
                     target_instrument, other,
                     current_corr, expected_corr,
                     divergence_sigma, signal.implication,
-                )
+                ))
 
             except Exception as e:
                 logger.warning(f"Cross-asset analysis failed for {target_instrument}/{other}: {e}")
 
+        # Log to DB
+        self._log_snapshots(snapshots)
+
         return signals
 
+    def _current_correlation(self, instrument: str, other: str) -> Optional[float]:
+        """Rolling correlation of two instruments (matrix or per-pair)."""
+        if self.matrix_mode:
+            return self.matrix.correlation(instrument, other)
+
+        # Get candles for both instruments
+        target_candles = self._get_candles_cached(instrument)
+        other_candles = self._get_candles_cached(other)
+
+        if not target_candles or not other_candles:
+            return None
+
+        # Calculate rolling correlation
+        return self._calculate_rolling_correlation(target_candles, other_candles)
+
+    def refresh_matrix(self, force: bool = False) -> None:
+        """Fetch candles for all matrix instruments and update the matrix (once per bar)."""
+        now = datetime.now(timezone.utc)
+        with self._matrix_lock:
+            if not force and self._matrix_expiry and now < self._matrix_expiry:
+                return
+
+            candles = {}
+            for instrument in self.matrix_instruments:
+                try:
+                    candles[instrument] = self.client.get_candles(instrument, "M5", 50)
+                except Exception as e:
+                    logger.warning(f"Failed to get candles for {instrument}: {e}")
+
+            try:
+                applied = self.matrix.sync(candles)
+            except Exception as e:
+                logger.warning(f"Correlation matrix update failed: {e}")
+                return
+            self._matrix_expiry = now + timedelta(seconds=MATRIX_REFRESH_SECONDS)
+            logger.debug(
+                f"Correlation matrix {'rebuilt' if applied < 0 else f'updated with {applied} bars'}: "
+                f"{len(self.matrix.instruments)} instruments"
+            )
+
     def get_confidence_modifier(
         self,
         instrument: str,
@@ -289,20 +493,27 @@ class CrossAssetDetector:
     def _log_snapshot(self, pair1, pair2, current_corr, expected_corr,
                       divergence_sigma, implication):
         """Log correlation snapshot to DB."""
+        self._log_snapshots([(pair1, pair2, current_corr, expected_corr, divergence_sigma, implication)])
+
+    def _log_snapshots(self, rows: List[tuple]):
+        """
+        Log correlation snapshots to DB in one insert.
+
+        Args:
+            rows: (pair1, pair2, current_corr, expected_corr, divergence_sigma, implication)
+        """
+        if not rows:
+            return
+        timestamp = datetime.now(timezone.utc).isoformat()
         try:
             with self.db._connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
+                cursor.executemany("""
                     INSERT INTO correlation_snapshots (
                         timestamp, pair1, pair2,
                         correlation_30bar, expected_correlation,
                         divergence_sigma, implication
                     ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    datetime.now(timezone.utc).isoformat(),
-                    pair1, pair2,
-                    current_corr, expected_corr,
-                    divergence_sigma, implication,
-                ))
+                """, [(timestamp, *row) for row in rows])
         except Exception as e:
-            logger.warning(f"Failed to log correlation snapshot: {e}")
+            logger.warning(f"Failed to log correlation snapshots: {e}")
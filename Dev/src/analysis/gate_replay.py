@@ -0,0 +1,381 @@
+"""
+Gate Replay - Counterfactual gate/preset scoring over recorded setup labels.
+
+Every SMC v2 evaluation is stored in setup_labels with one column per gate
+(within_killzone, news_clear, ..., sl_cap_pass), the grade, confidence and
+R:R. Asking "what if this gate were off" used to mean a full backtest per
+variant. GateReplay answers it from the labels instead:
+
+- each label's failed gates are packed into one bitmask
+- a variant is a mask of enforced gates plus per-grade RR/confidence floors
+  and daily trade caps
+- all variants are scored at once with numpy: a label passes a variant when
+  (failed & enforced) == 0 and it clears the grade thresholds
+
+Outcomes come from closed trades joined to the latest label for the same
+instrument/direction within `match_window_minutes` before the entry.
+Labels that never became a trade have no outcome: loosening a gate shows
+how many more setups would pass, but only the traded ones carry P&L.
+
+Usage:
+    replay = GateReplay.from_database(days=30)
+    scores = replay.evaluate_presets(QUICK_TUNING_PRESETS)
+    scores = replay.evaluate(replay.gate_combinations(GateVariant.from_config(cfg.smc_v2)))
+"""
+
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.utils.database import SETUP_LABEL_GATES, _iso_to_epoch
+
+
+GATE_BITS = {gate: 1 << i for i, gate in enumerate(SETUP_LABEL_GATES)}
+ALL_GATES_MASK = (1 << len(SETUP_LABEL_GATES)) - 1
+
+GRADES = ("A+", "A", "B", "NO_TRADE")
+GRADE_INDEX = {grade: i for i, grade in enumerate(GRADES)}
+
+# Quick-tuning toggles -> gate columns they control
+PRESET_GATE_KEYS = {
+    "qt_killzone_gate": "within_killzone",
+    "qt_htf_poi_gate": "htf_poi_gate",
+    "qt_strict_sweep": "sweep_valid",
+    "qt_strict_fvg": "fvg_valid",
+}
+
+# Gates every variant keeps (not exposed as quick-tuning toggles)
+ALWAYS_ON_GATES = ("news_clear", "direction_confirmed", "choch_or_bos", "sl_cap_pass")
+
+# Variants scored per numpy pass (bounds the variants x labels matrices)
+VARIANT_BATCH = 256
+
+DEFAULT_MATCH_WINDOW_MINUTES = 60
+
+
+def gate_mask(gates: Sequence[str]) -> int:
+    """Bitmask of gate names."""
+    mask = 0
+    for gate in gates:
+        mask |= GATE_BITS[gate]
+    return mask
+
+
+@dataclass
+class GateVariant:
+    """One gate/threshold configuration to score."""
+    name: str
+    gates: int = ALL_GATES_MASK                   # Enforced gates (GATE_BITS mask)
+    grades: tuple = ("A+", "A")                   # Live-eligible grades
+    min_rr: Dict[str, float] = field(default_factory=dict)          # Per grade, on risk_reward
+    min_confidence: Dict[str, float] = field(default_factory=dict)  # Per grade
+    max_daily_trades: Optional[int] = None
+    max_trades_per_instrument: Optional[int] = None
+
+    @property
+    def gate_names(self) -> List[str]:
+        return [g for g in SETUP_LABEL_GATES if self.gates & GATE_BITS[g]]
+
+    @classmethod
+    def from_preset(cls, name: str, preset: dict) -> "GateVariant":
+        """Variant from a Quick Tuning preset (qt_* keys of config_experiments)."""
+        enforced = list(ALWAYS_ON_GATES)
+        enforced += [gate for key, gate in PRESET_GATE_KEYS.items() if preset.get(key, True)]
+        return cls(
+            name=name,
+            # RR floors are applied to risk_reward directly, replacing rr_pass
+            gates=gate_mask(enforced),
+            grades=("A+",) if preset.get("qt_a_plus_only") else ("A+", "A"),
+            min_rr={
+                "A+": float(preset.get("qt_min_rr_a_plus", 0.0)),
+                "A": float(preset.get("qt_min_rr_a", 0.0)),
+                "B": float(preset.get("qt_min_rr_b", 0.0)),
+            },
+            min_confidence={
+                "A+": float(preset.get("qt_min_conf_a_plus", 0)),
+                "A": float(preset.get("qt_min_conf_a", 0)),
+            },
+            max_daily_trades=preset.get("qt_max_daily_trades"),
+            max_trades_per_instrument=preset.get("qt_max_per_instrument"),
+        )
+
+    @classmethod
+    def from_config(cls, smc_v2, name: str = "CURRENT") -> "GateVariant":
+        """
+        Variant matching an SMCv2Config, as _evaluate_setup_v2 gates live trades.
+
+        Every recorded gate is enforced: gates a config leaves off are logged
+        as None (not evaluated) or as pass, so the labels already carry them.
+        """
+        grade_execution = smc_v2.grade_execution
+        if not grade_execution.enabled:
+            grades = GRADES
+        elif grade_execution.a_plus_only_live:
+            grades = ("A+",)
+        else:
+            grades = ("A+", "A")
+        return cls(
+            name=name,
+            gates=ALL_GATES_MASK,
+            grades=grades,
+            min_confidence={
+                "A+": float(grade_execution.min_confidence_a_plus),
+                "A": float(grade_execution.min_confidence_a),
+            },
+        )
+
+
+@dataclass
+class VariantScore:
+    """How a variant would have filtered the recorded labels."""
+    name: str
+    gates: List[str]
+    labels_passed: int
+    pass_rate: float          # % of labels passing
+    trades: int               # Traded labels this variant keeps (after caps)
+    wins: int
+    win_rate: float           # % of kept trades
+    total_pnl: float
+    avg_r: Optional[float]    # Mean R multiple of kept trades with a known risk
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "gates": self.gates,
+            "labels_passed": self.labels_passed,
+            "pass_rate": self.pass_rate,
+            "trades": self.trades,
+            "wins": self.wins,
+            "win_rate": self.win_rate,
+            "total_pnl": self.total_pnl,
+            "avg_r": self.avg_r,
+        }
+
+
+class GateReplay:
+    """Scores gate variants against setup labels in vectorized passes."""
+
+    def __init__(
+        self,
+        labels: List[dict],
+        trades: List[dict],
+        match_window_minutes: float = DEFAULT_MATCH_WINDOW_MINUTES,
+    ):
+        """
+        Args:
+            labels: setup_labels rows with resolved gates (Database.get_setup_labels)
+            trades: Closed trades (Database.get_recent_trades)
+            match_window_minutes: Max minutes from a label to the trade entry it explains
+        """
+        labels = [row for row in labels if _iso_to_epoch(row.get("timestamp")) is not None]
+        labels.sort(key=lambda row: _iso_to_epoch(row["timestamp"]))
+        n = len(labels)
+        self.size = n
+
+        self.times = np.array([_iso_to_epoch(row["timestamp"]) for row in labels], dtype=np.float64)
+        self.failed = np.zeros(n, dtype=np.int64)
+        for gate, bit in GATE_BITS.items():
+            self.failed |= np.array([bit if row.get(gate) == 0 else 0 for row in labels], dtype=np.int64)
+        self.grade = np.array(
+            [GRADE_INDEX.get(row.get("setup_grade") or "NO_TRADE", GRADE_INDEX["NO_TRADE"]) for row in labels],
+            dtype=np.int64,
+        )
+        self.confidence = np.array(
+            [np.nan if row.get("confidence") is None else float(row["confidence"]) for row in labels],
+            dtype=np.float64,
+        )
+        self.risk_reward = np.array(
+            [np.nan if row.get("risk_reward") is None else float(row["risk_reward"]) for row in labels],
+            dtype=np.float64,
+        )
+
+        # Outcomes: each closed trade explained by the latest matching label before it
+        self.outcome_index = self._match_trades(labels, trades, match_window_minutes * 60)
+        order = np.array(sorted(self.outcome_index), dtype=np.int64)
+        self.outcome_rows = order
+        trade_for = [trades[self.outcome_index[i]] for i in order]
+        self.outcome_pnl = np.array([float(t.get("pnl") or 0.0) for t in trade_for], dtype=np.float64)
+        self.outcome_r = np.array(
+            [float(t["pnl"]) / float(t["risk_amount"])
+             if t.get("pnl") is not None and t.get("risk_amount") else np.nan
+             for t in trade_for],
+            dtype=np.float64,
+        )
+        self.matched_trades = len(order)
+
+        # Caps: day and (instrument, day) groups of the traded labels, in time order
+        days = (self.times[order] // 86400).astype(np.int64) if len(order) else np.zeros(0, dtype=np.int64)
+        instruments = [labels[i].get("instrument") for i in order]
+        self._day_groups = _group_starts(list(days))
+        self._inst_sort = np.array(
+            sorted(range(len(order)), key=lambda j: (instruments[j] or "", days[j], j)), dtype=np.int64
+        )
+        self._inst_groups = _group_starts([(instruments[j], days[j]) for j in self._inst_sort])
+
+    @classmethod
+    def from_database(
+        cls,
+        database=None,
+        days: int = 30,
+        match_window_minutes: float = DEFAULT_MATCH_WINDOW_MINUTES,
+    ) -> "GateReplay":
+        """Labels and closed trades from the last N days."""
+        if database is None:
+            from src.utils.database import db as database
+        return cls(database.get_setup_labels(days), database.get_recent_trades(days), match_window_minutes)
+
+    @staticmethod
+    def _match_trades(labels: List[dict], trades: List[dict], window_seconds: float) -> Dict[int, int]:
+        """{label row: trade index}, latest label per (instrument, direction) before each entry."""
+        by_key: Dict[tuple, List[tuple]] = {}
+        for i, row in enumerate(labels):
+            key = (row.get("instrument"), row.get("direction"))
+            by_key.setdefault(key, []).append((_iso_to_epoch(row["timestamp"]), i))
+
+        matches: Dict[int, int] = {}
+        for t, trade in enumerate(trades):
+            entry = _iso_to_epoch(trade.get("timestamp"))
+            candidates = by_key.get((trade.get("instrument"), trade.get("direction")))
+            if entry is None or not candidates:
+                continue
+            times = [c[0] for c in candidates]
+            k = int(np.searchsorted(times, entry, side="right")) - 1
+            if k >= 0 and entry - times[k] <= window_seconds:
+                matches.setdefault(candidates[k][1], t)
+        return matches
+
+    # ---------- Scoring ----------
+
+    def passes(self, variants: Sequence[GateVariant]) -> np.ndarray:
+        """Bool matrix [variant, label]: label passes the variant's gates and thresholds."""
+        v = len(variants)
+        n_grades = len(GRADES)
+        enforced = np.array([variant.gates for variant in variants], dtype=np.int64)
+        grade_ok = np.zeros((v, n_grades), dtype=bool)
+        min_rr = np.zeros((v, n_grades), dtype=np.float64)
+        min_conf = np.zeros((v, n_grades), dtype=np.float64)
+        rr_gate = np.zeros(v, dtype=bool)
+        for row, variant in enumerate(variants):
+            for grade in variant.grades:
+                grade_ok[row, GRADE_INDEX[grade]] = True
+            for grade, value in variant.min_rr.items():
+                min_rr[row, GRADE_INDEX[grade]] = value
+            for grade, value in variant.min_confidence.items():
+                min_conf[row, GRADE_INDEX[grade]] = value
+            rr_gate[row] = bool(variant.min_rr)
+
+        # RR floors replace the recorded rr_pass gate when a variant sets them
+        enforced = np.where(rr_gate, enforced & ~GATE_BITS["rr_pass"], enforced)
+
+        result = (self.failed[None, :] & enforced[:, None]) == 0
+        result &= grade_ok[:, self.grade]
+        rr_floor = min_rr[:, self.grade]
+        result &= (rr_floor <= 0) | (self.risk_reward[None, :] >= rr_floor - 1e-9)
+        conf_floor = min_conf[:, self.grade]
+        result &= (conf_floor <= 0) | (self.confidence[None, :] >= conf_floor)
+        return result
+
+    def _apply_caps(self, taken: np.ndarray, variants: Sequence[GateVariant]) -> np.ndarray:
+        """Drop traded labels beyond each variant's per-instrument and daily caps."""
+        if not taken.shape[1]:
+            return taken
+        inst_caps = np.array([_cap(v.max_trades_per_instrument) for v in variants], dtype=np.float64)
+        if np.isfinite(inst_caps).any():
+            ordered = taken[:, self._inst_sort]
+            ordered &= _rank_in_groups(ordered, self._inst_groups) <= inst_caps[:, None]
+            taken = np.empty_like(taken)
+            taken[:, self._inst_sort] = ordered
+        daily_caps = np.array([_cap(v.max_daily_trades) for v in variants], dtype=np.float64)
+        if np.isfinite(daily_caps).any():
+            taken = taken & (_rank_in_groups(taken, self._day_groups) <= daily_caps[:, None])
+        return taken
+
+    def evaluate(self, variants: Sequence[GateVariant]) -> List[VariantScore]:
+        """Score variants (in batches of VARIANT_BATCH)."""
+        scores: List[VariantScore] = []
+        for start in range(0, len(variants), VARIANT_BATCH):
+            batch = variants[start:start + VARIANT_BATCH]
+            passed = self.passes(batch)
+            taken = self._apply_caps(passed[:, self.outcome_rows], batch)
+
+            labels_passed = passed.sum(axis=1)
+            trades = taken.sum(axis=1)
+            wins = (taken & (self.outcome_pnl > 0)[None, :]).sum(axis=1)
+            total_pnl = taken.astype(np.float64) @ self.outcome_pnl
+            has_r = ~np.isnan(self.outcome_r)
+            r_taken = taken & has_r[None, :]
+            r_counts = r_taken.sum(axis=1)
+            r_sums = r_taken.astype(np.float64) @ np.where(has_r, self.outcome_r, 0.0)
+
+            for row, variant in enumerate(batch):
+                n_trades = int(trades[row])
+                scores.append(VariantScore(
+                    name=variant.name,
+                    gates=variant.gate_names,
+                    labels_passed=int(labels_passed[row]),
+                    pass_rate=round(100.0 * labels_passed[row] / self.size, 1) if self.size else 0.0,
+                    trades=n_trades,
+                    wins=int(wins[row]),
+                    win_rate=round(100.0 * wins[row] / n_trades, 1) if n_trades else 0.0,
+                    total_pnl=round(float(total_pnl[row]), 2),
+                    avg_r=round(float(r_sums[row] / r_counts[row]), 3) if r_counts[row] else None,
+                ))
+        return scores
+
+    def evaluate_presets(self, presets: Dict[str, dict]) -> List[VariantScore]:
+        """Score Quick Tuning presets ({name: qt_* values})."""
+        return self.evaluate([GateVariant.from_preset(name, values) for name, values in presets.items()])
+
+    @staticmethod
+    def gate_combinations(
+        base: GateVariant,
+        toggles: Sequence[str] = SETUP_LABEL_GATES,
+        max_off: Optional[int] = None,
+    ) -> List[GateVariant]:
+        """
+        Base variant with every subset of `toggles` switched off.
+
+        Args:
+            base: Variant to vary (its thresholds and caps are kept)
+            toggles: Gates to switch off in combination
+            max_off: Only subsets of up to this many gates (None = all 2^k)
+        """
+        limit = len(toggles) if max_off is None else max_off
+        variants = []
+        for k in range(limit + 1):
+            for off in combinations(toggles, k):
+                mask = base.gates & ~gate_mask(off)
+                name = base.name if not off else f"{base.name} -" + " -".join(off)
+                variants.append(GateVariant(
+                    name=name,
+                    gates=mask,
+                    grades=base.grades,
+                    min_rr=dict(base.min_rr),
+                    min_confidence=dict(base.min_confidence),
+                    max_daily_trades=base.max_daily_trades,
+                    max_trades_per_instrument=base.max_trades_per_instrument,
+                ))
+        return variants
+
+
+# ---------- Group helpers ----------
+
+def _cap(value) -> float:
+    return float(value) if value is not None else np.inf
+
+
+def _group_starts(keys: list) -> np.ndarray:
+    """Index of the first element of each element's run of equal keys."""
+    starts = np.zeros(len(keys), dtype=np.int64)
+    for j in range(1, len(keys)):
+        starts[j] = starts[j - 1] if keys[j] == keys[j - 1] else j
+    return starts
+
+
+def _rank_in_groups(mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """1-based running count of True values within each group (per row)."""
+    counts = np.cumsum(mask, axis=1)
+    before = np.where(starts > 0, counts[:, np.maximum(starts - 1, 0)], 0)
+    return counts - before
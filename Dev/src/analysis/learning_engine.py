@@ -21,9 +21,12 @@ Usage:
 """
 
 import json
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from pathlib import Path
 
 from src.utils.logger import logger
@@ -112,6 +115,305 @@ class TradeInsight:
         return "\n".join(lines)
 
 
+# (pattern_type, pattern_value, instrument, direction) - instrument/direction may be None
+PatternKey = Tuple[str, str, Optional[str], Optional[str]]
+
+
+@dataclass
+class PatternDelta:
+    """Accumulated change to one pattern_stats row (one or more trades)."""
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    pnl_pips: float = 0.0
+    pnl_amount: float = 0.0
+    mfe_sum: float = 0.0
+    mae_sum: float = 0.0
+
+    def add(self, won: bool, pnl_pips: float, pnl_amount: float, mfe_pips: float, mae_pips: float):
+        self.trades += 1
+        self.wins += 1 if won else 0
+        self.losses += 0 if won else 1
+        self.pnl_pips += pnl_pips
+        self.pnl_amount += pnl_amount
+        self.mfe_sum += mfe_pips
+        self.mae_sum += mae_pips
+
+
+def _pattern_name(key: PatternKey) -> str:
+    """Stats dict key, more specific patterns carry instrument/direction."""
+    p_type, p_value, p_inst, p_dir = key
+    if p_inst and p_dir:
+        return f"{p_type}_{p_value}_{p_inst}_{p_dir}"
+    if p_inst:
+        return f"{p_type}_{p_value}_{p_inst}"
+    return f"{p_type}_{p_value}"
+
+
+class PatternStatsIndex:
+    """
+    In-memory mirror of pattern_stats plus recent P/L per instrument.
+
+    Loaded once with two queries, then kept current by the writes the
+    engine itself makes through upsert(). Scanner lookups are dict
+    reads. Other processes (dashboard sync, CLI bootstrap) write to the
+    same tables, so the index reloads itself after REFRESH_SECONDS.
+    """
+
+    REFRESH_SECONDS = 300
+    RECENT_TRADES = 10
+
+    def __init__(self, database):
+        self.db = database
+        self._lock = threading.RLock()
+        self._rows: Dict[PatternKey, dict] = {}
+        self._recent: Dict[str, deque] = {}  # instrument -> deque[(trade_id, pnl_pips)], newest first
+        self._relevant_cache: Dict[str, Dict[str, PatternStats]] = {}
+        self._loaded_at: Optional[float] = None
+
+    # =========================================================================
+    # Loading
+    # =========================================================================
+
+    def invalidate(self):
+        """Force a reload on next access."""
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.REFRESH_SECONDS:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.REFRESH_SECONDS:
+                return
+            self._load()
+
+    def _load(self):
+        rows: Dict[PatternKey, dict] = {}
+        recent: Dict[str, deque] = {}
+
+        with self.db._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, pattern_type, pattern_value, instrument, direction,
+                       total_trades, winning_trades, losing_trades,
+                       total_pnl_pips, total_pnl_amount, avg_mfe_pips, avg_mae_pips
+                FROM pattern_stats
+            """)
+            for r in cursor.fetchall():
+                key = (r[1], r[2], r[3], r[4])
+                rec = {
+                    "id": r[0],
+                    "total": r[5] or 0,
+                    "wins": r[6] or 0,
+                    "losses": r[7] or 0,
+                    "pnl_pips": r[8] or 0.0,
+                    "pnl_amount": r[9] or 0.0,
+                    "avg_mfe": r[10] or 0.0,
+                    "avg_mae": r[11] or 0.0,
+                }
+                if key in rows:
+                    # NULLs are distinct in UNIQUE, so legacy duplicates can exist
+                    self._merge_into(rows[key], rec)
+                else:
+                    rows[key] = rec
+
+            cursor.execute("""
+                SELECT instrument, trade_id, pnl_pips FROM (
+                    SELECT instrument, trade_id, pnl_pips,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY instrument ORDER BY created_at DESC, id DESC
+                           ) AS rn
+                    FROM trade_analyses
+                )
+                WHERE rn <= ?
+                ORDER BY instrument, rn
+            """, (self.RECENT_TRADES,))
+            for inst, trade_id, pnl in cursor.fetchall():
+                recent.setdefault(inst, deque(maxlen=self.RECENT_TRADES)).append((trade_id, pnl or 0.0))
+
+        self._rows = rows
+        self._recent = recent
+        self._relevant_cache = {}
+        self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _merge_into(rec: dict, other: dict):
+        total = rec["total"] + other["total"]
+        if total:
+            rec["avg_mfe"] = (rec["avg_mfe"] * rec["total"] + other["avg_mfe"] * other["total"]) / total
+            rec["avg_mae"] = (rec["avg_mae"] * rec["total"] + other["avg_mae"] * other["total"]) / total
+        rec["total"] = total
+        for k in ("wins", "losses", "pnl_pips", "pnl_amount"):
+            rec[k] += other[k]
+
+    # =========================================================================
+    # Writes
+    # =========================================================================
+
+    def upsert(
+        self,
+        deltas: Dict[PatternKey, PatternDelta],
+        recent: List[Tuple[str, str, float]] = (),
+        extra_writes: Optional[Callable] = None,
+    ) -> int:
+        """
+        Write deltas in one transaction, then mirror them in memory.
+
+        Updates are relative (total = total + n) so concurrent writers in
+        other processes never lose increments. The lock is held across
+        commit + apply so a reload can't double-count the new rows.
+
+        Args:
+            deltas: {key: PatternDelta}
+            recent: (instrument, trade_id, pnl_pips) per saved analysis, oldest first
+            extra_writes: Optional callable(conn) run first in the same transaction
+
+        Returns:
+            Number of pattern rows written
+        """
+        with self._lock:
+            self._ensure_loaded()
+            with self.db._connection() as conn:
+                if extra_writes:
+                    extra_writes(conn)
+                ids = self._write(conn, deltas)
+            self._apply(deltas, ids, recent)
+        return len(deltas)
+
+    def _write(self, conn, deltas: Dict[PatternKey, PatternDelta]) -> Dict[PatternKey, int]:
+        """Upsert deltas on conn; returns {key: row id}."""
+        now = datetime.now(timezone.utc).isoformat()
+        cursor = conn.cursor()
+        ids: Dict[PatternKey, int] = {}
+
+        for key, d in deltas.items():
+            values = (
+                d.trades, d.wins, d.losses, d.pnl_pips, d.pnl_amount,
+                d.mfe_sum, d.trades, d.mae_sum, d.trades, now,
+            )
+            set_clause = """
+                total_trades = total_trades + ?,
+                winning_trades = winning_trades + ?,
+                losing_trades = losing_trades + ?,
+                total_pnl_pips = total_pnl_pips + ?,
+                total_pnl_amount = total_pnl_amount + ?,
+                avg_mfe_pips = (avg_mfe_pips * total_trades + ?) / (total_trades + ?),
+                avg_mae_pips = (avg_mae_pips * total_trades + ?) / (total_trades + ?),
+                last_updated = ?
+            """
+            known = self._rows.get(key)
+            if known is not None:
+                cursor.execute(f"UPDATE pattern_stats SET {set_clause} WHERE id = ?", values + (known["id"],))
+                if cursor.rowcount:
+                    ids[key] = known["id"]
+                    continue
+
+            # Not in the index (or deleted elsewhere) - another process may have inserted it
+            cursor.execute("""
+                SELECT id FROM pattern_stats
+                WHERE pattern_type = ? AND pattern_value = ? AND instrument IS ? AND direction IS ?
+            """, key)
+            row = cursor.fetchone()
+            if row:
+                cursor.execute(f"UPDATE pattern_stats SET {set_clause} WHERE id = ?", values + (row[0],))
+                ids[key] = row[0]
+                continue
+
+            cursor.execute("""
+                INSERT INTO pattern_stats (
+                    pattern_type, pattern_value, instrument, direction,
+                    total_trades, winning_trades, losing_trades,
+                    total_pnl_pips, total_pnl_amount, avg_mfe_pips, avg_mae_pips,
+                    last_updated
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, key + (
+                d.trades, d.wins, d.losses, d.pnl_pips, d.pnl_amount,
+                d.mfe_sum / d.trades, d.mae_sum / d.trades, now,
+            ))
+            ids[key] = cursor.lastrowid
+
+        return ids
+
+    def _apply(self, deltas: Dict[PatternKey, PatternDelta], ids: Dict[PatternKey, int],
+               recent: List[Tuple[str, str, float]] = ()):
+        """Mirror committed writes in memory."""
+        with self._lock:
+            for key, d in deltas.items():
+                rec = self._rows.get(key)
+                if rec is None:
+                    rec = self._rows[key] = {
+                        "id": ids.get(key), "total": 0, "wins": 0, "losses": 0,
+                        "pnl_pips": 0.0, "pnl_amount": 0.0, "avg_mfe": 0.0, "avg_mae": 0.0,
+                    }
+                self._merge_into(rec, {
+                    "total": d.trades, "wins": d.wins, "losses": d.losses,
+                    "pnl_pips": d.pnl_pips, "pnl_amount": d.pnl_amount,
+                    "avg_mfe": d.mfe_sum / d.trades, "avg_mae": d.mae_sum / d.trades,
+                })
+                rec["id"] = ids.get(key, rec["id"])
+
+            for instrument, trade_id, pnl in recent:
+                dq = self._recent.setdefault(instrument, deque(maxlen=self.RECENT_TRADES))
+                # INSERT OR REPLACE re-dates a re-analyzed trade - move it to the front
+                for item in list(dq):
+                    if item[0] == trade_id:
+                        dq.remove(item)
+                dq.appendleft((trade_id, pnl))
+
+            self._relevant_cache = {}
+
+    # =========================================================================
+    # Lookups
+    # =========================================================================
+
+    def get(self, key: PatternKey) -> Optional[PatternStats]:
+        """O(1) stats for one (pattern_type, value, instrument, direction) key."""
+        self._ensure_loaded()
+        rec = self._rows.get(key)
+        return self._to_stats(key, rec) if rec else None
+
+    def relevant_stats(self, instrument: str) -> Dict[str, PatternStats]:
+        """
+        Global + instrument-specific patterns, keyed by pattern name.
+
+        Built once per instrument and reused until the next write/reload.
+        """
+        self._ensure_loaded()
+        cached = self._relevant_cache.get(instrument)
+        if cached is None:
+            with self._lock:
+                cached = {
+                    _pattern_name(key): self._to_stats(key, rec)
+                    for key, rec in self._rows.items()
+                    if key[2] is None or key[2] == instrument
+                }
+                self._relevant_cache[instrument] = cached
+        return dict(cached)
+
+    def recent_pnl(self, instrument: str) -> List[float]:
+        """Most recent analyzed P/L (pips) for an instrument, newest first."""
+        self._ensure_loaded()
+        return [pnl for _, pnl in self._recent.get(instrument, ())]
+
+    @staticmethod
+    def _to_stats(key: PatternKey, rec: dict) -> PatternStats:
+        total, wins, mfe, mae = rec["total"], rec["wins"], rec["avg_mfe"], rec["avg_mae"]
+        win_rate = wins / total if total > 0 else 0
+        name = _pattern_name(key)
+        return PatternStats(
+            pattern_name=name,
+            total_trades=total,
+            winning_trades=wins,
+            losing_trades=rec["losses"],
+            total_pnl=rec["pnl_pips"],
+            avg_win_pips=mfe,  # Using MFE as proxy for avg win
+            avg_loss_pips=mae,  # Using MAE as proxy for avg loss
+            win_rate=win_rate,
+            expectancy=(win_rate * mfe) - ((1 - win_rate) * mae),
+        )
+
+
 class LearningEngine:
     """
     The Learning Engine - learns from every trade to improve future decisions.
@@ -139,14 +441,21 @@ class LearningEngine:
     GOOD_WIN_RATE = 0.55  # Above this = positive signal
     EXCELLENT_WIN_RATE = 0.65  # Above this = bonus
 
-    def __init__(self):
-        """Initialize the learning engine."""
+    def __init__(self, database=None):
+        """
+        Initialize the learning engine.
+
+        Args:
+            database: Database instance (defaults to the shared db)
+        """
+        self.db = database or db
         self._init_tables()
+        self._index = PatternStatsIndex(self.db)
         logger.info("LearningEngine initialized")
 
     def _init_tables(self):
         """Create learning-specific tables if they don't exist."""
-        with db._connection() as conn:
+        with self.db._connection() as conn:
             cursor = conn.cursor()
 
             # Trade analyses table - stores detailed post-trade analysis
@@ -253,12 +562,9 @@ class LearningEngine:
         }
 
         try:
-            # 1. Save detailed analysis
-            self._save_analysis(analysis)
+            # 1+2. Save detailed analysis and update pattern statistics (one transaction)
+            patterns_updated = self._persist([analysis])
             result["analysis_saved"] = True
-
-            # 2. Update pattern statistics
-            patterns_updated = self._update_pattern_stats(analysis)
             result["patterns_updated"] = patterns_updated
 
             # 3. Check for new insights/warnings
@@ -276,65 +582,105 @@ class LearningEngine:
             logger.error(f"Error learning from trade: {e}")
             return result
 
-    def _save_analysis(self, analysis: 'PostTradeAnalysis'):
-        """Save detailed analysis to database."""
-        with db._connection() as conn:
-            cursor = conn.cursor()
+    def learn_from_trades(self, analyses: List['PostTradeAnalysis']) -> dict:
+        """
+        Learn from many completed trades at once (bootstrap / backfill).
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO trade_analyses (
-                    trade_id, instrument, direction, pnl_pips, pnl_amount, duration_hours,
-                    htf_trend, ltf_trend, trend_aligned, rsi_at_entry, atr_pips,
-                    entry_quality, session, was_killzone, day_of_week, with_trend,
-                    at_fvg, at_order_block, at_support_resistance,
-                    mfe_pips, mae_pips, mfe_r_multiple, mae_r_multiple,
-                    reached_1r, reached_2r, stop_hunt,
-                    exit_type, was_optimal_exit, reversed_after_exit,
-                    outcome, was_good_trade, findings, lessons
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                analysis.trade_id,
-                analysis.instrument,
-                analysis.direction,
-                analysis.pnl_pips,
-                analysis.pnl_amount,
-                analysis.duration_hours,
-                analysis.market_context.htf_trend,
-                analysis.market_context.ltf_trend,
-                1 if analysis.market_context.trend_aligned else 0,
-                analysis.market_context.rsi_at_entry,
-                analysis.market_context.atr_pips,
-                analysis.entry_analysis.quality.value,
-                analysis.entry_analysis.session.value,
-                1 if analysis.entry_analysis.was_killzone else 0,
-                analysis.entry_analysis.day_of_week,
-                1 if analysis.entry_analysis.with_trend else 0,
-                1 if analysis.entry_analysis.at_fvg else 0,
-                1 if analysis.entry_analysis.at_order_block else 0,
-                1 if analysis.entry_analysis.at_support_resistance else 0,
-                analysis.excursion.mfe_pips,
-                analysis.excursion.mae_pips,
-                analysis.excursion.mfe_as_multiple_of_risk,
-                analysis.excursion.mae_as_multiple_of_risk,
-                1 if analysis.excursion.reached_1r_profit else 0,
-                1 if analysis.excursion.reached_2r_profit else 0,
-                1 if analysis.excursion.stop_hunt_detected else 0,
-                analysis.exit_analysis.exit_type,
-                1 if analysis.exit_analysis.was_optimal else 0,
-                1 if analysis.exit_analysis.reversed_after_exit else 0,
-                analysis.outcome.value,
-                1 if analysis.was_good_trade else 0,
-                json.dumps(analysis.findings),
-                json.dumps(analysis.lessons)
-            ))
+        All analyses and the aggregated pattern updates are written in a
+        single transaction; per-trade insight checks are skipped.
 
-    def _update_pattern_stats(self, analysis: 'PostTradeAnalysis') -> int:
-        """Update all relevant pattern statistics."""
-        count = 0
-        won = analysis.pnl_pips > 0
+        Args:
+            analyses: PostTradeAnalysis results, oldest first
+
+        Returns:
+            Dict with analyses_saved and patterns_updated
+        """
+        if not analyses:
+            return {"analyses_saved": 0, "patterns_updated": 0}
+        patterns_updated = self._persist(analyses)
+        logger.info(f"Learned from {len(analyses)} trades: updated {patterns_updated} patterns")
+        return {"analyses_saved": len(analyses), "patterns_updated": patterns_updated}
+
+    def _persist(self, analyses: List['PostTradeAnalysis']) -> int:
+        """Save analyses and their pattern deltas in one transaction."""
+        deltas: Dict[PatternKey, PatternDelta] = {}
+        for analysis in analyses:
+            won = analysis.pnl_pips > 0
+            for key in self._pattern_keys(analysis):
+                deltas.setdefault(key, PatternDelta()).add(
+                    won=won,
+                    pnl_pips=analysis.pnl_pips,
+                    pnl_amount=analysis.pnl_amount,
+                    mfe_pips=analysis.excursion.mfe_pips,
+                    mae_pips=analysis.excursion.mae_pips,
+                )
+
+        def save_analyses(conn):
+            for analysis in analyses:
+                self._save_analysis(analysis, conn)
 
-        # Patterns to track
-        patterns = [
+        self._index.upsert(
+            deltas,
+            recent=[(a.instrument, a.trade_id, a.pnl_pips) for a in analyses],
+            extra_writes=save_analyses,
+        )
+        # Same count the per-row updater reported (patterns touched per trade)
+        return sum(d.trades for d in deltas.values())
+
+    def _save_analysis(self, analysis: 'PostTradeAnalysis', conn):
+        """Save detailed analysis on an open connection."""
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO trade_analyses (
+                trade_id, instrument, direction, pnl_pips, pnl_amount, duration_hours,
+                htf_trend, ltf_trend, trend_aligned, rsi_at_entry, atr_pips,
+                entry_quality, session, was_killzone, day_of_week, with_trend,
+                at_fvg, at_order_block, at_support_resistance,
+                mfe_pips, mae_pips, mfe_r_multiple, mae_r_multiple,
+                reached_1r, reached_2r, stop_hunt,
+                exit_type, was_optimal_exit, reversed_after_exit,
+                outcome, was_good_trade, findings, lessons
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            analysis.trade_id,
+            analysis.instrument,
+            analysis.direction,
+            analysis.pnl_pips,
+            analysis.pnl_amount,
+            analysis.duration_hours,
+            analysis.market_context.htf_trend,
+            analysis.market_context.ltf_trend,
+            1 if analysis.market_context.trend_aligned else 0,
+            analysis.market_context.rsi_at_entry,
+            analysis.market_context.atr_pips,
+            analysis.entry_analysis.quality.value,
+            analysis.entry_analysis.session.value,
+            1 if analysis.entry_analysis.was_killzone else 0,
+            analysis.entry_analysis.day_of_week,
+            1 if analysis.entry_analysis.with_trend else 0,
+            1 if analysis.entry_analysis.at_fvg else 0,
+            1 if analysis.entry_analysis.at_order_block else 0,
+            1 if analysis.entry_analysis.at_support_resistance else 0,
+            analysis.excursion.mfe_pips,
+            analysis.excursion.mae_pips,
+            analysis.excursion.mfe_as_multiple_of_risk,
+            analysis.excursion.mae_as_multiple_of_risk,
+            1 if analysis.excursion.reached_1r_profit else 0,
+            1 if analysis.excursion.reached_2r_profit else 0,
+            1 if analysis.excursion.stop_hunt_detected else 0,
+            analysis.exit_analysis.exit_type,
+            1 if analysis.exit_analysis.was_optimal else 0,
+            1 if analysis.exit_analysis.reversed_after_exit else 0,
+            analysis.outcome.value,
+            1 if analysis.was_good_trade else 0,
+            json.dumps(analysis.findings),
+            json.dumps(analysis.lessons)
+        ))
+
+    def _pattern_keys(self, analysis: 'PostTradeAnalysis') -> List[PatternKey]:
+        """All pattern_stats keys a trade contributes to."""
+        return [
             # Global patterns
             ("instrument", analysis.instrument, None, None),
             ("instrument_direction", f"{analysis.instrument}_{analysis.direction}", None, None),
@@ -356,95 +702,6 @@ class LearningEngine:
             ("regime_direction", f"{getattr(analysis, 'market_regime', 'UNKNOWN')}_{analysis.direction}", analysis.instrument, None),
         ]
 
-        for pattern_type, pattern_value, instrument, direction in patterns:
-            self._update_single_pattern(
-                pattern_type=pattern_type,
-                pattern_value=pattern_value,
-                instrument=instrument,
-                direction=direction,
-                won=won,
-                pnl_pips=analysis.pnl_pips,
-                pnl_amount=analysis.pnl_amount,
-                mfe_pips=analysis.excursion.mfe_pips,
-                mae_pips=analysis.excursion.mae_pips
-            )
-            count += 1
-
-        return count
-
-    def _update_single_pattern(
-        self,
-        pattern_type: str,
-        pattern_value: str,
-        instrument: Optional[str],
-        direction: Optional[str],
-        won: bool,
-        pnl_pips: float,
-        pnl_amount: float,
-        mfe_pips: float,
-        mae_pips: float
-    ):
-        """Update a single pattern's statistics."""
-        with db._connection() as conn:
-            cursor = conn.cursor()
-
-            # Get existing stats
-            cursor.execute("""
-                SELECT total_trades, winning_trades, losing_trades,
-                       total_pnl_pips, total_pnl_amount, avg_mfe_pips, avg_mae_pips
-                FROM pattern_stats
-                WHERE pattern_type = ? AND pattern_value = ?
-                      AND (instrument = ? OR (instrument IS NULL AND ? IS NULL))
-                      AND (direction = ? OR (direction IS NULL AND ? IS NULL))
-            """, (pattern_type, pattern_value, instrument, instrument, direction, direction))
-
-            row = cursor.fetchone()
-
-            if row:
-                # Update existing
-                total = row[0] + 1
-                wins = row[1] + (1 if won else 0)
-                losses = row[2] + (0 if won else 1)
-                total_pnl = row[3] + pnl_pips
-                total_amount = row[4] + pnl_amount
-                # Running average for MFE/MAE
-                avg_mfe = (row[5] * row[0] + mfe_pips) / total
-                avg_mae = (row[6] * row[0] + mae_pips) / total
-
-                cursor.execute("""
-                    UPDATE pattern_stats SET
-                        total_trades = ?,
-                        winning_trades = ?,
-                        losing_trades = ?,
-                        total_pnl_pips = ?,
-                        total_pnl_amount = ?,
-                        avg_mfe_pips = ?,
-                        avg_mae_pips = ?,
-                        last_updated = ?
-                    WHERE pattern_type = ? AND pattern_value = ?
-                          AND (instrument = ? OR (instrument IS NULL AND ? IS NULL))
-                          AND (direction = ? OR (direction IS NULL AND ? IS NULL))
-                """, (
-                    total, wins, losses, total_pnl, total_amount, avg_mfe, avg_mae,
-                    datetime.now(timezone.utc).isoformat(),
-                    pattern_type, pattern_value, instrument, instrument, direction, direction
-                ))
-            else:
-                # Insert new
-                cursor.execute("""
-                    INSERT INTO pattern_stats (
-                        pattern_type, pattern_value, instrument, direction,
-                        total_trades, winning_trades, losing_trades,
-                        total_pnl_pips, total_pnl_amount, avg_mfe_pips, avg_mae_pips,
-                        last_updated
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    pattern_type, pattern_value, instrument, direction,
-                    1, 1 if won else 0, 0 if won else 1,
-                    pnl_pips, pnl_amount, mfe_pips, mae_pips,
-                    datetime.now(timezone.utc).isoformat()
-                ))
-
     def _check_for_new_insights(self, analysis: 'PostTradeAnalysis') -> List[str]:
         """Check if this trade reveals any new important insights."""
         insights = []
@@ -453,7 +710,7 @@ class LearningEngine:
         instrument = analysis.instrument
 
         # Get recent analyses for this instrument
-        with db._connection() as conn:
+        with self.db._connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT outcome, entry_quality, with_trend, was_killzone
@@ -699,70 +956,18 @@ class LearningEngine:
         direction: str,
         context: dict
     ) -> Dict[str, PatternStats]:
-        """Get all relevant pattern statistics."""
-        stats = {}
-
-        with db._connection() as conn:
-            cursor = conn.cursor()
-
-            # Get all patterns for this instrument
-            cursor.execute("""
-                SELECT pattern_type, pattern_value, instrument, direction,
-                       total_trades, winning_trades, losing_trades,
-                       total_pnl_pips, avg_mfe_pips, avg_mae_pips
-                FROM pattern_stats
-                WHERE instrument IS NULL OR instrument = ?
-            """, (instrument,))
-
-            for row in cursor.fetchall():
-                p_type, p_value, p_inst, p_dir, total, wins, losses, pnl, mfe, mae = row
-
-                # Create key based on specificity
-                if p_inst and p_dir:
-                    key = f"{p_type}_{p_value}_{p_inst}_{p_dir}"
-                elif p_inst:
-                    key = f"{p_type}_{p_value}_{p_inst}"
-                else:
-                    key = f"{p_type}_{p_value}"
-
-                win_rate = wins / total if total > 0 else 0
-                avg_win = pnl / wins if wins > 0 else 0
-                avg_loss = pnl / losses if losses > 0 else 0  # Will be negative
-                expectancy = (win_rate * mfe) - ((1 - win_rate) * mae)
-
-                stats[key] = PatternStats(
-                    pattern_name=key,
-                    total_trades=total,
-                    winning_trades=wins,
-                    losing_trades=losses,
-                    total_pnl=pnl,
-                    avg_win_pips=mfe,  # Using MFE as proxy for avg win
-                    avg_loss_pips=mae,  # Using MAE as proxy for avg loss
-                    win_rate=win_rate,
-                    expectancy=expectancy
-                )
-
-        return stats
+        """Get all relevant pattern statistics (served from the in-memory index)."""
+        return self._index.relevant_stats(instrument)
 
     def _get_recent_consecutive_losses(self, instrument: str) -> int:
         """Get number of recent consecutive losses for an instrument."""
-        with db._connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT pnl_pips FROM trade_analyses
-                WHERE instrument = ?
-                ORDER BY created_at DESC
-                LIMIT 10
-            """, (instrument,))
-
-            consecutive = 0
-            for (pnl,) in cursor.fetchall():
-                if pnl < 0:
-                    consecutive += 1
-                else:
-                    break
-
-            return consecutive
+        consecutive = 0
+        for pnl in self._index.recent_pnl(instrument):
+            if pnl < 0:
+                consecutive += 1
+            else:
+                break
+        return consecutive
 
     def _calculate_trade_quality(self, insight: TradeInsight, context: dict) -> int:
         """Calculate overall trade quality score (0-100)."""
@@ -820,7 +1025,7 @@ class LearningEngine:
             "key_insights": []
         }
 
-        with db._connection() as conn:
+        with self.db._connection() as conn:
             cursor = conn.cursor()
 
             # Total trades
@@ -930,7 +1135,7 @@ class LearningEngine:
             "recommendations": []
         }
 
-        with db._connection() as conn:
+        with self.db._connection() as conn:
             cursor = conn.cursor()
 
             if instrument:
@@ -1004,37 +1209,25 @@ class LearningEngine:
         Returns:
             Confidence adjustment (-25 to +15)
         """
-        with db._connection() as conn:
-            cursor = conn.cursor()
+        # Check regime + direction + instrument combo
+        s = self._index.get(("regime_direction", f"{regime}_{direction}", instrument, None))
+        if not s or s.total_trades < self.MIN_TRADES_FOR_PATTERN:
+            return 0
 
-            # Check regime + direction + instrument combo
-            cursor.execute("""
-                SELECT total_trades, winning_trades
-                FROM pattern_stats
-                WHERE pattern_type = 'regime_direction'
-                AND pattern_value = ?
-                AND instrument = ?
-            """, (f"{regime}_{direction}", instrument))
+        win_rate = s.win_rate
 
-            row = cursor.fetchone()
-            if not row or row[0] < self.MIN_TRADES_FOR_PATTERN:
-                return 0
-
-            total, wins = row
-            win_rate = wins / total
-
-            if win_rate == 0:
-                return -20
-            elif win_rate < self.POOR_WIN_RATE:
-                return -15
-            elif win_rate < self.LOW_WIN_RATE:
-                return -8
-            elif win_rate >= self.EXCELLENT_WIN_RATE:
-                return +10
-            elif win_rate >= self.GOOD_WIN_RATE:
-                return +5
+        if win_rate == 0:
+            return -20
+        elif win_rate < self.POOR_WIN_RATE:
+            return -15
+        elif win_rate < self.LOW_WIN_RATE:
+            return -8
+        elif win_rate >= self.EXCELLENT_WIN_RATE:
+            return +10
+        elif win_rate >= self.GOOD_WIN_RATE:
+            return +5
 
-            return 0
+        return 0
 
 
 # Singleton instance
@@ -292,6 +292,25 @@ Context (JSON):
 {json.dumps(context, ensure_ascii=True, indent=2)}
 """.strip()
 
+    @staticmethod
+    def _knowledge_query(
+        instrument: str,
+        technical: object,
+        skill_name: Optional[str],
+        trade_context: Optional[dict]
+    ) -> str:
+        """Retrieval query describing the setup (instrument, trend, regime, context)."""
+        terms = [instrument, skill_name or ""]
+        for attr in ("trend", "market_regime", "macd_trend"):
+            terms.append(str(getattr(technical, attr, "") or ""))
+        for key, value in (trade_context or {}).items():
+            if isinstance(value, bool):
+                if value:
+                    terms.append(key)
+            elif isinstance(value, str):
+                terms.append(value)
+        return " ".join(t for t in terms if t)
+
     def analyze(
         self,
         instrument: str,
@@ -308,7 +327,9 @@ Context (JSON):
         if not self.is_available():
             return None
 
-        system_prompt = settings_manager.get_full_system_prompt()
+        system_prompt = settings_manager.get_relevant_system_prompt(
+            self._knowledge_query(instrument, technical, skill_name, trade_context)
+        )
         recent_lessons = settings_manager.get_knowledge("lessons")
         if recent_lessons and len(recent_lessons) > 2000:
             recent_lessons = recent_lessons[:2000] + "\n... (truncated)"
@@ -20,6 +20,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional, List, Dict, Any
 
 from src.utils.logger import logger
+from src.utils import clock
 
 
 _dev_dir = Path(__file__).parent.parent.parent
@@ -127,7 +128,7 @@ class NewsFilter:
             return False, ""
 
         if now is None:
-            now = datetime.now(timezone.utc)
+            now = clock.now(timezone.utc)
 
         # Get affected currencies
         affected = self._get_affected_currencies(instrument)
@@ -190,7 +191,7 @@ class NewsFilter:
         if not self._events:
             return []
 
-        now = datetime.now(timezone.utc)
+        now = clock.now(timezone.utc)
         cutoff = now + timedelta(hours=hours_ahead)
         affected = self._get_affected_currencies(instrument)
 
@@ -17,11 +17,18 @@ Usage:
         "closed_at": "2026-02-02T15:30:47+00:00"
     })
     print(result.summary)
+
+    # Many trades: one candle fetch per instrument/timeframe, analysis in a process pool
+    results = analyzer.analyze_trades(trades)
 """
 
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from enum import Enum
 import pandas as pd
 import numpy as np
@@ -29,6 +36,15 @@ import numpy as np
 from src.utils.logger import logger
 
 
+# Candle windows fetched around each trade
+HTF_LOOKBACK = timedelta(hours=48)
+HTF_LOOKAHEAD = timedelta(hours=24)
+M15_PADDING = timedelta(hours=6)
+
+# Below this many trades, batch analysis runs inline (pool startup costs more)
+MIN_TRADES_FOR_POOL = 8
+
+
 class TradingSession(Enum):
     """Trading sessions."""
     ASIAN = "ASIAN"
@@ -312,7 +328,7 @@ class PostTradeAnalyzer:
         except:
             return datetime.now(timezone.utc)
 
-    def analyze_trade(self, trade_data: dict) -> PostTradeAnalysis:
+    def analyze_trade(self, trade_data: dict, candles: Optional[tuple] = None) -> PostTradeAnalysis:
         """
         Perform comprehensive post-trade analysis.
 
@@ -328,6 +344,7 @@ class PostTradeAnalyzer:
                 - stop_loss: SL price (optional)
                 - take_profit: TP price (optional)
                 - pnl: P/L amount (optional)
+            candles: Pre-fetched (h1, h4, m15) candles (see fetch_market_data_batch)
 
         Returns:
             PostTradeAnalysis with all findings
@@ -364,13 +381,16 @@ class PostTradeAnalyzer:
         logger.info(f"Analyzing trade {trade_id}: {instrument} {direction} {pnl_pips:.1f} pips")
 
         # Fetch market data
-        try:
-            candles_h1, candles_h4, candles_m15 = self._fetch_market_data(
-                instrument, opened_at, closed_at
-            )
-        except Exception as e:
-            logger.error(f"Failed to fetch market data: {e}")
-            candles_h1, candles_h4, candles_m15 = [], [], []
+        if candles is not None:
+            candles_h1, candles_h4, candles_m15 = candles
+        else:
+            try:
+                candles_h1, candles_h4, candles_m15 = self._fetch_market_data(
+                    instrument, opened_at, closed_at
+                )
+            except Exception as e:
+                logger.error(f"Failed to fetch market data: {e}")
+                candles_h1, candles_h4, candles_m15 = [], [], []
 
         # Perform analyses
         market_context = self._analyze_market_context(
@@ -441,39 +461,138 @@ class PostTradeAnalyzer:
         closed_at: datetime
     ) -> tuple:
         """Fetch candles for multiple timeframes around the trade."""
-        client = self._get_client()
-
-        # Fetch H1 data - 48 hours before to 24 hours after
         # We need historical data at the time of trade, so we use copy_rates_range
+        symbol = self._select_symbol(instrument)
+
+        # H1/H4 - 48 hours before to 24 hours after
+        start_time = opened_at - HTF_LOOKBACK
+        end_time = closed_at + HTF_LOOKAHEAD
+        candles_h1 = self._copy_rates(symbol, "H1", start_time, end_time)
+        candles_h4 = self._copy_rates(symbol, "H4", start_time, end_time)
+
+        # M15 candles for precise entry/exit analysis
+        candles_m15 = self._copy_rates(symbol, "M15", opened_at - M15_PADDING, closed_at + M15_PADDING)
+
+        logger.info(f"Fetched candles: H1={len(candles_h1)}, H4={len(candles_h4)}, M15={len(candles_m15)}")
+
+        return candles_h1, candles_h4, candles_m15
+
+    def _select_symbol(self, instrument: str) -> str:
+        """Broker symbol for an instrument (selected in Market Watch)."""
         import MetaTrader5 as mt5
 
-        symbol = client._convert_symbol(instrument)
+        symbol = self._get_client()._convert_symbol(instrument)
 
         # Ensure symbol is selected
         if not mt5.symbol_select(symbol, True):
             logger.warning(f"Could not select symbol {symbol}")
+        return symbol
 
-        # Calculate time ranges
-        start_time = opened_at - timedelta(hours=48)
-        end_time = closed_at + timedelta(hours=24)
+    def _copy_rates(self, symbol: str, timeframe: str, start: datetime, end: datetime) -> list:
+        """Candles of one timeframe ('H1', 'H4', 'M15') between two times."""
+        import MetaTrader5 as mt5
 
-        # Fetch H1 candles
-        rates_h1 = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_H1, start_time, end_time)
-        candles_h1 = self._rates_to_candles(rates_h1) if rates_h1 is not None else []
+        rates = mt5.copy_rates_range(symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), start, end)
+        return self._rates_to_candles(rates) if rates is not None else []
 
-        # Fetch H4 candles
-        rates_h4 = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_H4, start_time, end_time)
-        candles_h4 = self._rates_to_candles(rates_h4) if rates_h4 is not None else []
+    def fetch_market_data_batch(self, trades: List[dict]) -> Dict[str, tuple]:
+        """
+        Candles for many trades with one fetch per instrument and timeframe.
 
-        # Fetch M15 candles for precise entry/exit analysis
-        rates_m15 = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_M15,
-                                          opened_at - timedelta(hours=6),
-                                          closed_at + timedelta(hours=6))
-        candles_m15 = self._rates_to_candles(rates_m15) if rates_m15 is not None else []
+        Each instrument's H1/H4/M15 range covers all its trades; every trade
+        then gets the same windows _fetch_market_data would have fetched,
+        sliced from memory.
 
-        logger.info(f"Fetched candles: H1={len(candles_h1)}, H4={len(candles_h4)}, M15={len(candles_m15)}")
+        Args:
+            trades: Trade dicts (trade_id, instrument, opened_at, closed_at)
 
-        return candles_h1, candles_h4, candles_m15
+        Returns:
+            {trade_id: (h1, h4, m15)}; trades whose fetch failed get empty lists
+        """
+        by_instrument: Dict[str, List[tuple]] = defaultdict(list)
+        for trade in trades:
+            opened_at = self._parse_datetime(trade.get("opened_at", ""))
+            closed_at = self._parse_datetime(trade.get("closed_at", ""))
+            by_instrument[trade.get("instrument", "EUR_USD")].append((trade.get("trade_id", "UNKNOWN"), opened_at, closed_at))
+
+        market_data: Dict[str, tuple] = {}
+        for instrument, spans in by_instrument.items():
+            first_open = min(opened for _, opened, _ in spans)
+            last_close = max(closed for _, _, closed in spans)
+            try:
+                symbol = self._select_symbol(instrument)
+                series = {
+                    "H1": self._copy_rates(symbol, "H1", first_open - HTF_LOOKBACK, last_close + HTF_LOOKAHEAD),
+                    "H4": self._copy_rates(symbol, "H4", first_open - HTF_LOOKBACK, last_close + HTF_LOOKAHEAD),
+                    "M15": self._copy_rates(symbol, "M15", first_open - M15_PADDING, last_close + M15_PADDING),
+                }
+            except Exception as e:
+                logger.error(f"Failed to fetch market data for {instrument}: {e}")
+                series = {"H1": [], "H4": [], "M15": []}
+
+            times = {
+                tf: [datetime.fromisoformat(c["time"]).timestamp() for c in candles]
+                for tf, candles in series.items()
+            }
+            logger.info(
+                f"Fetched {instrument} for {len(spans)} trades: "
+                f"H1={len(series['H1'])}, H4={len(series['H4'])}, M15={len(series['M15'])}"
+            )
+
+            def window(tf: str, start: datetime, end: datetime) -> list:
+                lo = bisect_left(times[tf], start.timestamp())
+                hi = bisect_right(times[tf], end.timestamp())
+                return series[tf][lo:hi]
+
+            for trade_id, opened_at, closed_at in spans:
+                market_data[trade_id] = (
+                    window("H1", opened_at - HTF_LOOKBACK, closed_at + HTF_LOOKAHEAD),
+                    window("H4", opened_at - HTF_LOOKBACK, closed_at + HTF_LOOKAHEAD),
+                    window("M15", opened_at - M15_PADDING, closed_at + M15_PADDING),
+                )
+        return market_data
+
+    def analyze_trades(
+        self,
+        trades: List[dict],
+        workers: Optional[int] = None
+    ) -> List[Tuple[dict, Optional[PostTradeAnalysis]]]:
+        """
+        Analyze many closed trades with shared candle fetches.
+
+        Candles are fetched here (the MT5 terminal connection stays in this
+        process); the analysis itself runs in a process pool.
+
+        Args:
+            trades: Trade dicts as for analyze_trade
+            workers: Pool size (default: CPU count, max 4; 1 = inline)
+
+        Returns:
+            (trade, analysis) pairs in input order; analysis is None on failure
+        """
+        market_data = self.fetch_market_data_batch(trades)
+        jobs = [
+            (trade, market_data.get(trade.get("trade_id", "UNKNOWN"), ([], [], [])))
+            for trade in trades
+        ]
+
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        if workers <= 1 or len(jobs) < MIN_TRADES_FOR_POOL:
+            return [(trade, _analyze_with_candles(trade, candles)) for trade, candles in jobs]
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                analyses = list(pool.map(
+                    _analyze_with_candles,
+                    [trade for trade, _ in jobs],
+                    [candles for _, candles in jobs],
+                    chunksize=max(1, len(jobs) // (workers * 4)),
+                ))
+        except Exception as e:
+            logger.warning(f"Process pool analysis failed ({e}), analyzing inline")
+            analyses = [_analyze_with_candles(trade, candles) for trade, candles in jobs]
+        return list(zip([trade for trade, _ in jobs], analyses))
 
     def _rates_to_candles(self, rates) -> list:
         """Convert MT5 rates to candle list."""
@@ -1263,6 +1382,15 @@ class PostTradeAnalyzer:
         return summary
 
 
+def _analyze_with_candles(trade_data: dict, candles: tuple) -> Optional[PostTradeAnalysis]:
+    """Process-pool worker: analyze one trade on pre-fetched candles."""
+    try:
+        return PostTradeAnalyzer().analyze_trade(trade_data, candles=candles)
+    except Exception as e:
+        logger.warning(f"Failed to analyze {trade_data.get('trade_id')}: {e}")
+        return None
+
+
 # Convenience function
 def analyze_closed_trade(trade_data: dict) -> PostTradeAnalysis:
     """
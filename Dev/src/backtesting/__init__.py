@@ -7,8 +7,10 @@ Phase 3 Enhancement: Walk-Forward Validation and Monte Carlo.
 
 from .data_loader import DataLoader, HistoricalData, HistoricalDataRequest
 from .engine import BacktestEngine, BacktestConfig, BacktestResult, SimulatedTrade
+from .portfolio import PortfolioBacktester, PortfolioBacktestConfig, PortfolioBacktestResult
 from .metrics import MetricsCalculator, BacktestMetrics
 from .report import ReportGenerator, BacktestReport
+from .catalog import ResultCatalog
 from .walk_forward import (
     WalkForwardValidator,
     WalkForwardResult,
@@ -17,6 +19,8 @@ from .walk_forward import (
     MonteCarloResult,
     validate_strategy,
 )
+from .optimizer import ParameterOptimizer, OptimizationResult, SEARCH_SPACE
+from .jobs import BacktestJob, BacktestJobQueue, BacktestJobRunner, JobCancelled
 
 __all__ = [
     # Data Loading
@@ -28,12 +32,17 @@ __all__ = [
     "BacktestConfig",
     "BacktestResult",
     "SimulatedTrade",
+    # Portfolio
+    "PortfolioBacktester",
+    "PortfolioBacktestConfig",
+    "PortfolioBacktestResult",
     # Metrics
     "MetricsCalculator",
     "BacktestMetrics",
     # Reporting
     "ReportGenerator",
     "BacktestReport",
+    "ResultCatalog",
     # Walk-Forward (Phase 3)
     "WalkForwardValidator",
     "WalkForwardResult",
@@ -41,4 +50,13 @@ __all__ = [
     "MonteCarloSimulator",
     "MonteCarloResult",
     "validate_strategy",
+    # Parameter optimization
+    "ParameterOptimizer",
+    "OptimizationResult",
+    "SEARCH_SPACE",
+    # Background jobs
+    "BacktestJob",
+    "BacktestJobQueue",
+    "BacktestJobRunner",
+    "JobCancelled",
 ]
@@ -0,0 +1,363 @@
+"""
+Backtest Result Catalog
+
+Indexed store for backtest runs from the dashboard, job queue and suite:
+- One backtest_runs row per run (instrument, dates, config hash, headline
+  metrics) so listing/filtering/sorting thousands of runs is a single
+  indexed query that never touches trade data
+- Trades and the equity curve go to a gzip-compressed columnar sidecar
+  (one file per run) that is only read when a run is opened or compared;
+  chart series are derived from it on load instead of being stored
+- Legacy report JSON files are imported once and re-imported only when
+  their mtime changes
+
+Usage:
+    from src.backtesting.catalog import ResultCatalog
+
+    catalog = ResultCatalog()
+    run_id = catalog.add_report(report, source="dashboard")
+    runs = catalog.list_runs(instrument="EUR_USD", order_by="sharpe_ratio")
+    report = catalog.load_report(run_id)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.utils.database import Database, db
+from src.utils.logger import logger
+
+
+DEFAULT_CATALOG_DIR = Path(__file__).parent.parent.parent / "backtest_results" / "catalog"
+SIDECAR_SUFFIX = ".cols.json.gz"
+SIDECAR_VERSION = 1
+SIDECAR_CACHE_SIZE = 8  # Decoded sidecars kept in memory (compare views reopen the same runs)
+
+
+# ===================
+# Columnar encoding
+# ===================
+
+def to_columns(rows: list[dict]) -> dict:
+    """Row dicts -> {"n": len, "columns": {name: [values]}} (union of keys)."""
+    names: dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            names.setdefault(key, None)
+    return {
+        "n": len(rows),
+        "columns": {name: [row.get(name) for row in rows] for name in names},
+    }
+
+
+def from_columns(block: Optional[dict]) -> list[dict]:
+    """Inverse of to_columns()."""
+    if not block or not block.get("n"):
+        return []
+    columns = block["columns"]
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*(columns[n] for n in names))]
+
+
+def config_hash(config: dict) -> str:
+    """Stable hash of a run's config (dates/floats as serialized)."""
+    encoded = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def _as_dict(value) -> dict:
+    if value is None:
+        return {}
+    return value.to_dict() if hasattr(value, "to_dict") else dict(value)
+
+
+def _finite(value) -> Optional[float]:
+    """Metric value for an indexed REAL column (NaN/inf -> NULL)."""
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value == value and abs(value) != float("inf") else None
+
+
+# ===================
+# Catalog
+# ===================
+
+class ResultCatalog:
+    """Metadata index (SQLite) + compressed columnar sidecars for backtest runs."""
+
+    def __init__(self, database: Optional[Database] = None, directory: Optional[Path] = None):
+        self.db = database or db
+        self.directory = Path(directory or DEFAULT_CATALOG_DIR)
+        self._cache: OrderedDict = OrderedDict()
+
+    # ---------- Writing ----------
+
+    def add_report(
+        self,
+        report,
+        source: str = "report",
+        label: Optional[str] = None,
+        summary: Optional[dict] = None,
+        run_id: Optional[str] = None,
+        source_path: Optional[str] = None,
+        source_mtime: Optional[float] = None,
+    ) -> str:
+        """
+        Catalog a BacktestReport (live or loaded from JSON).
+
+        Args:
+            report: BacktestReport
+            source: Origin tag ("dashboard", "job", "suite", "file", ...)
+            label: Display label (defaults to the report id)
+            summary: Extra flat summary stored with the row (e.g. suite stats)
+            run_id: Catalog id (defaults to report.report_id)
+            source_path / source_mtime: Imported file, for re-import detection
+
+        Returns:
+            run_id
+        """
+        return self._add(
+            run_id=run_id or report.report_id,
+            created_at=report.created_at,
+            source=source,
+            label=label or report.report_id,
+            instrument=report.instrument,
+            timeframe=report.timeframe,
+            result=_as_dict(report.result),
+            metrics=_as_dict(report.metrics),
+            summary=summary,
+            source_path=source_path,
+            source_mtime=source_mtime,
+        )
+
+    def add_result(self, result, source: str = "backtest", label: Optional[str] = None,
+                   summary: Optional[dict] = None, metrics=None) -> str:
+        """
+        Catalog a BacktestResult without building a full report.
+
+        Returns:
+            run_id
+        """
+        if metrics is None:
+            from .metrics import MetricsCalculator
+            metrics = MetricsCalculator().calculate(result)
+        config = result.config
+        run_id = f"{config.instrument}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        return self._add(
+            run_id=run_id,
+            created_at=datetime.now().isoformat(),
+            source=source,
+            label=label or run_id,
+            instrument=config.instrument,
+            timeframe=config.timeframe,
+            result=_as_dict(result),
+            metrics=_as_dict(metrics),
+            summary=summary,
+        )
+
+    def _add(self, run_id: str, created_at: str, source: str, label: str, instrument: str,
+             timeframe: str, result: dict, metrics: dict, summary: Optional[dict],
+             source_path: Optional[str] = None, source_mtime: Optional[float] = None) -> str:
+        config = result.get("config") or {}
+        trades = result.get("trades") or []
+        equity_curve = result.get("equity_curve") or []
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sidecar = self.directory / f"{run_id}{SIDECAR_SUFFIX}"
+        payload = {
+            "version": SIDECAR_VERSION,
+            "result": {k: v for k, v in result.items() if k not in ("trades", "equity_curve")},
+            "trades": to_columns(trades),
+            "equity_curve": to_columns(equity_curve),
+        }
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(payload, f, separators=(",", ":"), default=str)
+        tmp.replace(sidecar)
+        self._cache.pop(str(sidecar), None)
+
+        self.db.save_backtest_run({
+            "run_id": run_id,
+            "created_at": created_at,
+            "source": source,
+            "label": label,
+            "instrument": instrument,
+            "timeframe": timeframe,
+            "start_date": config.get("start_date"),
+            "end_date": config.get("end_date"),
+            "config_hash": config_hash(config) if config else None,
+            "config": json.dumps(config, default=str),
+            "total_trades": metrics.get("total_trades", len(trades)),
+            "win_rate": _finite(metrics.get("win_rate")),
+            "total_return_pct": _finite(metrics.get("total_return_pct")),
+            "total_return_abs": _finite(metrics.get("total_return_abs")),
+            "profit_factor": _finite(metrics.get("profit_factor")),
+            "max_drawdown_pct": _finite(metrics.get("max_drawdown_pct")),
+            "sharpe_ratio": _finite(metrics.get("sharpe_ratio")),
+            "final_equity": _finite(result.get("final_equity")),
+            "metrics": json.dumps(metrics, default=str),
+            "summary": json.dumps(summary, default=str) if summary is not None else None,
+            "sidecar_path": str(sidecar),
+            "sidecar_bytes": sidecar.stat().st_size,
+            "source_path": source_path,
+            "source_mtime": source_mtime,
+        })
+        return run_id
+
+    def delete(self, run_id: str) -> bool:
+        """Remove a run and its sidecar."""
+        sidecar = self.db.delete_backtest_run(run_id)
+        if sidecar is None:
+            return False
+        self._cache.pop(sidecar, None)
+        Path(sidecar).unlink(missing_ok=True)
+        return True
+
+    # ---------- Reading ----------
+
+    def list_runs(self, **kwargs) -> list[dict]:
+        """Catalog rows, see Database.list_backtest_runs() for arguments."""
+        return self.db.list_backtest_runs(**kwargs)
+
+    def count_runs(self, **filters) -> int:
+        return self.db.count_backtest_runs(**filters)
+
+    def get_runs(self, run_ids: list[str]) -> dict[str, dict]:
+        """Full rows with config/metrics/summary decoded (no sidecar I/O)."""
+        rows = self.db.get_backtest_runs(run_ids)
+        for row in rows.values():
+            for key in ("config", "metrics", "summary"):
+                row[key] = json.loads(row[key]) if row.get(key) else None
+        return rows
+
+    def get_run(self, run_id: str) -> Optional[dict]:
+        return self.get_runs([run_id]).get(run_id)
+
+    def _sidecar(self, run_id: str) -> dict:
+        row = self.db.get_backtest_runs([run_id]).get(run_id)
+        if row is None:
+            raise KeyError(f"Unknown backtest run: {run_id}")
+        path = row["sidecar_path"]
+        if path in self._cache:
+            self._cache.move_to_end(path)
+            return self._cache[path]
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        self._cache[path] = payload
+        while len(self._cache) > SIDECAR_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return payload
+
+    def load_trades(self, run_id: str) -> list[dict]:
+        """Trades of one run (row dicts, as in BacktestResult.to_dict())."""
+        return from_columns(self._sidecar(run_id)["trades"])
+
+    def load_equity_curve(self, run_id: str) -> list[dict]:
+        return from_columns(self._sidecar(run_id)["equity_curve"])
+
+    def load_result(self, run_id: str) -> dict:
+        """Full result dict, shaped like BacktestResult.to_dict()."""
+        payload = self._sidecar(run_id)
+        return {
+            **payload["result"],
+            "trades": from_columns(payload["trades"]),
+            "equity_curve": from_columns(payload["equity_curve"]),
+        }
+
+    def load_report(self, run_id: str):
+        """Rebuild a BacktestReport (result/metrics as dicts, like BacktestReport.load())."""
+        from .report import BacktestReport, ReportGenerator
+
+        row = self.get_run(run_id)
+        if row is None:
+            raise KeyError(f"Unknown backtest run: {run_id}")
+        result = self.load_result(run_id)
+        charts = ReportGenerator.charts_from_dict(result)
+        return BacktestReport(
+            report_id=run_id,
+            created_at=row["created_at"],
+            instrument=row["instrument"],
+            timeframe=row["timeframe"],
+            date_range=f"{(row['start_date'] or '')[:10]} to {(row['end_date'] or '')[:10]}",
+            result=result,
+            metrics=row["metrics"] or {},
+            equity_chart=charts.get("equity_chart", {}),
+            drawdown_chart=charts.get("drawdown_chart", {}),
+            trade_distribution=charts.get("trade_distribution", {}),
+            monthly_returns=charts.get("monthly_returns", {}),
+        )
+
+    def compare(self, run_ids: list[str], metrics: Optional[list[str]] = None) -> dict:
+        """
+        Side-by-side metrics and equity curves for a few runs.
+
+        Only the requested runs' sidecars are read.
+
+        Returns:
+            {"runs": {run_id: row}, "metrics": {name: {run_id: value}},
+             "equity": {run_id: {"x": [...], "y": [...]}}}
+        """
+        rows = self.get_runs(run_ids)
+        names = metrics or [
+            "total_trades", "win_rate", "total_return_pct", "profit_factor",
+            "max_drawdown_pct", "sharpe_ratio", "expectancy",
+        ]
+        equity = {}
+        for run_id in run_ids:
+            if run_id not in rows:
+                continue
+            columns = self._sidecar(run_id)["equity_curve"].get("columns", {})
+            equity[run_id] = {"x": columns.get("time", []), "y": columns.get("equity", [])}
+        return {
+            "runs": rows,
+            "metrics": {
+                name: {rid: (row["metrics"] or {}).get(name) for rid, row in rows.items()}
+                for name in names
+            },
+            "equity": equity,
+        }
+
+    # ---------- Legacy report files ----------
+
+    def import_directory(self, directory: str = "data/backtests") -> int:
+        """
+        Catalog report JSON files (BacktestReport.save()) that are new or changed.
+
+        Unchanged files are skipped by mtime without being opened.
+
+        Returns:
+            Number of files (re)imported
+        """
+        from .report import BacktestReport
+
+        path = Path(directory).resolve()
+        if not path.exists():
+            return 0
+        known = self.db.get_backtest_run_sources(os.path.join(str(path), ""))
+        imported = 0
+        for filepath in path.glob("*.json"):
+            mtime = filepath.stat().st_mtime
+            if known.get(str(filepath)) == mtime:
+                continue
+            try:
+                report = BacktestReport.load(str(filepath))
+                self.add_report(
+                    report, source="file", run_id=f"file_{report.report_id}",
+                    source_path=str(filepath), source_mtime=mtime,
+                )
+                imported += 1
+            except Exception as e:
+                logger.debug(f"Skipping {filepath.name} for backtest catalog: {e}")
+        if imported:
+            logger.info(f"Backtest catalog imported {imported} report file(s) from {path}")
+        return imported
@@ -8,7 +8,13 @@ DataLoader automatically splits large date ranges into chunks.
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional
-import MetaTrader5 as mt5
+try:
+    import MetaTrader5 as mt5
+    MT5_AVAILABLE = True
+except ImportError:
+    # Windows-only package; offline tools (backtests, benchmarks) still import this module
+    mt5 = None
+    MT5_AVAILABLE = False
 
 
 @dataclass
@@ -80,7 +86,7 @@ class DataLoader:
         "D1": mt5.TIMEFRAME_D1,
         "W": mt5.TIMEFRAME_W1,
         "W1": mt5.TIMEFRAME_W1,
-    }
+    } if MT5_AVAILABLE else {}
 
     # Approximate bars per day for each timeframe
     BARS_PER_DAY = {
@@ -101,6 +107,8 @@ class DataLoader:
 
     def _ensure_mt5_connected(self) -> None:
         """Ensure MT5 is initialized."""
+        if not MT5_AVAILABLE:
+            raise RuntimeError("MetaTrader5 package not installed - cannot load MT5 history")
         if not mt5.initialize():
             raise RuntimeError(f"MT5 initialization failed: {mt5.last_error()}")
 
@@ -25,6 +25,7 @@ Usage:
 """
 
 import time as _time
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Callable, Dict, List
@@ -39,6 +40,14 @@ from src.utils.instrument_profiles import (
     normalize_instrument_symbol,
 )
 from src.utils.logger import logger
+from src.utils import clock
+from src.utils.session_calendar import (
+    SessionCalendar,
+    bar_minutes,
+    killzone_at,
+    minute_of_week_from_iso,
+    parse_windows,
+)
 
 
 class TradeDirection(Enum):
@@ -205,6 +214,38 @@ class BacktestState:
     pending_order: Optional[PendingOrder] = None
     closed_trades: list = field(default_factory=list)
     equity_curve: list = field(default_factory=list)
+    skip_reasons: dict = field(default_factory=dict)
+    signals_generated: int = 0
+    signals_skipped: int = 0
+
+    def count_skip(self, reason: str) -> None:
+        self.skip_reasons[reason] = self.skip_reasons.get(reason, 0) + 1
+
+
+class CandleIndex:
+    """Timestamp index over sorted candles for as-of window lookups."""
+
+    def __init__(self, candles: list):
+        self.candles = candles
+        self.timestamps = [c["timestamp"] for c in candles]
+
+    def window(self, timestamp: int, lookback: int) -> list:
+        """Last `lookback` candles with timestamp <= the given one."""
+        end = bisect_right(self.timestamps, timestamp)
+        return self.candles[max(0, end - lookback):end]
+
+
+@dataclass
+class InstrumentFeed:
+    """One instrument's indexed candles and ISI components for a run."""
+    h4: CandleIndex
+    h1: CandleIndex
+    m5_candles: list
+    trade_time_ok: Optional[list] = None
+    sequence_tracker: Optional[object] = None
+    cross_asset_adapter: Optional["BacktestCrossAssetAdapter"] = None
+    calibrator: Optional[object] = None
+    htf_cache: dict = field(default_factory=dict)  # Last HTF analysis, keyed by its windows
 
 
 @dataclass
@@ -458,33 +499,18 @@ class SMCBacktestEngine:
                 return price - half_spread - slip
             return price + half_spread + slip
 
+    def _session_calendar(self, config: BacktestConfig) -> SessionCalendar:
+        """Entry-session calendar: config.session_hours on weekdays (all hours if unset)."""
+        return SessionCalendar(parse_windows(config.session_hours or []), allow_weekends=False)
+
     def _is_trade_time(self, candle_time: str, config: BacktestConfig) -> bool:
         """Check if candle time is within allowed session."""
         if not config.check_session:
             return True
-
-        try:
-            dt = datetime.fromisoformat(candle_time.replace("Z", "+00:00"))
-        except Exception:
-            return True
-
-        # Skip weekends
-        if dt.weekday() >= 5:
-            return False
-
-        if not config.session_hours:
+        minute = minute_of_week_from_iso(candle_time)
+        if minute is None:
             return True
-
-        hour = dt.hour
-        for start, end in config.session_hours:
-            if start <= end:
-                if start <= hour < end:
-                    return True
-            else:
-                if hour >= start or hour < end:
-                    return True
-
-        return False
+        return self._session_calendar(config).in_session(minute)
 
     def _check_market_regime(self, technical, config: BacktestConfig) -> tuple:
         """Check market regime filter."""
@@ -502,27 +528,11 @@ class SMCBacktestEngine:
 
     def _is_in_killzone(self, candle_time: str) -> tuple[bool, str]:
         """Mirror scanner killzone windows using candle timestamp."""
-        try:
-            dt = datetime.fromisoformat(candle_time.replace("Z", "+00:00"))
-            hour = dt.hour
-        except Exception:
-            return False, ""
-        if 7 <= hour < 9:
-            return True, "LONDON_OPEN"
-        if 12 <= hour < 14:
-            return True, "NY_OPEN"
-        if 15 <= hour < 17:
-            return True, "LONDON_CLOSE"
-        return False, ""
+        name = killzone_at(minute_of_week_from_iso(candle_time))
+        return bool(name), name
 
     def _is_in_killzone_for_instrument(self, profile: dict, candle_time: str) -> tuple[bool, str]:
-        in_kz, kz_name = self._is_in_killzone(candle_time)
-        if not in_kz:
-            return False, ""
-        allowed = profile.get("killzones", [])
-        if not allowed:
-            return in_kz, kz_name
-        return kz_name in allowed, kz_name
+        return SessionCalendar.for_profile(profile).in_killzone(minute_of_week_from_iso(candle_time))
 
     def _compute_htf_range_and_poi_gate(
         self, smc_analysis: Optional[SMCAnalysis], direction_hint: Optional[str] = None
@@ -794,6 +804,7 @@ class SMCBacktestEngine:
         config: BacktestConfig,
         sequence_tracker=None, cross_asset_adapter=None, calibrator=None,
         current_m5_index: int = 0, m5_candles: list = None, technical=None,
+        htf_cache: Optional[dict] = None,
     ) -> Optional[dict]:
         """
         Generate trading signal using SMC pipeline.
@@ -819,8 +830,19 @@ class SMCBacktestEngine:
         if len(h4_window) < 20 or len(h1_window) < 20 or len(m5_window) < 30:
             return None
 
-        # Step 1: HTF Analysis
-        htf_result = self.smc_analyzer.analyze_htf(h4_window, h1_window, instrument)
+        # Step 1: HTF Analysis (only changes when a new H4/H1 bar closes)
+        if htf_cache is None:
+            htf_result = self.smc_analyzer.analyze_htf(h4_window, h1_window, instrument)
+        else:
+            htf_key = (
+                instrument,
+                h4_window[0]["timestamp"], h4_window[-1]["timestamp"],
+                h1_window[0]["timestamp"], h1_window[-1]["timestamp"],
+            )
+            if htf_cache.get("key") != htf_key:
+                htf_cache["key"] = htf_key
+                htf_cache["result"] = self.smc_analyzer.analyze_htf(h4_window, h1_window, instrument)
+            htf_result = htf_cache["result"]
 
         # Step 2: LTF Analysis
         smc_analysis = self.smc_analyzer.analyze_ltf(m5_window, htf_result, instrument)
@@ -1009,6 +1031,264 @@ class SMCBacktestEngine:
             "divergence_modifier": div_modifier,
         }
 
+    # ---------- Per-instrument simulation steps ----------
+    # Shared by run() and PortfolioBacktester, which drives several
+    # instruments through the same steps on one timeline.
+
+    def _build_feed(
+        self,
+        h4_candles: list,
+        h1_candles: list,
+        m5_candles: list,
+        config: BacktestConfig,
+        cross_asset_data: Optional[Dict[str, list]] = None,
+    ) -> "InstrumentFeed":
+        """Index an instrument's candles and set up its ISI components."""
+        sequence_tracker = None
+        cross_asset_adapter = None
+        calibrator = None
+
+        if config.isi_sequence_tracker or config.isi_calibrator:
+            from src.utils.database import Database
+            db = Database()
+
+        if config.isi_sequence_tracker:
+            from src.smc.sequence_tracker import SequenceTracker
+            sequence_tracker = SequenceTracker(db)
+
+        if config.isi_cross_asset and cross_asset_data:
+            cross_asset_adapter = BacktestCrossAssetAdapter(cross_asset_data)
+
+        if config.isi_calibrator:
+            from src.analysis.confidence_calibrator import ConfidenceCalibrator
+            calibrator = ConfidenceCalibrator(db)
+
+        # Per-bar session gate, computed once (unparseable times are allowed)
+        trade_time_ok = None
+        if config.check_session:
+            trade_time_ok = self._session_calendar(config).gate(bar_minutes(m5_candles))
+
+        return InstrumentFeed(
+            h4=CandleIndex(h4_candles),
+            h1=CandleIndex(h1_candles),
+            m5_candles=m5_candles,
+            trade_time_ok=trade_time_ok,
+            sequence_tracker=sequence_tracker,
+            cross_asset_adapter=cross_asset_adapter,
+            calibrator=calibrator,
+        )
+
+    def _close_trade(
+        self, trade: SimulatedTrade, exit_price: float, exit_reason: str,
+        exit_time: str, config: BacktestConfig
+    ) -> float:
+        """Apply exit costs and commission and fill in the trade's P&L. Returns the effective exit."""
+        exit_eff = self._apply_costs(
+            exit_price, trade.direction,
+            config.instrument, config.spread_pips,
+            config.slippage_pips, "exit"
+        )
+
+        # PnL on remaining units
+        pnl_remaining, pnl_pips = self._calculate_pnl(
+            trade.entry_price_effective or trade.entry_price,
+            exit_eff, trade.direction,
+            trade.units, config.instrument
+        )
+
+        # Total PnL = partial close PnL + remaining PnL
+        total_pnl = trade.partial_pnl + pnl_remaining
+
+        contract_size = self._get_contract_size(config.instrument)
+        total_units = trade.original_units if trade.original_units > 0 else trade.units
+        lots = abs(total_units) / contract_size
+        commission = config.commission_per_lot * lots
+
+        trade.exit_time = exit_time
+        trade.exit_price = exit_price
+        trade.exit_price_effective = exit_eff
+        trade.exit_reason = exit_reason
+        trade.pnl = total_pnl - commission
+        trade.pnl_pips = pnl_pips
+        trade.commission = commission
+        return exit_eff
+
+    def _step_position(
+        self, state: BacktestState, candle: dict, config: BacktestConfig
+    ) -> Optional[SimulatedTrade]:
+        """Check the open position for SL/TP on this bar. Returns the trade if it closed."""
+        sl_tp = self._check_sl_tp(state.open_position, candle, config)
+        if not sl_tp:
+            return None
+
+        exit_price, exit_reason = sl_tp
+        trade = state.open_position
+        exit_eff = self._close_trade(trade, exit_price, exit_reason, candle["time"], config)
+
+        # Actual R:R
+        entry_eff = trade.entry_price_effective or trade.entry_price
+        risk_dist = abs(entry_eff - trade.stop_loss)
+        reward_dist = abs(exit_eff - entry_eff)
+        trade.risk_reward_actual = (
+            reward_dist / risk_dist if risk_dist > 0 else 0
+        )
+
+        state.cash += trade.pnl
+        state.equity = state.cash
+        state.closed_trades.append(trade)
+        state.open_position = None
+        return trade
+
+    def _step_pending(
+        self, state: BacktestState, bar: int, candle: dict, config: BacktestConfig
+    ) -> Optional[SimulatedTrade]:
+        """Expire or fill the pending limit order on this bar. Returns the trade if it filled."""
+        po = state.pending_order
+        bars_elapsed = bar - po.created_bar
+
+        # Expire pending order
+        if bars_elapsed > po.max_bars:
+            state.count_skip("LIMIT_EXPIRED")
+            state.pending_order = None
+            return None
+
+        # Check if price entered the entry zone
+        if po.signal["direction"] == TradeDirection.LONG:
+            # LONG: price must dip DOWN into the zone
+            filled = candle["low"] <= po.entry_price
+        else:
+            # SHORT: price must rise UP into the zone
+            filled = candle["high"] >= po.entry_price
+        if not filled:
+            return None
+
+        signal = po.signal
+        entry_price = po.entry_price
+        state.pending_order = None
+
+        # Recalculate R:R with the better entry price
+        risk = abs(entry_price - signal["stop_loss"])
+        reward = abs(signal["take_profit"] - entry_price)
+        new_rr = reward / risk if risk > 0 else 0
+        if new_rr < config.target_rr - 0.01:
+            return None
+
+        entry_eff = self._apply_costs(
+            entry_price, signal["direction"],
+            config.instrument, config.spread_pips,
+            config.slippage_pips, "entry"
+        )
+        trade = self._create_trade(candle, signal, entry_eff, state.equity, config)
+        if trade:
+            state.open_position = trade
+        return trade
+
+    def _evaluate_bar(
+        self, feed: "InstrumentFeed", bar: int, state: BacktestState, config: BacktestConfig
+    ) -> Optional[dict]:
+        """Run the SMC pipeline at one bar. Returns a tradeable signal; skips are counted on state."""
+        m5_candles = feed.m5_candles
+        current_ts = m5_candles[bar]["timestamp"]
+
+        # Get timeframe windows at current point in time
+        m5_window = m5_candles[max(0, bar - config.ltf_lookback):bar + 1]
+        h4_window = feed.h4.window(current_ts, config.htf_lookback)
+        h1_window = feed.h1.window(current_ts, config.htf_lookback)
+
+        # Market regime check (also used by sequence tracker)
+        technical = None
+        if (config.check_regime or feed.sequence_tracker) and len(m5_window) >= 30:
+            technical = self.technical_analyzer.analyze(m5_window, config.instrument)
+            if config.check_regime:
+                regime_ok, regime_reason = self._check_market_regime(technical, config)
+                if not regime_ok:
+                    state.count_skip(f"REGIME_{regime_reason}")
+                    return None
+
+        signal = self._generate_smc_signal(
+            h4_window, h1_window, m5_window, config,
+            sequence_tracker=feed.sequence_tracker,
+            cross_asset_adapter=feed.cross_asset_adapter,
+            calibrator=feed.calibrator,
+            current_m5_index=bar,
+            m5_candles=m5_candles,
+            technical=technical,
+            htf_cache=feed.htf_cache,
+        )
+
+        if signal and "skip" in signal:
+            state.signals_skipped += 1
+            state.count_skip(signal["skip"])
+            return None
+        if signal:
+            state.signals_generated += 1
+        return signal
+
+    def _enter_from_signal(
+        self, state: BacktestState, bar: int, candle: dict,
+        signal: dict, config: BacktestConfig
+    ) -> Optional[SimulatedTrade]:
+        """Place a limit order at the entry zone, or enter at market. Returns a market trade."""
+        # Limit entry: create pending order at FVG/OB zone
+        if config.limit_entry_enabled and signal.get("entry_zone"):
+            zone_low, zone_high = signal["entry_zone"]
+            if config.limit_entry_midpoint:
+                # Enter at zone midpoint (deeper = better price, fewer fills)
+                limit_price = (zone_low + zone_high) / 2
+            elif signal["direction"] == TradeDirection.LONG:
+                # Buy at top of bullish zone (first touch on retracement)
+                limit_price = zone_high
+            else:
+                # Sell at bottom of bearish zone
+                limit_price = zone_low
+
+            state.pending_order = PendingOrder(
+                signal=signal,
+                entry_price=limit_price,
+                created_bar=bar,
+                max_bars=config.limit_entry_max_bars,
+                entry_zone=(zone_low, zone_high),
+            )
+            return None
+
+        # Market entry (no entry zone or limit disabled)
+        entry_eff = self._apply_costs(
+            signal["entry_price"], signal["direction"],
+            config.instrument, config.spread_pips,
+            config.slippage_pips, "entry"
+        )
+        trade = self._create_trade(candle, signal, entry_eff, state.equity, config)
+        if trade:
+            state.open_position = trade
+        return trade
+
+    def _unrealized_pnl(
+        self, trade: SimulatedTrade, candle: dict, config: BacktestConfig
+    ) -> float:
+        """Mark an open trade to the bar close (spread only, no slippage)."""
+        mark_price = self._apply_costs(
+            candle["close"], trade.direction,
+            config.instrument, config.spread_pips,
+            0.0, "exit"
+        )
+        unrealized, _ = self._calculate_pnl(
+            trade.entry_price_effective or trade.entry_price,
+            mark_price, trade.direction,
+            trade.units, config.instrument
+        )
+        return unrealized
+
+    def _close_at_end(
+        self, state: BacktestState, last: dict, config: BacktestConfig
+    ) -> SimulatedTrade:
+        """Close the remaining position at the last price."""
+        trade = state.open_position
+        self._close_trade(trade, last["close"], "END", last["time"], config)
+        state.cash += trade.pnl
+        state.closed_trades.append(trade)
+        state.open_position = None
+        return trade
+
     def run(
         self,
         h4_candles: list,
@@ -1040,9 +1320,6 @@ class SMCBacktestEngine:
         )
 
         total_bars = len(m5_candles)
-        skip_reasons = {}
-        signals_generated = 0
-        signals_skipped = 0
 
         min_start_bar = max(config.ltf_lookback, 30)
         if total_bars < min_start_bar + 10:
@@ -1052,24 +1329,7 @@ class SMCBacktestEngine:
             )
 
         # Initialize ISI components (only if enabled in config)
-        sequence_tracker = None
-        cross_asset_adapter = None
-        calibrator = None
-
-        if config.isi_sequence_tracker or config.isi_calibrator:
-            from src.utils.database import Database
-            db = Database()
-
-        if config.isi_sequence_tracker:
-            from src.smc.sequence_tracker import SequenceTracker
-            sequence_tracker = SequenceTracker(db)
-
-        if config.isi_cross_asset and cross_asset_data:
-            cross_asset_adapter = BacktestCrossAssetAdapter(cross_asset_data)
-
-        if config.isi_calibrator:
-            from src.analysis.confidence_calibrator import ConfidenceCalibrator
-            calibrator = ConfidenceCalibrator(db)
+        feed = self._build_feed(h4_candles, h1_candles, m5_candles, config, cross_asset_data)
 
         isi_label = ""
         if config.isi_sequence_tracker or config.isi_cross_asset or config.isi_calibrator:
@@ -1088,270 +1348,64 @@ class SMCBacktestEngine:
             f"{isi_label}"
         )
 
-        for i in range(min_start_bar, total_bars):
-            current_candle = m5_candles[i]
-            current_ts = current_candle["timestamp"]
-
-            # Progress
-            if progress_callback and i % 500 == 0:
-                progress_callback(
-                    i - min_start_bar + 1,
-                    total_bars - min_start_bar,
-                    f"Bar {i + 1}/{total_bars}"
-                )
-
-            # === Check existing position for SL/TP ===
-            if state.open_position:
-                sl_tp = self._check_sl_tp(state.open_position, current_candle, config)
+        trade_time_ok = feed.trade_time_ok
 
-                if sl_tp:
-                    exit_price, exit_reason = sl_tp
-                    trade = state.open_position
+        # Production code reads the bar time from the clock (heat map decay, risk resets, ...)
+        with clock.replay(m5_candles[min_start_bar]["timestamp"], thread_only=True) as replay:
+            for i in range(min_start_bar, total_bars):
+                current_candle = m5_candles[i]
+                replay.set_timestamp(current_candle["timestamp"])
 
-                    exit_eff = self._apply_costs(
-                        exit_price, trade.direction,
-                        config.instrument, config.spread_pips,
-                        config.slippage_pips, "exit"
+                # Progress
+                if progress_callback and i % 500 == 0:
+                    progress_callback(
+                        i - min_start_bar + 1,
+                        total_bars - min_start_bar,
+                        f"Bar {i + 1}/{total_bars}"
                     )
 
-                    # PnL on remaining units
-                    pnl_remaining, pnl_pips = self._calculate_pnl(
-                        trade.entry_price_effective or trade.entry_price,
-                        exit_eff, trade.direction,
-                        trade.units, config.instrument
+                # === Check existing position for SL/TP ===
+                if state.open_position:
+                    self._step_position(state, current_candle, config)
+
+                # === Check pending limit order for fill ===
+                if state.pending_order and state.open_position is None:
+                    self._step_pending(state, i, current_candle, config)
+
+                # === Generate signal if no position and no pending (at signal_interval) ===
+                if (state.open_position is None
+                        and state.pending_order is None
+                        and (i % config.signal_interval == 0)
+                        and (trade_time_ok is None or trade_time_ok[i])):
+                    signal = self._evaluate_bar(feed, i, state, config)
+                    if signal:
+                        self._enter_from_signal(state, i, current_candle, signal, config)
+
+                # === Record equity ===
+                current_equity = state.cash
+                if state.open_position:
+                    current_equity += self._unrealized_pnl(
+                        state.open_position, current_candle, config
                     )
 
-                    # Total PnL = partial close PnL + remaining PnL
-                    total_pnl = trade.partial_pnl + pnl_remaining
-
-                    contract_size = self._get_contract_size(config.instrument)
-                    total_units = trade.original_units if trade.original_units > 0 else trade.units
-                    lots = abs(total_units) / contract_size
-                    commission = config.commission_per_lot * lots
-
-                    trade.exit_time = current_candle["time"]
-                    trade.exit_price = exit_price
-                    trade.exit_price_effective = exit_eff
-                    trade.exit_reason = exit_reason
-                    trade.pnl = total_pnl - commission
-                    trade.pnl_pips = pnl_pips
-                    trade.commission = commission
-
-                    # Actual R:R
-                    entry_eff = trade.entry_price_effective or trade.entry_price
-                    risk_dist = abs(entry_eff - trade.stop_loss)
-                    reward_dist = abs(exit_eff - entry_eff)
-                    trade.risk_reward_actual = (
-                        reward_dist / risk_dist if risk_dist > 0 else 0
-                    )
-
-                    state.cash += trade.pnl
-                    state.equity = state.cash
-                    state.closed_trades.append(trade)
-                    state.open_position = None
-
-            # === Check pending limit order for fill ===
-            if state.pending_order and state.open_position is None:
-                po = state.pending_order
-                bars_elapsed = i - po.created_bar
-                c_high = current_candle["high"]
-                c_low = current_candle["low"]
-
-                # Expire pending order
-                if bars_elapsed > po.max_bars:
-                    skip_reasons["LIMIT_EXPIRED"] = skip_reasons.get("LIMIT_EXPIRED", 0) + 1
-                    state.pending_order = None
-                else:
-                    # Check if price entered the entry zone
-                    filled = False
-                    if po.signal["direction"] == TradeDirection.LONG:
-                        # LONG: price must dip DOWN into the zone
-                        if c_low <= po.entry_price:
-                            filled = True
-                    else:
-                        # SHORT: price must rise UP into the zone
-                        if c_high >= po.entry_price:
-                            filled = True
-
-                    if filled:
-                        signal = po.signal
-                        entry_price = po.entry_price
-                        state.pending_order = None
-
-                        # Recalculate R:R with the better entry price
-                        sl = signal["stop_loss"]
-                        tp = signal["take_profit"]
-                        risk = abs(entry_price - sl)
-                        reward = abs(tp - entry_price)
-                        new_rr = reward / risk if risk > 0 else 0
-
-                        if new_rr >= config.target_rr - 0.01:
-                            entry_eff = self._apply_costs(
-                                entry_price, signal["direction"],
-                                config.instrument, config.spread_pips,
-                                config.slippage_pips, "entry"
-                            )
-                            trade = self._create_trade(
-                                current_candle, signal, entry_eff,
-                                state.equity, config
-                            )
-                            if trade:
-                                state.open_position = trade
-
-            # === Generate signal if no position and no pending (at signal_interval) ===
-            if (state.open_position is None
-                    and state.pending_order is None
-                    and (i % config.signal_interval == 0)):
-                # Session filter
-                if not self._is_trade_time(current_candle["time"], config):
-                    pass
-                else:
-                    # Get timeframe windows at current point in time
-                    m5_window = m5_candles[max(0, i - config.ltf_lookback):i + 1]
-                    h4_window = self._get_htf_candles_at(
-                        h4_candles, current_ts, config.htf_lookback
-                    )
-                    h1_window = self._get_htf_candles_at(
-                        h1_candles, current_ts, config.htf_lookback
-                    )
-
-                    # Market regime check (also used by sequence tracker)
-                    technical = None
-                    regime_ok = True
-                    if (config.check_regime or sequence_tracker) and len(m5_window) >= 30:
-                        technical = self.technical_analyzer.analyze(
-                            m5_window, config.instrument
-                        )
-                        if config.check_regime:
-                            regime_ok, regime_reason = self._check_market_regime(
-                                technical, config
-                            )
-                            if not regime_ok:
-                                reason_key = f"REGIME_{regime_reason}"
-                                skip_reasons[reason_key] = (
-                                    skip_reasons.get(reason_key, 0) + 1
-                                )
-
-                    if regime_ok:
-                        signal = self._generate_smc_signal(
-                            h4_window, h1_window, m5_window, config,
-                            sequence_tracker=sequence_tracker,
-                            cross_asset_adapter=cross_asset_adapter,
-                            calibrator=calibrator,
-                            current_m5_index=i,
-                            m5_candles=m5_candles,
-                            technical=technical,
-                        )
-
-                        if signal and "skip" in signal:
-                            signals_skipped += 1
-                            reason = signal["skip"]
-                            skip_reasons[reason] = (
-                                skip_reasons.get(reason, 0) + 1
-                            )
-
-                        elif signal:
-                            signals_generated += 1
-
-                            # Limit entry: create pending order at FVG/OB zone
-                            if config.limit_entry_enabled and signal.get("entry_zone"):
-                                zone_low, zone_high = signal["entry_zone"]
-                                if config.limit_entry_midpoint:
-                                    # Enter at zone midpoint (deeper = better price, fewer fills)
-                                    limit_price = (zone_low + zone_high) / 2
-                                elif signal["direction"] == TradeDirection.LONG:
-                                    # Buy at top of bullish zone (first touch on retracement)
-                                    limit_price = zone_high
-                                else:
-                                    # Sell at bottom of bearish zone
-                                    limit_price = zone_low
-
-                                state.pending_order = PendingOrder(
-                                    signal=signal,
-                                    entry_price=limit_price,
-                                    created_bar=i,
-                                    max_bars=config.limit_entry_max_bars,
-                                    entry_zone=(zone_low, zone_high),
-                                )
-                            else:
-                                # Market entry (no entry zone or limit disabled)
-                                entry_eff = self._apply_costs(
-                                    signal["entry_price"], signal["direction"],
-                                    config.instrument, config.spread_pips,
-                                    config.slippage_pips, "entry"
-                                )
-                                trade = self._create_trade(
-                                    current_candle, signal, entry_eff,
-                                    state.equity, config
-                                )
-                                if trade:
-                                    state.open_position = trade
-
-            # === Record equity ===
-            current_equity = state.cash
-            if state.open_position:
-                mid = current_candle["close"]
-                mark_price = self._apply_costs(
-                    mid, state.open_position.direction,
-                    config.instrument, config.spread_pips,
-                    0.0, "exit"
-                )
-                unrealized, _ = self._calculate_pnl(
-                    state.open_position.entry_price_effective
-                    or state.open_position.entry_price,
-                    mark_price, state.open_position.direction,
-                    state.open_position.units, config.instrument
-                )
-                current_equity += unrealized
-
-            # Record every 12th bar to keep equity curve manageable
-            if i % 12 == 0 or state.open_position is not None:
-                state.equity_curve.append({
-                    "time": current_candle["time"],
-                    "equity": current_equity,
-                    "cash": state.cash,
-                    "has_position": state.open_position is not None,
-                })
+                # Record every 12th bar to keep equity curve manageable
+                if i % 12 == 0 or state.open_position is not None:
+                    state.equity_curve.append({
+                        "time": current_candle["time"],
+                        "equity": current_equity,
+                        "cash": state.cash,
+                        "has_position": state.open_position is not None,
+                    })
 
         # Close remaining position at last price
         if state.open_position:
-            last = m5_candles[-1]
-            trade = state.open_position
-
-            exit_eff = self._apply_costs(
-                last["close"], trade.direction,
-                config.instrument, config.spread_pips,
-                config.slippage_pips, "exit"
-            )
-            pnl_remaining, pnl_pips = self._calculate_pnl(
-                trade.entry_price_effective or trade.entry_price,
-                exit_eff, trade.direction,
-                trade.units, config.instrument
-            )
-
-            total_pnl = trade.partial_pnl + pnl_remaining
-
-            contract_size = self._get_contract_size(config.instrument)
-            total_units = trade.original_units if trade.original_units > 0 else trade.units
-            lots = abs(total_units) / contract_size
-            commission = config.commission_per_lot * lots
-
-            trade.exit_time = last["time"]
-            trade.exit_price = last["close"]
-            trade.exit_price_effective = exit_eff
-            trade.exit_reason = "END"
-            trade.pnl = total_pnl - commission
-            trade.pnl_pips = pnl_pips
-            trade.commission = commission
-
-            state.cash += trade.pnl
-            state.closed_trades.append(trade)
+            self._close_at_end(state, m5_candles[-1], config)
 
         run_time = _time.time() - start_time
 
         logger.info(
             f"SMC Backtest complete: {len(state.closed_trades)} trades, "
-            f"{signals_generated} signals, {signals_skipped} skipped, "
+            f"{state.signals_generated} signals, {state.signals_skipped} skipped, "
             f"{run_time:.1f}s"
         )
 
@@ -1363,10 +1417,10 @@ class SMCBacktestEngine:
             final_equity=state.cash,
             total_bars=total_bars,
             bars_analyzed=total_bars - min_start_bar,
-            signals_generated=signals_generated,
-            signals_skipped=signals_skipped,
+            signals_generated=state.signals_generated,
+            signals_skipped=state.signals_skipped,
             run_time_seconds=run_time,
-            skip_reasons=skip_reasons,
+            skip_reasons=state.skip_reasons,
         )
 
 
@@ -0,0 +1,720 @@
+"""
+Background Backtest Jobs
+
+Local job queue so long backtests never run in a Streamlit script thread:
+- Jobs live in the backtest_jobs table (status, progress, result pointer),
+  so a rerun, refresh or second tab just polls the same job
+- Identical submissions (same kind + parameters) share one queued/running
+  job; finished results are reused unless a rerun is forced
+- BacktestJobRunner claims queued jobs atomically and runs each one in its
+  own worker process; several runners (dashboard, CLI scripts) can serve
+  the same database
+- Cancellation is cooperative (checked on every progress update) and
+  enforced by terminating the worker after a grace period
+
+Usage:
+    from src.backtesting.jobs import BacktestJobQueue, BacktestJobRunner
+
+    queue = BacktestJobQueue()
+    job = queue.submit("backtest", {"config": {...}}, label="EUR_USD Lim12")
+
+    runner = BacktestJobRunner(queue)
+    runner.start()                 # Background dispatcher thread
+    done = queue.wait([job.id])
+"""
+
+import atexit
+import hashlib
+import importlib
+import json
+import multiprocessing
+import signal
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.utils.database import Database, db
+from src.utils.logger import logger
+
+
+# Job statuses
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+FINAL_STATUSES = (DONE, FAILED, CANCELLED)
+
+# Job kind -> "module:function" executed in the worker process
+JOB_KINDS = {
+    "backtest": "src.backtesting.jobs:run_backtest_job",
+    "walk_forward": "src.backtesting.jobs:run_walk_forward_job",
+    "optimize": "src.backtesting.jobs:run_optimize_job",
+}
+
+# Job kinds that start their own process pool (launched non-daemonic)
+POOLED_JOB_KINDS = ("optimize",)
+
+DEFAULT_RESULT_DIR = Path(__file__).parent.parent.parent / "backtest_results" / "jobs"
+DEFAULT_MAX_WORKERS = 2
+POLL_INTERVAL_SECONDS = 1.0
+HEARTBEAT_SECONDS = 10        # Runner refreshes heartbeats of its jobs this often
+STALE_AFTER_SECONDS = 120     # RUNNING jobs without a heartbeat this long are failed
+CANCEL_GRACE_SECONDS = 5      # Time a worker gets to stop itself before terminate()
+PROGRESS_MIN_INTERVAL = 1.0   # Seconds between progress writes from a worker
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job was cancelled."""
+
+
+@dataclass
+class BacktestJob:
+    """One row of the backtest_jobs table."""
+    id: int
+    kind: str
+    label: Optional[str]
+    params: dict
+    status: str
+    progress: float
+    message: Optional[str]
+    result_path: Optional[str]
+    summary: Optional[dict]
+    error: Optional[str]
+    submitted_by: Optional[str]
+    cancel_requested: bool
+    created_at: str
+    started_at: Optional[str]
+    finished_at: Optional[str]
+    job_key: str
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    @classmethod
+    def from_row(cls, row: dict) -> "BacktestJob":
+        return cls(
+            id=row["id"],
+            kind=row["kind"],
+            label=row.get("label"),
+            params=json.loads(row["params"]),
+            status=row["status"],
+            progress=float(row.get("progress") or 0.0),
+            message=row.get("message"),
+            result_path=row.get("result_path"),
+            summary=json.loads(row["summary"]) if row.get("summary") else None,
+            error=row.get("error"),
+            submitted_by=row.get("submitted_by"),
+            cancel_requested=bool(row.get("cancel_requested")),
+            created_at=row["created_at"],
+            started_at=row.get("started_at"),
+            finished_at=row.get("finished_at"),
+            job_key=row["job_key"],
+        )
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Job parameter of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_params(params: dict) -> str:
+    """Canonical JSON for job parameters (datetimes as ISO strings)."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=_json_default)
+
+
+def job_key(kind: str, params: dict) -> str:
+    """Dedup key: hash of kind + canonical parameters (label excluded)."""
+    payload = {k: v for k, v in params.items() if k != "label"}
+    return hashlib.sha256(f"{kind}:{encode_params(payload)}".encode("utf-8")).hexdigest()
+
+
+# ===================
+# Queue
+# ===================
+
+class BacktestJobQueue:
+    """Submit, inspect and cancel jobs (safe from any process or thread)."""
+
+    def __init__(self, database: Optional[Database] = None):
+        self.db = database or db
+
+    def submit(
+        self,
+        kind: str,
+        params: dict,
+        label: Optional[str] = None,
+        submitted_by: Optional[str] = None,
+        reuse_completed: bool = True,
+    ) -> BacktestJob:
+        """
+        Queue a job, or return the identical job that already exists.
+
+        Args:
+            kind: Job kind (key of JOB_KINDS)
+            params: JSON-serializable job parameters
+            label: Display label (not part of the dedup key)
+            submitted_by: Submitter tag, e.g. "dashboard" or "suite"
+            reuse_completed: Return a finished identical job whose result still exists
+
+        Returns:
+            The queued, running or reused job
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown backtest job kind: {kind}")
+        key = job_key(kind, params)
+        encoded = encode_params(params)
+
+        if reuse_completed:
+            done = self.db.find_backtest_job(key, (DONE,))
+            if done and done["result_path"] and Path(done["result_path"]).exists():
+                return BacktestJob.from_row(done)
+
+        while True:
+            job_id = self.db.create_backtest_job(key, kind, encoded, label=label, submitted_by=submitted_by)
+            if job_id is not None:
+                logger.info(f"Backtest job {job_id} queued: {kind} {label or ''}".rstrip())
+                return self.get(job_id)
+            active = self.db.find_backtest_job(key, ACTIVE_STATUSES)
+            if active:
+                return BacktestJob.from_row(active)
+            # The identical job finished between the insert and the lookup; retry
+
+    def get(self, job_id: int) -> Optional[BacktestJob]:
+        row = self.db.get_backtest_job(job_id)
+        return BacktestJob.from_row(row) if row else None
+
+    def list_jobs(self, limit: int = 50, statuses: Optional[tuple] = None) -> list[BacktestJob]:
+        return [BacktestJob.from_row(r) for r in self.db.list_backtest_jobs(limit, statuses)]
+
+    def cancel(self, job_id: int) -> Optional[str]:
+        """Cancel a job; returns its status afterwards (RUNNING until the runner stops it)."""
+        return self.db.request_backtest_job_cancel(job_id)
+
+    def wait(
+        self,
+        job_ids: list[int],
+        timeout: Optional[float] = None,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        on_update: Optional[Callable[[BacktestJob], None]] = None,
+    ) -> dict[int, BacktestJob]:
+        """
+        Poll until all jobs are final (or the timeout expires).
+
+        Args:
+            job_ids: Jobs to wait for
+            timeout: Max seconds to wait (None = forever)
+            poll_interval: Seconds between polls
+            on_update: Called with each job whose status/progress changed
+
+        Returns:
+            {job_id: latest BacktestJob}
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        seen: dict[int, tuple] = {}
+        latest: dict[int, BacktestJob] = {}
+        while True:
+            for job_id in job_ids:
+                job = self.get(job_id)
+                if job is None:
+                    continue
+                latest[job_id] = job
+                state = (job.status, round(job.progress, 3))
+                if on_update and seen.get(job_id) != state:
+                    on_update(job)
+                seen[job_id] = state
+            if all(j.status in FINAL_STATUSES for j in latest.values()) and len(latest) == len(job_ids):
+                return latest
+            if deadline is not None and time.monotonic() >= deadline:
+                return latest
+            time.sleep(poll_interval)
+
+
+# ===================
+# Runner
+# ===================
+
+class BacktestJobRunner:
+    """
+    Dispatches queued jobs to worker processes.
+
+    Runs as a daemon thread inside the dashboard or a CLI script. Each job
+    gets a fresh process, so a crash or a terminate() never takes the
+    host down and workers don't share MT5/SQLite state.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[BacktestJobQueue] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        result_dir: Optional[Path] = None,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+    ):
+        self.queue = queue or BacktestJobQueue()
+        self.max_workers = max(1, int(max_workers))
+        self.result_dir = Path(result_dir or DEFAULT_RESULT_DIR)
+        self.poll_interval = poll_interval
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: dict[int, multiprocessing.Process] = {}
+        self._cancel_seen: dict[int, float] = {}
+        self._last_heartbeat = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._exit_hook = False
+
+    @property
+    def db(self) -> Database:
+        return self.queue.db
+
+    @property
+    def running_jobs(self) -> list[int]:
+        return list(self._workers)
+
+    def start(self) -> "BacktestJobRunner":
+        """Start the dispatcher thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.serve_forever, name="backtest-job-runner", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, terminate_workers: bool = False, timeout: float = 5.0):
+        """Stop dispatching; optionally terminate running workers."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if terminate_workers:
+            for job_id, proc in list(self._workers.items()):
+                proc.terminate()
+                proc.join(timeout)
+                self.db.finish_backtest_job(job_id, CANCELLED, message="Runner stopped")
+            self._workers.clear()
+
+    def serve_forever(self):
+        """Dispatch loop (blocks until stop())."""
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Backtest job runner tick failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def tick(self):
+        """One dispatch pass: reap, enforce cancels, heartbeat, fail stale, start new."""
+        self._reap()
+        self._enforce_cancels()
+
+        now = time.monotonic()
+        if now - self._last_heartbeat >= HEARTBEAT_SECONDS:
+            self._last_heartbeat = now
+            self.db.touch_backtest_jobs(self.running_jobs)
+            stale_before = (datetime.now(timezone.utc) - timedelta(seconds=STALE_AFTER_SECONDS)).isoformat()
+            failed = self.db.fail_stale_backtest_jobs(stale_before, tuple(self.running_jobs))
+            if failed:
+                logger.warning(f"Failed {failed} backtest job(s) whose worker stopped responding")
+
+        while len(self._workers) < self.max_workers:
+            row = self.db.claim_backtest_job()
+            if row is None:
+                break
+            self._launch(row)
+
+    def _launch(self, row: dict):
+        target = JOB_KINDS.get(row["kind"])
+        if target is None:
+            self.db.finish_backtest_job(row["id"], FAILED, error=f"Unknown job kind: {row['kind']}")
+            return
+        proc = self._ctx.Process(
+            target=execute_job,
+            args=(row["id"], target, str(self.db.db_path), str(self.result_dir)),
+            name=f"backtest-job-{row['id']}",
+            # Daemonic processes can't have children: pooled jobs run non-daemonic
+            daemon=row["kind"] not in POOLED_JOB_KINDS,
+        )
+        proc.start()
+        self._workers[row["id"]] = proc
+        if not proc.daemon and not self._exit_hook:
+            # multiprocessing joins non-daemonic children at exit: terminate
+            # them first (atexit is LIFO) so the host doesn't wait for a sweep
+            atexit.register(self.stop, terminate_workers=True)
+            self._exit_hook = True
+        logger.info(f"Backtest job {row['id']} started in worker pid {proc.pid}")
+
+    def _reap(self):
+        for job_id, proc in list(self._workers.items()):
+            if proc.is_alive():
+                continue
+            proc.join()
+            del self._workers[job_id]
+            self._cancel_seen.pop(job_id, None)
+            # A worker that died without recording a final status crashed
+            if self.db.finish_backtest_job(job_id, FAILED, error=f"Worker exited with code {proc.exitcode}"):
+                logger.error(f"Backtest job {job_id} worker exited with code {proc.exitcode}")
+
+    def _enforce_cancels(self):
+        now = time.monotonic()
+        for job_id, proc in list(self._workers.items()):
+            row = self.db.get_backtest_job(job_id)
+            if not row or not row["cancel_requested"]:
+                continue
+            first_seen = self._cancel_seen.setdefault(job_id, now)
+            if now - first_seen < CANCEL_GRACE_SECONDS:
+                continue
+            proc.terminate()
+            proc.join(5)
+            del self._workers[job_id]
+            self._cancel_seen.pop(job_id, None)
+            self.db.finish_backtest_job(job_id, CANCELLED, message="Cancelled (worker terminated)")
+            logger.info(f"Backtest job {job_id} terminated after cancel request")
+
+
+# ===================
+# Worker
+# ===================
+
+class JobContext:
+    """Handed to job functions: progress reporting and cancellation checks."""
+
+    def __init__(self, database: Database, job_id: int, result_dir: Path):
+        self.db = database
+        self.job_id = job_id
+        self.result_dir = result_dir
+        self._last_write = 0.0
+
+    def progress(self, fraction: float, message: str = "", force: bool = False):
+        """
+        Report progress (0..1); raises JobCancelled if the job was cancelled.
+
+        Writes are throttled to PROGRESS_MIN_INTERVAL unless forced.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_write < PROGRESS_MIN_INTERVAL:
+            return
+        self._last_write = now
+        if self.db.update_backtest_job_progress(self.job_id, max(0.0, min(1.0, fraction)), message):
+            raise JobCancelled()
+
+    def result_file(self, name: str) -> Path:
+        """Path for a result artifact of this job."""
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+        return self.result_dir / f"job{self.job_id}_{name}"
+
+
+def _resolve(target: str) -> Callable:
+    module_name, func_name = target.split(":", 1)
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _cancel_on_sigterm(signum, frame):
+    raise JobCancelled()
+
+
+def execute_job(job_id: int, target: str, db_path: str, result_dir: str):
+    """
+    Worker process entry point: run one claimed job and record its outcome.
+
+    Job functions take (params, ctx) and return (result_path, summary).
+    terminate() raises JobCancelled in the job, so jobs that start their
+    own processes (optimize) tear them down on the way out.
+    """
+    signal.signal(signal.SIGTERM, _cancel_on_sigterm)
+    database = Database(Path(db_path))
+    row = database.get_backtest_job(job_id)
+    if row is None:
+        return
+    ctx = JobContext(database, job_id, Path(result_dir))
+    try:
+        func = _resolve(target)
+        result_path, summary = func(json.loads(row["params"]), ctx)
+        database.finish_backtest_job(
+            job_id, DONE,
+            result_path=str(result_path) if result_path else None,
+            summary=json.dumps(summary, default=str) if summary is not None else None,
+            message="Done",
+        )
+    except JobCancelled:
+        database.finish_backtest_job(job_id, CANCELLED, message="Cancelled")
+    except Exception as e:
+        logger.error(f"Backtest job {job_id} failed: {e}")
+        database.finish_backtest_job(job_id, FAILED, error=f"{e}\n{traceback.format_exc()}", message="Failed")
+
+
+# ===================
+# Job Kinds
+# ===================
+
+def _parse_dt(value) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+
+def _load_candles(instruments: list[str], start: datetime, end: datetime, ctx: JobContext,
+                  span: tuple[float, float] = (0.0, 0.3)) -> dict:
+    """Load H4/H1/M5 candles per instrument; progress spans the given range."""
+    from src.backtesting.data_loader import DataLoader
+
+    loader = DataLoader()
+    data = {}
+    steps = max(1, len(instruments) * 3)
+    done = 0
+    for inst in instruments:
+        frames = []
+        for tf in ("H4", "H1", "M5"):
+            ctx.progress(span[0] + (span[1] - span[0]) * done / steps, f"Loading {inst} {tf}...", force=True)
+            frames.append(loader.load_simple(inst, tf, start, end).candles)
+            done += 1
+        data[inst] = tuple(frames)
+    return data
+
+
+def summarize_backtest(label: str, config, result, elapsed: float, isi_enabled: bool = False,
+                       metrics=None) -> dict:
+    """
+    Flat summary of one SMC backtest (used by the suite table and job results).
+
+    Args:
+        label: Config label
+        config: BacktestConfig that was run
+        result: BacktestResult
+        elapsed: Wall time in seconds
+        isi_enabled: Whether any ISI component was on
+        metrics: Precomputed BacktestMetrics (calculated if omitted)
+    """
+    from src.backtesting.metrics import MetricsCalculator
+
+    if not result.trades:
+        metrics = None
+    elif metrics is None:
+        metrics = MetricsCalculator().calculate(result)
+
+    # Trade breakdown
+    winners = [t for t in result.trades if t.pnl > 0]
+    losers = [t for t in result.trades if t.pnl <= 0]
+
+    # Grade distribution
+    grades = {}
+    for t in result.trades:
+        g = t.setup_grade
+        grades[g] = grades.get(g, 0) + 1
+
+    # Direction distribution
+    longs = sum(1 for t in result.trades if t.direction.value == "LONG")
+    shorts = len(result.trades) - longs
+
+    # Top skip reasons
+    top_skips = sorted(result.skip_reasons.items(), key=lambda x: -x[1])[:5]
+
+    # ISI metadata summary
+    isi_phases = {}
+    total_seq_mod = 0
+    total_div_mod = 0
+    for t in result.trades:
+        if t.sequence_phase_name:
+            isi_phases[t.sequence_phase_name] = isi_phases.get(t.sequence_phase_name, 0) + 1
+        total_seq_mod += t.sequence_modifier
+        total_div_mod += t.divergence_modifier
+
+    return {
+        "label": label,
+        "instrument": config.instrument,
+        "min_confidence": config.min_confidence,
+        "target_rr": config.target_rr,
+        "check_regime": config.check_regime,
+        "check_session": config.check_session,
+        "session_hours": config.session_hours,
+        "isi_enabled": isi_enabled,
+        "trades": len(result.trades),
+        "signals_generated": result.signals_generated,
+        "signals_skipped": result.signals_skipped,
+        "winners": len(winners),
+        "losers": len(losers),
+        "win_rate": (len(winners) / len(result.trades) * 100) if result.trades else 0,
+        "return_pct": metrics.total_return_pct if metrics else 0,
+        "return_abs": metrics.total_return_abs if metrics else 0,
+        "max_dd_pct": metrics.max_drawdown_pct if metrics else 0,
+        "sharpe": metrics.sharpe_ratio if metrics else None,
+        "profit_factor": metrics.profit_factor if metrics else None,
+        "expectancy": metrics.expectancy if metrics else 0,
+        "avg_win": metrics.avg_win if metrics else 0,
+        "avg_loss": metrics.avg_loss if metrics else 0,
+        "largest_win": metrics.largest_win if metrics else 0,
+        "largest_loss": metrics.largest_loss if metrics else 0,
+        "max_consec_wins": metrics.max_consecutive_wins if metrics else 0,
+        "max_consec_losses": metrics.max_consecutive_losses if metrics else 0,
+        "longs": longs,
+        "shorts": shorts,
+        "grades": grades,
+        "top_skips": top_skips,
+        "run_time": elapsed,
+        "final_equity": result.final_equity,
+        # ISI summary
+        "isi_phases": isi_phases if isi_phases else None,
+        "avg_seq_modifier": (total_seq_mod / len(result.trades)) if result.trades else 0,
+        "avg_div_modifier": (total_div_mod / len(result.trades)) if result.trades else 0,
+    }
+
+
+def run_backtest_job(params: dict, ctx: JobContext) -> tuple[str, dict]:
+    """
+    Single SMC backtest.
+
+    Params:
+        config: BacktestConfig fields (dates as ISO strings)
+        cross_asset: Extra instruments loaded for ISI cross-asset (optional)
+        label: Display label (optional)
+    """
+    from src.backtesting.engine import SMCBacktestEngine, BacktestConfig
+    from src.backtesting.report import ReportGenerator
+    from src.backtesting.catalog import ResultCatalog
+
+    cfg = dict(params["config"])
+    cfg["start_date"] = _parse_dt(cfg["start_date"])
+    cfg["end_date"] = _parse_dt(cfg["end_date"])
+    config = BacktestConfig(**cfg)
+    isi_enabled = config.isi_sequence_tracker or config.isi_cross_asset or config.isi_calibrator
+
+    cross = [i for i in params.get("cross_asset", []) if i != config.instrument] if config.isi_cross_asset else []
+    data = _load_candles([config.instrument] + cross, config.start_date, config.end_date, ctx)
+    h4, h1, m5 = data[config.instrument]
+    cross_asset_data = {inst: data[inst][2] for inst in data if inst != config.instrument} or None
+
+    def on_progress(current, total, message):
+        ctx.progress(0.3 + 0.65 * current / max(total, 1), message)
+
+    # ISI components write to Database(): point this worker process at a temp DB
+    temp_db_path = None
+    if config.isi_sequence_tracker or config.isi_calibrator:
+        import src.utils.database as db_module
+        temp_db_path = ctx.result_file("isi.db")
+        db_module._db_path = temp_db_path
+
+    t0 = time.time()
+    try:
+        result = SMCBacktestEngine().run(
+            h4, h1, m5, config,
+            progress_callback=on_progress,
+            cross_asset_data=cross_asset_data,
+        )
+    finally:
+        if temp_db_path is not None:
+            temp_db_path.unlink(missing_ok=True)
+    elapsed = time.time() - t0
+
+    ctx.progress(0.97, "Generating report...", force=True)
+    report = ReportGenerator().generate(result)
+    report.report_id = f"job{ctx.job_id}_{report.report_id}"
+    label = params.get("label") or config.instrument
+    summary = summarize_backtest(label, config, result, elapsed, isi_enabled, metrics=report.metrics)
+    catalog = ResultCatalog(ctx.db)
+    summary["run_id"] = catalog.add_report(report, source="job", label=label)
+    return catalog.get_run(summary["run_id"])["sidecar_path"], summary
+
+
+def run_walk_forward_job(params: dict, ctx: JobContext) -> tuple[str, dict]:
+    """
+    Walk-forward validation for one instrument.
+
+    Params:
+        wf_config: WalkForwardConfig fields
+        start_date / end_date: Data range to load (ISO strings)
+        cross_asset: Extra instruments loaded for ISI cross-asset (optional)
+        label: Display label (optional)
+    """
+    from src.backtesting.walk_forward import WalkForwardValidator, WalkForwardConfig
+
+    wf_config = WalkForwardConfig(**params["wf_config"])
+    start, end = _parse_dt(params["start_date"]), _parse_dt(params["end_date"])
+    cross = [i for i in params.get("cross_asset", []) if i != wf_config.instrument] if wf_config.isi_cross_asset else []
+    data = _load_candles([wf_config.instrument] + cross, start, end, ctx, span=(0.0, 0.4))
+    h4, h1, m5 = data[wf_config.instrument]
+    cross_asset_data = {inst: data[inst][2] for inst in data if inst != wf_config.instrument} or None
+
+    ctx.progress(0.4, f"Walk-forward {wf_config.windows} windows...", force=True)
+    t0 = time.time()
+    result = WalkForwardValidator().run(wf_config, h4, h1, m5, cross_asset_data)
+    elapsed = time.time() - t0
+
+    path = ctx.result_file(f"walk_forward_{wf_config.instrument}.json")
+    with open(path, "w") as f:
+        json.dump(result.to_dict(), f, indent=2, default=str)
+
+    return str(path), {
+        "label": params.get("label") or wf_config.instrument,
+        "instrument": wf_config.instrument,
+        "avg_test_win_rate": result.avg_test_win_rate,
+        "total_test_pnl": result.total_test_pnl,
+        "avg_test_sharpe": result.avg_test_sharpe,
+        "consistency_score": result.consistency_score,
+        "robustness_score": result.robustness_score,
+        "prob_profit": result.monte_carlo.prob_profit if result.monte_carlo else None,
+        "run_time": elapsed,
+    }
+
+
+def run_optimize_job(params: dict, ctx: JobContext) -> tuple[str, dict]:
+    """
+    Parameter sweep with successive halving (see src.backtesting.optimizer).
+
+    Params:
+        config: Base BacktestConfig fields (dates as ISO strings)
+        candidates / eta / rungs / seed: Sweep settings (optional)
+        objective / min_trades: Scoring (optional)
+        cross_asset: Extra instruments loaded for ISI cross-asset (optional)
+        label: Display label (optional)
+    """
+    from src.backtesting.engine import BacktestConfig
+    from src.backtesting.optimizer import ParameterOptimizer
+
+    cfg = dict(params["config"])
+    cfg["start_date"] = _parse_dt(cfg["start_date"])
+    cfg["end_date"] = _parse_dt(cfg["end_date"])
+    config = BacktestConfig(**cfg)
+
+    cross = [i for i in params.get("cross_asset", []) if i != config.instrument] if config.isi_cross_asset else []
+    data = _load_candles([config.instrument] + cross, config.start_date, config.end_date, ctx, span=(0.0, 0.2))
+    h4, h1, m5 = data[config.instrument]
+    cross_asset_data = {inst: data[inst][2] for inst in data if inst != config.instrument} or None
+
+    def on_progress(current, total, message):
+        ctx.progress(0.2 + 0.75 * current / max(total, 1), message)
+
+    optimizer = ParameterOptimizer(
+        h4, h1, m5, config,
+        objective=params.get("objective", "sharpe"),
+        min_trades=params.get("min_trades", 10),
+        cross_asset_data=cross_asset_data,
+        cache_path=ctx.result_dir / "optimizer_cache.json",
+    )
+    result = optimizer.run(
+        candidates=params.get("candidates", 27),
+        eta=params.get("eta", 3),
+        rungs=params.get("rungs", 3),
+        seed=params.get("seed", 42),
+        progress_callback=on_progress,
+    )
+
+    path = ctx.result_file(f"optimize_{config.instrument}.json")
+    with open(path, "w") as f:
+        json.dump(result.to_dict(), f, indent=2, default=str)
+
+    best = result.best
+    return str(path), {
+        "label": params.get("label") or config.instrument,
+        "instrument": config.instrument,
+        "objective": optimizer.objective,
+        "best_params": best.params if best else None,
+        "best_score": best.score if best else None,
+        "candidates": len(result.trials),
+        "evaluations": result.evaluations,
+        "cache_hits": result.cache_hits,
+        "run_time": result.run_time_seconds,
+    }
@@ -0,0 +1,480 @@
+"""
+Parameter Optimizer - Random search with successive halving.
+
+Samples BacktestConfig parameter sets from a search space and runs them
+through SMCBacktestEngine in a process pool. Every candidate first runs on
+a short prefix of the period; only the best 1/eta advance to the next,
+longer rung, and only the last rung runs the full period. With 27
+candidates and eta=3 that is 9 full-period runs worth of bars instead of 27.
+
+Evaluations are cached by a hash of (parameters, period, data), so a rerun
+or an overlapping sweep only runs the new configurations.
+
+Usage:
+    from src.backtesting.optimizer import ParameterOptimizer
+
+    optimizer = ParameterOptimizer(h4, h1, m5, base_config, workers=4,
+                                   cache_path=Path("backtest_results/optimizer_cache.json"))
+    result = optimizer.run(candidates=27, seed=42)
+    print(result.best.params, result.best.score)
+"""
+
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import tempfile
+import time as _time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.backtesting.engine import SMCBacktestEngine, BacktestConfig
+from src.core.tuning_config import SettingBounds, TunableSettings
+from src.utils.logger import logger
+
+
+# BacktestConfig fields searched by default (target_rr uses the AI override bounds)
+SEARCH_SPACE: Dict[str, SettingBounds] = {
+    "min_confidence": SettingBounds(60, 90, 68, "Min SMC grade confidence", "int"),
+    "target_rr": TunableSettings.get_bounds("target_rr"),
+    "max_sl_pips": SettingBounds(10.0, 40.0, 30.0, "Max stop loss in pips"),
+    "signal_interval": SettingBounds(1, 12, 1, "Check for signals every N M5 bars", "int"),
+    "limit_entry_enabled": SettingBounds(0, 1, 1, "Wait for FVG/OB retest", "bool"),
+    "limit_entry_max_bars": SettingBounds(3, 36, 12, "Bars before a pending entry is cancelled", "int"),
+    "breakeven_sl_enabled": SettingBounds(0, 1, 1, "Move SL to entry at the trigger", "bool"),
+    "breakeven_sl_trigger_rr": SettingBounds(0.5, 2.0, 1.0, "R:R that triggers breakeven"),
+}
+
+# Objective name -> BacktestMetrics attribute (higher is better)
+OBJECTIVES = {
+    "sharpe": "sharpe_ratio",
+    "profit_factor": "profit_factor",
+    "return": "total_return_pct",
+    "expectancy": "expectancy",
+}
+
+
+@dataclass
+class Trial:
+    """One parameter set and its best-rung evaluation."""
+    params: dict
+    rung: int = 0              # Highest rung reached
+    fraction: float = 0.0      # Share of the period at that rung
+    score: float = float("-inf")
+    summary: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "params": self.params,
+            "rung": self.rung,
+            "fraction": round(self.fraction, 4),
+            "score": self.score if math.isfinite(self.score) else None,
+            "summary": self.summary,
+        }
+
+
+@dataclass
+class OptimizationResult:
+    """Outcome of a sweep."""
+    trials: List[Trial]
+    rungs: List[float]                # Period fraction per rung
+    evaluations: int = 0              # Engine runs performed
+    cache_hits: int = 0
+    run_time_seconds: float = 0.0
+
+    @property
+    def best(self) -> Optional[Trial]:
+        """Best trial of the final rung."""
+        finalists = [t for t in self.trials if t.rung == len(self.rungs) - 1 and math.isfinite(t.score)]
+        return max(finalists, key=lambda t: t.score) if finalists else None
+
+    def to_dict(self) -> dict:
+        best = self.best
+        return {
+            "rungs": self.rungs,
+            "evaluations": self.evaluations,
+            "cache_hits": self.cache_hits,
+            "run_time_seconds": self.run_time_seconds,
+            "best": best.to_dict() if best else None,
+            "trials": [t.to_dict() for t in sorted(self.trials, key=lambda t: (-t.rung, -t.score))],
+        }
+
+
+def sample_params(space: Dict[str, SettingBounds], rng: random.Random) -> dict:
+    """Draw one parameter set uniformly from the bounds."""
+    params = {}
+    for name, bounds in space.items():
+        if bounds.setting_type == "bool":
+            params[name] = rng.random() < 0.5
+        elif bounds.setting_type == "int":
+            params[name] = rng.randint(int(bounds.min_value), int(bounds.max_value))
+        else:
+            params[name] = round(rng.uniform(bounds.min_value, bounds.max_value), 2)
+    return params
+
+
+def summarize_result(result) -> dict:
+    """Metrics of one backtest run, as cached and scored."""
+    from src.backtesting.metrics import MetricsCalculator
+
+    summary = {"trades": len(result.trades), "final_equity": result.final_equity}
+    if result.trades:
+        metrics = MetricsCalculator().calculate(result)
+        summary.update({
+            "sharpe_ratio": metrics.sharpe_ratio,
+            "profit_factor": metrics.profit_factor,
+            "total_return_pct": metrics.total_return_pct,
+            "expectancy": metrics.expectancy,
+            "win_rate": metrics.win_rate,
+            "max_drawdown_pct": metrics.max_drawdown_pct,
+        })
+    return summary
+
+
+# ===================
+# Worker Process
+# ===================
+
+_WORKER: dict = {}
+
+
+def _init_worker(data: tuple, engine_class: type, isolate_db: bool) -> None:
+    """Pool initializer: keep candles in the worker."""
+    h4, h1, m5, cross_asset = data
+    _WORKER.update(
+        h4=h4, h1=h1, m5=m5, cross_asset=cross_asset, engine_class=engine_class,
+        isolate_db=isolate_db,
+        h4_ts=[c["timestamp"] for c in h4],
+        h1_ts=[c["timestamp"] for c in h1],
+        m5_ts=[c["timestamp"] for c in m5],
+    )
+
+
+@contextmanager
+def _fresh_isi_db():
+    """Point ISI writes at a new temp DB for one run, then delete it."""
+    import src.utils.database as db_module
+
+    fd, path = tempfile.mkstemp(prefix="optimizer_isi_", suffix=".db")
+    os.close(fd)
+    saved_db_path = db_module._db_path
+    db_module._db_path = Path(path)
+    try:
+        yield
+    finally:
+        db_module._db_path = saved_db_path
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            Path(path + suffix).unlink(missing_ok=True)
+
+
+def _evaluate_config(config: BacktestConfig, end_ts: float) -> dict:
+    """
+    Run one config on the candles up to end_ts (in a worker or inline).
+
+    ISI state starts empty for every run, so a result doesn't depend on
+    which configs the worker ran before (it is cached by config alone).
+    """
+    if _WORKER["isolate_db"]:
+        with _fresh_isi_db():
+            return _run_engine(config, end_ts)
+    return _run_engine(config, end_ts)
+
+
+def _run_engine(config: BacktestConfig, end_ts: float) -> dict:
+    """Slice the worker's candles at end_ts and summarize one engine run."""
+    m5 = _WORKER["m5"][:bisect_right(_WORKER["m5_ts"], end_ts)]
+    h1 = _WORKER["h1"][:bisect_right(_WORKER["h1_ts"], end_ts)]
+    h4 = _WORKER["h4"][:bisect_right(_WORKER["h4_ts"], end_ts)]
+    cross_asset = None
+    if _WORKER["cross_asset"]:
+        cross_asset = {inst: [c for c in candles if c["timestamp"] <= end_ts]
+                       for inst, candles in _WORKER["cross_asset"].items()}
+    try:
+        result = _WORKER["engine_class"]().run(h4, h1, m5, config, cross_asset_data=cross_asset)
+    except ValueError as e:
+        return {"trades": 0, "error": str(e)}
+    return summarize_result(result)
+
+
+# ===================
+# Optimizer
+# ===================
+
+class ParameterOptimizer:
+    """Random search over BacktestConfig parameters with successive halving."""
+
+    def __init__(
+        self,
+        h4_candles: list,
+        h1_candles: list,
+        m5_candles: list,
+        base_config: BacktestConfig,
+        space: Optional[Dict[str, SettingBounds]] = None,
+        objective: str = "sharpe",
+        min_trades: int = 10,
+        workers: Optional[int] = None,
+        cross_asset_data: Optional[Dict[str, list]] = None,
+        cache_path: Optional[Path] = None,
+        engine_class: type = SMCBacktestEngine,
+    ):
+        """
+        Args:
+            h4_candles / h1_candles / m5_candles: Full-period candles with 'timestamp'
+            base_config: Settings not being searched
+            space: {BacktestConfig field: bounds} (default: SEARCH_SPACE)
+            objective: Key of OBJECTIVES to maximize
+            min_trades: Trades required on the full period (scaled down on shorter rungs)
+            workers: Pool size (default: CPU count; 1 = inline)
+            cross_asset_data: {instrument: M5 candles} for ISI cross-asset
+            cache_path: JSON file persisting evaluations between runs
+            engine_class: Engine to run (SMCBacktestEngine or a subclass)
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}' (choose from {', '.join(OBJECTIVES)})")
+        if not m5_candles:
+            raise ValueError("No M5 candles to optimize on")
+
+        self.data = (h4_candles, h1_candles, m5_candles, cross_asset_data)
+        self.base_config = base_config
+        self.space = space or SEARCH_SPACE
+        self.objective = objective
+        self.min_trades = min_trades
+        self.engine_class = engine_class
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # Daemonic processes cannot start a pool (optimize jobs run non-daemonic)
+        self.workers = 1 if multiprocessing.current_process().daemon else max(1, workers)
+
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.cache: Dict[str, dict] = {}
+        if self.cache_path and self.cache_path.exists():
+            try:
+                self.cache = json.loads(self.cache_path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable optimizer cache {self.cache_path}: {e}")
+
+        # Evaluation period starts after the engine's warmup bars
+        warmup = max(base_config.ltf_lookback, 30)
+        self._first_ts = m5_candles[min(warmup, len(m5_candles) - 1)]["timestamp"]
+        self._last_ts = m5_candles[-1]["timestamp"]
+        self._fingerprint = [
+            base_config.instrument, len(h4_candles), len(h1_candles), len(m5_candles),
+            m5_candles[0]["timestamp"], self._last_ts, sorted(cross_asset_data or {}),
+        ]
+
+    # ---------- Keys & scores ----------
+
+    def config_for(self, params: dict, end_ts: Optional[float] = None) -> BacktestConfig:
+        """Base config with params applied (end_date moved to the rung's cutoff)."""
+        config = replace(self.base_config, **params)
+        if end_ts is not None and end_ts < self._last_ts:
+            config = replace(config, end_date=datetime.fromtimestamp(end_ts))
+        return config
+
+    def cache_key(self, params: dict, end_ts: float) -> str:
+        """Hash of everything that determines a run's result."""
+        payload = {
+            "config": asdict(self.config_for(params)),
+            "end_ts": end_ts,
+            "data": self._fingerprint,
+            "engine": f"{self.engine_class.__module__}.{self.engine_class.__qualname__}",
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+    def score(self, summary: dict, fraction: float) -> float:
+        """Objective value; -inf without enough trades for the period share."""
+        if summary.get("trades", 0) < max(1, math.ceil(self.min_trades * fraction)):
+            return float("-inf")
+        value = summary.get(OBJECTIVES[self.objective])
+        return float(value) if value is not None else float("-inf")
+
+    # ---------- Sweep ----------
+
+    def run(
+        self,
+        candidates: int = 27,
+        eta: int = 3,
+        rungs: int = 3,
+        seed: Optional[int] = 42,
+        include_base: bool = True,
+        progress_callback: Optional[Callable] = None,
+    ) -> OptimizationResult:
+        """
+        Sample candidates and race them with successive halving.
+
+        Args:
+            candidates: Parameter sets sampled for the first rung
+            eta: Keep the best 1/eta of each rung (rung periods grow by eta)
+            rungs: Number of rungs; the last one runs the full period
+            seed: Sampling seed (None = random)
+            include_base: Race the base config's own values as one candidate
+            progress_callback: Optional callback(current, total, message), called
+                after every engine run; an exception it raises (e.g. JobCancelled)
+                aborts the sweep and terminates the pool
+
+        Returns:
+            OptimizationResult (best = top final-rung trial)
+        """
+        start_time = _time.time()
+        rng = random.Random(seed)
+        fractions = [eta ** -(rungs - 1 - r) for r in range(rungs)]
+
+        trials = []
+        seen = set()
+        if include_base:
+            base_params = {name: getattr(self.base_config, name) for name in self.space}
+            trials.append(Trial(params=base_params))
+            seen.add(json.dumps(base_params, sort_keys=True))
+        attempts = 0
+        while len(trials) < candidates and attempts < candidates * 20:
+            attempts += 1
+            params = sample_params(self.space, rng)
+            key = json.dumps(params, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                trials.append(Trial(params=params))
+
+        result = OptimizationResult(trials=trials, rungs=fractions)
+        survivors = trials
+        total_runs = sum(max(1, math.ceil(len(trials) / eta ** r)) for r in range(rungs))
+        done_runs = 0
+
+        with self._executor() as run_configs:
+            for rung, fraction in enumerate(fractions):
+                end_ts = self._first_ts + (self._last_ts - self._first_ts) * fraction
+                message = f"Rung {rung + 1}/{rungs}: {len(survivors)} candidates"
+
+                def on_result(finished: int, base: int = done_runs, message: str = message) -> None:
+                    if progress_callback:
+                        progress_callback(base + finished, total_runs, message)
+
+                summaries = self._evaluate_rung(survivors, end_ts, result, run_configs, on_result)
+                for trial, summary in zip(survivors, summaries):
+                    trial.rung, trial.fraction = rung, fraction
+                    trial.summary = summary
+                    trial.score = self.score(summary, fraction)
+
+                done_runs += len(survivors)
+                if progress_callback:
+                    progress_callback(done_runs, total_runs, message)
+
+                ranked = sorted(survivors, key=lambda t: t.score, reverse=True)
+                logger.info(
+                    f"Optimizer rung {rung + 1}/{rungs} ({fraction:.0%} of period): "
+                    f"{len(survivors)} candidates, best {self.objective}={ranked[0].score:.3f}"
+                )
+                if rung < rungs - 1:
+                    keep = max(1, math.ceil(len(survivors) / eta))
+                    survivors = [t for t in ranked[:keep] if math.isfinite(t.score)] or ranked[:1]
+
+        self._save_cache()
+        result.run_time_seconds = _time.time() - start_time
+        best = result.best
+        logger.info(
+            f"Optimizer done: {result.evaluations} runs, {result.cache_hits} cached, "
+            f"{result.run_time_seconds:.1f}s, best {best.params if best else None}"
+        )
+        return result
+
+    def _evaluate_rung(self, trials: List[Trial], end_ts: float, result: OptimizationResult,
+                       run_configs: Callable, on_result: Callable) -> List[dict]:
+        """Summaries for trials at a cutoff, from the cache or fresh engine runs."""
+        keys = [self.cache_key(t.params, end_ts) for t in trials]
+        pending = {}
+        for trial, key in zip(trials, keys):
+            if key in self.cache:
+                result.cache_hits += 1
+            elif key not in pending:
+                pending[key] = self.config_for(trial.params, end_ts)
+
+        if pending:
+            for key, summary in zip(pending, run_configs(list(pending.values()), end_ts, on_result)):
+                self.cache[key] = summary
+            result.evaluations += len(pending)
+        return [self.cache[key] for key in keys]
+
+    @contextmanager
+    def _executor(self):
+        """
+        Yield run_configs(configs, end_ts, on_result) backed by a process pool or inline runs.
+
+        on_result(finished) is called after each run. If it (or a SIGTERM
+        handler) raises, queued runs are cancelled and the pool processes
+        killed, so no orphaned worker keeps running a backtest.
+        """
+        isolate_db = self.base_config.isi_sequence_tracker or self.base_config.isi_calibrator
+
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.data, self.engine_class, isolate_db),
+            )
+
+            def run_pooled(configs, end_ts, on_result):
+                futures = {pool.submit(_evaluate_config, config, end_ts): i for i, config in enumerate(configs)}
+                summaries = [None] * len(configs)
+                for finished, future in enumerate(as_completed(futures), 1):
+                    summaries[futures[future]] = future.result()
+                    on_result(finished)
+                return summaries
+
+            try:
+                yield run_pooled
+            except BaseException:
+                processes = list((pool._processes or {}).values())
+                pool.shutdown(wait=False, cancel_futures=True)
+                for process in processes:
+                    process.kill()  # Mid-backtest: they never read a shutdown request
+                for process in processes:
+                    process.join(5)
+                raise
+            else:
+                pool.shutdown()
+            return
+
+        def run_inline(configs, end_ts, on_result):
+            summaries = []
+            for config in configs:
+                summaries.append(_evaluate_config(config, end_ts))
+                on_result(len(summaries))
+            return summaries
+
+        # Inline: same worker code in this process
+        _init_worker(self.data, self.engine_class, isolate_db)
+        try:
+            yield run_inline
+        finally:
+            _WORKER.clear()
+
+    def _save_cache(self) -> None:
+        """Merge evaluations into the cache file and replace it atomically (jobs share it)."""
+        if not self.cache_path:
+            return
+        try:
+            merged = {}
+            if self.cache_path.exists():
+                try:
+                    merged = json.loads(self.cache_path.read_text())
+                except ValueError:
+                    pass  # Unreadable: rewritten from this sweep
+            merged.update(self.cache)
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_path.parent, prefix=f".{self.cache_path.name}.")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(merged, f, default=str)
+                os.replace(temp_path, self.cache_path)
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not save optimizer cache: {e}")
@@ -0,0 +1,428 @@
+"""
+Portfolio Backtest - Several instruments on one shared timeline.
+
+SMCBacktestEngine.run() simulates one instrument against its own equity,
+so account-level questions (shared equity, concurrent exposure, daily
+limits) needed separate runs stitched together by hand. The portfolio
+backtester advances every instrument's M5 bars in timestamp order in one
+process, using the engine's per-instrument steps, and applies the live
+account rules between them:
+
+- one cash balance: position sizing and P&L use the shared equity
+- max concurrent positions (open + pending limit orders), as live
+- max trades per UTC day, total and per instrument
+  (AutoExecutor._check_trade_limits)
+- daily drawdown stop on realized P&L (RiskManager.MAX_DAILY_DRAWDOWN)
+- optional cap on same-direction exposure per currency
+
+Account limits are checked before an instrument's bar is analyzed, so a
+saturated account skips the SMC pipeline entirely. Each instrument keeps
+its own candle indexes and HTF analysis cache for the whole run.
+
+Usage:
+    from src.backtesting.portfolio import PortfolioBacktester, PortfolioBacktestConfig
+
+    data = {inst: (h4, h1, m5) for inst, ...}
+    config = PortfolioBacktestConfig.from_live_config(
+        [BacktestConfig(instrument=inst, ...) for inst in data]
+    )
+    result = PortfolioBacktester().run(data, config)
+    metrics = MetricsCalculator().calculate(result.to_backtest_result())
+"""
+
+import heapq
+import time as _time
+from dataclasses import dataclass, field, replace
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional
+
+from src.backtesting.engine import (
+    BacktestConfig,
+    BacktestResult,
+    BacktestState,
+    InstrumentFeed,
+    SMCBacktestEngine,
+    TradeDirection,
+)
+from src.core.auto_config import load_auto_config
+from src.trading.risk_manager import RiskManager
+from src.utils.instrument_profiles import normalize_instrument_symbol
+from src.utils.logger import logger
+from src.utils import clock
+
+
+SECONDS_PER_DAY = 86400
+
+# Account-level skip reasons
+LIMIT_MAX_POSITIONS = "MAX_POSITIONS"
+LIMIT_DAILY_TRADES = "DAILY_TRADE_LIMIT"
+LIMIT_INSTRUMENT_TRADES = "INSTRUMENT_TRADE_LIMIT"
+LIMIT_DAILY_DRAWDOWN = "DAILY_DRAWDOWN_LIMIT"
+LIMIT_CURRENCY_EXPOSURE = "CURRENCY_EXPOSURE_LIMIT"
+
+
+@dataclass
+class PortfolioBacktestConfig:
+    """Instruments plus account-level rules for a portfolio backtest."""
+    instruments: List[BacktestConfig]
+    initial_capital: float = 10000.0
+    max_concurrent_positions: int = 5                 # Open positions + pending limit orders
+    max_daily_trades: Optional[int] = None            # Per UTC day (None = unlimited)
+    max_trades_per_instrument: Optional[int] = None   # Per instrument per UTC day
+    max_daily_drawdown: Optional[float] = RiskManager.MAX_DAILY_DRAWDOWN  # Realized loss / day-start equity
+    max_currency_exposure: Optional[int] = None       # Same-direction positions per currency
+
+    @classmethod
+    def from_live_config(
+        cls,
+        instruments: List[BacktestConfig],
+        live_config=None,
+        **overrides,
+    ) -> "PortfolioBacktestConfig":
+        """Account limits from the live auto-trading config (active learning-mode limits)."""
+        live = live_config or load_auto_config()
+        max_daily, max_per_instrument = live.get_active_trade_limits()
+        settings = {
+            "max_concurrent_positions": live.max_concurrent_positions,
+            "max_daily_trades": max_daily,
+            "max_trades_per_instrument": max_per_instrument,
+        }
+        settings.update(overrides)
+        return cls(instruments=instruments, **settings)
+
+
+@dataclass
+class PortfolioBacktestResult:
+    """Portfolio backtest result with per-instrument attribution."""
+    config: PortfolioBacktestConfig
+    results: Dict[str, BacktestResult]  # Per instrument: its trades and signal stats
+    trades: list                        # All closed trades, in exit order
+    equity_curve: list
+    initial_equity: float
+    final_equity: float
+    total_bars: int                     # Timeline slots (distinct M5 timestamps)
+    limit_skips: dict = field(default_factory=dict)  # Analyses skipped by account limits
+    peak_positions: int = 0
+    run_time_seconds: float = 0.0
+
+    def to_backtest_result(self) -> BacktestResult:
+        """The whole portfolio as one BacktestResult (for MetricsCalculator / ReportGenerator)."""
+        first = self.config.instruments[0]
+        skip_reasons: Dict[str, int] = dict(self.limit_skips)
+        for result in self.results.values():
+            for reason, count in result.skip_reasons.items():
+                skip_reasons[reason] = skip_reasons.get(reason, 0) + count
+        return BacktestResult(
+            config=replace(first, instrument="PORTFOLIO", initial_capital=self.initial_equity),
+            trades=self.trades,
+            equity_curve=self.equity_curve,
+            initial_equity=self.initial_equity,
+            final_equity=self.final_equity,
+            total_bars=self.total_bars,
+            bars_analyzed=sum(r.bars_analyzed for r in self.results.values()),
+            signals_generated=sum(r.signals_generated for r in self.results.values()),
+            signals_skipped=sum(r.signals_skipped for r in self.results.values()),
+            run_time_seconds=self.run_time_seconds,
+            skip_reasons=skip_reasons,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "instruments": list(self.results),
+            "results": {inst: r.to_dict() for inst, r in self.results.items()},
+            "trades": [t.to_dict() for t in self.trades],
+            "equity_curve": self.equity_curve,
+            "initial_equity": self.initial_equity,
+            "final_equity": self.final_equity,
+            "total_bars": self.total_bars,
+            "limit_skips": self.limit_skips,
+            "peak_positions": self.peak_positions,
+            "run_time_seconds": self.run_time_seconds,
+        }
+
+
+@dataclass
+class _Book:
+    """One instrument's simulation state inside the portfolio."""
+    config: BacktestConfig
+    feed: InstrumentFeed
+    state: BacktestState
+    start_bar: int
+    last_candle: Optional[dict] = None
+
+    @property
+    def busy(self) -> bool:
+        return self.state.open_position is not None or self.state.pending_order is not None
+
+    @property
+    def direction(self) -> Optional[TradeDirection]:
+        if self.state.open_position is not None:
+            return self.state.open_position.direction
+        if self.state.pending_order is not None:
+            return self.state.pending_order.signal["direction"]
+        return None
+
+
+def currency_legs(instrument: str, direction: TradeDirection) -> List[tuple]:
+    """(currency, +1 long / -1 short) legs of a position; non-FX symbols are one leg."""
+    sign = 1 if direction == TradeDirection.LONG else -1
+    parts = normalize_instrument_symbol(instrument).split("_")
+    if len(parts) == 2:
+        return [(parts[0], sign), (parts[1], -sign)]
+    return [(parts[0], sign)]
+
+
+@dataclass
+class _Account:
+    """Shared cash and the live daily counters."""
+    config: PortfolioBacktestConfig
+    cash: float
+    day: int = -1
+    day_start_cash: float = 0.0
+    day_pnl: float = 0.0
+    trades_today: Dict[str, int] = field(default_factory=dict)
+
+    def roll_day(self, timestamp: int) -> None:
+        day = timestamp // SECONDS_PER_DAY
+        if day != self.day:
+            self.day = day
+            self.day_start_cash = self.cash
+            self.day_pnl = 0.0
+            self.trades_today = {}
+
+    def block_reason(self, instrument: str, books: List[_Book]) -> Optional[str]:
+        """Account rule that forbids a new entry right now (checked before analysis)."""
+        config = self.config
+        if (config.max_daily_drawdown is not None and self.day_pnl < 0
+                and -self.day_pnl >= config.max_daily_drawdown * self.day_start_cash):
+            return LIMIT_DAILY_DRAWDOWN
+        if config.max_daily_trades is not None and sum(self.trades_today.values()) >= config.max_daily_trades:
+            return LIMIT_DAILY_TRADES
+        if (config.max_trades_per_instrument is not None
+                and self.trades_today.get(instrument, 0) >= config.max_trades_per_instrument):
+            return LIMIT_INSTRUMENT_TRADES
+        if sum(1 for b in books if b.busy) >= config.max_concurrent_positions:
+            return LIMIT_MAX_POSITIONS
+        return None
+
+    def exposure_reason(self, instrument: str, direction: TradeDirection, books: List[_Book]) -> Optional[str]:
+        """Currency exposure check, once the signal's direction is known."""
+        limit = self.config.max_currency_exposure
+        if limit is None:
+            return None
+        exposure: Dict[tuple, int] = {}
+        for book in books:
+            if book.busy:
+                for leg in currency_legs(book.config.instrument, book.direction):
+                    exposure[leg] = exposure.get(leg, 0) + 1
+        for leg in currency_legs(instrument, direction):
+            if exposure.get(leg, 0) >= limit:
+                return LIMIT_CURRENCY_EXPOSURE
+        return None
+
+
+def _bar_events(k: int, book: _Book):
+    """(timestamp, book index, bar index) for each simulated bar of one instrument."""
+    candles = book.feed.m5_candles
+    for i in range(book.start_bar, len(candles)):
+        yield candles[i]["timestamp"], k, i
+
+
+class PortfolioBacktester:
+    """Runs SMCBacktestEngine's per-instrument steps across a portfolio."""
+
+    def __init__(self, engine: Optional[SMCBacktestEngine] = None):
+        self.engine = engine or SMCBacktestEngine()
+
+    def run(
+        self,
+        data: Dict[str, tuple],
+        config: PortfolioBacktestConfig,
+        progress_callback: Optional[Callable] = None,
+    ) -> PortfolioBacktestResult:
+        """
+        Run all instruments on one timeline with shared equity.
+
+        Args:
+            data: {instrument: (h4_candles, h1_candles, m5_candles)}
+            config: Instruments and account rules
+            progress_callback: Optional callback(current, total, message)
+
+        Returns:
+            PortfolioBacktestResult
+        """
+        start_time = _time.time()
+        engine = self.engine
+        account = _Account(config=config, cash=config.initial_capital)
+
+        books: List[_Book] = []
+        for inst_config in config.instruments:
+            instrument = inst_config.instrument
+            h4, h1, m5 = data[instrument]
+            start_bar = max(inst_config.ltf_lookback, 30)
+            if len(m5) < start_bar + 10:
+                raise ValueError(
+                    f"Not enough M5 data for {instrument}: {len(m5)} bars, "
+                    f"need at least {start_bar + 10}"
+                )
+            cross_asset_data = None
+            if inst_config.isi_cross_asset:
+                cross_asset_data = {other: bars[2] for other, bars in data.items() if other != instrument}
+            books.append(_Book(
+                config=inst_config,
+                feed=engine._build_feed(h4, h1, m5, inst_config, cross_asset_data),
+                state=BacktestState(equity=config.initial_capital, cash=config.initial_capital),
+                start_bar=start_bar,
+            ))
+
+        # Shared timeline: every instrument's bars merged by timestamp
+        timeline = heapq.merge(*[_bar_events(k, book) for k, book in enumerate(books)])
+        total_slots = len({
+            c["timestamp"] for book in books for c in book.feed.m5_candles[book.start_bar:]
+        })
+
+        logger.info(
+            f"Portfolio backtest starting: {len(books)} instruments, "
+            f"{total_slots} timeline bars, max {config.max_concurrent_positions} positions"
+        )
+
+        limit_skips: Dict[str, int] = {}
+        equity_curve = []
+        closed = []
+        peak_positions = 0
+
+        # Production code reads the bar time from the clock (heat map decay, risk resets, ...)
+        with clock.replay(thread_only=True) as replay:
+            for slot, (timestamp, group) in enumerate(groupby(timeline, key=itemgetter(0))):
+                replay.set_timestamp(timestamp)
+                bars = [(books[k], i) for _, k, i in group]
+                account.roll_day(timestamp)
+
+                if progress_callback and slot % 500 == 0:
+                    progress_callback(slot + 1, total_slots, f"Bar {slot + 1}/{total_slots}")
+
+                # Exits first, so slots and P&L freed on this bar count for entries
+                for book, i in bars:
+                    candle = book.feed.m5_candles[i]
+                    book.last_candle = candle
+                    if book.state.open_position:
+                        self._sync_in(book, account)
+                        trade = engine._step_position(book.state, candle, book.config)
+                        if trade:
+                            self._settle(book, account, trade, closed)
+
+                # Pending limit fills (slot already reserved when the order was placed)
+                for book, i in bars:
+                    if book.state.pending_order and book.state.open_position is None:
+                        self._sync_in(book, account)
+                        engine._step_pending(book.state, i, book.feed.m5_candles[i], book.config)
+
+                # New entries, gated by the account rules
+                for book, i in bars:
+                    inst_config = book.config
+                    trade_time_ok = book.feed.trade_time_ok
+                    if (book.busy
+                            or i % inst_config.signal_interval != 0
+                            or (trade_time_ok is not None and not trade_time_ok[i])):
+                        continue
+
+                    reason = account.block_reason(inst_config.instrument, books)
+                    if reason is None:
+                        self._sync_in(book, account)
+                        signal = engine._evaluate_bar(book.feed, i, book.state, inst_config)
+                        if not signal:
+                            continue
+                        reason = account.exposure_reason(inst_config.instrument, signal["direction"], books)
+                        if reason is None:
+                            engine._enter_from_signal(book.state, i, book.feed.m5_candles[i], signal, inst_config)
+                            if book.busy:
+                                account.trades_today[inst_config.instrument] = (
+                                    account.trades_today.get(inst_config.instrument, 0) + 1
+                                )
+                            continue
+                    limit_skips[reason] = limit_skips.get(reason, 0) + 1
+
+                # Portfolio equity: shared cash + every open position marked to its last bar
+                open_books = [b for b in books if b.state.open_position is not None]
+                peak_positions = max(peak_positions, len(open_books))
+                if slot % 12 == 0 or open_books:
+                    equity = account.cash + sum(
+                        engine._unrealized_pnl(b.state.open_position, b.last_candle, b.config)
+                        for b in open_books
+                    )
+                    equity_curve.append({
+                        "time": bars[0][0].feed.m5_candles[bars[0][1]]["time"],
+                        "equity": equity,
+                        "cash": account.cash,
+                        "has_position": bool(open_books),
+                        "positions": len(open_books),
+                    })
+
+        # Close remaining positions at each instrument's last price
+        for book in books:
+            if book.state.open_position:
+                self._sync_in(book, account)
+                trade = engine._close_at_end(book.state, book.feed.m5_candles[-1], book.config)
+                self._settle(book, account, trade, closed)
+
+        run_time = _time.time() - start_time
+        results = {
+            book.config.instrument: self._instrument_result(book, config, run_time)
+            for book in books
+        }
+
+        logger.info(
+            f"Portfolio backtest complete: {len(closed)} trades across {len(books)} instruments, "
+            f"final equity {account.cash:.2f}, {run_time:.1f}s"
+        )
+
+        return PortfolioBacktestResult(
+            config=config,
+            results=results,
+            trades=closed,
+            equity_curve=equity_curve,
+            initial_equity=config.initial_capital,
+            final_equity=account.cash,
+            total_bars=total_slots,
+            limit_skips=limit_skips,
+            peak_positions=peak_positions,
+            run_time_seconds=run_time,
+        )
+
+    # ---------- Helpers ----------
+
+    @staticmethod
+    def _sync_in(book: _Book, account: _Account) -> None:
+        """Point the instrument's state at the shared equity before an engine step."""
+        book.state.cash = account.cash
+        book.state.equity = account.cash
+
+    @staticmethod
+    def _settle(book: _Book, account: _Account, trade, closed: list) -> None:
+        """Book a closed trade's P&L into the shared account."""
+        account.cash += trade.pnl
+        account.day_pnl += trade.pnl
+        book.state.cash = book.state.equity = account.cash
+        closed.append(trade)
+
+    @staticmethod
+    def _instrument_result(
+        book: _Book, config: PortfolioBacktestConfig, run_time: float
+    ) -> BacktestResult:
+        """P&L attribution for one instrument (its equity is the portfolio's)."""
+        state = book.state
+        total_bars = len(book.feed.m5_candles)
+        return BacktestResult(
+            config=replace(book.config, initial_capital=config.initial_capital),
+            trades=state.closed_trades,
+            equity_curve=[],
+            initial_equity=config.initial_capital,
+            final_equity=config.initial_capital + sum(t.pnl for t in state.closed_trades),
+            total_bars=total_bars,
+            bars_analyzed=total_bars - book.start_bar,
+            signals_generated=state.signals_generated,
+            signals_skipped=state.signals_skipped,
+            run_time_seconds=run_time,
+            skip_reasons=state.skip_reasons,
+        )
@@ -5,9 +5,11 @@ Prepares data for visualization and saves/loads reports.
 """
 
 import json
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional
 
 from .engine import BacktestResult
@@ -42,8 +44,9 @@ class BacktestReport:
             "instrument": self.instrument,
             "timeframe": self.timeframe,
             "date_range": self.date_range,
-            "result": self.result.to_dict(),
-            "metrics": self.metrics.to_dict(),
+            # Loaded reports keep result/metrics as raw dicts
+            "result": self.result.to_dict() if hasattr(self.result, "to_dict") else self.result,
+            "metrics": self.metrics.to_dict() if hasattr(self.metrics, "to_dict") else self.metrics,
             "equity_chart": self.equity_chart,
             "drawdown_chart": self.drawdown_chart,
             "trade_distribution": self.trade_distribution,
@@ -132,6 +135,30 @@ class ReportGenerator:
             monthly_returns=monthly_returns,
         )
 
+    @classmethod
+    def charts_from_dict(cls, result: dict) -> dict:
+        """
+        Chart series from a serialized result (BacktestResult.to_dict() shape).
+
+        Used for catalogued runs, which store trades/equity but not charts.
+        """
+        trades = [
+            SimpleNamespace(**{**t, "direction": SimpleNamespace(value=t.get("direction"))})
+            for t in result.get("trades", [])
+        ]
+        view = SimpleNamespace(
+            trades=trades,
+            equity_curve=result.get("equity_curve", []),
+            initial_equity=result.get("initial_equity", 0.0),
+        )
+        generator = cls()
+        return {
+            "equity_chart": generator._prepare_equity_chart(view),
+            "drawdown_chart": generator._prepare_drawdown_chart(view),
+            "trade_distribution": generator._prepare_trade_distribution(view),
+            "monthly_returns": generator._prepare_monthly_returns(view),
+        }
+
     def _prepare_equity_chart(self, result: BacktestResult) -> dict:
         """Prepare equity curve data for Plotly line chart."""
         equity_curve = result.equity_curve
@@ -294,28 +321,26 @@ class ReportGenerator:
             "heatmap_data": heatmap_data,
         }
 
-    def list_saved_reports(self, directory: str = "data/backtests") -> list[dict]:
-        """List all saved reports in directory."""
-        path = Path(directory)
-        if not path.exists():
-            return []
-
-        reports = []
-        for filepath in path.glob("*.json"):
-            try:
-                with open(filepath, "r") as f:
-                    data = json.load(f)
-                    reports.append({
-                        "filename": filepath.name,
-                        "report_id": data.get("report_id", ""),
-                        "instrument": data.get("instrument", ""),
-                        "timeframe": data.get("timeframe", ""),
-                        "date_range": data.get("date_range", ""),
-                        "created_at": data.get("created_at", ""),
-                    })
-            except Exception:
-                continue
+    def list_saved_reports(self, directory: str = "data/backtests", limit: int = 1000) -> list[dict]:
+        """
+        List saved reports in directory, newest first.
 
-        # Sort by created_at descending
-        reports.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return reports
+        Served from the result catalog: only files that are new or changed
+        since the last call are parsed.
+        """
+        from .catalog import ResultCatalog
+
+        catalog = ResultCatalog()
+        catalog.import_directory(directory)
+        prefix = os.path.join(str(Path(directory).resolve()), "")
+        return [
+            {
+                "filename": Path(run["source_path"]).name,
+                "report_id": run["run_id"][len("file_"):],
+                "instrument": run["instrument"] or "",
+                "timeframe": run["timeframe"] or "",
+                "date_range": f"{(run['start_date'] or '')[:10]} to {(run['end_date'] or '')[:10]}",
+                "created_at": run["created_at"] or "",
+            }
+            for run in catalog.list_runs(source="file", source_prefix=prefix, limit=limit)
+        ]
@@ -99,6 +99,9 @@ class AIOverrideConfig:
         "disable_setting_after_losses": 3,
     })
 
+    # Approximate token cap for knowledge chunks in the prompt (0 = none)
+    knowledge_token_budget: int = 600
+
 
 @dataclass
 class MarketRegimeConfig:
@@ -168,6 +171,10 @@ class SmartIntervalConfig:
     - News blocking: 120s (no point scanning during high-impact news)
     - Active market: 30s (signals found, faster reaction needed)
     - Quiet market: 90s (nothing happening, save resources)
+
+    With bar_aligned, full scans run only after M5 closes (plus
+    bar_settle_seconds); the interval then paces intra-bar housekeeping and
+    rechecks of instruments blocked by spread/session/news.
     """
     enabled: bool = True
     base_interval_seconds: int = 60  # M5 timeframe default
@@ -180,6 +187,10 @@ class SmartIntervalConfig:
     quiet_market_interval: int = 90    # No signals for multiple scans
     quiet_threshold_scans: int = 5     # Scans without signals = quiet
 
+    # Bar-close alignment
+    bar_aligned: bool = True
+    bar_settle_seconds: float = 2.0
+
 
 @dataclass
 class SelfUpgradeConfig:
@@ -198,6 +209,11 @@ class SelfUpgradeConfig:
         "consecutive_losses": 5,
         "max_block_rate": 50.0
     })
+    # Run AI-generated filters in worker processes with per-call deadlines
+    sandbox_filters: bool = False
+    sandbox_workers: int = 2
+    sandbox_timeout_ms: int = 250
+    sandbox_latency_budget_ms: int = 50
 
 
 @dataclass
@@ -497,7 +513,8 @@ class AutoTradingConfig:
                 max_overrides_per_day=ai_override_data.get("max_overrides_per_day", 10),
                 cooldown_after_loss_minutes=ai_override_data.get("cooldown_after_loss_minutes", 30),
                 adjustable_settings=ai_override_data.get("adjustable_settings", AIOverrideConfig().adjustable_settings),
-                learning=ai_override_data.get("learning", AIOverrideConfig().learning)
+                learning=ai_override_data.get("learning", AIOverrideConfig().learning),
+                knowledge_token_budget=ai_override_data.get("knowledge_token_budget", 600),
             )
         else:
             ai_override = AIOverrideConfig()
@@ -542,7 +559,11 @@ class AutoTradingConfig:
                 min_trades_for_analysis=self_upgrade_data.get("min_trades_for_analysis", 20),
                 max_proposals_per_cycle=self_upgrade_data.get("max_proposals_per_cycle", 3),
                 min_robustness_score=self_upgrade_data.get("min_robustness_score", 60.0),
-                auto_rollback_threshold=self_upgrade_data.get("auto_rollback_threshold", SelfUpgradeConfig().auto_rollback_threshold)
+                auto_rollback_threshold=self_upgrade_data.get("auto_rollback_threshold", SelfUpgradeConfig().auto_rollback_threshold),
+                sandbox_filters=self_upgrade_data.get("sandbox_filters", False),
+                sandbox_workers=self_upgrade_data.get("sandbox_workers", 2),
+                sandbox_timeout_ms=self_upgrade_data.get("sandbox_timeout_ms", 250),
+                sandbox_latency_budget_ms=self_upgrade_data.get("sandbox_latency_budget_ms", 50),
             )
         else:
             self_upgrade = SelfUpgradeConfig()
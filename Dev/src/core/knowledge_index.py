@@ -0,0 +1,277 @@
+"""
+Knowledge Index - BM25 retrieval over knowledge and skill files.
+
+get_full_system_prompt() pastes every knowledge file into each prompt, so
+prompt size grows with the knowledge base and lessons.md. KnowledgeIndex
+splits the markdown files into heading/paragraph chunks and ranks them
+with BM25, so a prompt can carry only the chunks relevant to one
+instrument/setup:
+
+    index = KnowledgeIndex({"knowledge": knowledge_dir, "skills": skills_dir})
+    chunks = index.search("EUR_USD liquidity sweep fvg london", top_k=6, token_budget=1500)
+    text = format_chunks(chunks)
+
+Files are re-chunked only when their mtime/size changes; search() checks
+the directories on every call (one stat per file).
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.logger import logger
+
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+MAX_CHUNK_CHARS = 1200
+CHARS_PER_TOKEN = 4  # Rough token estimate for budgets
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_HEADING_RE = re.compile(r"^(#{1,4})\s+(.*)$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; EUR_USD also yields eur and usd."""
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        tokens.append(word)
+        if "_" in word:
+            tokens.extend(part for part in word.split("_") if part)
+    return tokens
+
+
+@dataclass
+class KnowledgeChunk:
+    """One retrievable piece of a knowledge or skill file."""
+    source: str              # Directory key ("knowledge", "skills")
+    name: str                # File stem
+    heading: str             # Nearest heading above the chunk
+    text: str
+    terms: Counter = field(default_factory=Counter, repr=False)
+    length: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def chunk_markdown(text: str, max_chars: int = MAX_CHUNK_CHARS) -> List[tuple]:
+    """
+    Split markdown into (heading, text) chunks.
+
+    Chunks break at headings and are packed from paragraphs up to max_chars
+    (a single longer paragraph stays whole).
+    """
+    chunks = []
+    heading = ""
+    paragraphs: List[str] = []
+
+    def flush():
+        current = ""
+        for paragraph in paragraphs:
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append((heading, current))
+                current = paragraph
+            else:
+                current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append((heading, current))
+        paragraphs.clear()
+
+    block: List[str] = []
+    for line in text.splitlines():
+        match = _HEADING_RE.match(line)
+        if match:
+            if block:
+                paragraphs.append("\n".join(block).strip())
+                block = []
+            flush()
+            heading = match.group(2).strip()
+        elif line.strip():
+            block.append(line)
+        elif block:
+            paragraphs.append("\n".join(block).strip())
+            block = []
+    if block:
+        paragraphs.append("\n".join(block).strip())
+    flush()
+    return chunks
+
+
+class KnowledgeIndex:
+    """BM25 chunk index over markdown directories, refreshed by file mtime."""
+
+    def __init__(self, directories: Dict[str, Path], max_chunk_chars: int = MAX_CHUNK_CHARS):
+        """
+        Args:
+            directories: {source name: directory of *.md files}
+            max_chunk_chars: Target chunk size
+        """
+        self.directories = {source: Path(path) for source, path in directories.items()}
+        self.max_chunk_chars = max_chunk_chars
+
+        self._files: Dict[Path, tuple] = {}                   # path -> (mtime, size)
+        self._chunks: Dict[Path, List[KnowledgeChunk]] = {}
+        self._df: Counter = Counter()                         # term -> chunks containing it
+        self._total_length = 0
+        self._chunk_count = 0
+        self._lock = threading.Lock()
+
+    # ---------- Indexing ----------
+
+    def refresh(self) -> int:
+        """
+        Re-index new, changed and deleted files.
+
+        Returns:
+            Number of files re-indexed or removed
+        """
+        seen = {}
+        for source, directory in self.directories.items():
+            if not directory.exists():
+                continue
+            for path in directory.glob("*.md"):
+                if path.name == "README.md":
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                seen[path] = (source, (stat.st_mtime, stat.st_size))
+
+        changed = 0
+        with self._lock:
+            for path in [p for p in self._files if p not in seen]:
+                self._remove(path)
+                changed += 1
+            for path, (source, signature) in seen.items():
+                if self._files.get(path) == signature:
+                    continue
+                self._remove(path)
+                try:
+                    text = path.read_text(encoding="utf-8")
+                except OSError as e:
+                    logger.warning(f"Could not index {path.name}: {e}")
+                    continue
+                self._add(path, source, text)
+                self._files[path] = signature
+                changed += 1
+        if changed:
+            logger.debug(f"Knowledge index refreshed: {changed} files, {self._chunk_count} chunks")
+        return changed
+
+    def _add(self, path: Path, source: str, text: str) -> None:
+        chunks = []
+        for heading, body in chunk_markdown(text, self.max_chunk_chars):
+            # Headings and file names are part of what a chunk is about
+            terms = Counter(tokenize(f"{path.stem} {heading} {body}"))
+            chunk = KnowledgeChunk(source, path.stem, heading, body, terms, sum(terms.values()))
+            chunks.append(chunk)
+            self._df.update(terms.keys())
+            self._total_length += chunk.length
+        self._chunks[path] = chunks
+        self._chunk_count += len(chunks)
+
+    def _remove(self, path: Path) -> None:
+        self._files.pop(path, None)
+        for chunk in self._chunks.pop(path, []):
+            self._df.subtract(chunk.terms.keys())
+            self._total_length -= chunk.length
+            self._chunk_count -= 1
+        self._df += Counter()  # Drop terms no longer present
+
+    # ---------- Search ----------
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 6,
+        token_budget: Optional[int] = None,
+        sources: Optional[Iterable[str]] = None,
+        names: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> List[KnowledgeChunk]:
+        """
+        Most relevant chunks for a query.
+
+        Args:
+            query: Free text (instrument, setup, skip reason, ...)
+            top_k: Maximum chunks returned
+            token_budget: Stop before the chunks' estimated tokens exceed this
+            sources: Only these directory keys (None = all)
+            names: {source: allowed file stems} to restrict a source
+
+        Returns:
+            Chunks by descending BM25 score (score > 0 only)
+        """
+        self.refresh()
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return []
+
+        allowed_sources = set(sources) if sources is not None else None
+        allowed_names = {src: set(stems) for src, stems in (names or {}).items()}
+
+        with self._lock:
+            n = self._chunk_count
+            if n == 0:
+                return []
+            avg_length = self._total_length / n
+            idf = {
+                term: math.log(1 + (n - self._df[term] + 0.5) / (self._df[term] + 0.5))
+                for term in query_terms if self._df.get(term)
+            }
+            scored = []
+            for chunks in self._chunks.values():
+                for chunk in chunks:
+                    if allowed_sources is not None and chunk.source not in allowed_sources:
+                        continue
+                    if chunk.source in allowed_names and chunk.name not in allowed_names[chunk.source]:
+                        continue
+                    score = 0.0
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * chunk.length / avg_length)
+                    for term, weight in idf.items():
+                        tf = chunk.terms.get(term)
+                        if tf:
+                            score += weight * tf * (BM25_K1 + 1) / (tf + norm)
+                    if score > 0:
+                        scored.append((score, chunk))
+
+        scored.sort(key=lambda item: -item[0])
+        results: List[KnowledgeChunk] = []
+        used = 0
+        for _, chunk in scored:
+            if len(results) >= top_k:
+                break
+            if token_budget is not None and used + chunk.tokens > token_budget:
+                continue
+            results.append(chunk)
+            used += chunk.tokens
+        return results
+
+    def get_stats(self) -> dict:
+        return {
+            "files": len(self._files),
+            "chunks": self._chunk_count,
+            "terms": len(self._df),
+        }
+
+
+def format_chunks(chunks: List[KnowledgeChunk]) -> str:
+    """Prompt text for retrieved chunks."""
+    parts = []
+    for chunk in chunks:
+        title = f"{chunk.name} / {chunk.heading}" if chunk.heading else chunk.name
+        parts.append(f"### {title}\n\n{chunk.text}")
+    return "\n\n".join(parts)
@@ -12,13 +12,21 @@ Usage:
 
     # Get all knowledge
     knowledge = settings_manager.get_all_knowledge()
+
+    # Prompt with only the knowledge relevant to a setup
+    prompt = settings_manager.get_relevant_system_prompt("EUR_USD LONG liquidity sweep")
 """
 
 import json
 from pathlib import Path
 from typing import Optional
+from src.core.knowledge_index import KnowledgeIndex, format_chunks
 from src.utils.logger import logger
 
+# Retrieval defaults (overridable under "knowledge" in config.json)
+DEFAULT_RETRIEVAL_TOP_K = 6
+DEFAULT_RETRIEVAL_TOKEN_BUDGET = 1500
+
 
 class SettingsManager:
     """Manages AI settings, skills, and knowledge base."""
@@ -43,6 +51,10 @@ class SettingsManager:
         self._system_prompt = None
         self._skills_cache = {}
         self._knowledge_cache = {}
+        self.knowledge_index = KnowledgeIndex({
+            "knowledge": self.knowledge_dir,
+            "skills": self.skills_dir,
+        })
 
         self._load_config()
         logger.info(f"SettingsManager initialized: {self.settings_dir}")
@@ -219,8 +231,7 @@ class SettingsManager:
 
         # Add enabled skills
         if include_skills is None:
-            include_skills = self.get_config("skills.enabled", [])
-            include_skills.extend(self.get_config("skills.custom", []))
+            include_skills = self._enabled_skills()
 
         for skill_name in include_skills:
             skill_content = self.get_skill(skill_name)
@@ -236,6 +247,66 @@ class SettingsManager:
 
         return "\n".join(parts)
 
+    def _enabled_skills(self) -> list[str]:
+        return list(self.get_config("skills.enabled", [])) + list(self.get_config("skills.custom", []))
+
+    def get_relevant_knowledge(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        include_skills: list[str] = None
+    ) -> str:
+        """
+        Knowledge and skill chunks most relevant to a query.
+
+        Args:
+            query: Instrument, direction, setup features, skip reason, ...
+            top_k: Max chunks (default: knowledge.top_k from config)
+            token_budget: Approximate token cap (default: knowledge.token_budget)
+            include_skills: Skills that may contribute (None = enabled skills)
+
+        Returns:
+            Formatted chunks ("" if nothing matches)
+        """
+        if top_k is None:
+            top_k = self.get_config("knowledge.top_k", DEFAULT_RETRIEVAL_TOP_K)
+        if token_budget is None:
+            token_budget = self.get_config("knowledge.token_budget", DEFAULT_RETRIEVAL_TOKEN_BUDGET)
+        if include_skills is None:
+            include_skills = self._enabled_skills()
+
+        chunks = self.knowledge_index.search(
+            query,
+            top_k=top_k,
+            token_budget=token_budget,
+            names={"skills": include_skills},
+        )
+        return format_chunks(chunks)
+
+    def get_relevant_system_prompt(self, query: str, include_skills: list[str] = None) -> str:
+        """
+        System prompt with only the knowledge relevant to a query.
+
+        Falls back to get_full_system_prompt() when knowledge.retrieval is
+        off in config.json.
+
+        Args:
+            query: Instrument, direction and setup description
+            include_skills: Skills that may contribute (None = enabled skills)
+
+        Returns:
+            Prompt string
+        """
+        if not self.get_config("knowledge.retrieval", True):
+            return self.get_full_system_prompt(include_skills)
+
+        parts = [self.get_system_prompt()]
+        relevant = self.get_relevant_knowledge(query, include_skills=include_skills)
+        if relevant:
+            parts.append(f"\n\n---\n\n## Relevant Knowledge\n\n{relevant}")
+        return "\n".join(parts)
+
     def reload(self) -> None:
         """Reload all settings from disk."""
         self._config = None
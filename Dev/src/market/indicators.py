@@ -14,6 +14,7 @@ from typing import Optional
 from dataclasses import dataclass
 
 from src.utils.logger import logger
+from src.utils.latency import Stopwatch
 
 
 @dataclass
@@ -137,6 +138,8 @@ class TechnicalAnalyzer:
         Returns:
             TechnicalAnalysis result
         """
+        sw = Stopwatch("technical")
+
         # Convert to DataFrame
         df = pd.DataFrame(candles)
         df['time'] = pd.to_datetime(df['time'])
@@ -146,6 +149,8 @@ class TechnicalAnalyzer:
         for col in ['open', 'high', 'low', 'close', 'volume']:
             df[col] = pd.to_numeric(df[col])
 
+        sw.lap("frame")
+
         current_price = df['close'].iloc[-1]
         # Crypto pairs use whole dollar, JPY has 2 decimals, standard forex has 4
         if "BTC" in instrument or "ETH" in instrument:
@@ -174,6 +179,7 @@ class TechnicalAnalyzer:
         bbands = ta.bbands(df['close'], length=20, std=2)
         if bbands is not None:
             df = pd.concat([df, bbands], axis=1)
+        sw.lap("indicators")
 
         # Get latest values
         ema20 = df['ema20'].iloc[-1]
@@ -237,6 +243,7 @@ class TechnicalAnalyzer:
             trend, trend_strength, rsi, macd_hist,
             price_vs_ema20, dist_support, dist_resistance
         )
+        sw.lap("structure_regime")
 
         return TechnicalAnalysis(
             trend=trend,
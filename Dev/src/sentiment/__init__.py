@@ -15,9 +15,12 @@ Usage:
 
 from src.sentiment.aggregator import SentimentAggregator, EnhancedSentimentResult
 from src.sentiment.base_provider import BaseSentimentProvider
+from src.sentiment.cache import SentimentCache, sentiment_cache
 
 __all__ = [
     "SentimentAggregator",
     "EnhancedSentimentResult",
     "BaseSentimentProvider",
+    "SentimentCache",
+    "sentiment_cache",
 ]
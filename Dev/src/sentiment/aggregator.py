@@ -7,6 +7,10 @@ Weights:
 - VIX Correlation: 15%
 - Economic Calendar: 20%
 
+Providers are queried concurrently through the shared stale-while-revalidate
+cache: warm scans never wait on a provider, cold scans wait at most the
+provider's deadline (see BaseSentimentProvider.get_deadline_seconds).
+
 Usage:
     from src.sentiment.aggregator import SentimentAggregator
 
@@ -14,11 +18,14 @@ Usage:
     result = aggregator.get_combined_sentiment("EUR_USD")
 """
 
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 
 from src.sentiment.base_provider import BaseSentimentProvider, ProviderSentiment
+from src.sentiment.cache import SentimentCache, sentiment_cache
 from src.sentiment.providers.news_provider import NewsProvider
 from src.sentiment.providers.vix_provider import VIXProvider
 from src.sentiment.providers.calendar_provider import CalendarProvider
@@ -89,7 +96,9 @@ class SentimentAggregator:
         weights: Optional[dict] = None,
         enable_news: bool = True,
         enable_vix: bool = True,
-        enable_calendar: bool = True
+        enable_calendar: bool = True,
+        cache: Optional[SentimentCache] = None,
+        deadline_seconds: Optional[float] = None
     ):
         """
         Initialize aggregator with providers.
@@ -99,8 +108,12 @@ class SentimentAggregator:
             enable_news: Enable news provider
             enable_vix: Enable VIX provider
             enable_calendar: Enable calendar provider
+            cache: Result cache (uses shared process-wide cache if None)
+            deadline_seconds: Override every provider's cold-cache deadline
         """
         self.weights = weights or self.DEFAULT_WEIGHTS.copy()
+        self.cache = cache or sentiment_cache
+        self.deadline_seconds = deadline_seconds
 
         # Initialize providers
         self.providers: List[BaseSentimentProvider] = []
@@ -161,41 +174,38 @@ class SentimentAggregator:
         vix_score = 0.0
         calendar_score = 0.0
 
-        for provider in self.providers:
-            try:
-                result = provider.get_sentiment(instrument)
-                provider_name = provider.get_name()
-                provider_weight = self.weights.get(provider_name, provider.get_weight())
+        provider_results, provider_warnings = self._collect_provider_results(instrument)
+        warnings.extend(provider_warnings)
 
-                if result.is_error:
-                    warnings.append(f"{provider_name}: {result.error_message}")
-                    continue
-
-                # Apply confidence-adjusted weighting
-                adjusted_weight = provider_weight * result.confidence
-                weighted_sum += result.score * adjusted_weight
-                total_weight += adjusted_weight
-
-                components[provider_name] = {
-                    "score": result.score,
-                    "confidence": result.confidence,
-                    "weight": provider_weight,
-                    "adjusted_weight": adjusted_weight,
-                    "reasoning": result.reasoning,
-                }
-
-                # Store specific scores
-                if provider_name == "news_claude":
-                    news_score = result.score
-                    claude_reasoning = result.reasoning
-                elif provider_name == "vix":
-                    vix_score = result.score
-                elif provider_name == "calendar":
-                    calendar_score = result.score
+        for provider in self.providers:
+            provider_name = provider.get_name()
+            result = provider_results.get(provider_name)
+            if result is None:
+                continue
+
+            provider_weight = self.weights.get(provider_name, provider.get_weight())
+
+            # Apply confidence-adjusted weighting
+            adjusted_weight = provider_weight * result.confidence
+            weighted_sum += result.score * adjusted_weight
+            total_weight += adjusted_weight
+
+            components[provider_name] = {
+                "score": result.score,
+                "confidence": result.confidence,
+                "weight": provider_weight,
+                "adjusted_weight": adjusted_weight,
+                "reasoning": result.reasoning,
+            }
 
-            except Exception as e:
-                logger.error(f"Provider {provider.get_name()} failed: {e}")
-                warnings.append(f"{provider.get_name()}: Error - {str(e)}")
+            # Store specific scores
+            if provider_name == "news_claude":
+                news_score = result.score
+                claude_reasoning = result.reasoning
+            elif provider_name == "vix":
+                vix_score = result.score
+            elif provider_name == "calendar":
+                calendar_score = result.score
 
         # Calculate final score
         if total_weight > 0:
@@ -236,6 +246,70 @@ class SentimentAggregator:
 
         return result
 
+    def _collect_provider_results(
+        self,
+        instrument: str
+    ) -> Tuple[Dict[str, ProviderSentiment], List[str]]:
+        """
+        Query all providers concurrently via the shared cache.
+
+        Cached values (fresh or stale) are returned immediately; stale ones
+        get a background refresh. Providers without a cached value are
+        fetched in parallel and waited on up to their own deadline.
+
+        Args:
+            instrument: Currency pair
+
+        Returns:
+            (results by provider name, warnings)
+        """
+        results: Dict[str, ProviderSentiment] = {}
+        warnings: List[str] = []
+        pending = []
+
+        for provider in self.providers:
+            name = provider.get_name()
+            try:
+                entry = self.cache.get(name, instrument)
+                needs_refresh = self.cache.needs_refresh(name, instrument)
+
+                if entry is not None and entry.value is not None:
+                    results[name] = entry.value
+                    if needs_refresh:
+                        self.cache.refresh(provider, instrument)
+                    continue
+
+                if entry is not None and not needs_refresh and entry.last_error:
+                    # Recent failure, still in retry back-off
+                    warnings.append(f"{name}: {entry.last_error}")
+                    continue
+
+                pending.append((provider, self.cache.refresh(provider, instrument)))
+
+            except Exception as e:
+                logger.error(f"Provider {name} failed: {e}")
+                warnings.append(f"{name}: Error - {str(e)}")
+
+        # All cold fetches run in parallel, so deadlines share one start time
+        started = time.monotonic()
+        for provider, future in pending:
+            name = provider.get_name()
+            deadline = self.deadline_seconds if self.deadline_seconds is not None else provider.get_deadline_seconds()
+            remaining = max(0.0, deadline - (time.monotonic() - started))
+            try:
+                result = future.result(timeout=remaining)
+                if result.is_error:
+                    warnings.append(f"{name}: {result.error_message}")
+                else:
+                    results[name] = result
+            except FutureTimeoutError:
+                warnings.append(f"{name}: no result within {deadline:.1f}s (refreshing in background)")
+            except Exception as e:
+                logger.error(f"Provider {name} failed: {e}")
+                warnings.append(f"{name}: Error - {str(e)}")
+
+        return results, warnings
+
     def get_quick_sentiment(self, instrument: str) -> float:
         """
         Quick sentiment check without full analysis.
@@ -248,12 +322,9 @@ class SentimentAggregator:
         Returns:
             Sentiment score -1.0 to +1.0
         """
-        # Check if we have cached VIX data (fastest)
-        from src.sentiment.providers.vix_provider import VIXProvider
-        vix_provider = VIXProvider()
-        vix_result = vix_provider.get_sentiment(instrument)
-
-        if not vix_result.is_error:
+        # VIX is the most frequently refreshed component
+        vix_result = self.cache.get_value("vix", instrument)
+        if vix_result is not None:
             return vix_result.score
 
         return 0.0  # Neutral if no data
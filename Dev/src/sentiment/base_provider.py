@@ -98,6 +98,16 @@ class BaseSentimentProvider(ABC):
         """
         return 1800
 
+    def get_deadline_seconds(self) -> float:
+        """
+        Get max time a scan waits for this provider on a cold cache.
+
+        After the deadline the call keeps running in the background and
+        fills the cache for the next scan.
+        Default: 2 seconds
+        """
+        return 2.0
+
     def _create_error_result(
         self,
         instrument: str,
@@ -0,0 +1,211 @@
+"""
+Unified Sentiment Cache - Stale-While-Revalidate.
+
+Single thread-safe store for provider results, keyed on
+(provider name, instrument). Replaces the per-provider module-level
+cache dicts.
+
+Semantics:
+- Fresh entry (age < provider TTL): served directly, no provider call
+- Stale entry: served immediately, refresh scheduled in the background
+- Missing entry: caller may wait on the refresh future (with a deadline)
+- Failed refresh: last good value is kept, retry is delayed
+
+Usage:
+    from src.sentiment.cache import sentiment_cache
+
+    entry = sentiment_cache.get("vix", "EUR_USD")
+    if entry is None or sentiment_cache.needs_refresh("vix", "EUR_USD"):
+        future = sentiment_cache.refresh(provider, "EUR_USD")
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.sentiment.base_provider import BaseSentimentProvider, ProviderSentiment
+from src.utils.logger import logger
+
+
+# Minimum delay before retrying a provider whose last refresh failed
+ERROR_RETRY_SECONDS = 60
+
+
+@dataclass
+class CacheEntry:
+    """Cached provider result plus freshness bookkeeping."""
+    value: Optional[ProviderSentiment]
+    ttl_seconds: float
+    fetched_at: Optional[float] = None  # time.monotonic() of last good value
+    error_at: Optional[float] = None    # time.monotonic() of last failure
+    last_error: str = ""
+
+    def age_seconds(self) -> Optional[float]:
+        if self.fetched_at is None:
+            return None
+        return time.monotonic() - self.fetched_at
+
+    def is_fresh(self) -> bool:
+        age = self.age_seconds()
+        return age is not None and age < self.ttl_seconds
+
+
+class SentimentCache:
+    """
+    Thread-safe stale-while-revalidate cache for sentiment providers.
+
+    Refreshes run on a small background pool and are de-duplicated,
+    so at most one provider call per (provider, instrument) is in flight.
+    """
+
+    def __init__(self, max_workers: int = 4, error_retry_seconds: float = ERROR_RETRY_SECONDS):
+        self._entries: Dict[Tuple[str, str], CacheEntry] = {}
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="sentiment-refresh",
+        )
+        self.error_retry_seconds = error_retry_seconds
+
+    def get(self, provider_name: str, instrument: str) -> Optional[CacheEntry]:
+        """Get cache entry (fresh or stale), None if never fetched."""
+        with self._lock:
+            return self._entries.get((provider_name, instrument))
+
+    def get_value(
+        self,
+        provider_name: str,
+        instrument: str,
+        allow_stale: bool = True
+    ) -> Optional[ProviderSentiment]:
+        """Get last good value, optionally only if still fresh."""
+        entry = self.get(provider_name, instrument)
+        if entry is None or entry.value is None:
+            return None
+        if not allow_stale and not entry.is_fresh():
+            return None
+        return entry.value
+
+    def put(
+        self,
+        provider_name: str,
+        instrument: str,
+        value: ProviderSentiment,
+        ttl_seconds: float
+    ) -> None:
+        """Store a good value."""
+        with self._lock:
+            self._entries[(provider_name, instrument)] = CacheEntry(
+                value=value,
+                ttl_seconds=ttl_seconds,
+                fetched_at=time.monotonic(),
+            )
+
+    def record_error(
+        self,
+        provider_name: str,
+        instrument: str,
+        message: str,
+        ttl_seconds: float
+    ) -> None:
+        """Record a failed refresh, keeping any previous good value."""
+        with self._lock:
+            key = (provider_name, instrument)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = CacheEntry(value=None, ttl_seconds=ttl_seconds)
+                self._entries[key] = entry
+            entry.error_at = time.monotonic()
+            entry.last_error = message
+
+    def needs_refresh(self, provider_name: str, instrument: str) -> bool:
+        """True if entry is missing/stale and not in error back-off."""
+        with self._lock:
+            key = (provider_name, instrument)
+            if key in self._inflight:
+                return False
+            entry = self._entries.get(key)
+        if entry is None:
+            return True
+        if entry.is_fresh():
+            return False
+        if entry.error_at is not None:
+            if time.monotonic() - entry.error_at < self.error_retry_seconds:
+                return False
+        return True
+
+    def refresh(self, provider: BaseSentimentProvider, instrument: str) -> Future:
+        """
+        Schedule a background refresh (de-duplicated).
+
+        Returns:
+            Future resolving to the fresh ProviderSentiment
+        """
+        key = (provider.get_name(), instrument)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._load, provider, instrument)
+            self._inflight[key] = future
+        return future
+
+    def _load(self, provider: BaseSentimentProvider, instrument: str) -> ProviderSentiment:
+        """Run provider call and update cache (runs on worker thread)."""
+        name = provider.get_name()
+        ttl = provider.get_cache_ttl_seconds()
+        try:
+            result = provider.get_sentiment(instrument)
+            if result.is_error:
+                self.record_error(name, instrument, result.error_message, ttl)
+            else:
+                self.put(name, instrument, result, ttl)
+            return result
+        except Exception as e:
+            logger.error(f"Sentiment refresh failed for {name}/{instrument}: {e}")
+            self.record_error(name, instrument, str(e), ttl)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop((name, instrument), None)
+
+    def invalidate(self, provider_name: Optional[str] = None, instrument: Optional[str] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            provider_name: Only this provider (all if None)
+            instrument: Only this instrument (all if None)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [
+                k for k in self._entries
+                if (provider_name is None or k[0] == provider_name)
+                and (instrument is None or k[1] == instrument)
+            ]
+            for k in keys:
+                del self._entries[k]
+        return len(keys)
+
+    def get_stats(self) -> dict:
+        """Cache summary for monitoring."""
+        with self._lock:
+            entries = list(self._entries.values())
+            inflight = len(self._inflight)
+        return {
+            "entries": len(entries),
+            "fresh": sum(1 for e in entries if e.is_fresh()),
+            "stale": sum(1 for e in entries if e.value is not None and not e.is_fresh()),
+            "errors": sum(1 for e in entries if e.value is None),
+            "inflight": inflight,
+        }
+
+
+# Process-wide cache shared by all aggregators
+sentiment_cache = SentimentCache()
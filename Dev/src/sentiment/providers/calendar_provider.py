@@ -9,15 +9,11 @@ Provides sentiment based on economic event outcomes.
 Integrates with existing news_filter.py for event data.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
-
 from src.sentiment.base_provider import BaseSentimentProvider, ProviderSentiment
+from src.sentiment.cache import sentiment_cache
 from src.utils.logger import logger
 
 
-# Cache for calendar sentiment
-_calendar_cache: dict = {}
 _cache_ttl = 600  # 10 minutes
 
 
@@ -115,13 +111,6 @@ class CalendarProvider(BaseSentimentProvider):
         Returns:
             ProviderSentiment based on economic calendar
         """
-        # Check cache
-        cache_key = f"calendar_{instrument}"
-        if cache_key in _calendar_cache:
-            cached, timestamp = _calendar_cache[cache_key]
-            if datetime.now() - timestamp < timedelta(seconds=_cache_ttl):
-                return cached
-
         try:
             base, quote = self._get_currencies(instrument)
 
@@ -160,8 +149,6 @@ class CalendarProvider(BaseSentimentProvider):
                 }
             )
 
-            # Cache result
-            _calendar_cache[cache_key] = (result, datetime.now())
             return result
 
         except Exception as e:
@@ -275,7 +262,6 @@ class CalendarProvider(BaseSentimentProvider):
 
 
 def clear_calendar_cache():
-    """Clear the calendar cache."""
-    global _calendar_cache
-    _calendar_cache = {}
+    """Clear cached calendar sentiment."""
+    sentiment_cache.invalidate(provider_name="calendar")
     logger.info("Calendar cache cleared")
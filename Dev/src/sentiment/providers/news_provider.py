@@ -2,22 +2,20 @@
 News Sentiment Provider - Claude-Powered News Analysis.
 
 Uses Claude to analyze forex news headlines and extract sentiment.
-Caches results for 30 minutes.
+Results are cached for 30 minutes by the shared sentiment cache.
 """
 
 import json
-import time
-from datetime import datetime, timedelta
 from typing import Optional
 from dataclasses import dataclass, field
 
 from src.sentiment.base_provider import BaseSentimentProvider, ProviderSentiment
+from src.sentiment.cache import sentiment_cache
 from src.utils.logger import logger
 
 
-# Cache for news sentiment
-_news_cache: dict = {}
 _cache_ttl = 1800  # 30 minutes
+_deadline_seconds = 5.0  # LLM call - longest cold-start wait
 
 
 @dataclass
@@ -63,7 +61,7 @@ class NewsProvider(BaseSentimentProvider):
     News sentiment provider using Claude for analysis.
 
     Fetches news headlines and uses Claude to analyze sentiment.
-    Caches results for 30 minutes.
+    Caching is handled by the shared sentiment cache (30 minutes).
     """
 
     def __init__(self, llm_engine=None):
@@ -86,6 +84,9 @@ class NewsProvider(BaseSentimentProvider):
     def get_cache_ttl_seconds(self) -> int:
         return _cache_ttl
 
+    def get_deadline_seconds(self) -> float:
+        return _deadline_seconds
+
     def _get_llm_engine(self):
         """Lazy load LLM engine."""
         if self._llm_engine is None:
@@ -107,14 +108,6 @@ class NewsProvider(BaseSentimentProvider):
         Returns:
             ProviderSentiment with Claude analysis
         """
-        # Check cache first
-        cache_key = f"news_{instrument}"
-        if cache_key in _news_cache:
-            cached, timestamp = _news_cache[cache_key]
-            if datetime.now() - timestamp < timedelta(seconds=_cache_ttl):
-                logger.debug(f"News cache hit for {instrument}")
-                return cached
-
         try:
             # Fetch headlines
             headlines = self._fetch_headlines(instrument)
@@ -149,8 +142,6 @@ class NewsProvider(BaseSentimentProvider):
                 }
             )
 
-            # Cache result
-            _news_cache[cache_key] = (result, datetime.now())
             logger.info(
                 f"News sentiment for {instrument}: "
                 f"{analysis.sentiment_score:+.2f} (conf: {analysis.confidence:.0%})"
@@ -266,7 +257,6 @@ class NewsProvider(BaseSentimentProvider):
 
 
 def clear_news_cache():
-    """Clear the news cache."""
-    global _news_cache
-    _news_cache = {}
+    """Clear cached news sentiment."""
+    sentiment_cache.invalidate(provider_name="news_claude")
     logger.info("News cache cleared")
@@ -14,8 +14,6 @@ from src.sentiment.base_provider import BaseSentimentProvider, ProviderSentiment
 from src.utils.logger import logger
 
 
-# Cache for VIX data
-_vix_cache: dict = {}
 _cache_ttl = 300  # 5 minutes - VIX updates frequently
 
 
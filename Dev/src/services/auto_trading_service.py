@@ -26,6 +26,7 @@ from src.trading.orders import OrderManager
 from src.trading.risk_manager import RiskManager
 from src.trading.auto_scanner import MarketScanner, TradingSignal
 from src.trading.auto_executor import AutoExecutor, ExecutionResult
+from src.trading.position_monitor import PositionMonitor
 from src.trading.emergency import emergency_controller
 from src.core.auto_config import (
     AutoTradingConfig,
@@ -34,7 +35,11 @@ from src.core.auto_config import (
 )
 from src.utils.database import db
 from src.utils.logger import logger
+from src.utils.latency import latency
+from src.utils.instrument_profiles import normalize_instrument_symbol
 from src.services.heartbeat import heartbeat_manager
+from src.services.event_stream import event_publisher
+from src.services.bar_scheduler import BarCloseScheduler
 from src.upgrade.upgrade_manager import UpgradeManager, UpgradeConfig
 
 
@@ -84,13 +89,20 @@ class AutoTradingService:
         self.risk_manager = RiskManager()
         self.scanner: Optional[MarketScanner] = None
         self.executor: Optional[AutoExecutor] = None
+        self.position_monitor: Optional[PositionMonitor] = None
 
         # Service state
         self._status = ServiceStatus()
         self._running = False
         self._loop_task: Optional[asyncio.Task] = None
+        self._monitor_task: Optional[asyncio.Task] = None
         self._lock = threading.Lock()
 
+        # Aligns scans to M5 closes and skips instruments with unchanged bars
+        self.bar_scheduler = BarCloseScheduler(
+            settle_seconds=self.config.smart_interval.bar_settle_seconds
+        )
+
         # Callbacks
         self._on_signal_callbacks: List[Callable[[TradingSignal], None]] = []
         self._on_execution_callbacks: List[Callable[[ExecutionResult], None]] = []
@@ -146,12 +158,21 @@ class AutoTradingService:
             self._status.running = True
             self._status.enabled = self.config.enabled
 
+            # Push channel for the dashboard
+            event_publisher.start()
+
             # Start heartbeat for watchdog monitoring
             heartbeat_manager.start_background_beats()
             heartbeat_manager.update_state("STARTING")
 
             self._loop_task = asyncio.create_task(self._main_loop())
 
+            # Fill/close detection between scans (bulk snapshot every second)
+            self.position_monitor = PositionMonitor(
+                self.client, self.executor, on_event=self._handle_position_event
+            )
+            self._monitor_task = asyncio.create_task(self.position_monitor.run())
+
             logger.info("AutoTradingService started")
             self._update_state("WAITING" if not self.config.enabled else "SCANNING")
 
@@ -167,19 +188,26 @@ class AutoTradingService:
         logger.info("Stopping AutoTradingService...")
         self._running = False
 
-        if self._loop_task:
-            self._loop_task.cancel()
-            try:
-                await self._loop_task
-            except asyncio.CancelledError:
-                pass
+        if self.position_monitor:
+            self.position_monitor.stop()
+        for task in (self._loop_task, self._monitor_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
 
         self._status.running = False
         self._update_state("STOPPED")
 
+        # Flush the partial latency window
+        latency.export()
+
         # Stop heartbeat and clear file
         heartbeat_manager.stop_background_beats()
         heartbeat_manager.clear_heartbeat()
+        event_publisher.stop()
 
         logger.info("AutoTradingService stopped")
 
@@ -236,21 +264,30 @@ class AutoTradingService:
 
                 # Run scan cycle
                 self._update_state("SCANNING")
+                scans_before = self._status.scans_today
                 await self._scan_cycle()
+                scanned = self._status.scans_today > scans_before
 
                 # Sync closed positions and run learning (every 5th scan)
-                if self._status.scans_today % 5 == 0:
+                if scanned and self._status.scans_today % 5 == 0:
                     await self._sync_and_learn()
 
                 # Run Self-Upgrade cycle if it's time (daily)
                 if self._should_run_upgrade_cycle():
                     await self._run_upgrade_cycle()
 
-                # Wait for next scan interval (smart or fixed)
+                # Persist per-stage latency histograms (Monitoring page)
+                if latency.maybe_export():
+                    db.clear_old_stage_latency(days=14)
+
+                # Wait for the next bar close or scan interval (smart or fixed)
                 self._update_state("WAITING")
                 interval = self._get_smart_interval()
                 self._status.current_interval = interval
-                await asyncio.sleep(interval)
+                if self.config.smart_interval.bar_aligned:
+                    await asyncio.sleep(self.bar_scheduler.seconds_until_next(interval))
+                else:
+                    await asyncio.sleep(interval)
 
             except asyncio.CancelledError:
                 break
@@ -261,6 +298,8 @@ class AutoTradingService:
                 self._update_state("ERROR")
                 await asyncio.sleep(10)  # Wait before retrying
 
+        if self.position_monitor:
+            self.position_monitor.stop()
         logger.info("Auto-trading loop ended")
 
     async def _scan_cycle(self) -> None:
@@ -271,57 +310,40 @@ class AutoTradingService:
         scan_start = datetime.now(timezone.utc)
 
         try:
-            # Fast close-sync: keep dashboard/DB in near real-time sync with MT5.
-            try:
-                mt5_positions = self.client.get_positions() if self.client else []
-                sync_result = db.sync_trades_with_mt5(
-                    mt5_positions,
-                    mt5_history=[],
-                    mt5_client=self.client,
-                )
-                if sync_result.get("closed"):
-                    logger.info(
-                        f"Realtime trade sync: closed {len(sync_result.get('closed', []))} trade(s), "
-                        f"with P/L for {sync_result.get('closed_with_pnl', 0)}, "
-                        f"reconciled {sync_result.get('reconciled', 0)}"
+            # Fills and closes are picked up by the position monitor; poll here
+            # only if it isn't running.
+            if not (self.position_monitor and self.position_monitor.is_running):
+                try:
+                    mt5_positions = self.client.get_positions() if self.client else []
+                    sync_result = db.sync_trades_with_mt5(
+                        mt5_positions,
+                        mt5_history=[],
+                        mt5_client=self.client,
                     )
-            except Exception as e:
-                logger.warning(f"Realtime trade sync failed: {e}")
-
-            # Check pending limit order status before scanning
-            if self.executor._pending_orders:
-                pending_events = self.executor.check_pending_orders()
-                for event in pending_events:
-                    if event["type"] == "FILLED":
-                        self._status.trades_executed_today += 1
-                        self._status.last_execution_time = datetime.now(timezone.utc)
-                        heartbeat_manager.increment_trades()
-                        logger.info(f"Pending order filled: {event['instrument']} {event['direction']}")
-                        try:
-                            db.update_auto_signal_result(
-                                instrument=event["instrument"],
-                                direction=event["direction"],
-                                executed=True,
-                                skip_reason=None,
-                                trade_id=event.get("trade_id"),
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to update auto_signal for filled pending order: {e}")
-                    elif event["type"] == "EXPIRED":
-                        logger.info(f"Pending order expired: {event['instrument']} {event['direction']}")
-                        try:
-                            db.update_auto_signal_result(
-                                instrument=event["instrument"],
-                                direction=event["direction"],
-                                executed=False,
-                                skip_reason="Pending limit order expired",
-                                trade_id=None,
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to update auto_signal for expired pending order: {e}")
-
-            # Scan all instruments
-            signals = self.scanner.scan_all_instruments()
+                    if sync_result.get("closed"):
+                        logger.info(
+                            f"Realtime trade sync: closed {len(sync_result.get('closed', []))} trade(s), "
+                            f"with P/L for {sync_result.get('closed_with_pnl', 0)}, "
+                            f"reconciled {sync_result.get('reconciled', 0)}"
+                        )
+                    if sync_result.get("closed_trades"):
+                        from src.trading.trade_lifecycle import calibrate_synced_closes
+                        calibrate_synced_closes(sync_result["closed_trades"])
+                except Exception as e:
+                    logger.warning(f"Realtime trade sync failed: {e}")
+
+                for event in self.executor.check_pending_orders():
+                    self._handle_position_event(event)
+
+            # Scan instruments with a new closed bar (or all, if not bar-aligned)
+            instruments = self._due_instruments()
+            if not instruments:
+                logger.debug("No new bars since last scan; skipping scan")
+                return
+            signals = self.scanner.scan_all_instruments(instruments)
+            for instrument in instruments:
+                result = self.scanner.last_results.get(instrument)
+                self.bar_scheduler.record(instrument, result.skip_reason if result else None)
 
             self._status.scans_today += 1
             self._status.last_scan_time = scan_start
@@ -334,6 +356,21 @@ class AutoTradingService:
                 errors=self._status.errors_today
             )
 
+            event_publisher.publish("scan", {
+                "instruments": instruments,
+                "scans_today": self._status.scans_today,
+                "signals": [
+                    {"instrument": s.instrument, "direction": s.direction, "confidence": s.confidence}
+                    for s in signals
+                ],
+                "skipped": {
+                    instrument: result.skip_reason
+                    for instrument, result in self.scanner.last_results.items()
+                    if instrument in instruments and result and result.skip_reason
+                },
+            })
+            self._publish_status()
+
             # Track for smart interval
             if signals:
                 self._status.scans_without_signals = 0
@@ -384,6 +421,8 @@ class AutoTradingService:
                 except Exception as e:
                     logger.warning(f"Failed to update auto_signal: {e}")
 
+                event_publisher.publish("execution", result.to_dict())
+
                 # Notify callbacks
                 for callback in self._on_execution_callbacks:
                     try:
@@ -403,9 +442,61 @@ class AutoTradingService:
             self._status.errors_today += 1
             heartbeat_manager.increment_errors()
 
+    def _handle_position_event(self, event: dict) -> None:
+        """Record a FILLED/EXPIRED pending order (other monitor events are informational)."""
+        event_publisher.publish("position", event)
+        if event["type"] == "FILLED":
+            self._status.trades_executed_today += 1
+            self._status.last_execution_time = datetime.now(timezone.utc)
+            heartbeat_manager.increment_trades()
+            logger.info(f"Pending order filled: {event['instrument']} {event['direction']}")
+            try:
+                db.update_auto_signal_result(
+                    instrument=event["instrument"],
+                    direction=event["direction"],
+                    executed=True,
+                    skip_reason=None,
+                    trade_id=event.get("trade_id"),
+                )
+            except Exception as e:
+                logger.warning(f"Failed to update auto_signal for filled pending order: {e}")
+        elif event["type"] == "EXPIRED":
+            logger.info(f"Pending order expired: {event['instrument']} {event['direction']}")
+            try:
+                db.update_auto_signal_result(
+                    instrument=event["instrument"],
+                    direction=event["direction"],
+                    executed=False,
+                    skip_reason="Pending limit order expired",
+                    trade_id=None,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to update auto_signal for expired pending order: {e}")
+        elif event["type"] == "CLOSED":
+            logger.info(f"Position closed: {event['instrument']} {event['direction']} (#{event['trade_id']})")
+
+    def _due_instruments(self) -> List[str]:
+        """Instruments to scan this cycle (see BarCloseScheduler)."""
+        si = self.config.smart_interval
+        if not si.bar_aligned:
+            return list(self.config.instruments)
+        self.bar_scheduler.settle_seconds = si.bar_settle_seconds
+        return self.bar_scheduler.due_instruments(self.config.instruments, self._probe_closed_bar)
+
+    def _probe_closed_bar(self, instrument: str) -> Optional[str]:
+        """Time of the instrument's last closed bar (2-candle MT5 request)."""
+        candles = self.client.get_candles(
+            normalize_instrument_symbol(instrument), self.bar_scheduler.timeframe, 2
+        )
+        closed = [c for c in candles if c.get("complete")]
+        return closed[-1]["time"] if closed else None
+
     def _update_state(self, state: str) -> None:
         """Update service state and notify callbacks."""
+        changed = state != self._status.current_state
         self._status.current_state = state
+        if changed:
+            self._publish_status()
 
         # Update heartbeat state for watchdog
         heartbeat_manager.update_state(state)
@@ -416,6 +507,13 @@ class AutoTradingService:
             except Exception as e:
                 logger.error(f"Status callback error: {e}")
 
+    def _publish_status(self) -> None:
+        """Push the current status to dashboard subscribers."""
+        try:
+            event_publisher.publish("status", self.get_status())
+        except Exception as e:
+            logger.warning(f"Status publish failed: {e}")
+
     def _get_smart_interval(self) -> int:
         """
         Calculate dynamic scan interval based on market conditions.
@@ -507,8 +605,8 @@ class AutoTradingService:
 
             logger.info("Running position sync and learning...")
 
-            # Sync closed trades from MT5
-            result = sync_mt5_history(days=1, client=self.client)
+            # Sync closed trades from MT5 (only deals newer than the last sync)
+            result = sync_mt5_history(client=self.client, incremental=True)
             if result.get("trades_analyzed", 0) > 0:
                 logger.info(f"Learned from {result['trades_analyzed']} newly closed trades")
 
@@ -652,6 +750,8 @@ class AutoTradingService:
             "errors_today": self._status.errors_today,
             "emergency_stopped": emergency_controller.is_stopped(),
             "executor_stats": executor_stats,
+            "scheduler": self.bar_scheduler.get_stats(),
+            "position_monitor": self.position_monitor.get_stats() if self.position_monitor else {},
             "config": {
                 "mode": self.config.mode,
                 "instruments": self.config.instruments,
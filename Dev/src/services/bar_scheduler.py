@@ -0,0 +1,165 @@
+"""
+Bar-Close Scheduler - Aligns auto-trading scans to candle closes.
+
+The scanner's signal comes from closed M5 candles (H1/H4 bars close on M5
+boundaries too), so rescanning between closes re-analyzes unchanged data,
+while a free-running sleep can land well after a close. The scheduler:
+
+- wakes a few settle seconds after each M5 close (broker bars are final)
+- between closes, still wakes on the smart interval so cheap housekeeping
+  (position sync, pending orders) keeps its cadence, but only rescans
+  instruments whose last scan was blocked by live conditions (spread,
+  session, news) that can clear intra-bar
+- probes each instrument's last closed bar with a 2-candle request and
+  skips instruments with no new bar (weekend, illiquid symbol, broker lag)
+- with a smart interval longer than a bar (quiet/news modes), skips bar
+  closes until the interval has elapsed
+
+Usage:
+    scheduler = BarCloseScheduler()
+    due = scheduler.due_instruments(config.instruments, probe)
+    results = scanner.scan_all_instruments(due) ...
+    scheduler.record(instrument, result.skip_reason)
+    await asyncio.sleep(scheduler.seconds_until_next(interval))
+"""
+
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from src.utils.logger import logger
+
+
+TIMEFRAME_SECONDS = {
+    "M1": 60, "M5": 300, "M15": 900, "M30": 1800, "H1": 3600, "H4": 14400,
+}
+DEFAULT_SETTLE_SECONDS = 2.0
+
+# Skip reasons that depend on live conditions rather than candle data
+TRANSIENT_SKIP_PREFIXES = ("Spread too high", "Outside trading session", "News filter")
+
+
+class BarCloseScheduler:
+    """Decides when to wake and which instruments need a rescan."""
+
+    def __init__(
+        self,
+        timeframe: str = "M5",
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            timeframe: Signal timeframe whose closes trigger scans
+            settle_seconds: Delay after a close before the bar is read
+            clock: Epoch-seconds source (injectable for tests)
+        """
+        self.timeframe = timeframe
+        self.bar_seconds = TIMEFRAME_SECONDS[timeframe]
+        self.settle_seconds = settle_seconds
+        self.clock = clock
+
+        self._scanned_bar: Dict[str, str] = {}  # instrument -> closed bar time last scanned
+        self._seen_slot: Dict[str, int] = {}    # instrument -> bar slot already probed
+        self._recheck: Set[str] = set()         # blocked by live conditions
+        self.probes = 0
+        self.skipped = 0
+
+    # ---------- Timing ----------
+
+    def _slot(self, now: float) -> int:
+        """Index of the latest bar close (after settling) at or before now."""
+        return math.floor((now - self.settle_seconds) / self.bar_seconds)
+
+    def next_bar_close(self, now: Optional[float] = None) -> float:
+        """Epoch time of the next bar close plus the settle delay."""
+        now = self.clock() if now is None else now
+        return (self._slot(now) + 1) * self.bar_seconds + self.settle_seconds
+
+    def seconds_until_next(self, interval: float) -> float:
+        """
+        Sleep before the next wake.
+
+        Args:
+            interval: Smart interval in seconds (housekeeping/recheck cadence)
+
+        Returns:
+            Seconds until the earlier of the next bar close and now + interval;
+            intervals of a bar or longer wake on the first close after them
+        """
+        now = self.clock()
+        if interval >= self.bar_seconds:
+            wake = self.next_bar_close(now + interval - 1e-6)
+        else:
+            wake = min(self.next_bar_close(now), now + interval)
+        return max(0.0, wake - now)
+
+    # ---------- Due instruments ----------
+
+    def due_instruments(
+        self,
+        instruments: Iterable[str],
+        probe: Callable[[str], Optional[str]],
+    ) -> List[str]:
+        """
+        Instruments worth a full scan now.
+
+        Args:
+            instruments: Configured instruments
+            probe: Returns the instrument's last closed bar time (None if unknown)
+
+        Returns:
+            Instruments with a new closed bar or waiting on live conditions
+        """
+        now = self.clock()
+        slot = self._slot(now)
+        due = []
+        for instrument in instruments:
+            if self._seen_slot.get(instrument, -1) >= slot:
+                # No close since the last probe: only live-condition rechecks
+                if instrument in self._recheck:
+                    due.append(instrument)
+                else:
+                    self.skipped += 1
+                continue
+
+            self.probes += 1
+            try:
+                bar_time = probe(instrument)
+            except Exception as e:
+                logger.debug(f"Bar probe failed for {instrument}: {e}")
+                bar_time = None
+            if bar_time is None:
+                due.append(instrument)  # Let the scanner surface the problem
+                continue
+            if bar_time != self._scanned_bar.get(instrument):
+                self._seen_slot[instrument] = slot
+                self._scanned_bar[instrument] = bar_time
+                due.append(instrument)
+            elif instrument in self._recheck:
+                due.append(instrument)
+            else:
+                # Bar not in yet (or market closed): probe again next wake
+                self.skipped += 1
+        return due
+
+    def record(self, instrument: str, skip_reason: Optional[str]) -> None:
+        """Remember whether a scan was blocked by a live condition."""
+        if skip_reason and skip_reason.startswith(TRANSIENT_SKIP_PREFIXES):
+            self._recheck.add(instrument)
+        else:
+            self._recheck.discard(instrument)
+
+    def forget(self, instrument: str) -> None:
+        """Force a rescan of an instrument at the next wake."""
+        self._scanned_bar.pop(instrument, None)
+        self._seen_slot.pop(instrument, None)
+        self._recheck.discard(instrument)
+
+    def get_stats(self) -> dict:
+        return {
+            "timeframe": self.timeframe,
+            "probes": self.probes,
+            "skipped": self.skipped,
+            "recheck": sorted(self._recheck),
+        }
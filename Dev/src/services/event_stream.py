@@ -0,0 +1,429 @@
+"""
+Event Stream - Push channel from the trading service to the dashboard.
+
+The service publishes what it does (state changes, scan results,
+executions, position events, heartbeats) on a localhost TCP socket as
+newline-delimited JSON. Dashboard processes subscribe once and keep the
+latest state in memory, so pages render live updates without polling the
+trading database.
+
+- The publisher binds an ephemeral port on 127.0.0.1 and advertises it in
+  data/.event_stream.json (TCP rather than a Unix socket: works on Windows)
+- Every event carries a sequence number and the publisher's epoch (one
+  per service run); the publisher keeps the last BUFFER_SIZE events and
+  replays everything after the subscriber's last seen seq on (re)connect,
+  or everything if the subscriber last saw another epoch, so a dashboard
+  restart or a service restart doesn't lose deltas
+- Each subscriber has a bounded queue drained by its own writer thread;
+  publishing only enqueues, so a stalled dashboard never blocks trading.
+  Subscribers whose queue overflows or whose writes fail are dropped
+
+Usage:
+    # Trading service
+    from src.services.event_stream import event_publisher
+
+    event_publisher.start()
+    event_publisher.publish("scan", {"instruments": [...], "signals": [...]})
+
+    # Dashboard
+    from src.services.event_stream import EventSubscriber
+
+    subscriber = EventSubscriber()
+    subscriber.start()
+    events = subscriber.wait_for_events(since=seq, timeout=5)
+    state = subscriber.snapshot()
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.logger import logger
+
+
+STREAM_FILE = Path(__file__).parent.parent.parent / "data" / ".event_stream.json"
+STREAM_HOST = "127.0.0.1"
+BUFFER_SIZE = 500            # Events kept for replay on (re)connect
+SEND_TIMEOUT_SECONDS = 1.0   # Subscriber dropped if a write blocks longer
+SUBSCRIBER_QUEUE_SIZE = 1000 # Unsent events per subscriber before it is dropped
+RECONNECT_SECONDS = 2.0      # Subscriber retry delay while no publisher
+
+# Event types kept as history (others keep only their latest payload)
+HISTORY_TYPES = ("scan", "execution", "position")
+HISTORY_SIZE = 50
+
+
+def _encode(event: dict) -> bytes:
+    return (json.dumps(event, default=str) + "\n").encode("utf-8")
+
+
+class _Subscription:
+    """One connected subscriber: bounded outbox drained by a writer thread."""
+
+    def __init__(self, conn: socket.socket, on_drop):
+        self.conn = conn
+        self.outbox: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._on_drop = on_drop
+        self._closed = False
+
+    def start(self, replay: List[bytes]) -> None:
+        threading.Thread(target=self._write_loop, args=(replay,), daemon=True).start()
+
+    def offer(self, payload: bytes) -> bool:
+        """Queue a payload without blocking; False if the outbox is full."""
+        try:
+            self.outbox.put_nowait(payload)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)  # Unblocks a pending sendall
+        except OSError:
+            pass
+        self.conn.close()
+        self.offer(None)
+
+    def _write_loop(self, replay: List[bytes]) -> None:
+        try:
+            for payload in replay:
+                self.conn.sendall(payload)
+            while not self._closed:
+                payload = self.outbox.get()
+                if payload is None:
+                    break
+                self.conn.sendall(payload)
+        except OSError:
+            pass
+        self._on_drop(self)
+
+
+class EventPublisher:
+    """Localhost pub/sub server run inside the trading service."""
+
+    def __init__(self, stream_file: Path = STREAM_FILE, buffer_size: int = BUFFER_SIZE):
+        self.stream_file = Path(stream_file)
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._epoch = ""
+        self._subscribers: List[_Subscription] = []
+        self._server: Optional[socket.socket] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._server.getsockname()[1] if self._server else None
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def start(self) -> bool:
+        """
+        Bind the socket, advertise the port and accept subscribers.
+
+        Returns:
+            True if listening (also when already started)
+        """
+        if self._running:
+            return True
+        try:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind((STREAM_HOST, 0))
+            server.listen(16)
+            server.settimeout(0.5)
+        except OSError as e:
+            logger.warning(f"Event stream unavailable: {e}")
+            return False
+
+        self._server = server
+        self._epoch = f"{os.getpid()}-{time.time_ns()}"
+        self._running = True
+        self._write_stream_file()
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+        logger.info(f"Event stream listening on {STREAM_HOST}:{self.port}")
+        return True
+
+    def stop(self) -> None:
+        """Close all connections and remove the advertised port."""
+        if not self._running:
+            return
+        self._running = False
+        if self._accept_thread:
+            self._accept_thread.join(timeout=2)
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for subscriber in subscribers:
+            subscriber.close()
+        self._server.close()
+        self._server = None
+        try:
+            if self.stream_file.exists() and json.loads(self.stream_file.read_text()).get("pid") == os.getpid():
+                self.stream_file.unlink()
+        except (OSError, ValueError):
+            pass
+        logger.info("Event stream stopped")
+
+    def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Queue an event for all subscribers (no-op while not started, never blocks).
+
+        Args:
+            event_type: "status", "scan", "execution", "position", "heartbeat", ...
+            data: JSON-serializable payload (non-JSON values are str()-ed)
+
+        Returns:
+            The event's sequence number (0 if not published)
+        """
+        if not self._running:
+            return 0
+        with self._lock:
+            self._seq += 1
+            event = {
+                "seq": self._seq,
+                "epoch": self._epoch,
+                "type": event_type,
+                "time": datetime.now(timezone.utc).isoformat(),
+                "data": data or {},
+            }
+            self._buffer.append(event)
+            payload = _encode(event)
+            stalled = [s for s in self._subscribers if not s.offer(payload)]
+            seq = self._seq
+        for subscriber in stalled:
+            logger.warning("Event stream subscriber fell behind; dropping it")
+            self._drop(subscriber)
+        return seq
+
+    # === Private methods ===
+
+    def _write_stream_file(self) -> None:
+        self.stream_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.stream_file.with_suffix(".tmp")
+        temp_file.write_text(json.dumps({
+            "host": STREAM_HOST,
+            "port": self.port,
+            "pid": os.getpid(),
+            "epoch": self._epoch,
+            "started": datetime.now(timezone.utc).isoformat(),
+        }))
+        temp_file.replace(self.stream_file)
+
+    def _accept_loop(self) -> None:
+        while self._running:
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._register, args=(conn,), daemon=True).start()
+
+    def _register(self, conn: socket.socket) -> None:
+        """Read the subscriber's hello ({"since": seq, "epoch": ...}), replay, then subscribe."""
+        try:
+            conn.settimeout(SEND_TIMEOUT_SECONDS)
+            hello = conn.makefile("r", encoding="utf-8").readline()
+            hello = json.loads(hello) if hello.strip() else {}
+            since = int(hello.get("since", 0))
+            epoch = hello.get("epoch")
+        except (OSError, ValueError, AttributeError):
+            conn.close()
+            return
+
+        subscriber = _Subscription(conn, self._drop)
+        with self._lock:
+            if not self._running:
+                conn.close()
+                return
+            # Seqs of another run (publisher restarted) mean nothing here: replay all
+            if epoch != self._epoch or since > self._seq:
+                since = 0
+            replay = [event for event in self._buffer if event["seq"] > since]
+            self._subscribers.append(subscriber)
+        # Replay is sent by the writer, outside the lock, before queued live events
+        subscriber.start([_encode(event) for event in replay])
+
+    def _drop(self, subscriber: _Subscription) -> None:
+        """Unsubscribe and close (writer failed or outbox overflowed)."""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+        subscriber.close()
+
+
+class EventSubscriber:
+    """
+    Dashboard-side client keeping the latest service state in memory.
+
+    A background thread holds the connection (reconnecting while no
+    publisher is up) and folds events into snapshot(): the latest payload
+    per event type plus short histories for scans, executions and
+    position events.
+    """
+
+    def __init__(self, stream_file: Path = STREAM_FILE):
+        self.stream_file = Path(stream_file)
+        self._events: deque = deque(maxlen=BUFFER_SIZE)
+        self._latest: Dict[str, dict] = {}
+        self._history: Dict[str, deque] = {t: deque(maxlen=HISTORY_SIZE) for t in HISTORY_TYPES}
+        self._last_seq = 0
+        self._epoch: Optional[str] = None
+        self._connected = False
+        self._running = False
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def epoch(self) -> Optional[str]:
+        """Run of the publisher the buffered events come from."""
+        return self._epoch
+
+    def start(self) -> None:
+        """Start the background reader (idempotent)."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._sock:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def events_since(self, seq: int, types: Optional[tuple] = None, epoch: Optional[str] = None) -> List[dict]:
+        """
+        Buffered events with seq > `seq`, oldest first.
+
+        Pass the epoch `seq` was read in: after a publisher restart all
+        buffered events are new to the caller.
+        """
+        with self._cond:
+            if seq > self._last_seq or (epoch is not None and epoch != self._epoch):
+                seq = 0  # Publisher restarted since the caller's last read
+            return [e for e in self._events
+                    if e["seq"] > seq and (types is None or e["type"] in types)]
+
+    def wait_for_events(self, since: int, timeout: float, types: Optional[tuple] = None,
+                        epoch: Optional[str] = None) -> List[dict]:
+        """
+        Block until events newer than `since` arrive, or timeout.
+
+        Args:
+            since: Last sequence number already rendered
+            timeout: Max seconds to wait
+            types: Only wake for these event types (default: any)
+            epoch: Epoch `since` was read in (see events_since)
+
+        Returns:
+            New events (empty on timeout)
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                events = self.events_since(since, types, epoch)
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                self._cond.wait(remaining)
+
+    def snapshot(self) -> dict:
+        """Latest payload per event type and recent history (copies)."""
+        with self._cond:
+            return {
+                "connected": self._connected,
+                "last_seq": self._last_seq,
+                "epoch": self._epoch,
+                "latest": {k: dict(v) for k, v in self._latest.items()},
+                "history": {k: list(v) for k, v in self._history.items()},
+            }
+
+    # === Private methods ===
+
+    def _address(self) -> Optional[tuple]:
+        try:
+            info = json.loads(self.stream_file.read_text())
+            return info["host"], int(info["port"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _run(self) -> None:
+        while self._running:
+            address = self._address()
+            if address:
+                try:
+                    self._consume(address)
+                except OSError:
+                    pass
+                finally:
+                    with self._cond:
+                        self._connected = False
+                        self._cond.notify_all()
+            if self._running:
+                time.sleep(RECONNECT_SECONDS)
+
+    def _consume(self, address: tuple) -> None:
+        with socket.create_connection(address, timeout=RECONNECT_SECONDS) as sock:
+            self._sock = sock
+            sock.settimeout(None)
+            sock.sendall(_encode({"since": self._last_seq, "epoch": self._epoch}))
+            with self._cond:
+                self._connected = True
+                self._cond.notify_all()
+            for line in sock.makefile("r", encoding="utf-8"):
+                if not self._running:
+                    break
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+
+    def _apply(self, event: dict) -> None:
+        with self._cond:
+            if event.get("epoch") != self._epoch or event["seq"] <= self._last_seq:
+                # Publisher restarted: drop everything from the previous run
+                self._events.clear()
+                self._latest.clear()
+                for history in self._history.values():
+                    history.clear()
+                self._epoch = event.get("epoch")
+            self._last_seq = event["seq"]
+            self._events.append(event)
+            self._latest[event["type"]] = event
+            if event["type"] in self._history:
+                self._history[event["type"]].append(event)
+            self._cond.notify_all()
+
+
+# Global publisher used by the trading service (and heartbeat)
+event_publisher = EventPublisher()
@@ -27,6 +27,7 @@ from typing import Optional, Dict, Any
 from dataclasses import dataclass, asdict
 
 from src.utils.logger import logger
+from src.services.event_stream import event_publisher
 
 
 @dataclass
@@ -156,6 +157,9 @@ class HeartbeatManager:
         except Exception as e:
             logger.error(f"Failed to write heartbeat: {e}")
 
+        # Push to dashboard subscribers (no-op unless the service started the stream)
+        event_publisher.publish("heartbeat", asdict(data))
+
     def update_state(self, state: str) -> None:
         """Update service state."""
         with self._lock:
@@ -12,9 +12,9 @@ sweep to confirm institutional order flow.
 
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timezone
 
 from src.smc.structure import SwingPoint
+from src.utils.session_calendar import SESSION_RANGES, SESSIONS_BY_HOUR, hour_from_iso
 
 
 @dataclass
@@ -259,34 +259,27 @@ def detect_session_levels(
         {session_name: {high, low, high_idx, low_idx}}
     """
     sessions = {
-        "asian": {"start": 0, "end": 8, "high": 0, "low": float("inf"),
-                  "high_idx": -1, "low_idx": -1},
-        "london": {"start": 7, "end": 16, "high": 0, "low": float("inf"),
-                   "high_idx": -1, "low_idx": -1},
-        "ny": {"start": 12, "end": 21, "high": 0, "low": float("inf"),
-               "high_idx": -1, "low_idx": -1},
+        name: {"start": start, "end": end, "high": 0, "low": float("inf"),
+               "high_idx": -1, "low_idx": -1}
+        for name, (start, end) in SESSION_RANGES.items()
     }
 
     for i, candle in enumerate(candles):
         time_str = candle.get("time", "")
-        try:
-            if "T" in time_str:
-                dt = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
-            else:
-                continue
-        except (ValueError, TypeError):
+        if "T" not in time_str:
+            continue
+        hour = hour_from_iso(time_str)
+        if hour is None:
             continue
 
-        hour = dt.hour
-
-        for session_name, session in sessions.items():
-            if session["start"] <= hour < session["end"]:
-                if candle["high"] > session["high"]:
-                    session["high"] = candle["high"]
-                    session["high_idx"] = i
-                if candle["low"] < session["low"]:
-                    session["low"] = candle["low"]
-                    session["low_idx"] = i
+        for session_name in SESSIONS_BY_HOUR[hour]:
+            session = sessions[session_name]
+            if candle["high"] > session["high"]:
+                session["high"] = candle["high"]
+                session["high_idx"] = i
+            if candle["low"] < session["low"]:
+                session["low"] = candle["low"]
+                session["low_idx"] = i
 
     # Clean up - remove sessions with no data
     result = {}
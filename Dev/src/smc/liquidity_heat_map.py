@@ -19,6 +19,7 @@ from datetime import datetime, timezone
 from typing import List, Optional, Dict
 
 from src.utils.logger import logger
+from src.utils import clock
 
 
 @dataclass
@@ -109,7 +110,7 @@ class LiquidityHeatMapper:
             LiquidityHeatMap with scored levels
         """
         heat_map = LiquidityHeatMap()
-        now = datetime.now(timezone.utc)
+        now = clock.now(timezone.utc)
 
         if current_price is None and h1_candles:
             current_price = h1_candles[-1]["close"]
@@ -27,6 +27,7 @@ from src.smc.displacement import Displacement, detect_displacement
 from src.smc.liquidity_heat_map import LiquidityHeatMapper, LiquidityHeatMap
 from src.utils.instrument_profiles import get_profile
 from src.utils.logger import logger
+from src.utils.latency import Stopwatch
 
 
 @dataclass
@@ -133,6 +134,7 @@ class SMCAnalyzer:
         Returns:
             Dict with htf_bias, htf_structure, liquidity_map, session_levels, swing points
         """
+        sw = Stopwatch("smc.htf")
         result = {
             "htf_bias": "NEUTRAL",
             "htf_structure": "RANGING",
@@ -166,6 +168,7 @@ class SMCAnalyzer:
                 result["htf_swing_high"] = max(sp.price for sp in highs)
             if lows:
                 result["htf_swing_low"] = min(sp.price for sp in lows)
+        sw.lap("h4_structure")
 
         # H1 liquidity map
         if len(h1_candles) >= 20:
@@ -195,6 +198,7 @@ class SMCAnalyzer:
                     h1_lows = [sp for sp in h1_swings if sp.type == "LOW"]
                     if h1_lows:
                         result["htf_swing_low"] = min(sp.price for sp in h1_lows)
+        sw.lap("h1_liquidity")
 
         # ISI: Build liquidity heat map
         heat_mapper = LiquidityHeatMapper()
@@ -202,6 +206,7 @@ class SMCAnalyzer:
             h1_candles, result["liquidity_map"],
             result["session_levels"], instrument,
         )
+        sw.lap("heat_map")
 
         logger.info(
             f"HTF Analysis: bias={result['htf_bias']}, "
@@ -230,6 +235,7 @@ class SMCAnalyzer:
         Returns:
             Complete SMCAnalysis
         """
+        sw = Stopwatch("smc.ltf")
         profile = get_profile(instrument)
         sweep_source = profile.get("session_sweep_source", "london_ny")
 
@@ -260,6 +266,7 @@ class SMCAnalyzer:
             sweep_source=sweep_source,
             instrument=instrument,
         )
+        sw.lap("sweep")
 
         # Step 4: LTF structure analysis
         ltf_swings = detect_swing_points(m5_candles, left_bars=3, right_bars=2)
@@ -268,16 +275,19 @@ class SMCAnalyzer:
         # Detect CHoCH and BOS on M5
         analysis.ltf_choch = detect_choch(m5_candles, ltf_swings)
         analysis.ltf_bos = detect_bos(m5_candles, ltf_swings)
+        sw.lap("structure")
 
         # Step 5: Detect displacement
         displacements = detect_displacement(m5_candles, min_ratio=2.0, lookback=20)
         if displacements:
             # Use most recent displacement
             analysis.ltf_displacement = displacements[-1]
+        sw.lap("displacement")
 
         # Step 6: Detect FVGs and Order Blocks
         analysis.fvgs = detect_fvg(m5_candles)
         analysis.order_blocks = detect_order_blocks(m5_candles)
+        sw.lap("zones")
 
         # Step 7: Premium/Discount
         if analysis.htf_swing_high > 0 and analysis.htf_swing_low > 0:
@@ -297,6 +307,7 @@ class SMCAnalyzer:
 
         # Grade the setup
         analysis.setup_grade = self.grade_setup(analysis, instrument)
+        sw.lap("grading")
 
         # Map grade to confidence
         grade_confidence = {
@@ -310,6 +321,7 @@ class SMCAnalyzer:
         # Calculate SL/TP if we have a valid setup
         if analysis.direction and analysis.setup_grade != "NO_TRADE":
             self._calculate_sl_tp(analysis, m5_candles, instrument)
+            sw.lap("sl_tp")
 
         logger.info(
             f"LTF Analysis: sweep={'YES' if analysis.sweep_detected else 'NO'}, "
@@ -22,6 +22,7 @@ from typing import Optional, List, Dict, Any
 from src.core.auto_config import ScalpingConfig
 from src.market.indicators import TechnicalAnalysis
 from src.utils.logger import logger
+from src.utils import clock
 
 
 @dataclass
@@ -279,7 +280,7 @@ class ScalpingStrategy:
 
     def validate_entry_timing(self, instrument: str) -> tuple:
         """Validate if it's a good time for scalping entry."""
-        now = datetime.now(timezone.utc)
+        now = clock.now(timezone.utc)
         hour = now.hour
         preferred = self.config.preferred_sessions
 
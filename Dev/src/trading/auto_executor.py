@@ -21,10 +21,13 @@ from src.trading.risk_manager import RiskManager, ValidationResult
 from src.trading.emergency import emergency_controller
 from src.trading.auto_scanner import TradingSignal
 from src.trading.position_sizer import calculate_position_size
+from src.trading.position_monitor import AccountSnapshot, take_account_snapshot
 from src.core.auto_config import AutoTradingConfig, HardLimits, save_auto_config
 from src.analysis.llm_engine import LLMEngine, SignalValidation
+from src.utils.alert_aggregator import AggregationRule, AlertAggregator, Decision, fingerprint
 from src.utils.database import db
 from src.utils.logger import logger
+from src.utils.latency import Stopwatch, timed
 
 
 @dataclass
@@ -92,6 +95,13 @@ class AutoExecutor:
         self._last_reset_date: Optional[datetime] = None
         self._last_ai_shadow_at: Optional[datetime] = None
 
+        # The same skip (instrument, direction, reason) repeats every scan while
+        # its condition persists: write it once, then one summary per digest
+        self._skip_aggregator = AlertAggregator(
+            default_rule=AggregationRule(suppress_seconds=900, resolve_seconds=1800),
+            digest_interval=900,
+        )
+
         # STOP DAY tracking
         self._daily_losses: int = 0
         self._stop_day_active: bool = False
@@ -116,6 +126,7 @@ class AutoExecutor:
 
         logger.info("AutoExecutor initialized")
 
+    @timed("executor.execute_signal")
     def execute_signal(self, signal: TradingSignal) -> ExecutionResult:
         """
         Execute a trading signal.
@@ -157,6 +168,8 @@ class AutoExecutor:
         if not can_trade:
             return self._create_skip_result(signal, limit_reason)
 
+        sw = Stopwatch("executor")
+
         # 6. Run full validation
         grade_ok, grade_reason = self._validate_grade_execution(signal)
         if not grade_ok:
@@ -164,11 +177,13 @@ class AutoExecutor:
 
         # 7. Run full validation
         validation_ok, validation_reason = self._validate_signal(signal)
+        sw.lap("validation")
         if not validation_ok:
             return self._create_skip_result(signal, validation_reason)
 
         # 8. Calculate position size
         size_result = self._calculate_position_size(signal)
+        sw.lap("position_size")
         if not size_result["can_trade"]:
             return self._create_skip_result(signal, f"Position sizing: {size_result['reason']}")
 
@@ -179,6 +194,7 @@ class AutoExecutor:
         # 9. AI VALIDATION - Claude decides!
         if self.config.should_use_ai_validation():
             ai_result = self._validate_with_ai(signal)
+            sw.lap("ai_validation")
             if ai_result is None:
                 # AI call failed
                 if self.config.ai_validation.reject_on_failure:
@@ -245,6 +261,7 @@ class AutoExecutor:
                     confidence=signal.confidence,
                     risk_amount=size_result["risk_amount"],
                 )
+                sw.lap("place_pending_order")
 
                 if order_result.success:
                     # Track the pending order
@@ -315,6 +332,7 @@ class AutoExecutor:
                     confidence=signal.confidence,
                     risk_amount=size_result["risk_amount"]
                 )
+                sw.lap("open_position")
 
                 if order_result.success:
                     self._record_execution(signal, order_result)
@@ -510,63 +528,50 @@ class AutoExecutor:
         except Exception as e:
             logger.warning(f"Could not rebuild pending orders: {e}")
 
-    def check_pending_orders(self) -> List[dict]:
+    def check_pending_orders(self, snapshot: Optional[AccountSnapshot] = None) -> List[dict]:
         """
         Check status of all tracked pending orders.
 
+        Args:
+            snapshot: Bulk positions/orders snapshot (taken here if None)
+
         Returns:
             List of events: {"type": "FILLED"/"EXPIRED", "instrument": ..., ...}
         """
         events = []
         instruments_to_remove = []
+        if not self._pending_orders:
+            return events
+        if snapshot is None:
+            try:
+                snapshot = take_account_snapshot(self.order_manager.client, self.order_manager)
+            except Exception as e:
+                logger.warning(f"Error reading MT5 orders/positions: {e}")
+                return events
 
         for instrument, pending in self._pending_orders.items():
             order_ticket = pending["order_ticket"]
             try:
-                # Check if order still exists in MT5
-                import MetaTrader5 as mt5
-                orders = mt5.orders_get(ticket=order_ticket)
-                order_exists = orders is not None and len(orders) > 0
-
-                if order_exists:
-                    # Order still pending - check internal expiry as backup
+                if int(order_ticket) in snapshot.orders:
+                    # Order still pending
                     continue
 
-                # Order gone - check if it was filled (position exists)
-                symbol = self.order_manager.client._convert_symbol(instrument)
-                positions = mt5.positions_get(symbol=symbol)
-                position_exists = positions is not None and len(positions) > 0
+                # Order gone - check if it was filled (position exists).
+                # The opening order's ticket becomes the position ticket.
+                positions = snapshot.positions_for(instrument)
+                positions.sort(key=lambda p: p.get("ticket") != int(order_ticket))
 
-                if position_exists:
+                if positions:
                     # FILLED: Order converted to position
-                    trade_id = None
-                    fill_price = pending["limit_price"]
-                    units = pending.get("units")
-                    stop_loss = pending.get("stop_loss")
-                    take_profit = pending.get("take_profit")
+                    pos = positions[0]
+                    trade_id = str(pos["ticket"])
+                    fill_price = float(pos.get("price_open") or pending["limit_price"])
+                    stop_loss = pos.get("sl", pending.get("stop_loss"))
+                    take_profit = pos.get("tp", pending.get("take_profit"))
                     confidence = pending.get("confidence")
                     risk_amount = pending.get("risk_amount")
-                    direction = pending["direction"]
-                    if positions:
-                        pos = positions[0]
-                        trade_id = str(pos.ticket)
-                        fill_price = float(getattr(pos, "price_open", fill_price))
-                        stop_loss = getattr(pos, "sl", stop_loss)
-                        take_profit = getattr(pos, "tp", take_profit)
-                        vol = float(getattr(pos, "volume", 0.0) or 0.0)
-                        symbol_info = mt5.symbol_info(symbol)
-                        contract_size = float(getattr(symbol_info, "trade_contract_size", 100000.0) or 100000.0)
-                        signed_units = int(round(vol * contract_size))
-                        if getattr(pos, "type", None) == mt5.ORDER_TYPE_SELL:
-                            signed_units = -abs(signed_units)
-                        elif getattr(pos, "type", None) == mt5.ORDER_TYPE_BUY:
-                            signed_units = abs(signed_units)
-                        if signed_units:
-                            units = signed_units
-                        if getattr(pos, "type", None) == mt5.ORDER_TYPE_BUY:
-                            direction = "LONG"
-                        elif getattr(pos, "type", None) == mt5.ORDER_TYPE_SELL:
-                            direction = "SHORT"
+                    direction = pos.get("direction") or pending["direction"]
+                    units = pos.get("long_units") or -abs(pos.get("short_units") or 0) or pending.get("units")
 
                     event = {
                         "type": "FILLED",
@@ -742,6 +747,9 @@ class AutoExecutor:
             )
             if sync_result["closed"]:
                 logger.info(f"Synced DB: closed {len(sync_result['closed'])} stale trades")
+            if sync_result.get("closed_trades"):
+                from src.trading.trade_lifecycle import calibrate_synced_closes
+                calibrate_synced_closes(sync_result["closed_trades"])
 
             if len(mt5_positions) >= self.config.max_concurrent_positions:
                 return False, f"Max positions reached ({len(mt5_positions)})"
@@ -883,13 +891,11 @@ class AutoExecutor:
         })
 
     def _create_skip_result(self, signal: TradingSignal, reason: str) -> ExecutionResult:
-        """Create a skip result."""
+        """Create a skip result (repeats of an active skip are aggregated)."""
         self._stats["total_skipped"] += 1
-        logger.info(f"Signal skipped: {signal.instrument} - {reason}")
         self._run_ai_shadow_for_skip(signal, reason)
 
-        # Log to activity
-        db.log_activity({
+        activity = {
             "activity_type": "TRADE_SKIPPED",
             "instrument": signal.instrument,
             "direction": signal.direction,
@@ -902,7 +908,14 @@ class AutoExecutor:
                 "take_profit": signal.take_profit,
                 "risk_reward": signal.risk_reward
             }
-        })
+        }
+        key = fingerprint(signal.instrument, signal.direction, reason)
+        if self._skip_aggregator.observe(key, "skip", activity) is Decision.SUPPRESS:
+            logger.debug(f"Signal skipped: {signal.instrument} - {reason} (repeated)")
+        else:
+            logger.info(f"Signal skipped: {signal.instrument} - {reason}")
+            db.log_activity(activity)
+        self._flush_skip_digest()
 
         return ExecutionResult(
             signal=signal,
@@ -910,6 +923,14 @@ class AutoExecutor:
             skip_reason=reason
         )
 
+    def _flush_skip_digest(self, force: bool = False) -> None:
+        """Log one summary activity per skip that repeated since the last digest."""
+        for entry in self._skip_aggregator.digest(force=force):
+            activity = dict(entry.sample)
+            activity["reasoning"] = f"{activity['reasoning']} (repeated {entry.suppressed}x)"
+            activity["details"] = {**activity["details"], "aggregated": True, "repeats": entry.suppressed}
+            db.log_activity(activity)
+
     def _run_ai_shadow_for_skip(self, signal: TradingSignal, skip_reason: str) -> None:
         """
         Run throttled AI shadow validation for skipped signals.
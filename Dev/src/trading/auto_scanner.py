@@ -42,19 +42,23 @@ from src.analysis.confidence import ConfidenceCalculator, ConfidenceResult
 from src.analysis.learning_engine import LearningEngine
 from src.smc import SMCAnalyzer, SMCAnalysis
 from src.smc.sequence_tracker import SequenceTracker
-from src.analysis.confidence_calibrator import ConfidenceCalibrator
+from src.analysis.confidence_calibrator import get_calibrator
 from src.analysis.cross_asset_detector import CrossAssetDetector
 from src.analysis.llm_engine import LLMEngine
 from src.utils.database import db
 from src.utils.logger import logger
+from src.utils import clock
+from src.utils.latency import Stopwatch, timed
 from src.utils.instrument_profiles import (
     get_profile,
     get_profile_strict,
     is_in_session,
     normalize_instrument_symbol,
 )
+from src.utils.session_calendar import SessionCalendar, killzone_at, minute_of_week
 from src.analysis.news_filter import news_filter
 from src.upgrade.filter_registry import get_filter_registry
+from src.upgrade.filter_sandbox import FilterSandbox
 
 
 @dataclass
@@ -163,16 +167,26 @@ class MarketScanner:
 
         # ISI components
         self.sequence_tracker = SequenceTracker(db)
-        self.calibrator = ConfidenceCalibrator(db)
-        self.cross_asset = CrossAssetDetector(client, db)
+        self.calibrator = get_calibrator()
+        self.cross_asset = CrossAssetDetector(client, db, instruments=config.instruments, matrix_mode=True)
         self.llm_engine = LLMEngine()
         self._last_ai_shadow_at: Optional[datetime] = None
 
         # Thread pool for parallel scanning
         self._executor = ThreadPoolExecutor(max_workers=4)
 
+        # Latest ScanResult per instrument (read by the bar-close scheduler)
+        self.last_results: Dict[str, ScanResult] = {}
+
         # Filter registry for self-upgrade system
         self.filter_registry = get_filter_registry()
+        upgrade_cfg = getattr(config, "self_upgrade", None)
+        if upgrade_cfg is not None and upgrade_cfg.sandbox_filters and self.filter_registry.sandbox is None:
+            self.filter_registry.use_sandbox(FilterSandbox(
+                workers=upgrade_cfg.sandbox_workers,
+                call_timeout_ms=upgrade_cfg.sandbox_timeout_ms,
+                latency_budget_ms=upgrade_cfg.sandbox_latency_budget_ms,
+            ))
         ai_filters_loaded = self.filter_registry.load_ai_generated_filters()
 
         filter_status = f"{self.filter_registry.get_stats()['total_filters']} filters ({ai_filters_loaded} AI)"
@@ -233,24 +247,32 @@ class MarketScanner:
             return "Collect more candles, then repeat the scan."
         return "Proceed to next scheduled scan cycle."
 
-    def scan_all_instruments(self) -> List[TradingSignal]:
-        """Scan all configured instruments for SMC trading opportunities."""
+    @timed("scan.cycle")
+    def scan_all_instruments(self, instruments: Optional[List[str]] = None) -> List[TradingSignal]:
+        """
+        Scan instruments for SMC trading opportunities.
+
+        Args:
+            instruments: Subset to scan (defaults to all configured instruments)
+        """
         signals = []
         start_time = datetime.now(timezone.utc)
+        instruments = list(self.config.instruments if instruments is None else instruments)
 
         db.log_activity({
             "activity_type": "SCAN_START",
-            "reasoning": f"Starting SMC scan of {len(self.config.instruments)} instruments",
+            "reasoning": f"Starting SMC scan of {len(instruments)} instruments",
             "details": {
-                "instruments": self.config.instruments,
+                "instruments": instruments,
                 "mode": "SMC",
                 "min_confidence": self.config.get_active_threshold(),
             }
         })
 
-        for instrument in self.config.instruments:
+        for instrument in instruments:
             try:
                 result = self.scan_instrument(instrument)
+                self.last_results[instrument] = result
                 if result.has_signal and result.signal:
                     signals.append(result.signal)
                 elif result.skip_reason:
@@ -259,6 +281,7 @@ class MarketScanner:
                     logger.warning(f"{instrument}: Error - {result.error}")
             except Exception as e:
                 logger.error(f"Failed to scan {instrument}: {e}")
+                self.last_results[instrument] = ScanResult(instrument=instrument, has_signal=False, error=str(e))
                 db.log_activity({
                     "activity_type": "ERROR",
                     "instrument": instrument,
@@ -266,21 +289,21 @@ class MarketScanner:
                 })
 
         duration_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-        logger.info(f"SMC Scan complete: {len(signals)} signals from {len(self.config.instruments)} instruments in {duration_ms}ms")
+        logger.info(f"SMC Scan complete: {len(signals)} signals from {len(instruments)} instruments in {duration_ms}ms")
 
         db.log_activity({
             "activity_type": "SCAN_COMPLETE",
             "reasoning": f"SMC scan complete: found {len(signals)} signals",
             "duration_ms": duration_ms,
             "details": {
-                "instruments_scanned": len(self.config.instruments),
+                "instruments_scanned": len(instruments),
                 "signals_found": len(signals),
                 "signal_instruments": [s.instrument for s in signals],
             }
         })
         db.log_scanner_stats({
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "instruments_scanned": len(self.config.instruments),
+            "instruments_scanned": len(instruments),
             "signals_found": len(signals),
             # Executed count is tracked by executor after scan.
             "signals_executed": 0,
@@ -308,6 +331,7 @@ class MarketScanner:
                 signals.append(result.signal)
         return signals
 
+    @timed("scan.instrument")
     def scan_instrument(self, instrument: str) -> ScanResult:
         """
         Scan a single instrument using SMC pipeline.
@@ -319,6 +343,8 @@ class MarketScanner:
         → SL/TP → R:R → Signal
         """
         start_time = datetime.now(timezone.utc)
+        # Per-stage latency ("scan.<stage>"); early returns skip later laps
+        sw = Stopwatch("scan")
 
         db.log_activity({
             "activity_type": "ANALYZING",
@@ -351,6 +377,7 @@ class MarketScanner:
 
             # 1a. Get current price
             price = self.client.get_price(canonical_instrument)
+            sw.lap("price")
 
             # 1b. Check spread
             if not self._check_spread(price, canonical_instrument):
@@ -365,6 +392,7 @@ class MarketScanner:
 
             # 1d. Check news calendar
             should_avoid, news_reason = news_filter.should_avoid_trade(canonical_instrument)
+            sw.lap("prefilters")
             if should_avoid:
                 return self._skip(instrument, start_time,
                                   f"News filter: {news_reason}")
@@ -380,12 +408,15 @@ class MarketScanner:
 
             # H4 candles for HTF structure
             h4_candles = self.client.get_candles(canonical_instrument, "H4", 100)
+            sw.lap("candles_h4")
 
             # H1 candles for liquidity map + session levels
             h1_candles = self.client.get_candles(canonical_instrument, "H1", 100)
+            sw.lap("candles_h1")
 
             # M5 candles for LTF signal
             m5_candles = self.client.get_candles(canonical_instrument, "M5", 100)
+            sw.lap("candles_m5")
 
             if len(m5_candles) < 30:
                 return self._skip(instrument, start_time,
@@ -396,6 +427,7 @@ class MarketScanner:
             # ==========================================
 
             htf_result = self.smc_analyzer.analyze_htf(h4_candles, h1_candles, canonical_instrument)
+            sw.lap("smc_htf")
 
             # HARD GATE (with optional soft-relax): HTF must not be neutral
             if htf_result["htf_bias"] == "NEUTRAL":
@@ -437,6 +469,7 @@ class MarketScanner:
             # ==========================================
 
             smc_analysis = self.smc_analyzer.analyze_ltf(m5_candles, htf_result, canonical_instrument)
+            sw.lap("smc_ltf")
             ltf_within_killzone, _ = self._is_in_killzone_for_instrument(profile)
             ltf_candidate_direction = self._candidate_direction_from_sweep(smc_analysis)
             smc_v2_cfg = getattr(self.config, "smc_v2", None)
@@ -536,6 +569,7 @@ class MarketScanner:
             )
 
             direction = smc_analysis.direction
+            sw.lap("ltf_gates")
 
             # ==========================================
             # STEP 4.5: ISI Sequence Tracking
@@ -543,6 +577,7 @@ class MarketScanner:
 
             # Still run technical first for sequence tracker input
             technical = self.technical_analyzer.analyze(m5_candles, canonical_instrument)
+            sw.lap("technical")
 
             seq_state = self.sequence_tracker.update(instrument, smc_analysis, technical)
             seq_modifier = seq_state.confidence_modifier()
@@ -558,6 +593,7 @@ class MarketScanner:
                     "completion_rate": seq_state.completion_rate,
                 }
             })
+            sw.lap("sequence")
 
             # ==========================================
             # STEP 5: Market Regime filter (technical already computed above)
@@ -565,6 +601,7 @@ class MarketScanner:
 
             # 5a. Market Regime filter (still useful)
             regime_ok, regime_reason = self._check_market_regime(technical, canonical_instrument)
+            sw.lap("regime")
             if not regime_ok:
                 return self._skip(instrument, start_time,
                                   f"Regime filter: {regime_reason}",
@@ -580,12 +617,14 @@ class MarketScanner:
             # ==========================================
 
             sentiment = self.sentiment_analyzer.analyze(m5_candles, technical, instrument=canonical_instrument)
+            sw.lap("sentiment")
 
             # ==========================================
             # STEP 6.5: ISI Cross-Asset Divergence
             # ==========================================
 
             divergence_modifier = self.cross_asset.get_confidence_modifier(canonical_instrument, direction)
+            sw.lap("cross_asset")
 
             # ==========================================
             # STEP 7: Calculate confidence (SMC + ISI)
@@ -634,6 +673,7 @@ class MarketScanner:
             # Generate SMC-based bull/bear case
             confidence_result.bull_case = self._build_smc_bull_case(smc_analysis)
             confidence_result.bear_case = self._build_smc_bear_case(smc_analysis)
+            sw.lap("confidence")
 
             # ==========================================
             # STEP 8: Learning engine adjustment
@@ -649,6 +689,7 @@ class MarketScanner:
             learning_insights = self.learning_engine.get_insights_for_trade(
                 canonical_instrument, direction, learning_context
             )
+            sw.lap("learning")
 
             original_confidence = confidence_result.confidence_score
             adjusted_confidence = max(0, min(100,
@@ -703,6 +744,7 @@ class MarketScanner:
                 confidence_result.confidence_score,
                 technical, sentiment
             )
+            sw.lap("filters")
             if not filter_result.passed:
                 return self._skip(instrument, start_time,
                                   f"Filter: {filter_result.reason}",
@@ -845,6 +887,7 @@ class MarketScanner:
                 reason="SMC v2 shadow evaluation",
                 v2_eval=v2_eval,
             )
+            sw.lap("sl_tp")
 
             # ==========================================
             # STEP 13: Create signal
@@ -997,6 +1040,7 @@ class MarketScanner:
                 "skip_reason": None,
                 "trade_id": None,
             })
+            sw.lap("signal")
 
             return ScanResult(
                 instrument=instrument,
@@ -1212,7 +1256,7 @@ class MarketScanner:
 
         # Throttle to control API usage.
         cooldown_seconds = max(0, int(getattr(self.config.ai_validation, "shadow_cooldown_seconds", 45)))
-        now = datetime.now(timezone.utc)
+        now = clock.now(timezone.utc)
         if self._last_ai_shadow_at and cooldown_seconds > 0:
             elapsed = (now - self._last_ai_shadow_at).total_seconds()
             if elapsed < cooldown_seconds:
@@ -1545,27 +1589,16 @@ class MarketScanner:
 
     def _is_in_killzone(self) -> tuple:
         """Check if current time is in a high-probability killzone."""
-        hour = datetime.now(timezone.utc).hour
-        if 7 <= hour < 9:
-            return True, "LONDON_OPEN"
-        if 12 <= hour < 14:
-            return True, "NY_OPEN"
-        if 15 <= hour < 17:
-            return True, "LONDON_CLOSE"
-        return False, ""
+        name = killzone_at(minute_of_week(clock.now(timezone.utc)))
+        return bool(name), name
 
     def _is_in_killzone_for_instrument(self, profile: dict) -> tuple[bool, str]:
         """Check killzone using profile killzones and global time windows."""
         smc_v2 = getattr(self.config, "smc_v2", None)
         if smc_v2 and getattr(getattr(smc_v2, "killzone_gate", None), "always_true", False):
             return True, "ALWAYS_TRUE_OVERRIDE"
-        in_kz, kz_name = self._is_in_killzone()
-        if not in_kz:
-            return False, ""
-        allowed = profile.get("killzones", [])
-        if not allowed:
-            return in_kz, kz_name
-        return kz_name in allowed, kz_name
+        calendar = SessionCalendar.for_profile(profile)
+        return calendar.in_killzone(minute_of_week(clock.now(timezone.utc)))
 
     def _next_high_impact_news_minutes(self, instrument: str) -> Optional[int]:
         """Return minutes until next high-impact event for instrument, if any."""
@@ -1946,10 +1979,10 @@ class MarketScanner:
             "market_regime": technical.market_regime,
             "regime_strength": technical.regime_strength,
             "sentiment": sentiment.sentiment_score,
-            "timestamp": datetime.now(timezone.utc),
+            "timestamp": clock.now(timezone.utc),
         }
 
-        hour = datetime.now(timezone.utc).hour
+        hour = clock.now(timezone.utc).hour
         if 7 <= hour < 16:
             signal_data["session"] = "london"
         elif 12 <= hour < 21:
@@ -15,7 +15,13 @@ Usage:
 
 from typing import Optional
 from datetime import datetime, timezone, timedelta
-import MetaTrader5 as mt5
+try:
+    import MetaTrader5 as mt5
+    MT5_AVAILABLE = True
+except ImportError:
+    # Windows-only package; offline tools (backtests, benchmarks) still import this module
+    mt5 = None
+    MT5_AVAILABLE = False
 
 from src.utils.config import config
 from src.utils.logger import logger
@@ -76,12 +82,13 @@ class MT5Client:
         "W1": mt5.TIMEFRAME_W1,
         "MN": mt5.TIMEFRAME_MN1,
         "MN1": mt5.TIMEFRAME_MN1,
-    }
+    } if MT5_AVAILABLE else {}
 
     def __init__(self):
         """Initialize client and connect to MT5."""
         self._connected = False
         self._symbol_cache = {}
+        self._contract_sizes: dict[str, float] = {}
         self._connect()
 
     def _connect(self) -> bool:
@@ -91,6 +98,10 @@ class MT5Client:
         Returns:
             True if connected successfully
         """
+        if not MT5_AVAILABLE:
+            logger.warning("MetaTrader5 package not installed - MT5 client offline")
+            return False
+
         # Validate configuration
         is_valid, error_msg = config.validate_mt5()
         if not is_valid:
@@ -455,10 +466,13 @@ class MT5Client:
     # Position Methods
     # ===================
 
-    def get_positions(self) -> list[dict]:
+    def get_positions(self, strict: bool = False) -> list[dict]:
         """
         Get all open positions.
 
+        Args:
+            strict: Raise MT5Error on a failed read instead of returning []
+
         Returns:
             List of position dicts
         """
@@ -468,19 +482,20 @@ class MT5Client:
         positions = mt5.positions_get()
 
         if positions is None:
+            if strict:
+                raise MT5Error(f"Failed to read positions: {mt5.last_error()}")
             return []
 
         result = []
         for pos in positions:
             instrument = self._convert_symbol_reverse(pos.symbol)
             is_long = pos.type == mt5.ORDER_TYPE_BUY
-            symbol_info = mt5.symbol_info(pos.symbol)
-            contract_size = getattr(symbol_info, "trade_contract_size", 100000.0) if symbol_info else 100000.0
+            contract_size = self._contract_size(pos.symbol)
 
             result.append({
                 "instrument": instrument,
-                "long_units": int(pos.volume * contract_size) if is_long else 0,
-                "short_units": int(pos.volume * contract_size) if not is_long else 0,
+                "long_units": int(round(pos.volume * contract_size)) if is_long else 0,
+                "short_units": int(round(pos.volume * contract_size)) if not is_long else 0,
                 "unrealized_pl": pos.profit,
                 "direction": "LONG" if is_long else "SHORT",
                 "ticket": pos.ticket,
@@ -493,6 +508,17 @@ class MT5Client:
 
         return result
 
+    def _contract_size(self, symbol: str) -> float:
+        """Contract size per lot (static per symbol, so cached)."""
+        size = self._contract_sizes.get(symbol)
+        if size is None:
+            symbol_info = mt5.symbol_info(symbol)
+            if not symbol_info:
+                return 100000.0
+            size = float(getattr(symbol_info, "trade_contract_size", 100000.0) or 100000.0)
+            self._contract_sizes[symbol] = size
+        return size
+
     # ===================
     # Utility Methods
     # ===================
@@ -510,6 +536,7 @@ class MT5Client:
         mt5.shutdown()
         self._connected = False
         self._symbol_cache = {}
+        self._contract_sizes = {}
         return self._connect()
 
     def _ensure_connected(self) -> bool:
@@ -660,6 +687,64 @@ class MT5Client:
             logger.info("No trade history found in MT5")
             return []
 
+        closed_trades = self._closed_trades_from_deals(deals)
+
+        logger.info(f"Found {len(closed_trades)} closed trades in MT5 history")
+        return closed_trades
+
+    def get_history_since(self, since: datetime) -> tuple[list[dict], Optional[datetime]]:
+        """
+        Get trades closed since a deal-time cursor.
+
+        Unlike get_history(), the window is never widened: callers keep a
+        high-water mark and pass it back (minus a small overlap), so each
+        poll only pulls deals MT5 has not reported before. Positions whose
+        entry deal predates the window are completed with one
+        per-position lookup.
+
+        Args:
+            since: Earliest deal time to fetch
+
+        Returns:
+            Tuple of (closed trades as in get_history(), latest deal time seen
+            or None when the window was empty)
+        """
+        if not self._ensure_connected():
+            raise MT5Error("Not connected to MT5 and reconnect failed")
+
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # See get_history(): include forward buffer for broker/server clock skew.
+        to_date = datetime.now(timezone.utc) + timedelta(hours=6)
+
+        deals = mt5.history_deals_get(since, to_date)
+        if not deals:
+            return [], None
+        deals = list(deals)
+        last_deal_time = datetime.fromtimestamp(max(d.time for d in deals), tz=timezone.utc)
+
+        # Exits whose entry is older than the cursor: pull the whole position.
+        entered = {d.position_id for d in deals if d.entry == 0}
+        orphaned = {d.position_id for d in deals if d.entry == 1 and d.position_id} - entered
+        for pos_id in orphaned:
+            try:
+                older = mt5.history_deals_get(position=pos_id) or ()
+            except Exception:
+                older = ()
+            deals.extend(d for d in older if d.entry == 0 and d.position_id == pos_id)
+
+        return self._closed_trades_from_deals(deals), last_deal_time
+
+    def _closed_trades_from_deals(self, deals) -> list[dict]:
+        """
+        Group raw MT5 deals into fully closed trades.
+
+        Args:
+            deals: Iterable of MT5 deal records
+
+        Returns:
+            Closed trade dicts sorted by close time (see get_history())
+        """
         # Group deals by position_id
         # Each position has entry deal(s) and exit deal(s)
         positions = {}
@@ -691,6 +776,7 @@ class MT5Client:
 
         # Build closed trades list
         closed_trades = []
+        contract_sizes: dict[str, float] = {}
 
         for pos_id, pos_data in positions.items():
             if not pos_data["entries"] or not pos_data["exits"]:
@@ -723,9 +809,13 @@ class MT5Client:
             # Convert symbol
             instrument = self._convert_symbol_reverse(pos_data["symbol"])
 
-            # Get symbol info for contract size
-            symbol_info = mt5.symbol_info(pos_data["symbol"])
-            contract_size = getattr(symbol_info, "trade_contract_size", 100000.0) if symbol_info else 100000.0
+            # Get symbol info for contract size (once per symbol)
+            if pos_data["symbol"] not in contract_sizes:
+                symbol_info = mt5.symbol_info(pos_data["symbol"])
+                contract_sizes[pos_data["symbol"]] = (
+                    getattr(symbol_info, "trade_contract_size", 100000.0) if symbol_info else 100000.0
+                )
+            contract_size = contract_sizes[pos_data["symbol"]]
             units = int(total_entry_volume * contract_size)
             if not is_long:
                 units = -units
@@ -756,8 +846,6 @@ class MT5Client:
 
         # Sort by close time
         closed_trades.sort(key=lambda t: t["closed_at"])
-
-        logger.info(f"Found {len(closed_trades)} closed trades in MT5 history")
         return closed_trades
 
     def get_closed_trade_by_position(
@@ -14,12 +14,12 @@ from typing import Optional, List, Dict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import math
-import MetaTrader5 as mt5
 
-from src.trading.mt5_client import MT5Client, MT5Error
+from src.trading.mt5_client import MT5Client, MT5Error, mt5
 from src.trading.risk_manager import RiskManager, ValidationResult
 from src.utils.config import config
 from src.utils.logger import logger
+from src.utils.latency import Stopwatch, timed
 from src.utils.helpers import generate_trade_id, format_price, get_pip_divisor
 from src.utils.database import db
 from src.utils.instrument_profiles import get_profile, is_in_session
@@ -96,6 +96,7 @@ class OrderManager:
         else:  # RETURN (default)
             return 2  # ORDER_FILLING_RETURN
 
+    @timed("orders.open_position")
     def open_position(
         self,
         instrument: str,
@@ -134,6 +135,7 @@ class OrderManager:
                 error="Units cannot be zero"
             )
 
+        sw = Stopwatch("orders.open")
         equity = None
         # === RISK VALIDATION GATE ===
         if not _bypass_validation:
@@ -216,6 +218,7 @@ class OrderManager:
         else:
             # Only per-call bypass allowed - log warning
             logger.warning(f"RISK VALIDATION BYPASSED for {instrument} trade (per-call bypass)")
+        sw.lap("risk_validation")
 
         # Convert symbol to MT5 format
         symbol = self.client._convert_symbol(instrument)
@@ -291,10 +294,12 @@ class OrderManager:
         # Add take profit
         if take_profit is not None:
             request["tp"] = take_profit
+        sw.lap("prepare")
 
         # Execute order
         try:
             result = mt5.order_send(request)
+            sw.lap("order_send")
 
             if result is None:
                 error = mt5.last_error()
@@ -357,6 +362,7 @@ class OrderManager:
             if not trade_id:
                 trade_id = generate_trade_id()
                 logger.warning(f"Could not get MT5 ticket, using generated ID: {trade_id}")
+            sw.lap("resolve_ticket")
             direction = "LONG" if units > 0 else "SHORT"
 
             logger.info(
@@ -398,6 +404,7 @@ class OrderManager:
                 })
             except Exception as e:
                 logger.warning(f"Failed to log trade to DB: {e}")
+            sw.lap("persist")
 
             return OrderResult(
                 success=True,
@@ -1040,12 +1047,14 @@ class OrderManager:
             logger.error(f"Failed to cancel pending order: {e}")
             return OrderResult(success=False, error=str(e))
 
-    def get_pending_orders(self, instrument: str = None) -> List[Dict]:
+    def get_pending_orders(self, instrument: str = None, strict: bool = False) -> List[Dict]:
         """
         Get all pending orders, optionally filtered by instrument.
 
         Args:
             instrument: Filter by instrument (None = all)
+            strict: Raise MT5Error on a failed read instead of returning []
+                (so callers can tell "no orders" from "unknown")
 
         Returns:
             List of pending order dicts
@@ -1058,6 +1067,8 @@ class OrderManager:
                 orders = mt5.orders_get()
 
             if orders is None:
+                if strict:
+                    raise MT5Error(f"Failed to read pending orders: {mt5.last_error()}")
                 return []
 
             result = []
@@ -1082,5 +1093,7 @@ class OrderManager:
             return result
 
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Failed to get pending orders: {e}")
             return []
@@ -0,0 +1,198 @@
+"""
+Position Monitor - Fast fill/close detection from bulk account snapshots.
+
+Pending limit fills and SL/TP closes used to be noticed only at the start
+of the next scan cycle, with per-order MT5 lookups and a full DB-vs-MT5
+sync every cycle. The monitor instead takes one bulk snapshot per tick:
+
+    positions_get()  +  orders_get()      (2 terminal calls, any account size)
+
+and diffs it against the previous snapshot in memory. Only when something
+changed does it do real work:
+
+- a tracked pending order disappeared -> AutoExecutor.check_pending_orders()
+  resolves it against the same snapshot (FILLED / EXPIRED events)
+- a position disappeared -> one db.sync_trades_with_mt5() (CLOSED events)
+- a position appeared -> OPENED event
+
+The first snapshot also runs one sync, for trades closed while the
+service was down.
+
+Usage:
+    monitor = PositionMonitor(client, executor, on_event=handle_event)
+    task = asyncio.create_task(monitor.run())
+    ...
+    monitor.stop()
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from src.utils.database import db
+from src.utils.logger import logger
+
+
+MONITOR_INTERVAL_SECONDS = 1.0
+MONITOR_ERROR_BACKOFF_SECONDS = 10.0
+
+
+@dataclass
+class AccountSnapshot:
+    """Open positions and pending orders at one instant."""
+    positions: Dict[int, dict] = field(default_factory=dict)  # ticket -> MT5Client.get_positions() row
+    orders: Dict[int, dict] = field(default_factory=dict)     # ticket -> OrderManager.get_pending_orders() row
+    taken_at: float = 0.0
+
+    def position_list(self) -> List[dict]:
+        return list(self.positions.values())
+
+    def positions_for(self, instrument: str) -> List[dict]:
+        return [p for p in self.positions.values() if p.get("instrument") == instrument]
+
+
+def take_account_snapshot(client, order_manager) -> AccountSnapshot:
+    """One bulk positions + orders read (raises if either read fails)."""
+    positions = client.get_positions(strict=True)
+    orders = order_manager.get_pending_orders(strict=True)
+    return AccountSnapshot(
+        positions={int(p["ticket"]): p for p in positions if p.get("ticket") is not None},
+        orders={int(o["order_ticket"]): o for o in orders if o.get("order_ticket") is not None},
+        taken_at=time.time(),
+    )
+
+
+class PositionMonitor:
+    """Polls account snapshots at a short fixed cadence and emits change events."""
+
+    def __init__(
+        self,
+        client,
+        executor,
+        interval: float = MONITOR_INTERVAL_SECONDS,
+        on_event: Optional[Callable[[dict], None]] = None,
+    ):
+        """
+        Args:
+            client: MT5Client
+            executor: AutoExecutor (owns the tracked pending orders)
+            interval: Seconds between snapshots
+            on_event: Called with each event dict
+        """
+        self.client = client
+        self.executor = executor
+        self.interval = interval
+        self.on_event = on_event
+        self.previous: Optional[AccountSnapshot] = None
+        self._running = False
+        self._stats = {"polls": 0, "events": 0, "syncs": 0, "errors": 0}
+
+    # ---------- Diffing ----------
+
+    def _tracked_tickets(self) -> set:
+        return {int(p["order_ticket"]) for p in self.executor._pending_orders.values()}
+
+    def poll(self) -> List[dict]:
+        """Take one snapshot, diff it and emit events."""
+        snapshot = take_account_snapshot(self.client, self.executor.order_manager)
+        previous = self.previous
+        self._stats["polls"] += 1
+        events: List[dict] = []
+
+        # Tracked pending orders that left the order book: filled or expired
+        if self._tracked_tickets() - set(snapshot.orders):
+            events.extend(self.executor.check_pending_orders(snapshot))
+
+        if previous is None:
+            # First snapshot: close DB trades that ended while we weren't watching
+            self._sync_closed(snapshot)
+        else:
+            filled = {e.get("trade_id") for e in events if e["type"] == "FILLED"}
+            for ticket in snapshot.positions.keys() - previous.positions.keys():
+                if str(ticket) in filled:
+                    continue
+                pos = snapshot.positions[ticket]
+                events.append({
+                    "type": "OPENED",
+                    "instrument": pos.get("instrument"),
+                    "direction": pos.get("direction"),
+                    "trade_id": str(ticket),
+                })
+
+            gone = previous.positions.keys() - snapshot.positions.keys()
+            if gone:
+                sync_result = self._sync_closed(snapshot)
+                for ticket in gone:
+                    pos = previous.positions[ticket]
+                    events.append({
+                        "type": "CLOSED",
+                        "instrument": pos.get("instrument"),
+                        "direction": pos.get("direction"),
+                        "trade_id": str(ticket),
+                        "synced": str(ticket) in sync_result.get("closed", []),
+                    })
+
+        self.previous = snapshot
+        self._dispatch(events)
+        return events
+
+    def _sync_closed(self, snapshot: AccountSnapshot) -> dict:
+        """Close DB trades whose positions vanished (one diff per change, not per cycle)."""
+        self._stats["syncs"] += 1
+        try:
+            result = db.sync_trades_with_mt5(
+                snapshot.position_list(),
+                mt5_history=None,  # A close was seen: fetch new deals for its P/L
+                mt5_client=self.client,
+            )
+            if result.get("closed"):
+                logger.info(
+                    f"Position monitor: closed {len(result['closed'])} trade(s), "
+                    f"with P/L for {result.get('closed_with_pnl', 0)}"
+                )
+            if result.get("closed_trades"):
+                from src.trading.trade_lifecycle import calibrate_synced_closes
+                calibrate_synced_closes(result["closed_trades"])
+            return result
+        except Exception as e:
+            logger.warning(f"Position monitor trade sync failed: {e}")
+            return {}
+
+    def _dispatch(self, events: List[dict]) -> None:
+        self._stats["events"] += len(events)
+        if not self.on_event:
+            return
+        for event in events:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                logger.error(f"Position monitor callback error: {e}")
+
+    # ---------- Loop ----------
+
+    async def run(self) -> None:
+        """Poll until stop() (run as an asyncio task)."""
+        self._running = True
+        logger.info(f"Position monitor started ({self.interval:.1f}s cadence)")
+        while self._running:
+            try:
+                self.poll()
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Position monitor error: {e}")
+                await asyncio.sleep(MONITOR_ERROR_BACKOFF_SECONDS)
+        logger.info("Position monitor stopped")
+
+    def stop(self) -> None:
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def get_stats(self) -> dict:
+        return dict(self._stats)
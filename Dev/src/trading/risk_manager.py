@@ -19,6 +19,7 @@ from typing import Optional
 from datetime import datetime, timedelta, timezone, date
 
 from src.utils.config import config
+from src.utils import clock
 from src.utils.logger import logger
 
 
@@ -86,8 +87,8 @@ class RiskManager:
         """Initialize risk manager."""
         self._daily_pnl = 0.0
         self._weekly_pnl = 0.0
-        self._last_daily_reset = datetime.now(timezone.utc).date()
-        self._last_weekly_reset = self._get_week_start(datetime.now(timezone.utc))
+        self._last_daily_reset = clock.now(timezone.utc).date()
+        self._last_weekly_reset = self._get_week_start(clock.now(timezone.utc))
 
         # Auto-trading: Loss streak and cooldown tracking
         self._loss_streak = 0
@@ -106,7 +107,7 @@ class RiskManager:
 
     def _check_and_reset_if_needed(self) -> None:
         """Auto-reset daily/weekly P/L at UTC boundaries."""
-        now = datetime.now(timezone.utc)
+        now = clock.now(timezone.utc)
         today = now.date()
         current_week_start = self._get_week_start(now)
 
@@ -308,7 +309,7 @@ class RiskManager:
     def reset_daily_pnl(self) -> None:
         """Reset daily P/L (call at start of trading day)."""
         self._daily_pnl = 0.0
-        self._last_daily_reset = datetime.now(timezone.utc).date()
+        self._last_daily_reset = clock.now(timezone.utc).date()
         logger.info("Daily P/L reset to 0")
 
     def update_weekly_pnl(self, pnl: float) -> None:
@@ -319,7 +320,7 @@ class RiskManager:
     def reset_weekly_pnl(self) -> None:
         """Reset weekly P/L (call at start of week)."""
         self._weekly_pnl = 0.0
-        self._last_weekly_reset = self._get_week_start(datetime.now(timezone.utc))
+        self._last_weekly_reset = self._get_week_start(clock.now(timezone.utc))
         logger.info("Weekly P/L reset to 0")
 
     def get_remaining_risk_week(self, equity: float) -> float:
@@ -415,7 +416,7 @@ class RiskManager:
     def _trigger_cooldown(self) -> None:
         """Trigger cooldown period."""
         minutes = self._cooldown_config["cooldown_minutes"]
-        self._cooldown_until = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+        self._cooldown_until = clock.now(timezone.utc) + timedelta(minutes=minutes)
         logger.warning(
             f"COOLDOWN TRIGGERED: {self._loss_streak} consecutive losses. "
             f"Trading paused until {self._cooldown_until.isoformat()}"
@@ -426,7 +427,7 @@ class RiskManager:
         if self._cooldown_until is None:
             return False
 
-        if datetime.now(timezone.utc) >= self._cooldown_until:
+        if clock.now(timezone.utc) >= self._cooldown_until:
             # Cooldown expired
             logger.info("Cooldown period ended")
             self._cooldown_until = None
@@ -6,6 +6,7 @@ Central handler for the trade lifecycle:
 2. Analyzes losses
 3. Logs errors for RAG
 4. Generates lessons
+5. Updates the online confidence calibrator
 
 Usage:
     from src.trading.trade_lifecycle import trade_closed_handler
@@ -37,6 +38,7 @@ from src.analysis.error_analyzer import ErrorAnalyzer, ErrorCategory, build_less
 from src.analysis.llm_engine import LLMEngine
 from src.analysis.post_trade_analyzer import PostTradeAnalyzer
 from src.analysis.learning_engine import learning_engine
+from src.analysis.confidence_calibrator import get_calibrator
 
 
 def trade_closed_handler(
@@ -93,6 +95,8 @@ def trade_closed_handler(
         - trade_updated: bool
         - error_logged: bool
         - lesson_added: bool
+        - learning_updated: bool
+        - calibration_updated: bool
         - error_category: str (if loss)
     """
     result = {
@@ -101,6 +105,7 @@ def trade_closed_handler(
         "error_logged": False,
         "lesson_added": False,
         "learning_updated": False,
+        "calibration_updated": False,
         "error_category": None
     }
 
@@ -111,13 +116,14 @@ def trade_closed_handler(
 
     try:
         # === STEP 1: Update trade in database ===
-        trade_updated = db.close_trade(
+        closed_open_trade = db.close_trade(
             trade_id=trade_id,
             exit_price=exit_price,
             pnl=pnl,
             pnl_percent=pnl_percent,
             close_reason=close_reason
         )
+        trade_updated = closed_open_trade is not None
         result["trade_updated"] = trade_updated
 
         if not trade_updated:
@@ -241,6 +247,21 @@ def trade_closed_handler(
         except Exception as learn_error:
             logger.warning(f"Learning analysis failed for {trade_id}: {learn_error}")
 
+        # === STEP 6: Online confidence calibration (one Newton step) ===
+        # Skipped if an MT5 sync recorded the P/L first: it already fed the
+        # calibrator (calibrate_synced_closes), one step per outcome
+        if closed_open_trade is False:
+            confidence_score = None
+        elif confidence_score is None:
+            # Callers like OrderManager.close_position don't carry it
+            confidence_score = (db.get_trade(trade_id) or {}).get("confidence_score")
+        if confidence_score is not None:
+            try:
+                get_calibrator().update(confidence_score, pnl)
+                result["calibration_updated"] = True
+            except Exception as cal_error:
+                logger.warning(f"Calibration update failed for {trade_id}: {cal_error}")
+
         result["success"] = True
 
     except Exception as e:
@@ -310,6 +331,31 @@ def get_learning_stats() -> dict:
         return {}
 
 
+def calibrate_synced_closes(closed_trades: list[dict]) -> int:
+    """
+    Feed trades closed outside trade_closed_handler to the online calibrator.
+
+    SL/TP and manual closes are picked up by db.sync_trades_with_mt5(),
+    which reports the trades that got their P/L in "closed_trades".
+
+    Args:
+        closed_trades: Dicts with trade_id, pnl and confidence_score
+
+    Returns:
+        Number of calibrator updates
+    """
+    updated = 0
+    for trade in closed_trades:
+        if trade.get("confidence_score") is None or trade.get("pnl") is None:
+            continue
+        try:
+            get_calibrator().update(trade["confidence_score"], trade["pnl"])
+            updated += 1
+        except Exception as e:
+            logger.warning(f"Calibration update failed for {trade.get('trade_id')}: {e}")
+    return updated
+
+
 # Convenience function for simple closure
 def record_trade_close(
     instrument: str,
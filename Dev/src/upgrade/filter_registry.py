@@ -36,6 +36,40 @@ class FilterChainResult:
     filter_results: List[FilterResult] = field(default_factory=list)
 
 
+def load_filter_class(file_path: Path, module_name: str) -> type:
+    """
+    Import a filter file and return its BaseFilter subclass.
+
+    Raises:
+        ImportError: If the file can't be executed or defines no filter
+    """
+    # Load the module
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load spec for {file_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        del sys.modules[module_name]
+        raise ImportError(f"Failed to execute module: {e}")
+
+    # Find the filter class
+    for name in dir(module):
+        obj = getattr(module, name)
+        if (
+            isinstance(obj, type) and
+            issubclass(obj, BaseFilter) and
+            obj is not BaseFilter
+        ):
+            return obj
+
+    raise ImportError(f"No BaseFilter subclass found in {file_path}")
+
+
 class FilterRegistry:
     """
     Registry and executor for all trading filters.
@@ -49,6 +83,10 @@ class FilterRegistry:
         self._sorted_filters: List[BaseFilter] = []
         self._needs_sort = False
 
+        # Optional out-of-process execution for AI-generated filters
+        self.sandbox = None
+        self._filter_paths: Dict[str, Path] = {}
+
         # Paths for filter discovery
         self._builtin_path = Path(__file__).parent.parent / "filters" / "builtin"
         self._ai_generated_path = Path(__file__).parent.parent / "filters" / "ai_generated"
@@ -114,43 +152,36 @@ class FilterRegistry:
             The instantiated filter or None
         """
         module_name = f"filter_{filter_type}_{file_path.stem}"
-
-        # Load the module
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
-        if spec is None or spec.loader is None:
-            raise ImportError(f"Cannot load spec for {file_path}")
-
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = module
-
-        try:
-            spec.loader.exec_module(module)
-        except Exception as e:
-            del sys.modules[module_name]
-            raise ImportError(f"Failed to execute module: {e}")
-
-        # Find the filter class
-        filter_class = None
-        for name in dir(module):
-            obj = getattr(module, name)
-            if (
-                isinstance(obj, type) and
-                issubclass(obj, BaseFilter) and
-                obj is not BaseFilter
-            ):
-                filter_class = obj
-                break
-
-        if filter_class is None:
-            raise ImportError(f"No BaseFilter subclass found in {file_path}")
+        filter_class = load_filter_class(file_path, module_name)
 
         # Instantiate and register
         filter_instance = filter_class()
         filter_instance.filter_type = filter_type
         self.register(filter_instance)
 
+        if filter_type == "ai_generated":
+            self._filter_paths[filter_instance.name] = file_path
+            if self.sandbox is not None:
+                self.sandbox.add_filter(filter_instance.name, file_path)
+
         return filter_instance
 
+    def use_sandbox(self, sandbox) -> None:
+        """
+        Run AI-generated filter checks in a FilterSandbox worker pool.
+
+        Args:
+            sandbox: FilterSandbox instance (None = run in-process again)
+        """
+        if self.sandbox is not None and self.sandbox is not sandbox:
+            self.sandbox.close()
+        self.sandbox = sandbox
+        if sandbox is not None:
+            sandbox.start()
+            for name, path in self._filter_paths.items():
+                sandbox.add_filter(name, path)
+            logger.info(f"AI-generated filters run in sandbox ({len(self._filter_paths)} loaded)")
+
     def register(self, filter_instance: BaseFilter) -> None:
         """
         Register a filter with the registry.
@@ -179,6 +210,8 @@ class FilterRegistry:
         if filter_name in self._filters:
             del self._filters[filter_name]
             self._needs_sort = True
+            if self._filter_paths.pop(filter_name, None) is not None and self.sandbox is not None:
+                self.sandbox.remove_filter(filter_name)
             logger.info(f"Unregistered filter: {filter_name}")
             return True
         return False
@@ -222,20 +255,25 @@ class FilterRegistry:
             total_filters=len(enabled_filters)
         )
 
-        for filter_instance in enabled_filters:
+        i = 0
+        while i < len(enabled_filters):
+            filter_instance = enabled_filters[i]
+
+            if self._is_sandboxed(filter_instance):
+                # Consecutive AI-generated filters go to the sandbox as one batch
+                batch = []
+                while i < len(enabled_filters) and self._is_sandboxed(enabled_filters[i]):
+                    batch.append(enabled_filters[i])
+                    i += 1
+                if self._run_sandboxed(batch, signal_data, result):
+                    break
+                continue
+            i += 1
+
             try:
                 filter_result = filter_instance.check(signal_data)
                 filter_result.filter_name = filter_instance.name
-                result.filter_results.append(filter_result)
-                result.filters_run += 1
-
-                # Update filter stats
-                filter_instance.update_stats(filter_result)
-
-                if not filter_result.passed:
-                    result.passed = False
-                    result.blocking_filter = filter_instance.name
-                    result.reason = filter_result.reason
+                if self._record_result(filter_instance, filter_result, result):
                     break
 
             except Exception as e:
@@ -249,6 +287,51 @@ class FilterRegistry:
 
         return result
 
+    def _is_sandboxed(self, filter_instance: BaseFilter) -> bool:
+        return self.sandbox is not None and filter_instance.name in self._filter_paths
+
+    def _record_result(
+        self,
+        filter_instance: BaseFilter,
+        filter_result: FilterResult,
+        result: FilterChainResult
+    ) -> bool:
+        """Add a filter result to the chain result. Returns True if it blocked."""
+        result.filter_results.append(filter_result)
+        result.filters_run += 1
+
+        # Update filter stats
+        filter_instance.update_stats(filter_result)
+
+        if not filter_result.passed:
+            result.passed = False
+            result.blocking_filter = filter_instance.name
+            result.reason = filter_result.reason
+            return True
+        return False
+
+    def _run_sandboxed(
+        self,
+        batch: List[BaseFilter],
+        signal_data: dict,
+        result: FilterChainResult
+    ) -> bool:
+        """Run AI-generated filters in the sandbox. Returns True if one blocked."""
+        by_name = {f.name: f for f in batch}
+        try:
+            calls = self.sandbox.check(list(by_name), signal_data)
+        except Exception as e:
+            logger.error(f"Filter sandbox error: {e}")
+            return False
+
+        for call in calls:
+            if call.result is None:
+                logger.error(f"Filter '{call.name}' error: {call.error}")
+                continue
+            if self._record_result(by_name[call.name], call.result, result):
+                return True
+        return False
+
     def enable_filter(self, filter_name: str) -> bool:
         """Enable a filter by name."""
         if filter_name in self._filters:
@@ -270,6 +353,7 @@ class FilterRegistry:
             "enabled_filters": len(self.get_enabled()),
             "builtin_count": len([f for f in self._filters.values() if f.filter_type == "builtin"]),
             "ai_generated_count": len([f for f in self._filters.values() if f.filter_type == "ai_generated"]),
+            "sandbox": self.sandbox.get_stats() if self.sandbox is not None else None,
             "filters": [f.get_stats() for f in self.get_all()]
         }
 
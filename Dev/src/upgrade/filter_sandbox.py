@@ -0,0 +1,393 @@
+"""
+Filter Sandbox for AI Trader Self-Upgrade System.
+
+Runs AI-generated filters in a small pool of worker processes so a slow or
+hanging check() can't stall the scanner. Each chain call sends one request
+frame with the signal and the filters to run; the worker answers with one
+result frame per filter (stopping at the first block) and a closing frame.
+
+The parent waits at most `call_timeout_ms` for each filter's result. A
+filter that misses the deadline or crashes its worker is quarantined and
+the worker is killed; a filter that repeatedly runs over
+`latency_budget_ms` is quarantined too. Quarantined filters are skipped
+(treated as passing, like filter errors in the chain).
+
+Workers are always spawned (never forked: the scanner process runs
+thread pools, and forking a multithreaded process can deadlock the child)
+and report "ready" once their imports are done. Process startup and
+filter loading have their own, much longer timeouts; only check() calls
+are held to `call_timeout_ms`. Killed workers are respawned in a
+background thread, so the scan that hit the bad filter continues on
+another idle worker instead of waiting for a new interpreter.
+
+Usage:
+    from src.upgrade.filter_sandbox import FilterSandbox
+
+    registry = get_filter_registry()
+    registry.use_sandbox(FilterSandbox(workers=2, call_timeout_ms=250))
+    result = registry.run_all_filters(signal_data)
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.upgrade.base_filter import FilterResult
+from src.utils.logger import logger
+
+
+@dataclass
+class SandboxCall:
+    """Outcome of one filter check in the sandbox."""
+    name: str
+    result: Optional[FilterResult] = None  # None if skipped or failed
+    elapsed_ms: float = 0.0
+    error: str = ""
+
+
+def _worker_main(conn) -> None:
+    """Worker loop: load filters on request and run check batches."""
+    from src.upgrade.filter_registry import load_filter_class
+
+    filters = {}
+    conn.send(("ready",))
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        kind = message[0]
+        if kind == "stop":
+            return
+
+        if kind == "load":
+            _, name, path = message
+            try:
+                filter_class = load_filter_class(Path(path), f"sandboxed_filter_{name}")
+                filters[name] = filter_class()
+                conn.send(("loaded", name, ""))
+            except Exception as e:
+                conn.send(("loaded", name, str(e)))
+
+        elif kind == "check":
+            _, names, signal_data = message
+            for name in names:
+                start = time.perf_counter()
+                try:
+                    result = filters[name].check(signal_data)
+                    frame = ("result", name, bool(result.passed), result.reason, dict(result.details), "")
+                except Exception as e:
+                    frame = ("result", name, True, "", {}, str(e) or type(e).__name__)
+                conn.send(frame + ((time.perf_counter() - start) * 1000,))
+                if not frame[2]:
+                    break
+            conn.send(("done",))
+
+
+class _Worker:
+    """One worker process and its pipe."""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.loaded: set = set()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait for the worker's "ready" frame (sent after its imports)."""
+        try:
+            return self.conn.poll(timeout) and self.conn.recv() == ("ready",)
+        except (EOFError, OSError):
+            return False
+
+    def stop(self, timeout: float = 1.0) -> None:
+        try:
+            self.conn.send(("stop",))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(1.0)
+        self.conn.close()
+
+
+class FilterSandbox:
+    """
+    Pool of worker processes running AI-generated filter checks.
+
+    Thread-safe: concurrent scans each take an idle worker.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        call_timeout_ms: float = 250.0,
+        latency_budget_ms: float = 50.0,
+        max_budget_overruns: int = 3,
+        load_timeout_ms: float = 5000.0,
+        startup_timeout_s: float = 60.0,
+        acquire_timeout_ms: float = 2000.0,
+    ):
+        """
+        Args:
+            workers: Number of worker processes
+            call_timeout_ms: Deadline for each filter check
+            latency_budget_ms: Expected check latency; overruns count as strikes
+            max_budget_overruns: Consecutive strikes before quarantine
+            load_timeout_ms: Deadline for importing a filter file in a worker
+            startup_timeout_s: Deadline for a new worker's "ready" frame
+            acquire_timeout_ms: Max wait for an idle worker at the start of a chain
+        """
+        self.workers = max(1, workers)
+        self.call_timeout = call_timeout_ms / 1000
+        self.latency_budget_ms = latency_budget_ms
+        self.max_budget_overruns = max_budget_overruns
+        self.load_timeout = load_timeout_ms / 1000
+        self.startup_timeout = startup_timeout_s
+        self.acquire_timeout = acquire_timeout_ms / 1000
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all: List[_Worker] = []
+        self._lock = threading.Lock()
+
+        self._paths: Dict[str, str] = {}
+        self._overruns: Dict[str, int] = {}
+        self.quarantined: Dict[str, str] = {}  # name -> reason
+        self._started = False
+
+    # ---------- Lifecycle ----------
+
+    def start(self) -> None:
+        """Spawn the worker pool and wait until it is ready (FilterRegistry.use_sandbox)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            workers = [_Worker(self._ctx) for _ in range(self.workers)]
+            self._all.extend(workers)
+        ready = 0
+        for worker in workers:
+            if worker.wait_ready(self.startup_timeout):
+                self._idle.put(worker)
+                ready += 1
+            else:
+                logger.error("Filter sandbox worker failed to start")
+                self._retire(worker, respawn=False)
+        logger.info(f"Filter sandbox started with {ready}/{self.workers} workers")
+
+    def close(self) -> None:
+        """Stop all workers."""
+        with self._lock:
+            workers, self._all = self._all, []
+            self._started = False
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for worker in workers:
+            worker.stop()
+
+    def _retire(self, worker: _Worker, respawn: bool = True) -> None:
+        """Kill a worker; its replacement is spawned in the background."""
+        worker.kill()
+        with self._lock:
+            self._all = [w for w in self._all if w is not worker]
+        if respawn:
+            threading.Thread(target=self._respawn, daemon=True).start()
+
+    def _respawn(self) -> None:
+        with self._lock:
+            if not self._started:
+                return
+            worker = _Worker(self._ctx)
+            self._all.append(worker)
+        if not worker.wait_ready(self.startup_timeout):
+            logger.error("Filter sandbox replacement worker failed to start")
+            self._retire(worker, respawn=False)
+        elif self._started:
+            self._idle.put(worker)
+        else:
+            worker.stop()
+
+    def _acquire(self, timeout: float) -> Optional[_Worker]:
+        """Take an idle worker, or None if none frees up within timeout."""
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    # ---------- Filters ----------
+
+    def add_filter(self, name: str, path: Path) -> None:
+        """Make a filter file available to the workers (loaded lazily)."""
+        self._paths[name] = str(path)
+        self.quarantined.pop(name, None)
+        self._overruns.pop(name, None)
+        for worker in list(self._all):
+            worker.loaded.discard(name)
+
+    def remove_filter(self, name: str) -> None:
+        self._paths.pop(name, None)
+
+    def is_quarantined(self, name: str) -> bool:
+        return name in self.quarantined
+
+    def _quarantine(self, name: str, reason: str) -> None:
+        self.quarantined[name] = reason
+        logger.warning(f"Filter '{name}' quarantined: {reason}")
+
+    def _ensure_loaded(self, worker: _Worker, names: List[str]) -> Optional[_Worker]:
+        """
+        Load missing filters into a worker (quarantines files that hang or fail).
+
+        Returns:
+            The worker, or None if it was retired (a load hung or crashed it)
+        """
+        for name in names:
+            if name in worker.loaded or name in self.quarantined:
+                continue
+            try:
+                worker.conn.send(("load", name, self._paths[name]))
+            except OSError:
+                # Died outside a load (no filter to blame): just replace it
+                self._retire(worker)
+                return None
+            try:
+                frame = worker.conn.recv() if worker.conn.poll(self.load_timeout) else None
+            except (EOFError, OSError):
+                self._quarantine(name, "worker died while loading")
+                self._retire(worker)
+                return None
+            if frame is None:
+                self._quarantine(name, "load timed out")
+                self._retire(worker)
+                return None
+            _, _, error = frame
+            if error:
+                self._quarantine(name, f"load failed: {error}")
+            else:
+                worker.loaded.add(name)
+        return worker
+
+    # ---------- Checks ----------
+
+    def check(self, names: List[str], signal_data: dict) -> List[SandboxCall]:
+        """
+        Run filters in order on one signal, stopping at the first block.
+
+        Args:
+            names: Filter names (added with add_filter)
+            signal_data: Signal dict (must be picklable)
+
+        Returns:
+            SandboxCall per filter that ran or failed
+        """
+        if not self._started:
+            self.start()
+
+        calls: List[SandboxCall] = []
+        remaining = [n for n in names if n in self._paths and n not in self.quarantined]
+        if not remaining:
+            return calls
+        worker = self._acquire(self.acquire_timeout)
+        try:
+            while remaining:
+                if worker is None:
+                    # Pool busy or respawning: skip like a failed filter
+                    calls.extend(SandboxCall(n, error="no sandbox worker available") for n in remaining)
+                    break
+                worker = self._ensure_loaded(worker, remaining)
+                if worker is None:
+                    worker = self._acquire(self.call_timeout)
+                    remaining = [n for n in remaining if n not in self.quarantined]
+                    continue
+                batch = [n for n in remaining if n not in self.quarantined]
+                if not batch:
+                    break
+                try:
+                    worker.conn.send(("check", batch, signal_data))
+                except OSError:
+                    self._retire(worker)
+                    worker = self._acquire(self.call_timeout)
+                    continue
+                worker, ran, blocked = self._collect(worker, batch, calls)
+                if blocked:
+                    break
+                remaining = batch[ran:]
+                if worker is None and remaining:
+                    worker = self._acquire(self.call_timeout)
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+        return calls
+
+    def _collect(self, worker: _Worker, batch: List[str], calls: List[SandboxCall]):
+        """
+        Read result frames for a batch.
+
+        Returns:
+            (worker or None if retired, filters consumed, blocked)
+        """
+        ran = 0
+        while True:
+            expected = batch[ran] if ran < len(batch) else None
+            try:
+                ready = worker.conn.poll(self.call_timeout)
+                frame = worker.conn.recv() if ready else None
+            except (EOFError, OSError):
+                ready, frame = True, None
+
+            if frame is None:
+                # Deadline missed or worker died: the pending filter is at fault
+                reason = f"missed {self.call_timeout * 1000:.0f} ms deadline" if not ready else "crashed worker"
+                if expected is not None:
+                    self._quarantine(expected, reason)
+                    calls.append(SandboxCall(expected, error=reason))
+                self._retire(worker)
+                return None, ran + 1, False
+
+            if frame[0] == "done":
+                return worker, ran, False
+
+            _, name, passed, reason, details, error, elapsed = frame
+            ran += 1
+            call = SandboxCall(name, elapsed_ms=elapsed, error=error)
+            if not error:
+                call.result = FilterResult(passed=passed, reason=reason, filter_name=name, details=details)
+            calls.append(call)
+            self._record_latency(name, elapsed)
+
+            if not passed:
+                # Worker stops after a block; drain its closing frame
+                if worker.conn.poll(self.call_timeout):
+                    worker.conn.recv()
+                return worker, ran, True
+
+    def _record_latency(self, name: str, elapsed_ms: float) -> None:
+        if elapsed_ms <= self.latency_budget_ms:
+            self._overruns[name] = 0
+            return
+        self._overruns[name] = self._overruns.get(name, 0) + 1
+        if self._overruns[name] >= self.max_budget_overruns:
+            self._quarantine(
+                name,
+                f"over {self.latency_budget_ms:.0f} ms budget {self._overruns[name]} times in a row"
+            )
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": len(self._all),
+            "ready": self._idle.qsize(),
+            "filters": len(self._paths),
+            "quarantined": dict(self.quarantined),
+        }
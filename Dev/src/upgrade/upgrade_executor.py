@@ -9,6 +9,9 @@ Usage:
 
     executor = UpgradeExecutor()
     result = await executor.test_and_deploy(filter_code, filter_name)
+
+    # Several candidates against one decoded signal history
+    batch = await executor.validate_batch({"name": filter_code, ...})
 """
 
 from dataclasses import dataclass, field
@@ -52,6 +55,16 @@ class BacktestResult:
         return (self.would_have_lost / total_blocked) * 100
 
 
+@dataclass
+class BatchBacktestResult:
+    """Result of backtesting several filters on the same signals."""
+    filter_names: List[str] = field(default_factory=list)
+    accept: List[List[bool]] = field(default_factory=list)  # [filter][signal]: signal passed
+    results: Dict[str, BacktestResult] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)     # Filters that failed to load or run
+    total_signals: int = 0
+
+
 @dataclass
 class DeploymentResult:
     """Result of deploying a filter."""
@@ -86,7 +99,8 @@ class UpgradeExecutor:
         self,
         filter_code: str,
         filter_name: str,
-        proposal_id: Optional[str] = None
+        proposal_id: Optional[str] = None,
+        backtest: Optional[BacktestResult] = None
     ) -> DeploymentResult:
         """
         Test a filter and deploy if it passes validation and backtesting.
@@ -95,6 +109,7 @@ class UpgradeExecutor:
             filter_code: Python code for the filter
             filter_name: Unique name for the filter
             proposal_id: ID of the proposal (for audit logging)
+            backtest: Result from validate_batch (skips a separate backtest run)
 
         Returns:
             DeploymentResult with deployment status
@@ -112,7 +127,8 @@ class UpgradeExecutor:
         logger.info(f"Filter {filter_name} passed validation")
 
         # Step 2: Run backtest
-        backtest = await self._run_backtest(filter_code, filter_name)
+        if backtest is None:
+            backtest = await self._run_backtest(filter_code, filter_name)
         if backtest.total_signals < self.MIN_SIGNALS_FOR_BACKTEST:
             self._log_audit("backtest", proposal_id, False, f"Insufficient signals: {backtest.total_signals}")
             return DeploymentResult(
@@ -188,39 +204,9 @@ class UpgradeExecutor:
                 return result
 
             # Get historical signals with outcomes
-            signals = self._get_historical_signals(days)
-            result.total_signals = len(signals)
-
-            if result.total_signals == 0:
-                result.robustness_score = 0
-                return result
-
-            # Run filter on each signal
-            for signal in signals:
-                signal_data = self._signal_to_dict(signal)
-                filter_result = filter_instance.check(signal_data)
-
-                if not filter_result.passed:
-                    result.signals_blocked += 1
-
-                    # Check actual outcome
-                    pnl = signal.get("pnl", 0) or 0
-                    if pnl < 0:
-                        result.would_have_lost += 1
-                        result.estimated_pnl_impact += abs(pnl)  # Saved loss
-                    else:
-                        result.would_have_won += 1
-                        result.estimated_pnl_impact -= pnl  # Missed gain
-
-            # Calculate robustness score
-            result.robustness_score = self._calculate_robustness(result)
-
-            result.details = {
-                "days_tested": days,
-                "filter_name": filter_name,
-                "block_rate": f"{result.block_rate:.1f}%",
-                "accuracy": f"{result.accuracy:.1f}%",
-            }
+            signal_data, pnls = self._load_signal_data(days)
+            blocked = [not filter_instance.check(data).passed for data in signal_data]
+            result = self._score_blocks(blocked, pnls, filter_name, days)
 
         except Exception as e:
             logger.error(f"Backtest failed: {e}")
@@ -228,6 +214,123 @@ class UpgradeExecutor:
 
         return result
 
+    async def validate_batch(
+        self,
+        filter_sources: Optional[Dict[str, str]] = None,
+        days: int = 30
+    ) -> BatchBacktestResult:
+        """
+        Backtest several filters against one pass over the signal history.
+
+        Signals are read and converted to signal_data once; every filter then
+        checks every signal in the same loop. Filters share each signal_data
+        dict, as in the live filter chain, so they must not modify it.
+
+        Args:
+            filter_sources: {filter_name: code} (default: files in src/filters/ai_generated)
+            days: Days of executed signals to replay
+
+        Returns:
+            BatchBacktestResult with the filter x signal accept matrix and
+            a BacktestResult per filter (robustness 0 for filters that fail)
+        """
+        if filter_sources is None:
+            filter_sources = self.load_filter_sources()
+
+        batch = BatchBacktestResult()
+        filters: List[BaseFilter] = []
+        for name, code in filter_sources.items():
+            instance = self._instantiate_filter(code)
+            if instance is None:
+                batch.errors[name] = "Failed to instantiate filter"
+                batch.results[name] = BacktestResult()
+                continue
+            batch.filter_names.append(name)
+            filters.append(instance)
+
+        signal_data, pnls = self._load_signal_data(days)
+        batch.total_signals = len(signal_data)
+        batch.accept = [[True] * len(signal_data) for _ in filters]
+
+        live = list(range(len(filters)))
+        for j, data in enumerate(signal_data):
+            failed = []
+            for i in live:
+                try:
+                    batch.accept[i][j] = filters[i].check(data).passed
+                except Exception as e:
+                    batch.errors[batch.filter_names[i]] = str(e)
+                    failed.append(i)
+            if failed:
+                # A filter that raises is rejected; stop running it
+                live = [i for i in live if i not in failed]
+
+        for i, name in enumerate(batch.filter_names):
+            if name in batch.errors:
+                logger.error(f"Backtest failed for {name}: {batch.errors[name]}")
+                batch.results[name] = BacktestResult(total_signals=len(signal_data))
+                continue
+            blocked = [not passed for passed in batch.accept[i]]
+            batch.results[name] = self._score_blocks(blocked, pnls, name, days)
+
+        logger.info(f"Batch backtest: {len(filter_sources)} filters x {len(signal_data)} signals")
+        return batch
+
+    def load_filter_sources(self, directory: Optional[Path] = None) -> Dict[str, str]:
+        """Read candidate filter code ({file stem: code}) from a filter directory."""
+        directory = directory or get_filter_registry()._ai_generated_path
+        sources = {}
+        for filter_file in sorted(Path(directory).glob("*.py")):
+            if filter_file.name.startswith("_"):
+                continue
+            try:
+                sources[filter_file.stem] = filter_file.read_text(encoding="utf-8")
+            except OSError as e:
+                logger.error(f"Failed to read filter {filter_file.name}: {e}")
+        return sources
+
+    def _load_signal_data(self, days: int) -> tuple:
+        """Historical signals as (signal_data list, pnl list), decoded once."""
+        signals = self._get_historical_signals(days)
+        return [self._signal_to_dict(s) for s in signals], [s.get("pnl", 0) or 0 for s in signals]
+
+    def _score_blocks(
+        self,
+        blocked: List[bool],
+        pnls: List[float],
+        filter_name: str,
+        days: int
+    ) -> BacktestResult:
+        """BacktestResult for one filter's block decisions."""
+        result = BacktestResult(total_signals=len(blocked))
+        if result.total_signals == 0:
+            result.robustness_score = 0
+            return result
+
+        for is_blocked, pnl in zip(blocked, pnls):
+            if not is_blocked:
+                continue
+            result.signals_blocked += 1
+
+            # Check actual outcome
+            if pnl < 0:
+                result.would_have_lost += 1
+                result.estimated_pnl_impact += abs(pnl)  # Saved loss
+            else:
+                result.would_have_won += 1
+                result.estimated_pnl_impact -= pnl  # Missed gain
+
+        # Calculate robustness score
+        result.robustness_score = self._calculate_robustness(result)
+
+        result.details = {
+            "days_tested": days,
+            "filter_name": filter_name,
+            "block_rate": f"{result.block_rate:.1f}%",
+            "accuracy": f"{result.accuracy:.1f}%",
+        }
+        return result
+
     def _instantiate_filter(self, filter_code: str) -> Optional[BaseFilter]:
         """Instantiate a filter from code string."""
         try:
@@ -24,7 +24,7 @@ from typing import Dict, List, Optional, Any
 from src.upgrade.performance_analyzer import PerformanceAnalyzer, FilterProposal
 from src.upgrade.code_generator import CodeGenerator
 from src.upgrade.code_validator import CodeValidator
-from src.upgrade.upgrade_executor import UpgradeExecutor, DeploymentResult
+from src.upgrade.upgrade_executor import UpgradeExecutor, BacktestResult, DeploymentResult
 from src.upgrade.filter_registry import get_filter_registry
 from src.utils.database import db
 from src.utils.logger import logger
@@ -122,10 +122,31 @@ class UpgradeManager:
                 result.completed_at = datetime.now()
                 return result
 
-            # Step 3: Generate and deploy filters
+            # Step 3: Generate and validate filter code
+            candidates = []
             for proposal in proposals:
                 try:
-                    deployment = await self._process_proposal(proposal)
+                    prepared = self._prepare_proposal(proposal)
+                    if prepared is not None:
+                        candidates.append((proposal, *prepared))
+                except Exception as e:
+                    logger.error(f"Failed to process proposal {proposal.proposal_id}: {e}")
+                    result.errors.append(str(e))
+
+            # Backtest all candidates in one pass over the signal history
+            backtests = {}
+            if candidates:
+                batch = await self.executor.validate_batch(
+                    {proposal.filter_name: code for proposal, _, code in candidates}
+                )
+                backtests = batch.results
+
+            # Deploy the candidates that pass
+            for proposal, proposal_db_id, code in candidates:
+                try:
+                    deployment = await self._deploy_proposal(
+                        proposal, proposal_db_id, code, backtests.get(proposal.filter_name)
+                    )
                     if deployment.success:
                         result.filters_deployed += 1
                         result.deployed_filters.append(deployment.filter_name)
@@ -133,7 +154,7 @@ class UpgradeManager:
                     logger.error(f"Failed to process proposal {proposal.proposal_id}: {e}")
                     result.errors.append(str(e))
 
-            # Step 4: Check existing filters for rollback
+            # Step 5: Check existing filters for rollback
             rolled_back = await self._check_for_rollbacks()
             result.filters_rolled_back = len(rolled_back)
             result.rolled_back_filters = rolled_back
@@ -154,9 +175,13 @@ class UpgradeManager:
 
         return result
 
-    async def _process_proposal(self, proposal: FilterProposal) -> DeploymentResult:
-        """Process a single filter proposal through the pipeline."""
+    def _prepare_proposal(self, proposal: FilterProposal) -> Optional[tuple]:
+        """
+        Log, generate and validate a proposal's filter code.
 
+        Returns:
+            (proposal_db_id, code), or None if generation or validation failed
+        """
         # Log proposal to database
         proposal_db_id = self._log_proposal(proposal)
 
@@ -166,11 +191,8 @@ class UpgradeManager:
 
         if not gen_result.success:
             self._update_proposal_status(proposal_db_id, "GENERATION_FAILED", gen_result.error)
-            return DeploymentResult(
-                success=False,
-                filter_name=proposal.filter_name,
-                error=f"Code generation failed: {gen_result.error}"
-            )
+            logger.warning(f"Code generation failed for {proposal.filter_name}: {gen_result.error}")
+            return None
 
         # Validate code
         logger.info(f"Validating code for {proposal.filter_name}...")
@@ -182,18 +204,25 @@ class UpgradeManager:
                 "VALIDATION_FAILED",
                 "; ".join(validation.errors)
             )
-            return DeploymentResult(
-                success=False,
-                filter_name=proposal.filter_name,
-                error=f"Validation failed: {'; '.join(validation.errors)}"
-            )
+            logger.warning(f"Validation failed for {proposal.filter_name}: {'; '.join(validation.errors)}")
+            return None
+
+        return proposal_db_id, gen_result.code
 
-        # Test and deploy
+    async def _deploy_proposal(
+        self,
+        proposal: FilterProposal,
+        proposal_db_id: int,
+        code: str,
+        backtest: Optional[BacktestResult] = None
+    ) -> DeploymentResult:
+        """Test (or use a batch backtest) and deploy validated filter code."""
         logger.info(f"Testing and deploying {proposal.filter_name}...")
         deployment = await self.executor.test_and_deploy(
-            gen_result.code,
+            code,
             proposal.filter_name,
-            str(proposal_db_id)
+            str(proposal_db_id),
+            backtest=backtest
         )
 
         if deployment.success:
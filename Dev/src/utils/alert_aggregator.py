@@ -0,0 +1,254 @@
+"""
+Alert aggregation - fingerprinting, suppression, escalation and digests.
+
+Persistent conditions (spread too high, MT5 disconnected, daily drawdown
+hit) are re-detected on every scan cycle. Routing them through an
+AlertAggregator turns that stream into one notification per distinct
+problem:
+
+- fingerprint():  stable key for "the same problem" (numbers are
+                  normalized, so "spread 3.1 pips" == "spread 3.4 pips")
+- observe():      EMIT the first occurrence, SUPPRESS repeats inside the
+                  rule's window, ESCALATE once when the sliding-window count
+                  crosses the rule's threshold, EMIT again as a reminder
+                  once suppress_seconds have passed
+- digest():       periodically collect the suppressed counts per problem
+                  so callers can fold them into the original record with
+                  one write per problem
+
+State is bounded: at most max_fingerprints problems (least recently seen
+evicted) with a fixed number of counter buckets each; problems idle for
+resolve_seconds are dropped at digest time.
+
+Usage:
+    from src.utils.alert_aggregator import AlertAggregator, Decision, fingerprint
+
+    aggregator = AlertAggregator()
+    key = fingerprint("risk_monitor", "Daily loss limit exceeded: 3.4% > 3.0%")
+    if aggregator.observe(key, "critical") is not Decision.SUPPRESS:
+        ...  # write/notify
+    for entry in aggregator.digest():
+        ...  # entry.suppressed repeats since the last digest
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+
+DIGEST_INTERVAL_SECONDS = 900
+MAX_FINGERPRINTS = 500
+WINDOW_BUCKETS = 12
+
+_NUMBER_RE = re.compile(r"[-+]?\d+(?:[.,]\d+)*")
+
+
+class Decision(Enum):
+    """What the caller should do with an observed occurrence."""
+    EMIT = "emit"            # New (or re-notified) problem: record and notify
+    ESCALATE = "escalate"    # Rate threshold crossed: notify at a higher level
+    SUPPRESS = "suppress"    # Repeat of an active problem: counted only
+
+
+@dataclass(frozen=True)
+class AggregationRule:
+    """Suppression/escalation policy for one category of alerts."""
+    suppress_seconds: float = 900     # Repeats this soon after the last emit are suppressed;
+                                      # a persisting problem is re-emitted as a reminder after it
+    window_seconds: float = 900       # Sliding window for escalate_count
+    escalate_count: int = 0           # Occurrences within the window that escalate (0 = never)
+    resolve_seconds: float = 1800     # Forget a problem not seen for this long
+
+
+@dataclass
+class AggregateState:
+    """In-memory state of one fingerprinted problem."""
+    fingerprint: str
+    category: str
+    first_seen: float
+    last_seen: float
+    last_emitted: float
+    total: int = 1
+    suppressed: int = 0               # Since the last digest
+    escalated: bool = False
+    ref: Any = None                   # Caller handle for the emitted record (e.g. row id)
+    sample: Any = None                # Latest payload
+    buckets: deque = field(default_factory=lambda: deque(maxlen=WINDOW_BUCKETS))
+
+
+@dataclass
+class DigestEntry:
+    """Suppressed occurrences of one problem since the previous digest."""
+    fingerprint: str
+    category: str
+    suppressed: int
+    total: int
+    first_seen: float
+    last_seen: float
+    ref: Any
+    sample: Any
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Stable identity for a problem.
+
+    Numbers are replaced so readings of the same condition collapse,
+    whitespace and case are normalized.
+    """
+    text = "|".join(
+        _NUMBER_RE.sub("#", " ".join(str(p).split()).lower()) for p in parts if p is not None
+    )
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+class AlertAggregator:
+    """Bounded, thread-safe occurrence aggregator (see module docstring)."""
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, AggregationRule]] = None,
+        default_rule: Optional[AggregationRule] = None,
+        digest_interval: float = DIGEST_INTERVAL_SECONDS,
+        max_fingerprints: int = MAX_FINGERPRINTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rules = dict(rules or {})
+        self.default_rule = default_rule or AggregationRule()
+        self.digest_interval = digest_interval
+        self.max_fingerprints = max_fingerprints
+        self.clock = clock
+        self._states: "OrderedDict[str, AggregateState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_digest = clock()
+
+    def rule_for(self, category: str) -> AggregationRule:
+        return self.rules.get(category, self.default_rule)
+
+    # ---------- Observation ----------
+
+    def observe(self, key: str, category: str = "default", payload: Any = None) -> Decision:
+        """
+        Record one occurrence of a problem and decide whether to notify.
+
+        Args:
+            key: Fingerprint (see fingerprint())
+            category: Rule selector (e.g. alert level or activity type)
+            payload: Latest details, kept as the digest sample
+
+        Returns:
+            Decision for this occurrence
+        """
+        now = self.clock()
+        rule = self.rule_for(category)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = AggregateState(
+                    fingerprint=key, category=category, first_seen=now,
+                    last_seen=now, last_emitted=now, sample=payload,
+                )
+                self._count(state, now, rule)
+                self._states[key] = state
+                while len(self._states) > self.max_fingerprints:
+                    self._states.popitem(last=False)
+                return Decision.EMIT
+
+            self._states.move_to_end(key)
+            idle = now - state.last_seen
+            state.last_seen = now
+            state.total += 1
+            state.sample = payload
+            self._count(state, now, rule)
+
+            if idle >= rule.resolve_seconds:
+                # Problem went away and came back: treat as new
+                state.first_seen = now
+                state.escalated = False
+                state.last_emitted = now
+                return Decision.EMIT
+            if rule.escalate_count and not state.escalated and \
+                    self._window_count(state, now, rule) >= rule.escalate_count:
+                state.escalated = True
+                state.last_emitted = now
+                return Decision.ESCALATE
+            if now - state.last_emitted >= rule.suppress_seconds:
+                state.last_emitted = now
+                return Decision.EMIT
+            state.suppressed += 1
+            return Decision.SUPPRESS
+
+    def attach(self, key: str, ref: Any) -> None:
+        """Remember the caller's handle (e.g. stored row id) for a problem."""
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                state.ref = ref
+
+    def _count(self, state: AggregateState, now: float, rule: AggregationRule) -> None:
+        width = max(rule.window_seconds / WINDOW_BUCKETS, 1e-9)
+        slot = int(now // width)
+        if state.buckets and state.buckets[-1][0] == slot:
+            state.buckets[-1][1] += 1
+        else:
+            state.buckets.append([slot, 1])
+
+    def _window_count(self, state: AggregateState, now: float, rule: AggregationRule) -> int:
+        width = max(rule.window_seconds / WINDOW_BUCKETS, 1e-9)
+        oldest = int(now // width) - WINDOW_BUCKETS + 1
+        return sum(count for slot, count in state.buckets if slot >= oldest)
+
+    def window_count(self, key: str) -> int:
+        """Occurrences of a problem inside its rule's sliding window."""
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return 0
+            return self._window_count(state, self.clock(), self.rule_for(state.category))
+
+    def get(self, key: str) -> Optional[AggregateState]:
+        with self._lock:
+            return self._states.get(key)
+
+    def active(self) -> List[AggregateState]:
+        """Problems currently tracked, most recently seen last."""
+        with self._lock:
+            return list(self._states.values())
+
+    # ---------- Digest ----------
+
+    def digest_due(self) -> bool:
+        return self.clock() - self._last_digest >= self.digest_interval
+
+    def digest(self, force: bool = False) -> List[DigestEntry]:
+        """
+        Collect suppressed counts since the last digest and drop resolved problems.
+
+        Args:
+            force: Run even if digest_interval hasn't elapsed
+
+        Returns:
+            One entry per problem with suppressed occurrences (empty if not due)
+        """
+        now = self.clock()
+        with self._lock:
+            if not force and now - self._last_digest < self.digest_interval:
+                return []
+            self._last_digest = now
+            entries = []
+            for key, state in list(self._states.items()):
+                if state.suppressed:
+                    entries.append(DigestEntry(
+                        fingerprint=key, category=state.category, suppressed=state.suppressed,
+                        total=state.total, first_seen=state.first_seen, last_seen=state.last_seen,
+                        ref=state.ref, sample=state.sample,
+                    ))
+                    state.suppressed = 0
+                if now - state.last_seen >= self.rule_for(state.category).resolve_seconds:
+                    del self._states[key]
+            return entries
@@ -0,0 +1,135 @@
+"""
+Clock - Process-wide time source.
+
+Time-dependent trading logic (heat map decay, daily risk resets, news
+blackouts, session/killzone gates, database cutoffs) asks this module for
+the current time instead of calling datetime.now() directly. Live code
+gets the system clock; a backtest or a replay of recorded scans installs a
+ReplayClock and advances it per bar, so the production code path runs on
+historical time as fast as the data can be fed:
+
+    from src.utils import clock
+
+    now = clock.now(timezone.utc)          # instead of datetime.now(timezone.utc)
+
+    with clock.replay(first_bar_time) as replay:
+        for bar in m5_candles:
+            replay.set_timestamp(bar["timestamp"])
+            ...                            # clock.now() is the bar time here
+
+use_clock()/replay() install a clock process-wide by default (threads
+started by the code under replay see it too); thread_only=True keeps it to
+the calling thread, for replays running inside a live process.
+"""
+
+import threading
+import time as _time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Iterator, Optional, Union
+
+
+class SystemClock:
+    """Wall-clock time."""
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        """Same as datetime.now(tz)."""
+        return datetime.now(tz)
+
+    def time(self) -> float:
+        """Epoch seconds."""
+        return _time.time()
+
+
+class ReplayClock:
+    """Manually advanced clock for backtests and replays."""
+
+    def __init__(self, start: Union[datetime, float, int, None] = None):
+        """
+        Args:
+            start: Initial time (aware/naive-UTC datetime or epoch seconds; default: now)
+        """
+        self._epoch = _time.time()
+        if start is not None:
+            self.set(start)
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        """Replay time; naive local time when tz is None, like datetime.now()."""
+        return datetime.fromtimestamp(self._epoch, tz)
+
+    def time(self) -> float:
+        return self._epoch
+
+    def set(self, when: Union[datetime, float, int]) -> None:
+        """Jump to a datetime (naive = UTC) or epoch seconds."""
+        if isinstance(when, datetime):
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            self._epoch = when.timestamp()
+        else:
+            self._epoch = float(when)
+
+    def set_timestamp(self, epoch: float) -> None:
+        """Jump to epoch seconds (a candle's "timestamp")."""
+        self._epoch = float(epoch)
+
+    def advance(self, delta: Union[timedelta, float, int]) -> None:
+        """Move forward by a timedelta or seconds."""
+        self._epoch += delta.total_seconds() if isinstance(delta, timedelta) else float(delta)
+
+
+_clock = SystemClock()
+_local = threading.local()
+
+
+def get_clock():
+    """Clock in effect for the calling thread."""
+    return getattr(_local, "clock", None) or _clock
+
+
+def set_clock(new_clock=None):
+    """
+    Install a process-wide clock.
+
+    Args:
+        new_clock: SystemClock/ReplayClock (None = system clock)
+
+    Returns:
+        The previous process-wide clock
+    """
+    global _clock
+    previous, _clock = _clock, new_clock or SystemClock()
+    return previous
+
+
+def now(tz: Optional[tzinfo] = None) -> datetime:
+    """Current time from the active clock (drop-in for datetime.now)."""
+    return get_clock().now(tz)
+
+
+def time() -> float:
+    """Current epoch seconds from the active clock (drop-in for time.time)."""
+    return get_clock().time()
+
+
+@contextmanager
+def use_clock(new_clock, thread_only: bool = False) -> Iterator:
+    """Run a block on another clock, restoring the previous one afterwards."""
+    if thread_only:
+        previous = getattr(_local, "clock", None)
+        _local.clock = new_clock
+        try:
+            yield new_clock
+        finally:
+            _local.clock = previous
+    else:
+        previous = set_clock(new_clock)
+        try:
+            yield new_clock
+        finally:
+            set_clock(previous)
+
+
+def replay(start: Union[datetime, float, int, None] = None, thread_only: bool = False):
+    """Context manager running a block on a new ReplayClock."""
+    return use_clock(ReplayClock(start), thread_only=thread_only)
@@ -19,11 +19,12 @@ Usage:
 import sqlite3
 import json
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from contextlib import contextmanager
 
 from src.utils.logger import logger
+from src.utils import clock
 
 
 # Database path
@@ -37,6 +38,88 @@ def _to_int_or_none(value):
     return 1 if bool(value) else 0
 
 
+def _iso_to_epoch(value) -> Optional[float]:
+    """Parse an ISO timestamp to epoch seconds (naive = UTC, as SQLite does)."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+# SMC v2 gate columns of setup_labels
+SETUP_LABEL_GATES = (
+    "within_killzone",
+    "news_clear",
+    "htf_poi_gate",
+    "sweep_valid",
+    "fvg_valid",
+    "direction_confirmed",
+    "choch_or_bos",
+    "rr_pass",
+    "sl_cap_pass",
+)
+
+
+def _coerce_bool_int(v):
+    if v is None:
+        return None
+    if isinstance(v, bool):
+        return 1 if v else 0
+    if isinstance(v, (int, float)):
+        return 1 if int(v) != 0 else 0
+    if isinstance(v, str):
+        s = v.strip().lower()
+        if s in ("1", "true", "yes"):
+            return 1
+        if s in ("0", "false", "no"):
+            return 0
+    return None
+
+
+def setup_label_gates(item: dict) -> dict:
+    """
+    Gate values (1/0/None) of a setup_labels row.
+
+    Gate columns that are null are backfilled from the details payload
+    (details.gates, then details.raw_details.gates).
+    """
+    details = item.get("details")
+    if isinstance(details, str):
+        try:
+            details = json.loads(details) or {}
+        except (json.JSONDecodeError, TypeError):
+            details = {}
+    if not isinstance(details, dict):
+        details = {}
+
+    direct_gates = details.get("gates")
+    if not isinstance(direct_gates, dict):
+        direct_gates = {}
+    raw_details = details.get("raw_details")
+    nested_gates = raw_details.get("gates") if isinstance(raw_details, dict) else None
+    if not isinstance(nested_gates, dict):
+        nested_gates = {}
+
+    gates = {}
+    for gate in SETUP_LABEL_GATES:
+        value = _coerce_bool_int(item.get(gate))
+        if value is None:
+            value = _coerce_bool_int(direct_gates.get(gate))
+        if value is None:
+            value = _coerce_bool_int(nested_gates.get(gate))
+        gates[gate] = value
+    return gates
+
+
+# Close reasons for rows closed locally before MT5 reported the P/L
+PENDING_RECON_REASONS = ("SYNC_CLOSED_NO_PNL", "SYNC_CLOSED_ESTIMATED_SL", "SYNC_CLOSED_PENDING_RECON")
+
+
 class Database:
     """SQLite database manager for AI Trader."""
 
@@ -66,6 +149,27 @@ class Database:
         finally:
             conn.close()
 
+    def get_last_write_marker(self) -> tuple:
+        """
+        Cheap change marker for read-side caches.
+
+        Based on the database file's mtime/size (plus the WAL/journal file
+        if present), so checking it costs a stat() call instead of a query.
+        Any committed write changes the marker.
+
+        Returns:
+            Opaque hashable tuple
+        """
+        marker = []
+        for suffix in ("", "-wal", "-journal"):
+            path = Path(str(self.db_path) + suffix)
+            try:
+                stat = path.stat()
+                marker.append((suffix, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+        return tuple(marker)
+
     def _init_tables(self):
         """Create database tables if they don't exist."""
         with self._connection() as conn:
@@ -442,6 +546,12 @@ class Database:
                     active INTEGER DEFAULT 1
                 )
             """)
+            # Online calibration curvature (streaming Newton updates)
+            for column in ("hessian_aa", "hessian_ab", "hessian_bb"):
+                try:
+                    cursor.execute(f"ALTER TABLE calibration_params ADD COLUMN {column} REAL")
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
 
             # Sequence tracker states (institutional cycle per instrument)
             cursor.execute("""
@@ -555,6 +665,99 @@ class Database:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_corr_snapshots_time ON correlation_snapshots(timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_corr_snapshots_pairs ON correlation_snapshots(pair1, pair2)")
 
+            # Per-stage latency histograms (one row per stage per export window)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS stage_latency (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    window_start TEXT NOT NULL,
+                    window_end TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    total_ms REAL,
+                    max_ms REAL,
+                    p50_ms REAL,
+                    p95_ms REAL,
+                    p99_ms REAL,
+                    histogram TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_stage_latency_end ON stage_latency(window_end)")
+
+            # Small key/value store for sync cursors (e.g. MT5 deal high-water mark)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    updated_at TEXT
+                )
+            """)
+
+            # Background backtest jobs (see src/backtesting/jobs.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS backtest_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_key TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    label TEXT,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'QUEUED',
+                    progress REAL DEFAULT 0,
+                    message TEXT,
+                    result_path TEXT,
+                    summary TEXT,
+                    error TEXT,
+                    submitted_by TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    heartbeat_at TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_backtest_jobs_status ON backtest_jobs(status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_backtest_jobs_key ON backtest_jobs(job_key)")
+            # At most one queued/running job per identical parameter set
+            cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_backtest_jobs_active_key
+                ON backtest_jobs(job_key) WHERE status IN ('QUEUED', 'RUNNING')
+            """)
+
+            # Backtest result catalog (see src/backtesting/catalog.py).
+            # Rows hold metadata + headline metrics; trades/equity live in
+            # a compressed sidecar file loaded on demand.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS backtest_runs (
+                    run_id TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    source TEXT,
+                    label TEXT,
+                    instrument TEXT,
+                    timeframe TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    config_hash TEXT,
+                    config TEXT,
+                    total_trades INTEGER,
+                    win_rate REAL,
+                    total_return_pct REAL,
+                    total_return_abs REAL,
+                    profit_factor REAL,
+                    max_drawdown_pct REAL,
+                    sharpe_ratio REAL,
+                    final_equity REAL,
+                    metrics TEXT,
+                    summary TEXT,
+                    sidecar_path TEXT,
+                    sidecar_bytes INTEGER,
+                    source_path TEXT,
+                    source_mtime REAL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_backtest_runs_created ON backtest_runs(created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_backtest_runs_instrument ON backtest_runs(instrument, created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_backtest_runs_config ON backtest_runs(config_hash)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_backtest_runs_source_path ON backtest_runs(source_path)")
+
     # ===================
     # Trade Operations
     # ===================
@@ -618,10 +821,14 @@ class Database:
         pnl: float,
         pnl_percent: float,
         close_reason: str = "MANUAL"
-    ) -> bool:
+    ) -> Optional[bool]:
         """
         Close a trade and record P/L.
 
+        A trade that already has its P/L (e.g. recorded by an MT5 sync) is
+        overwritten with this close's data, but reported as such, so
+        per-outcome work like calibration runs once per trade.
+
         Args:
             trade_id: Trade ID
             exit_price: Exit price
@@ -630,31 +837,33 @@ class Database:
             close_reason: Reason for close (MANUAL, SL, TP, etc.)
 
         Returns:
-            True if successful
+            True if this call recorded the trade's first P/L (it was OPEN or
+            closed pending reconciliation), False if it already had one,
+            None if it is not in the database
+        """
+        params = (exit_price, pnl, pnl_percent, datetime.now().isoformat(), close_reason, trade_id)
+        update = """
+            UPDATE trades SET
+                exit_price = ?,
+                pnl = ?,
+                pnl_percent = ?,
+                status = 'CLOSED',
+                closed_at = ?,
+                close_reason = ?
+            WHERE trade_id = ?
         """
         with self._connection() as conn:
             cursor = conn.cursor()
-
-            cursor.execute("""
-                UPDATE trades SET
-                    exit_price = ?,
-                    pnl = ?,
-                    pnl_percent = ?,
-                    status = 'CLOSED',
-                    closed_at = ?,
-                    close_reason = ?
-                WHERE trade_id = ?
-            """, (
-                exit_price,
-                pnl,
-                pnl_percent,
-                datetime.now().isoformat(),
-                close_reason,
-                trade_id
-            ))
-
-            logger.info(f"Trade closed in DB: {trade_id}, P/L: {pnl:.2f}")
-            return cursor.rowcount > 0
+            # Guarded first, in the same transaction: the check is atomic
+            cursor.execute(update + " AND (status = 'OPEN' OR pnl IS NULL)", params)
+            if cursor.rowcount > 0:
+                logger.info(f"Trade closed in DB: {trade_id}, P/L: {pnl:.2f}")
+                return True
+            cursor.execute(update, params)
+            if cursor.rowcount > 0:
+                logger.info(f"Closed trade updated in DB: {trade_id}, P/L: {pnl:.2f}")
+                return False
+            return None
 
     def get_trade(self, trade_id: str) -> Optional[dict]:
         """Get trade by ID."""
@@ -673,7 +882,7 @@ class Database:
 
     def get_trades_today(self) -> list[dict]:
         """Get all trades from today."""
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = clock.now().strftime("%Y-%m-%d")
         with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -730,7 +939,7 @@ class Database:
 
     def get_pending_recon_count(self, days: int = 7) -> int:
         """Count closed trades waiting for MT5 reconciliation (no confirmed P/L yet)."""
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = clock.now() - timedelta(days=days)
         with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -999,6 +1208,8 @@ class Database:
 
         This method imports trades that were executed directly in MT5
         (not through the AI Trader system) so they appear in the dashboard.
+        Existing rows are loaded in one query, the writes are planned in
+        memory and applied in a single transaction.
 
         Args:
             mt5_trades: List of trade dicts from MT5Client.get_history()
@@ -1010,187 +1221,178 @@ class Database:
             - skipped: Number of trades already in DB
             - errors: Number of import errors
             - trades_imported: List of imported trade_ids
+            - closed_trade_ids: Local trade_ids that got their first P/L
+              (closed OPEN trades and reconciled pending ones)
         """
         results = {
             "total": len(mt5_trades),
             "imported": 0,
             "skipped": 0,
             "errors": 0,
-            "trades_imported": []
+            "trades_imported": [],
+            "closed_trade_ids": [],
         }
+        if not mt5_trades:
+            return results
+
+        reason_list = ", ".join("?" for _ in PENDING_RECON_REASONS)
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT trade_id, status, close_reason FROM trades")
+            existing = {
+                str(row[0]): (str(row[1] or "").upper(), str(row[2] or "").upper())
+                for row in cursor.fetchall()
+            }
+            # Candidates for the fallback match (MT5 id differs from local trade_id)
+            cursor.execute(f"""
+                SELECT trade_id, instrument, direction, COALESCE(closed_at, timestamp)
+                FROM trades
+                WHERE status = 'CLOSED'
+                  AND pnl IS NULL
+                  AND close_reason IN ({reason_list})
+            """, PENDING_RECON_REASONS)
+            pending_by_key: dict[tuple, list[tuple[str, Optional[float]]]] = {}
+            for row in cursor.fetchall():
+                pending_by_key.setdefault((row[1], row[2]), []).append((str(row[0]), _iso_to_epoch(row[3])))
+
+        # Planned writes: (statement, params, reported trade_id, log line)
+        writes = []
+        seen = set()
+        now_epoch = datetime.now().timestamp()
 
         for trade in mt5_trades:
             trade_id = trade.get("trade_id")
+            key = str(trade_id)
+            if key in seen:
+                results["skipped"] += 1
+                continue
+            seen.add(key)
+            close_values = (
+                trade.get("exit_price"),
+                trade.get("pnl"),
+                trade.get("pnl_percent"),
+                trade.get("closed_at"),
+            )
 
-            # Check if trade already exists
-            existing = self.get_trade(trade_id)
-            if existing:
-                # If trade exists but is still OPEN in DB, update it with MT5 close data.
-                if str(existing.get("status", "")).upper() == "OPEN":
-                    try:
-                        with self._connection() as conn:
-                            cursor = conn.cursor()
-                            cursor.execute("""
-                                UPDATE trades SET
-                                    status = 'CLOSED',
-                                    exit_price = ?,
-                                    pnl = ?,
-                                    pnl_percent = ?,
-                                    closed_at = ?,
-                                    close_reason = COALESCE(close_reason, 'MT5_SYNC')
-                                WHERE trade_id = ? AND status = 'OPEN'
-                            """, (
-                                trade.get("exit_price"),
-                                trade.get("pnl"),
-                                trade.get("pnl_percent"),
-                                trade.get("closed_at"),
-                                trade_id,
-                            ))
-                        results["imported"] += 1
-                        results["trades_imported"].append(trade_id)
-                        logger.info(
-                            f"Synced close for existing OPEN trade {trade_id}: "
-                            f"{trade.get('instrument')} {trade.get('direction')} P/L: {trade.get('pnl')}"
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to sync-close existing trade {trade_id}: {e}")
-                        results["errors"] += 1
-                elif (
-                    str(existing.get("status", "")).upper() == "CLOSED"
-                    and str(existing.get("close_reason", "")).upper() in {
-                        "SYNC_CLOSED_NO_PNL",
-                        "SYNC_CLOSED_ESTIMATED_SL",
-                        "SYNC_CLOSED_PENDING_RECON",
-                    }
-                    and trade.get("closed_at")
-                ):
+            if key in existing:
+                status, close_reason = existing[key]
+                if status == "OPEN":
+                    # Trade exists but is still OPEN in DB: update it with MT5 close data.
+                    writes.append((
+                        "close_open", close_values + (trade_id,), trade_id,
+                        f"Synced close for existing OPEN trade {trade_id}: "
+                        f"{trade.get('instrument')} {trade.get('direction')} P/L: {trade.get('pnl')}"
+                    ))
+                elif status == "CLOSED" and close_reason in PENDING_RECON_REASONS and trade.get("closed_at"):
                     # Reconcile previously closed-without-PnL rows once MT5 history appears.
-                    try:
-                        with self._connection() as conn:
-                            cursor = conn.cursor()
-                            cursor.execute("""
-                                UPDATE trades SET
-                                    exit_price = ?,
-                                    pnl = ?,
-                                    pnl_percent = ?,
-                                    closed_at = ?,
-                                    close_reason = 'MT5_SYNC_RECON'
-                                WHERE trade_id = ? AND status = 'CLOSED'
-                            """, (
-                                trade.get("exit_price"),
-                                trade.get("pnl"),
-                                trade.get("pnl_percent"),
-                                trade.get("closed_at"),
-                                trade_id,
-                            ))
-                        results["imported"] += 1
-                        results["trades_imported"].append(trade_id)
-                        logger.info(
-                            f"Reconciled previously pending closed trade {trade_id} with MT5 P/L: {trade.get('pnl')}"
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to reconcile pending trade {trade_id}: {e}")
-                        results["errors"] += 1
+                    writes.append((
+                        "recon", close_values + (trade_id,), trade_id,
+                        f"Reconciled previously pending closed trade {trade_id} with MT5 P/L: {trade.get('pnl')}"
+                    ))
                 else:
                     results["skipped"] += 1
                 continue
 
             # Fallback match when MT5 history uses a different identifier than local trade_id.
             # Reconcile pending/no-PnL rows by instrument+direction+time proximity.
-            try:
-                with self._connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(
-                        """
-                        SELECT
-                            trade_id,
-                            ABS(strftime('%s', COALESCE(closed_at, timestamp)) - strftime('%s', ?)) AS delta_sec
-                        FROM trades
-                        WHERE status = 'CLOSED'
-                          AND pnl IS NULL
-                          AND instrument = ?
-                          AND direction = ?
-                          AND close_reason IN ('SYNC_CLOSED_NO_PNL', 'SYNC_CLOSED_ESTIMATED_SL', 'SYNC_CLOSED_PENDING_RECON')
-                        ORDER BY delta_sec ASC
-                        LIMIT 1
-                        """,
-                        (
-                            trade.get("closed_at") or trade.get("opened_at") or datetime.now().isoformat(),
-                            trade.get("instrument"),
-                            trade.get("direction"),
-                        ),
-                    )
-                    pending_match = cursor.fetchone()
-                    if pending_match and int(pending_match[1] or 10**9) <= 12 * 3600:
-                        matched_trade_id = pending_match[0]
-                        cursor.execute(
-                            """
-                            UPDATE trades SET
-                                exit_price = ?,
-                                pnl = ?,
-                                pnl_percent = ?,
-                                closed_at = ?,
-                                close_reason = 'MT5_SYNC_RECON',
-                                notes = COALESCE(notes, '') || ?
-                            WHERE trade_id = ? AND status = 'CLOSED'
-                            """,
-                            (
-                                trade.get("exit_price"),
-                                trade.get("pnl"),
-                                trade.get("pnl_percent"),
-                                trade.get("closed_at"),
-                                f" | mt5_trade_id={trade_id}",
-                                matched_trade_id,
-                            ),
-                        )
-                        if cursor.rowcount > 0:
-                            results["imported"] += 1
-                            results["trades_imported"].append(matched_trade_id)
-                            logger.info(
-                                f"Reconciled pending trade {matched_trade_id} "
-                                f"using MT5 trade {trade_id}: P/L {trade.get('pnl')}"
-                            )
-                            continue
-            except Exception as e:
-                logger.warning(f"Pending fallback reconciliation failed for MT5 trade {trade_id}: {e}")
+            candidates = pending_by_key.get((trade.get("instrument"), trade.get("direction")))
+            if candidates:
+                ref = _iso_to_epoch(trade.get("closed_at") or trade.get("opened_at")) or now_epoch
+                best = min(
+                    (c for c in candidates if c[1] is not None),
+                    key=lambda c: abs(c[1] - ref),
+                    default=None,
+                )
+                if best is not None and abs(best[1] - ref) <= 12 * 3600:
+                    candidates.remove(best)
+                    writes.append((
+                        "fallback", close_values + (f" | mt5_trade_id={trade_id}", best[0]), best[0],
+                        f"Reconciled pending trade {best[0]} using MT5 trade {trade_id}: P/L {trade.get('pnl')}"
+                    ))
+                    continue
+
+            writes.append(("insert", (
+                trade_id,
+                trade.get("opened_at"),
+                trade.get("instrument"),
+                trade.get("direction"),
+                trade.get("entry_price"),
+                trade.get("exit_price"),
+                trade.get("stop_loss"),
+                trade.get("take_profit"),
+                trade.get("units"),
+                trade.get("pnl"),
+                trade.get("pnl_percent"),
+                "CLOSED",
+                trade.get("closed_at"),
+                "MT5_SYNC",
+                f"Synced from MT5. Commission: {trade.get('commission', 0)}, Swap: {trade.get('swap', 0)}"
+            ), trade_id,
+                f"Synced trade {trade_id}: {trade.get('instrument')} {trade.get('direction')} P/L: {trade.get('pnl')}"
+            ))
 
+        if writes:
+            statements = {
+                "close_open": """
+                    UPDATE trades SET
+                        status = 'CLOSED',
+                        exit_price = ?,
+                        pnl = ?,
+                        pnl_percent = ?,
+                        closed_at = ?,
+                        close_reason = COALESCE(close_reason, 'MT5_SYNC')
+                    WHERE trade_id = ? AND status = 'OPEN'
+                """,
+                "recon": """
+                    UPDATE trades SET
+                        exit_price = ?,
+                        pnl = ?,
+                        pnl_percent = ?,
+                        closed_at = ?,
+                        close_reason = 'MT5_SYNC_RECON'
+                    WHERE trade_id = ? AND status = 'CLOSED' AND pnl IS NULL
+                """,
+                "fallback": """
+                    UPDATE trades SET
+                        exit_price = ?,
+                        pnl = ?,
+                        pnl_percent = ?,
+                        closed_at = ?,
+                        close_reason = 'MT5_SYNC_RECON',
+                        notes = COALESCE(notes, '') || ?
+                    WHERE trade_id = ? AND status = 'CLOSED' AND pnl IS NULL
+                """,
+                # OR IGNORE: a trade_id inserted concurrently must not roll back the batch
+                "insert": """
+                    INSERT OR IGNORE INTO trades (
+                        trade_id, timestamp, instrument, direction,
+                        entry_price, exit_price, stop_loss, take_profit,
+                        units, pnl, pnl_percent, status, closed_at,
+                        close_reason, notes
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+            }
             try:
+                # One transaction; rows that matched nothing count as skipped
+                applied = []
                 with self._connection() as conn:
                     cursor = conn.cursor()
-
-                    # Insert as closed trade
-                    cursor.execute("""
-                        INSERT INTO trades (
-                            trade_id, timestamp, instrument, direction,
-                            entry_price, exit_price, stop_loss, take_profit,
-                            units, pnl, pnl_percent, status, closed_at,
-                            close_reason, notes
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        trade_id,
-                        trade.get("opened_at"),
-                        trade.get("instrument"),
-                        trade.get("direction"),
-                        trade.get("entry_price"),
-                        trade.get("exit_price"),
-                        trade.get("stop_loss"),
-                        trade.get("take_profit"),
-                        trade.get("units"),
-                        trade.get("pnl"),
-                        trade.get("pnl_percent"),
-                        "CLOSED",
-                        trade.get("closed_at"),
-                        "MT5_SYNC",
-                        f"Synced from MT5. Commission: {trade.get('commission', 0)}, Swap: {trade.get('swap', 0)}"
-                    ))
-
-                results["imported"] += 1
-                results["trades_imported"].append(trade_id)
-                logger.info(f"Synced trade {trade_id}: {trade.get('instrument')} {trade.get('direction')} P/L: {trade.get('pnl')}")
-
+                    for statement, params, reported_id, log_line in writes:
+                        cursor.execute(statements[statement], params)
+                        if cursor.rowcount > 0:
+                            applied.append((reported_id, log_line))
+                            if statement != "insert":
+                                results["closed_trade_ids"].append(str(params[-1]))
+                results["imported"] = len(applied)
+                results["skipped"] += len(writes) - len(applied)
+                results["trades_imported"] = [reported_id for reported_id, _ in applied]
+                for _, log_line in applied:
+                    logger.info(log_line)
             except Exception as e:
-                logger.error(f"Failed to sync trade {trade_id}: {e}")
-                results["errors"] += 1
+                logger.error(f"Failed to sync {len(writes)} MT5 trade(s): {e}")
+                results["errors"] = len(writes)
+                results["trades_imported"] = []
+                results["closed_trade_ids"] = []
 
         logger.info(f"MT5 sync complete: {results['imported']} imported, {results['skipped']} skipped, {results['errors']} errors")
         return results
@@ -1253,7 +1455,7 @@ class Database:
 
     def get_recent_trades(self, days: int = 30) -> list[dict]:
         """Get closed trades in last N days."""
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = clock.now() - timedelta(days=days)
         with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -1418,7 +1620,7 @@ class Database:
 
     def get_auto_trading_stats(self, days: int = 7) -> dict:
         """Get auto-trading statistics for last N days."""
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = clock.now() - timedelta(days=days)
 
         with self._connection() as conn:
             cursor = conn.cursor()
@@ -1506,7 +1708,7 @@ class Database:
 
     def get_smc_v2_shadow_stats(self, hours: int = 24) -> dict:
         """Get SMC v2 shadow evaluation stats for the last N hours."""
-        cutoff = datetime.now() - timedelta(hours=hours)
+        cutoff = clock.now() - timedelta(hours=hours)
         with self._connection() as conn:
             cursor = conn.cursor()
 
@@ -1574,21 +1776,10 @@ class Database:
 
     def get_smc_v2_gate_stats(self, hours: int = 24) -> dict:
         """Get per-gate pass/fail rates for setup_labels."""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        gates = [
-            "within_killzone",
-            "news_clear",
-            "htf_poi_gate",
-            "sweep_valid",
-            "fvg_valid",
-            "direction_confirmed",
-            "choch_or_bos",
-            "rr_pass",
-            "sl_cap_pass",
-        ]
+        cutoff = clock.now() - timedelta(hours=hours)
         results = {
             g: {"pass_count": 0, "fail_count": 0, "total": 0, "pass_rate": 0.0}
-            for g in gates
+            for g in SETUP_LABEL_GATES
         }
         with self._connection() as conn:
             cursor = conn.cursor()
@@ -1598,45 +1789,9 @@ class Database:
             """, (cutoff.isoformat(),))
             rows = cursor.fetchall()
 
-            def _coerce_bool_int(v):
-                if v is None:
-                    return None
-                if isinstance(v, bool):
-                    return 1 if v else 0
-                if isinstance(v, (int, float)):
-                    return 1 if int(v) != 0 else 0
-                if isinstance(v, str):
-                    s = v.strip().lower()
-                    if s in ("1", "true", "yes"):
-                        return 1
-                    if s in ("0", "false", "no"):
-                        return 0
-                return None
-
             for row in rows:
-                item = dict(row)
-                details = {}
-                if item.get("details"):
-                    try:
-                        details = json.loads(item["details"]) or {}
-                    except (json.JSONDecodeError, TypeError):
-                        details = {}
-
-                # Backfill gates from payload details when gate columns were null.
-                direct_gates = details.get("gates") if isinstance(details, dict) else {}
-                raw_details = details.get("raw_details") if isinstance(details, dict) else {}
-                nested_gates = {}
-                if isinstance(raw_details, dict):
-                    rg = raw_details.get("gates")
-                    if isinstance(rg, dict):
-                        nested_gates = rg
-
-                for gate in gates:
-                    gate_value = _coerce_bool_int(item.get(gate))
-                    if gate_value is None:
-                        gate_value = _coerce_bool_int(direct_gates.get(gate) if isinstance(direct_gates, dict) else None)
-                    if gate_value is None:
-                        gate_value = _coerce_bool_int(nested_gates.get(gate) if isinstance(nested_gates, dict) else None)
+                # Gate columns, backfilled from payload details when null
+                for gate, gate_value in setup_label_gates(dict(row)).items():
                     if gate_value is None:
                         continue
                     results[gate]["total"] += 1
@@ -1645,15 +1800,32 @@ class Database:
                     else:
                         results[gate]["fail_count"] += 1
 
-            for gate in gates:
+            for gate in SETUP_LABEL_GATES:
                 total = results[gate]["total"]
                 pass_count = results[gate]["pass_count"]
                 results[gate]["pass_rate"] = round((pass_count / total) * 100, 1) if total > 0 else 0.0
         return results
 
+    def get_setup_labels(self, days: int = 30) -> list[dict]:
+        """Setup labels from the last N days, oldest first, with resolved gate values."""
+        cutoff = clock.now(timezone.utc) - timedelta(days=days)
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM setup_labels
+                WHERE timestamp >= ?
+                ORDER BY timestamp ASC
+            """, (cutoff.isoformat(),))
+            rows = []
+            for row in cursor.fetchall():
+                item = dict(row)
+                item.update(setup_label_gates(item))
+                rows.append(item)
+            return rows
+
     def get_smc_v2_by_instrument(self, hours: int = 24) -> list[dict]:
         """Get SMC v2 shadow stats grouped by instrument."""
-        cutoff = datetime.now() - timedelta(hours=hours)
+        cutoff = clock.now() - timedelta(hours=hours)
         with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -1684,7 +1856,7 @@ class Database:
 
     def get_auto_trades_by_instrument(self, days: int = 7) -> dict:
         """Get auto trades grouped by instrument."""
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = clock.now() - timedelta(days=days)
 
         with self._connection() as conn:
             cursor = conn.cursor()
@@ -1801,6 +1973,57 @@ class Database:
                 results.append(item)
             return results
 
+    def get_activities_since(
+        self,
+        last_id: int,
+        limit: int = 500,
+        activity_types: list = None
+    ) -> list[dict]:
+        """
+        Get activities inserted after a known row id (oldest first).
+
+        Used by incremental feeds that only need the delta since their
+        last poll. Seeks on the primary key, so cost is proportional to
+        the number of new rows, not table size.
+
+        Args:
+            last_id: Highest activity id already seen
+            limit: Max number of activities
+            activity_types: Filter by types (optional)
+
+        Returns:
+            List of activity dicts ordered by id ascending
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            if activity_types:
+                placeholders = ",".join("?" * len(activity_types))
+                cursor.execute(f"""
+                    SELECT * FROM activity_log
+                    WHERE id > ? AND activity_type IN ({placeholders})
+                    ORDER BY id ASC
+                    LIMIT ?
+                """, (last_id, *activity_types, limit))
+            else:
+                cursor.execute("""
+                    SELECT * FROM activity_log
+                    WHERE id > ?
+                    ORDER BY id ASC
+                    LIMIT ?
+                """, (last_id, limit))
+
+            results = []
+            for row in cursor.fetchall():
+                item = dict(row)
+                if item.get("details"):
+                    try:
+                        item["details"] = json.loads(item["details"])
+                    except (json.JSONDecodeError, TypeError):
+                        pass
+                results.append(item)
+            return results
+
     def get_activities_for_instrument(self, instrument: str, limit: int = 50) -> list[dict]:
         """Get recent activities for a specific instrument."""
         with self._connection() as conn:
@@ -1830,7 +2053,7 @@ class Database:
         Returns:
             Dict with counts by activity type
         """
-        cutoff = datetime.now() - timedelta(hours=hours)
+        cutoff = clock.now() - timedelta(hours=hours)
 
         with self._connection() as conn:
             cursor = conn.cursor()
@@ -1864,7 +2087,7 @@ class Database:
         Returns:
             Number of rows deleted
         """
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = clock.now() - timedelta(days=days)
         with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -1896,6 +2119,9 @@ class Database:
             - closed: List of trade_ids that were sync-closed
             - closed_with_pnl: Number of trades closed with actual P/L data
             - still_open: Number still matching MT5
+            - closed_trades: Trades that got their P/L in this call, as dicts
+              with trade_id, pnl and confidence_score (closed with MT5 history
+              or reconciled from pending)
         """
         results = {
             "checked": 0,
@@ -1904,6 +2130,7 @@ class Database:
             "still_open": 0,
             "reconciled": 0,
             "pending_reconciled": 0,
+            "closed_trades": [],
         }
 
         # Get all open trades from DB
@@ -1945,18 +2172,16 @@ class Database:
                     from src.trading.mt5_client import MT5Client
                     client = MT5Client()
                 if client.is_connected():
-                    for lookback_days in (1, 3, 7, 30):
-                        fetched_history = client.get_history(days=lookback_days)
-                        for h in fetched_history:
-                            tid = str(h.get("trade_id", ""))
-                            if tid:
-                                history_lookup[tid] = h
-                        if history_lookup:
-                            logger.debug(
-                                f"Fetched {len(history_lookup)} trades from MT5 history for sync "
-                                f"(lookback={lookback_days}d)"
-                            )
-                            break
+                    from src.utils.mt5_sync import fetch_history_incremental
+                    fetched_history = fetch_history_incremental(
+                        client, database=self, cursor_key="mt5_position_sync_hwm"
+                    )
+                    for h in fetched_history:
+                        tid = str(h.get("trade_id", ""))
+                        if tid:
+                            history_lookup[tid] = h
+                    if history_lookup:
+                        logger.debug(f"Fetched {len(history_lookup)} trades from MT5 history for sync")
             except Exception as e:
                 logger.warning(f"Could not fetch MT5 history for sync: {e}")
 
@@ -1970,7 +2195,10 @@ class Database:
             results["still_open"] = len(db_open_trades)
             return results
 
-        # Check each DB open trade
+        # Check each DB open trade, collecting the closes for one transaction
+        closed_with_history = []
+        closed_pending = []
+        now_iso = datetime.now().isoformat()
         for trade in db_open_trades:
             trade_id = trade.get("trade_id")
             if not trade_id:
@@ -1995,50 +2223,19 @@ class Database:
 
                 if history_data:
                     # We have actual close data from MT5
-                    exit_price = history_data.get("exit_price", 0)
                     pnl = history_data.get("pnl", 0)
-                    pnl_percent = history_data.get("pnl_percent", 0)
-                    closed_at = history_data.get("closed_at", datetime.now().isoformat())
-
-                    with self._connection() as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            UPDATE trades SET
-                                status = 'CLOSED',
-                                exit_price = ?,
-                                pnl = ?,
-                                pnl_percent = ?,
-                                closed_at = ?,
-                                close_reason = 'SYNC_CLOSED'
-                            WHERE trade_id = ? AND status = 'OPEN'
-                        """, (
-                            exit_price,
-                            pnl,
-                            pnl_percent,
-                            closed_at,
-                            trade_id
-                        ))
-
+                    closed_with_history.append((
+                        history_data.get("exit_price", 0),
+                        pnl,
+                        history_data.get("pnl_percent", 0),
+                        history_data.get("closed_at", now_iso),
+                        trade_id,
+                    ))
                     results["closed_with_pnl"] += 1
                     logger.info(f"Sync-closed trade {trade_id} with P/L: {pnl:.2f} EUR")
                 else:
-                    # No history data - close with unknown P/L
                     # No MT5 close deal data yet -> close as pending reconciliation without guessing P/L.
-                    with self._connection() as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            UPDATE trades SET
-                                status = 'CLOSED',
-                                pnl = NULL,
-                                pnl_percent = NULL,
-                                closed_at = ?,
-                                close_reason = ?
-                            WHERE trade_id = ? AND status = 'OPEN'
-                        """, (
-                            datetime.now().isoformat(),
-                            "SYNC_CLOSED_PENDING_RECON",
-                            trade_id
-                        ))
+                    closed_pending.append((now_iso, "SYNC_CLOSED_PENDING_RECON", trade_id))
                     logger.warning(
                         f"Sync-closed trade {trade_id} without MT5 history "
                         f"(reason=SYNC_CLOSED_PENDING_RECON)"
@@ -2048,6 +2245,33 @@ class Database:
             else:
                 results["still_open"] += 1
 
+        closed_here = []  # Trades that got their first P/L in this call
+        if closed_with_history or closed_pending:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                for row in closed_with_history:
+                    cursor.execute("""
+                        UPDATE trades SET
+                            status = 'CLOSED',
+                            exit_price = ?,
+                            pnl = ?,
+                            pnl_percent = ?,
+                            closed_at = ?,
+                            close_reason = 'SYNC_CLOSED'
+                        WHERE trade_id = ? AND status = 'OPEN'
+                    """, row)
+                    if cursor.rowcount > 0:
+                        closed_here.append(str(row[4]))
+                cursor.executemany("""
+                    UPDATE trades SET
+                        status = 'CLOSED',
+                        pnl = NULL,
+                        pnl_percent = NULL,
+                        closed_at = ?,
+                        close_reason = ?
+                    WHERE trade_id = ? AND status = 'OPEN'
+                """, closed_pending)
+
         if results["closed"]:
             logger.info(f"DB Sync: Closed {len(results['closed'])} trades ({results['closed_with_pnl']} with P/L data)")
 
@@ -2056,6 +2280,7 @@ class Database:
             try:
                 recon = self.sync_from_mt5(fetched_history)
                 results["reconciled"] = int(recon.get("imported", 0) or 0)
+                closed_here += recon.get("closed_trade_ids", [])
                 if results["reconciled"] > 0:
                     logger.info(f"DB Sync: Reconciled/imported {results['reconciled']} trade(s) from MT5 history")
             except Exception as e:
@@ -2064,72 +2289,523 @@ class Database:
         # Direct per-position reconciliation for rows still pending P/L.
         if mt5_client is not None:
             try:
-                results["pending_reconciled"] = self.reconcile_pending_closed_with_mt5(mt5_client)
+                reconciled_ids = self._reconcile_pending(mt5_client)
+                results["pending_reconciled"] = len(reconciled_ids)
+                closed_here += reconciled_ids
                 if results["pending_reconciled"] > 0:
-                    logger.info(f"DB Sync: Reconciled {results['pending_reconciled']} pending trade(s) via position lookup")
+                    logger.info(f"DB Sync: Reconciled {results['pending_reconciled']} pending trade(s) via MT5 history")
             except Exception as e:
-                logger.warning(f"Pending reconciliation via position lookup failed: {e}")
+                logger.warning(f"Pending reconciliation via MT5 history failed: {e}")
+
+        if closed_here:
+            results["closed_trades"] = self._closed_trades_with_pnl(closed_here)
 
         return results
 
+    def _closed_trades_with_pnl(self, trade_ids: list[str]) -> list[dict]:
+        """trade_id, pnl and confidence_score of the given trades that are CLOSED with a P/L."""
+        ids = sorted(set(trade_ids))
+        placeholders = ", ".join("?" for _ in ids)
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT trade_id, pnl, confidence_score FROM trades
+                WHERE trade_id IN ({placeholders})
+                  AND status = 'CLOSED'
+                  AND pnl IS NOT NULL
+            """, ids)
+            return [dict(row) for row in cursor.fetchall()]
+
     def reconcile_pending_closed_with_mt5(self, mt5_client, lookback_days: int = 30, limit: int = 50) -> int:
         """
-        Reconcile CLOSED trades that have no P/L yet using MT5 position-based lookup.
+        Reconcile CLOSED trades that have no P/L yet against MT5 history.
+
+        Fetches one history window covering the oldest pending row (capped
+        at lookback_days) instead of querying MT5 once per position, and
+        applies all matches in a single transaction.
+
+        Args:
+            mt5_client: Connected MT5Client
+            lookback_days: Maximum history window in days
+            limit: Maximum pending rows to reconcile per call
+
+        Returns:
+            Number of trades reconciled
         """
+        return len(self._reconcile_pending(mt5_client, lookback_days, limit))
+
+    def _reconcile_pending(self, mt5_client, lookback_days: int = 30, limit: int = 50) -> list[str]:
+        """reconcile_pending_closed_with_mt5(), returning the reconciled trade_ids."""
+        reason_list = ", ".join("?" for _ in PENDING_RECON_REASONS)
         with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                SELECT trade_id
+                f"""
+                SELECT trade_id, timestamp, closed_at
                 FROM trades
                 WHERE status = 'CLOSED'
                   AND pnl IS NULL
-                  AND close_reason IN ('SYNC_CLOSED_NO_PNL', 'SYNC_CLOSED_ESTIMATED_SL', 'SYNC_CLOSED_PENDING_RECON')
+                  AND close_reason IN ({reason_list})
                 ORDER BY datetime(COALESCE(closed_at, timestamp)) DESC
                 LIMIT ?
                 """,
-                (int(limit),),
+                (*PENDING_RECON_REASONS, int(limit)),
             )
-            pending_ids = [str(row[0]) for row in cursor.fetchall() if row[0] is not None]
+            pending = [row for row in cursor.fetchall() if row[0] is not None]
+
+        if not pending:
+            return []
+
+        now = datetime.now(timezone.utc)
+        oldest = min(
+            (t for row in pending for t in (_iso_to_epoch(row[1]), _iso_to_epoch(row[2])) if t is not None),
+            default=None,
+        )
+        from_date = now - timedelta(days=lookback_days)
+        if oldest is not None:
+            from_date = max(from_date, datetime.fromtimestamp(oldest, tz=timezone.utc) - timedelta(days=1))
+
+        history = {
+            str(t.get("trade_id")): t
+            for t in mt5_client.get_history(from_date=from_date)
+        }
+        updates = []
+        for row in pending:
+            mt5_trade = history.get(str(row[0]))
+            if not mt5_trade:
+                continue
+            updates.append((
+                mt5_trade.get("exit_price"),
+                mt5_trade.get("pnl"),
+                mt5_trade.get("pnl_percent"),
+                mt5_trade.get("closed_at"),
+                str(row[0]),
+            ))
 
-        if not pending_ids:
-            return 0
+        reconciled = []
+        if not updates:
+            return reconciled
 
-        reconciled = 0
-        for trade_id in pending_ids:
-            try:
-                mt5_trade = mt5_client.get_closed_trade_by_position(trade_id, days=lookback_days)
-                if not mt5_trade:
-                    continue
-                if str(mt5_trade.get("trade_id")) != str(trade_id):
-                    continue
+        with self._connection() as conn:
+            for params in updates:
+                cursor = conn.execute(
+                    """
+                    UPDATE trades SET
+                        exit_price = ?,
+                        pnl = ?,
+                        pnl_percent = ?,
+                        closed_at = ?,
+                        close_reason = 'MT5_SYNC_RECON'
+                    WHERE trade_id = ? AND status = 'CLOSED' AND pnl IS NULL
+                    """,
+                    params,
+                )
+                if cursor.rowcount > 0:
+                    reconciled.append(params[-1])
+        return reconciled
 
-                with self._connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(
-                        """
-                        UPDATE trades SET
-                            exit_price = ?,
-                            pnl = ?,
-                            pnl_percent = ?,
-                            closed_at = ?,
-                            close_reason = 'MT5_SYNC_RECON'
-                        WHERE trade_id = ? AND status = 'CLOSED' AND pnl IS NULL
-                        """,
-                        (
-                            mt5_trade.get("exit_price"),
-                            mt5_trade.get("pnl"),
-                            mt5_trade.get("pnl_percent"),
-                            mt5_trade.get("closed_at"),
-                            trade_id,
-                        ),
-                    )
-                    if cursor.rowcount > 0:
-                        reconciled += 1
-            except Exception as e:
-                logger.debug(f"Pending reconcile failed for trade {trade_id}: {e}")
+    # ===================
+    # Sync State
+    # ===================
 
-        return reconciled
+    def get_sync_state(self, key: str) -> Optional[str]:
+        """Get a stored sync cursor value (None if never set)."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+
+    def set_sync_state(self, key: str, value: str):
+        """Store a sync cursor value."""
+        with self._connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO sync_state (key, value, updated_at) VALUES (?, ?, ?)
+                """,
+                (key, value, datetime.now(timezone.utc).isoformat()),
+            )
+
+    # ===================
+    # Backtest Jobs
+    # ===================
+
+    def create_backtest_job(
+        self,
+        job_key: str,
+        kind: str,
+        params: str,
+        label: Optional[str] = None,
+        submitted_by: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Queue a backtest job.
+
+        Args:
+            job_key: Hash of kind + params (dedup key)
+            kind: Job kind (e.g. "backtest", "walk_forward")
+            params: JSON-encoded job parameters
+            label: Display label
+            submitted_by: Free-form submitter tag (page, script)
+
+        Returns:
+            New job id, or None if an identical job is already queued/running
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO backtest_jobs (job_key, kind, label, params, status, submitted_by, created_at)
+                    VALUES (?, ?, ?, ?, 'QUEUED', ?, ?)
+                """, (job_key, kind, label, params, submitted_by, datetime.now(timezone.utc).isoformat()))
+                return cursor.lastrowid
+        except sqlite3.IntegrityError:
+            return None
+
+    def get_backtest_job(self, job_id: int) -> Optional[dict]:
+        """Get one backtest job row."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM backtest_jobs WHERE id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+
+    def find_backtest_job(self, job_key: str, statuses: tuple) -> Optional[dict]:
+        """Get the newest job with this key in one of the given statuses."""
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._connection() as conn:
+            row = conn.execute(f"""
+                SELECT * FROM backtest_jobs
+                WHERE job_key = ? AND status IN ({placeholders})
+                ORDER BY id DESC LIMIT 1
+            """, (job_key, *statuses)).fetchone()
+            return dict(row) if row else None
+
+    def list_backtest_jobs(self, limit: int = 50, statuses: Optional[tuple] = None) -> list[dict]:
+        """List backtest jobs, newest first."""
+        query = "SELECT * FROM backtest_jobs"
+        args: list = []
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            args.extend(statuses)
+        query += " ORDER BY id DESC LIMIT ?"
+        args.append(int(limit))
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(query, args).fetchall()]
+
+    def claim_backtest_job(self) -> Optional[dict]:
+        """
+        Atomically move the oldest QUEUED job to RUNNING.
+
+        Safe with several runners on one database: only the runner whose
+        conditional UPDATE succeeds owns the job.
+
+        Returns:
+            Claimed job row, or None if the queue is empty
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connection() as conn:
+            while True:
+                row = conn.execute("""
+                    SELECT id FROM backtest_jobs
+                    WHERE status = 'QUEUED' AND cancel_requested = 0
+                    ORDER BY id LIMIT 1
+                """).fetchone()
+                if row is None:
+                    return None
+                cursor = conn.execute("""
+                    UPDATE backtest_jobs
+                    SET status = 'RUNNING', started_at = ?, heartbeat_at = ?, message = 'Starting'
+                    WHERE id = ? AND status = 'QUEUED'
+                """, (now, now, row[0]))
+                if cursor.rowcount:
+                    claimed = conn.execute("SELECT * FROM backtest_jobs WHERE id = ?", (row[0],)).fetchone()
+                    return dict(claimed)
+
+    def update_backtest_job_progress(self, job_id: int, progress: float, message: str = "") -> bool:
+        """
+        Record job progress (also refreshes the heartbeat).
+
+        Returns:
+            True if cancellation was requested for this job
+        """
+        with self._connection() as conn:
+            conn.execute("""
+                UPDATE backtest_jobs SET progress = ?, message = ?, heartbeat_at = ?
+                WHERE id = ? AND status = 'RUNNING'
+            """, (float(progress), message, datetime.now(timezone.utc).isoformat(), job_id))
+            row = conn.execute("SELECT cancel_requested FROM backtest_jobs WHERE id = ?", (job_id,)).fetchone()
+            return bool(row and row[0])
+
+    def touch_backtest_jobs(self, job_ids: list[int]):
+        """Refresh the heartbeat of jobs a runner is still supervising."""
+        if not job_ids:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connection() as conn:
+            conn.executemany(
+                "UPDATE backtest_jobs SET heartbeat_at = ? WHERE id = ? AND status = 'RUNNING'",
+                [(now, job_id) for job_id in job_ids],
+            )
+
+    def finish_backtest_job(
+        self,
+        job_id: int,
+        status: str,
+        result_path: Optional[str] = None,
+        summary: Optional[str] = None,
+        error: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> bool:
+        """
+        Move a QUEUED/RUNNING job to a final status.
+
+        Returns:
+            True if the job was still active (first finisher wins)
+        """
+        with self._connection() as conn:
+            cursor = conn.execute("""
+                UPDATE backtest_jobs SET
+                    status = ?,
+                    progress = CASE WHEN ? = 'DONE' THEN 1.0 ELSE progress END,
+                    result_path = COALESCE(?, result_path),
+                    summary = COALESCE(?, summary),
+                    error = ?,
+                    message = COALESCE(?, message),
+                    finished_at = ?
+                WHERE id = ? AND status IN ('QUEUED', 'RUNNING')
+            """, (status, status, result_path, summary, error, message,
+                  datetime.now(timezone.utc).isoformat(), job_id))
+            return cursor.rowcount > 0
+
+    def request_backtest_job_cancel(self, job_id: int) -> Optional[str]:
+        """
+        Request cancellation of a job.
+
+        Queued jobs are cancelled immediately; running jobs are flagged and
+        stopped by their runner.
+
+        Returns:
+            Resulting job status, or None if the job doesn't exist
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connection() as conn:
+            conn.execute("""
+                UPDATE backtest_jobs SET status = 'CANCELLED', cancel_requested = 1,
+                    finished_at = ?, message = 'Cancelled before start'
+                WHERE id = ? AND status = 'QUEUED'
+            """, (now, job_id))
+            conn.execute(
+                "UPDATE backtest_jobs SET cancel_requested = 1 WHERE id = ? AND status = 'RUNNING'",
+                (job_id,),
+            )
+            row = conn.execute("SELECT status FROM backtest_jobs WHERE id = ?", (job_id,)).fetchone()
+            return row[0] if row else None
+
+    def fail_stale_backtest_jobs(self, stale_before: str, exclude_ids: tuple = ()) -> int:
+        """
+        Fail RUNNING jobs whose runner stopped sending heartbeats.
+
+        Args:
+            stale_before: ISO timestamp; older heartbeats are considered lost
+            exclude_ids: Jobs supervised by the caller (never stale)
+
+        Returns:
+            Number of jobs failed
+        """
+        query = """
+            UPDATE backtest_jobs SET status = 'FAILED', error = 'Worker lost (no heartbeat)', finished_at = ?
+            WHERE status = 'RUNNING' AND COALESCE(heartbeat_at, started_at) < ?
+        """
+        args: list = [datetime.now(timezone.utc).isoformat(), stale_before]
+        if exclude_ids:
+            query += f" AND id NOT IN ({', '.join('?' for _ in exclude_ids)})"
+            args.extend(exclude_ids)
+        with self._connection() as conn:
+            return conn.execute(query, args).rowcount
+
+    # ===================
+    # Backtest Result Catalog
+    # ===================
+
+    BACKTEST_RUN_SORT_COLUMNS = (
+        "created_at", "instrument", "label", "start_date", "total_trades", "win_rate",
+        "total_return_pct", "total_return_abs", "profit_factor", "max_drawdown_pct",
+        "sharpe_ratio", "final_equity",
+    )
+    # Listing skips the JSON blobs; get_backtest_runs() returns them
+    _BACKTEST_RUN_LIST_COLUMNS = (
+        "run_id, created_at, source, label, instrument, timeframe, start_date, end_date, "
+        "config_hash, total_trades, win_rate, total_return_pct, total_return_abs, profit_factor, "
+        "max_drawdown_pct, sharpe_ratio, final_equity, sidecar_path, sidecar_bytes, source_path"
+    )
+
+    def save_backtest_run(self, run: dict):
+        """Insert or replace one catalog row (keys = backtest_runs columns)."""
+        columns = list(run)
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO backtest_runs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [run[c] for c in columns],
+            )
+
+    def _backtest_run_filters(
+        self,
+        instrument: Optional[str] = None,
+        config_hash: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        search: Optional[str] = None,
+        source_prefix: Optional[str] = None,
+    ) -> tuple[str, list]:
+        clauses, args = [], []
+        for column, value in (("instrument", instrument), ("config_hash", config_hash), ("source", source)):
+            if value:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if since:
+            clauses.append("created_at >= ?")
+            args.append(since)
+        if until:
+            clauses.append("created_at < ?")
+            args.append(until)
+        if search:
+            clauses.append("(label LIKE ? OR run_id LIKE ?)")
+            args.extend([f"%{search}%"] * 2)
+        if source_prefix:
+            clauses.append("source_path >= ? AND source_path < ?")
+            args.extend([source_prefix, source_prefix + "\uffff"])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def list_backtest_runs(
+        self,
+        order_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 100,
+        offset: int = 0,
+        **filters,
+    ) -> list[dict]:
+        """
+        List catalog rows (metadata and headline metrics only).
+
+        Args:
+            order_by: One of BACKTEST_RUN_SORT_COLUMNS
+            descending: Sort direction
+            limit: Max rows
+            offset: Rows to skip
+            **filters: instrument, config_hash, source, since, until, search, source_prefix
+
+        Returns:
+            List of run dicts
+        """
+        if order_by not in self.BACKTEST_RUN_SORT_COLUMNS:
+            raise ValueError(f"Cannot sort backtest runs by {order_by}")
+        where, args = self._backtest_run_filters(**filters)
+        direction = "DESC" if descending else "ASC"
+        query = (
+            f"SELECT {self._BACKTEST_RUN_LIST_COLUMNS} FROM backtest_runs{where} "
+            f"ORDER BY {order_by} IS NULL, {order_by} {direction}, run_id {direction} LIMIT ? OFFSET ?"
+        )
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(query, args + [int(limit), int(offset)]).fetchall()]
+
+    def count_backtest_runs(self, **filters) -> int:
+        """Number of catalog rows matching list_backtest_runs() filters."""
+        where, args = self._backtest_run_filters(**filters)
+        with self._connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM backtest_runs{where}", args).fetchone()[0]
+
+    def get_backtest_runs(self, run_ids: list[str]) -> dict[str, dict]:
+        """Full catalog rows (incl. config/metrics/summary) by run id."""
+        if not run_ids:
+            return {}
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM backtest_runs WHERE run_id IN ({', '.join('?' for _ in run_ids)})",
+                list(run_ids),
+            ).fetchall()
+        return {row["run_id"]: dict(row) for row in rows}
+
+    def get_backtest_run_sources(self, prefix: str) -> dict[str, float]:
+        """{source_path: source_mtime} for runs imported from files under prefix."""
+        where, args = self._backtest_run_filters(source_prefix=prefix)
+        with self._connection() as conn:
+            rows = conn.execute(f"SELECT source_path, source_mtime FROM backtest_runs{where}", args).fetchall()
+        return {row["source_path"]: row["source_mtime"] for row in rows}
+
+    def delete_backtest_run(self, run_id: str) -> Optional[str]:
+        """Delete a catalog row; returns its sidecar path (caller removes the file)."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT sidecar_path FROM backtest_runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM backtest_runs WHERE run_id = ?", (run_id,))
+            return row["sidecar_path"]
+
+    # ===================
+    # Latency Instrumentation
+    # ===================
+
+    def save_stage_latency(self, window_start: str, window_end: str, histograms: dict) -> int:
+        """
+        Persist one export window of per-stage latency histograms.
+
+        Args:
+            window_start: Window start (ISO, UTC)
+            window_end: Window end (ISO, UTC)
+            histograms: {stage: LatencyHistogram}
+
+        Returns:
+            Number of rows written
+        """
+        rows = []
+        for stage, hist in histograms.items():
+            summary = hist.summary()
+            rows.append((
+                window_start, window_end, stage, summary["count"],
+                summary["total_ms"], summary["max_ms"],
+                summary["p50_ms"], summary["p95_ms"], summary["p99_ms"],
+                json.dumps(hist.to_dict(), separators=(",", ":")),
+            ))
+        with self._connection() as conn:
+            conn.executemany("""
+                INSERT INTO stage_latency (
+                    window_start, window_end, stage, count, total_ms, max_ms,
+                    p50_ms, p95_ms, p99_ms, histogram
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        return len(rows)
+
+    def get_stage_latency(self, hours: int = 24) -> list[dict]:
+        """
+        Get exported latency windows ending in the last N hours.
+
+        Returns:
+            Rows with histogram parsed back to a dict
+        """
+        cutoff = (clock.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM stage_latency
+                WHERE window_end >= ?
+                ORDER BY window_end ASC
+            """, (cutoff,))
+            rows = []
+            for row in cursor.fetchall():
+                item = dict(row)
+                try:
+                    item["histogram"] = json.loads(item.get("histogram") or "{}")
+                except (TypeError, ValueError):
+                    item["histogram"] = {}
+                rows.append(item)
+            return rows
+
+    def clear_old_stage_latency(self, days: int = 14) -> int:
+        """Delete latency windows older than N days."""
+        cutoff = (clock.now(timezone.utc) - timedelta(days=days)).isoformat()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM stage_latency WHERE window_end < ?", (cutoff,))
+            return cursor.rowcount
 
     # ===================
     # AI Override Operations
@@ -2226,7 +2902,7 @@ class Database:
         Returns:
             Dict with override statistics
         """
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = clock.now() - timedelta(days=days)
 
         with self._connection() as conn:
             cursor = conn.cursor()
@@ -2412,7 +3088,7 @@ class Database:
         Returns:
             Dict with regime statistics
         """
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = clock.now() - timedelta(days=days)
 
         with self._connection() as conn:
             cursor = conn.cursor()
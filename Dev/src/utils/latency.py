@@ -0,0 +1,298 @@
+"""
+Latency instrumentation - per-stage timing histograms for hot paths.
+
+Lightweight span/timer API used by the scan pipeline, SMC/technical
+analysis and order execution. Timings are aggregated in memory into
+fixed log-spaced histograms (a record is a perf_counter() call, a bisect
+and a counter increment) and exported periodically to the
+stage_latency table, where the Monitoring page reads them.
+
+Three ways to time a stage:
+- span():      context manager for a block
+- timed():     decorator for a whole function
+- Stopwatch:   lap() timer for linear pipelines with early returns,
+               so stages can be timed without re-indenting code
+
+Usage:
+    from src.utils.latency import latency, timed, Stopwatch
+
+    with latency.span("scan.news"):
+        news_filter.should_avoid_trade(instrument)
+
+    @timed("orders.open_position")
+    def open_position(...): ...
+
+    sw = Stopwatch("scan")
+    price = client.get_price(instrument)
+    sw.lap("price")                      # records "scan.price"
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from src.utils.logger import logger
+
+
+# Bucket upper bounds in ms: 0.01ms .. ~120s, 20% apart (worst-case
+# percentile error ~10% of the value, plenty for "where does time go")
+_BUCKET_GROWTH = 1.2
+_BUCKET_MIN_MS = 0.01
+BUCKET_BOUNDS_MS = []
+_bound = _BUCKET_MIN_MS
+while _bound < 120_000:
+    BUCKET_BOUNDS_MS.append(round(_bound, 6))
+    _bound *= _BUCKET_GROWTH
+del _bound
+
+EXPORT_INTERVAL_SECONDS = 300
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (mergeable, serializable)."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}  # Sparse: bucket index -> count
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        idx = bisect_left(BUCKET_BOUNDS_MS, ms)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q: float) -> float:
+        """
+        Approximate percentile (upper bound of the containing bucket).
+
+        Args:
+            q: Percentile 0-100
+
+        Returns:
+            Latency in ms (0.0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                if idx >= len(BUCKET_BOUNDS_MS):
+                    return self.max_ms
+                return min(BUCKET_BOUNDS_MS[idx], self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "total_ms": round(self.total_ms, 3),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "counts": {str(k): v for k, v in self.counts.items()},
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        hist = cls()
+        hist.counts = {int(k): int(v) for k, v in (data.get("counts") or {}).items()}
+        hist.count = int(data.get("count", 0))
+        hist.total_ms = float(data.get("total_ms", 0.0))
+        hist.max_ms = float(data.get("max_ms", 0.0))
+        return hist
+
+
+class LatencyRecorder:
+    """
+    Thread-safe registry of per-stage histograms.
+
+    Holds two views: a cumulative one for the process lifetime and a
+    window that is drained on each export.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._totals: Dict[str, LatencyHistogram] = {}
+        self._window: Dict[str, LatencyHistogram] = {}
+        self._window_start = datetime.now(timezone.utc)
+        self._last_export = time.monotonic()
+
+    def record(self, stage: str, ms: float) -> None:
+        """Record one duration for a stage."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for store in (self._totals, self._window):
+                hist = store.get(stage)
+                if hist is None:
+                    hist = store[stage] = LatencyHistogram()
+                hist.record(ms)
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time a block (recorded even if it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict[str, dict]:
+        """
+        Cumulative per-stage summary since process start.
+
+        Args:
+            prefix: Only stages starting with this prefix
+
+        Returns:
+            {stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms, total_ms}}
+        """
+        with self._lock:
+            items = [
+                (name, hist) for name, hist in self._totals.items()
+                if prefix is None or name.startswith(prefix)
+            ]
+            return {name: hist.summary() for name, hist in sorted(items)}
+
+    def drain_window(self) -> tuple:
+        """
+        Take the current export window and start a new one.
+
+        Returns:
+            (window_start, window_end, {stage: LatencyHistogram})
+        """
+        with self._lock:
+            window = self._window
+            start = self._window_start
+            self._window = {}
+            self._window_start = datetime.now(timezone.utc)
+        return start, self._window_start, window
+
+    def export(self, database=None) -> int:
+        """
+        Persist the current window to the stage_latency table.
+
+        Returns:
+            Number of stage rows written
+        """
+        if database is None:
+            from src.utils.database import db as database
+
+        start, end, window = self.drain_window()
+        self._last_export = time.monotonic()
+        if not window:
+            return 0
+        try:
+            return database.save_stage_latency(start.isoformat(), end.isoformat(), window)
+        except Exception as e:
+            # Instrumentation must never break trading
+            logger.warning(f"Latency export failed: {e}")
+            return 0
+
+    def maybe_export(self, interval_seconds: float = EXPORT_INTERVAL_SECONDS, database=None) -> int:
+        """Export if at least interval_seconds passed since the last export."""
+        if time.monotonic() - self._last_export < interval_seconds:
+            return 0
+        return self.export(database)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._window.clear()
+            self._window_start = datetime.now(timezone.utc)
+
+
+class Stopwatch:
+    """
+    Lap timer for linear pipelines.
+
+    Each lap() records the time since the previous lap (or creation)
+    as "<prefix>.<stage>", so stages can be timed by dropping a single
+    call after each step. Stages that are skipped by an early return
+    are simply not recorded.
+    """
+
+    __slots__ = ("prefix", "recorder", "_start", "_last")
+
+    def __init__(self, prefix: str, recorder: Optional[LatencyRecorder] = None):
+        self.prefix = prefix
+        self.recorder = recorder or latency
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> float:
+        """Record time since the previous lap; returns it in ms."""
+        now = time.perf_counter()
+        ms = (now - self._last) * 1000
+        self._last = now
+        self.recorder.record(f"{self.prefix}.{stage}", ms)
+        return ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+
+def timed(stage: str, recorder: Optional[LatencyRecorder] = None) -> Callable:
+    """Decorator recording each call's duration under stage."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                (recorder or latency).record(stage, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def merge_exported(rows: list) -> Dict[str, LatencyHistogram]:
+    """
+    Merge exported stage_latency rows into one histogram per stage.
+
+    Args:
+        rows: Rows from Database.get_stage_latency()
+
+    Returns:
+        {stage: LatencyHistogram}
+    """
+    merged: Dict[str, LatencyHistogram] = {}
+    for row in rows:
+        hist = LatencyHistogram.from_dict(row.get("histogram") or {})
+        stage = row["stage"]
+        if stage in merged:
+            merged[stage].merge(hist)
+        else:
+            merged[stage] = hist
+    return merged
+
+
+# Process-wide recorder
+latency = LatencyRecorder()
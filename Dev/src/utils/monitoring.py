@@ -2,17 +2,34 @@
 AI Trader - Error Monitoring and Alert System
 
 Provides centralized error tracking, health monitoring, and alerting.
+
+Errors and alerts are appended to an SQLite store (data/monitoring.db)
+indexed by time, so logging costs O(1) regardless of history size and
+queries only read the requested window. Identical errors within
+ERROR_DEDUP_SECONDS are folded into one record with an occurrence count,
+and each table is capped at MAX_STORED_RECORDS rows.
 """
 
 import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 from pathlib import Path
 
 from loguru import logger
 
+from src.utils.alert_aggregator import AggregationRule, AlertAggregator, Decision, fingerprint
+
+
+ERROR_DEDUP_SECONDS = 60      # Identical errors within this window share one record
+MAX_STORED_RECORDS = 20000    # Per table; oldest rows are rotated out
+PRUNE_EVERY = 500             # Appends between rotation checks
+
 
 class AlertLevel(Enum):
     """Alert severity levels."""
@@ -35,12 +52,14 @@ class ErrorCategory(Enum):
 
 @dataclass
 class ErrorRecord:
-    """Single error record."""
+    """Single error record (occurrences > 1 when duplicates were folded in)."""
     timestamp: str
     category: str
     message: str
     context: Dict[str, Any]
     resolved: bool = False
+    occurrences: int = 1
+    last_seen: Optional[str] = None
 
 
 @dataclass
@@ -51,6 +70,8 @@ class Alert:
     message: str
     source: str
     acknowledged: bool = False
+    occurrences: int = 1
+    last_seen: Optional[str] = None
 
 
 @dataclass
@@ -64,44 +85,235 @@ class HealthStatus:
     warnings: List[str]
 
 
+class MonitoringStore:
+    """
+    Append-only, time-indexed SQLite storage for errors and alerts.
+
+    Appends are a single INSERT (or an UPDATE by primary key for a folded
+    duplicate); reads use the timestamp index. Rows beyond
+    MAX_STORED_RECORDS per table are rotated out every PRUNE_EVERY appends.
+    """
+
+    _init_lock = threading.Lock()
+    _initialized: set = set()
+
+    def __init__(self, db_path: Path, max_records: int = MAX_STORED_RECORDS):
+        self.db_path = Path(db_path)
+        self.max_records = max_records
+        self._appends = 0
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        with self._init_lock:
+            if str(self.db_path) not in self._initialized or not self.db_path.exists():
+                self._init_tables()
+                self._initialized.add(str(self.db_path))
+
+    @contextmanager
+    def _connection(self):
+        # One long-lived connection per store: closing the last WAL
+        # connection checkpoints and deletes the WAL, which would cost more
+        # than the append itself under an error storm.
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+                self._conn.row_factory = sqlite3.Row
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _init_tables(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS errors (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    context TEXT,
+                    resolved INTEGER DEFAULT 0,
+                    occurrences INTEGER DEFAULT 1,
+                    last_seen TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_errors_timestamp ON errors(timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_errors_unresolved ON errors(resolved, timestamp)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    source TEXT,
+                    acknowledged INTEGER DEFAULT 0,
+                    occurrences INTEGER DEFAULT 1,
+                    last_seen TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts(timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_unacked ON alerts(acknowledged, timestamp)")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------- Writes ----------
+
+    def append(self, table: str, row: dict) -> int:
+        """Insert one record; returns its id."""
+        row = _encode_row(row)
+        columns = list(row)
+        with self._connection() as conn:
+            cursor = conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [row[c] for c in columns],
+            )
+            row_id = cursor.lastrowid
+            self._appends += 1
+            if self._appends % PRUNE_EVERY == 0:
+                conn.execute(f"DELETE FROM {table} WHERE id <= ?", (row_id - self.max_records,))
+        return row_id
+
+    def add_occurrences(self, table: str, row_id: int, count: int, last_seen: str) -> bool:
+        """Fold duplicates into an existing record; False if it no longer exists."""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                f"UPDATE {table} SET occurrences = occurrences + ?, last_seen = ? WHERE id = ?",
+                (count, last_seen, row_id),
+            )
+            return cursor.rowcount > 0
+
+    def append_many(self, table: str, rows: list[dict]) -> int:
+        if not rows:
+            return 0
+        rows = [_encode_row(r) for r in rows]
+        columns = list(rows[0])
+        with self._connection() as conn:
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [[r.get(c) for c in columns] for r in rows],
+            )
+        return len(rows)
+
+    def set_flag(self, table: str, flag: str, timestamp: Optional[str] = None) -> int:
+        """Set resolved/acknowledged for one timestamp, or for all unset rows."""
+        query = f"UPDATE {table} SET {flag} = 1 WHERE {flag} = 0"
+        args: tuple = ()
+        if timestamp is not None:
+            query += " AND timestamp = ?"
+            args = (timestamp,)
+        with self._connection() as conn:
+            return conn.execute(query, args).rowcount
+
+    def delete_before(self, table: str, cutoff: str) -> int:
+        with self._connection() as conn:
+            return conn.execute(f"DELETE FROM {table} WHERE timestamp < ?", (cutoff,)).rowcount
+
+    # ---------- Reads ----------
+
+    def select(self, table: str, since: Optional[str] = None, where: str = "",
+               args: tuple = (), limit: Optional[int] = None) -> list[dict]:
+        """Records in timestamp order (oldest first), optionally the newest `limit`."""
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if where:
+            clauses.append(where)
+            params.extend(args)
+        query = f"SELECT * FROM {table}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if limit is not None:
+            query = f"SELECT * FROM ({query} ORDER BY timestamp DESC, id DESC LIMIT ?)"
+            params.append(int(limit))
+        query += " ORDER BY timestamp, id"
+        with self._connection() as conn:
+            return [_decode_row(r) for r in conn.execute(query, params).fetchall()]
+
+    def count(self, table: str, since: Optional[str] = None, occurrences: bool = True) -> int:
+        """Number of events (or records) since a timestamp."""
+        expr = "COALESCE(SUM(occurrences), 0)" if occurrences else "COUNT(*)"
+        query = f"SELECT {expr} FROM {table}"
+        args: tuple = ()
+        if since is not None:
+            query += " WHERE timestamp >= ?"
+            args = (since,)
+        with self._connection() as conn:
+            return conn.execute(query, args).fetchone()[0]
+
+    def is_empty(self, table: str) -> bool:
+        with self._connection() as conn:
+            return conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+
+
+def _encode_row(row: dict) -> dict:
+    row = dict(row)
+    if isinstance(row.get("context"), dict):
+        row["context"] = json.dumps(row["context"], default=str)
+    return row
+
+
+def _decode_row(row: sqlite3.Row) -> dict:
+    data = dict(row)
+    if "context" in data:
+        data["context"] = json.loads(data["context"]) if data["context"] else {}
+    return data
+
+
+def _record(cls, row: dict):
+    names = {f.name for f in fields(cls)}
+    data = {k: v for k, v in row.items() if k in names}
+    for flag in ("resolved", "acknowledged"):
+        if flag in data:
+            data[flag] = bool(data[flag])
+    return cls(**data)
+
+
+def _migrate_json(store: MonitoringStore, table: str, json_file: Path) -> None:
+    """One-time import of a legacy errors.json/alerts.json into the store."""
+    if not json_file.exists():
+        return
+    try:
+        if store.is_empty(table):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                rows = json.load(f)
+            store.append_many(table, rows)
+            logger.info(f"Migrated {len(rows)} records from {json_file.name} to {store.db_path.name}")
+        json_file.rename(json_file.with_name(json_file.name + ".migrated"))
+    except Exception as e:
+        logger.error(f"Failed to migrate {json_file.name}: {e}")
+
+
 class ErrorTracker:
     """
     Tracks and manages application errors.
 
-    Stores errors in a JSON file for persistence and provides
-    methods for querying and analyzing error patterns.
+    Stores errors in the monitoring store (append-only, time-indexed) and
+    provides methods for querying and analyzing error patterns. Repeats
+    of the same error within ERROR_DEDUP_SECONDS are counted on the first
+    record instead of being stored and logged again.
     """
 
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None, dedup_seconds: float = ERROR_DEDUP_SECONDS):
         """Initialize error tracker."""
         if data_dir is None:
             data_dir = Path(__file__).parent.parent.parent / "data"
 
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.errors_file = self.data_dir / "errors.json"
-        self._load_errors()
-
-    def _load_errors(self) -> None:
-        """Load errors from file."""
-        if self.errors_file.exists():
-            try:
-                with open(self.errors_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.errors = [ErrorRecord(**e) for e in data]
-            except Exception as e:
-                logger.error(f"Failed to load errors file: {e}")
-                self.errors = []
-        else:
-            self.errors = []
-
-    def _save_errors(self) -> None:
-        """Save errors to file."""
-        try:
-            with open(self.errors_file, 'w', encoding='utf-8') as f:
-                json.dump([asdict(e) for e in self.errors], f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save errors file: {e}")
+        self.store = MonitoringStore(self.data_dir / "monitoring.db")
+        self.dedup_seconds = dedup_seconds
+        # (category, message) -> (row id, monotonic time of first occurrence)
+        self._recent: Dict[tuple, tuple] = {}
+        _migrate_json(self.store, "errors", self.data_dir / "errors.json")
 
     def log_error(
         self,
@@ -118,79 +330,99 @@ class ErrorTracker:
             category: Error category for grouping
 
         Returns:
-            The created ErrorRecord
+            The created ErrorRecord (or the record the duplicate was folded into)
         """
+        now = datetime.now().isoformat()
         record = ErrorRecord(
-            timestamp=datetime.now().isoformat(),
+            timestamp=now,
             category=category.value,
             message=str(error),
             context=context or {},
-            resolved=False
+            resolved=False,
+            last_seen=now,
         )
 
-        self.errors.append(record)
-        self._save_errors()
+        key = (record.category, record.message)
+        recent = self._recent.get(key)
+        mono = time.monotonic()
+        if recent and mono - recent[1] < self.dedup_seconds:
+            if self.store.add_occurrences("errors", recent[0], 1, now):
+                logger.debug(f"[{category.value}] {error} (repeated)")
+                return record
+
+        try:
+            row_id = self.store.append("errors", asdict(record))
+            if len(self._recent) > 1000:
+                self._recent = {k: v for k, v in self._recent.items() if mono - v[1] < self.dedup_seconds}
+            self._recent[key] = (row_id, mono)
+        except Exception as e:
+            logger.error(f"Failed to store error record: {e}")
 
         # Also log to standard logger
         logger.error(f"[{category.value}] {error}", extra=context or {})
 
         return record
 
-    def get_recent_errors(self, hours: int = 24) -> List[ErrorRecord]:
+    def get_recent_errors(self, hours: int = 24, limit: Optional[int] = None) -> List[ErrorRecord]:
         """
         Get errors from the last N hours.
 
         Args:
             hours: Number of hours to look back
+            limit: Only the newest N records
 
         Returns:
-            List of recent errors
+            List of recent errors (oldest first)
         """
-        cutoff = datetime.now() - timedelta(hours=hours)
-        cutoff_str = cutoff.isoformat()
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        return [_record(ErrorRecord, r) for r in self.store.select("errors", since=cutoff, limit=limit)]
 
-        return [
-            e for e in self.errors
-            if e.timestamp >= cutoff_str
-        ]
+    def count_recent_errors(self, hours: float = 1) -> int:
+        """Number of error occurrences (duplicates included) in the last N hours."""
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        return self.store.count("errors", since=cutoff)
 
     def get_error_summary(self) -> Dict[str, Any]:
         """
         Get error statistics summary.
 
+        Counts are occurrences, so folded duplicates still count.
+
         Returns:
             Dictionary with error counts by category and time period
         """
         now = datetime.now()
-
-        # Count by category
-        by_category = {}
-        for e in self.errors:
-            cat = e.category
-            by_category[cat] = by_category.get(cat, 0) + 1
-
-        # Count by time period
         last_hour = (now - timedelta(hours=1)).isoformat()
         last_24h = (now - timedelta(hours=24)).isoformat()
         last_7d = (now - timedelta(days=7)).isoformat()
 
+        with self.store._connection() as conn:
+            rows = conn.execute("""
+                SELECT category,
+                       SUM(occurrences) AS total,
+                       SUM(CASE WHEN resolved = 0 THEN occurrences ELSE 0 END) AS unresolved,
+                       SUM(CASE WHEN timestamp >= ? THEN occurrences ELSE 0 END) AS last_hour,
+                       SUM(CASE WHEN timestamp >= ? THEN occurrences ELSE 0 END) AS last_24h,
+                       SUM(CASE WHEN timestamp >= ? THEN occurrences ELSE 0 END) AS last_7d
+                FROM errors GROUP BY category
+            """, (last_hour, last_24h, last_7d)).fetchall()
+
         return {
-            "total": len(self.errors),
-            "unresolved": len([e for e in self.errors if not e.resolved]),
-            "by_category": by_category,
-            "last_hour": len([e for e in self.errors if e.timestamp >= last_hour]),
-            "last_24h": len([e for e in self.errors if e.timestamp >= last_24h]),
-            "last_7d": len([e for e in self.errors if e.timestamp >= last_7d]),
+            "total": sum(r["total"] for r in rows),
+            "unresolved": sum(r["unresolved"] for r in rows),
+            "by_category": {r["category"]: r["total"] for r in rows},
+            "last_hour": sum(r["last_hour"] for r in rows),
+            "last_24h": sum(r["last_24h"] for r in rows),
+            "last_7d": sum(r["last_7d"] for r in rows),
         }
 
     def resolve_error(self, timestamp: str) -> bool:
         """Mark an error as resolved."""
-        for e in self.errors:
-            if e.timestamp == timestamp:
-                e.resolved = True
-                self._save_errors()
-                return True
-        return False
+        return self.store.set_flag("errors", "resolved", timestamp) > 0
+
+    def resolve_all(self) -> int:
+        """Mark every unresolved error as resolved."""
+        return self.store.set_flag("errors", "resolved")
 
     def clear_old_errors(self, days: int = 30) -> int:
         """
@@ -203,10 +435,8 @@ class ErrorTracker:
             Number of errors removed
         """
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        original_count = len(self.errors)
-        self.errors = [e for e in self.errors if e.timestamp >= cutoff]
-        self._save_errors()
-        return original_count - len(self.errors)
+        self._recent.clear()
+        return self.store.delete_before("errors", cutoff)
 
     def check_health(self) -> HealthStatus:
         """
@@ -246,11 +476,11 @@ class ErrorTracker:
             issues.append(f"Database error: {e}")
 
         # Check recent error rate
-        recent = self.get_recent_errors(hours=1)
-        if len(recent) > 10:
-            warnings.append(f"High error rate: {len(recent)} errors in last hour")
-        elif len(recent) > 5:
-            warnings.append(f"Elevated error rate: {len(recent)} errors in last hour")
+        recent = self.count_recent_errors(hours=1)
+        if recent > 10:
+            warnings.append(f"High error rate: {recent} errors in last hour")
+        elif recent > 5:
+            warnings.append(f"Elevated error rate: {recent} errors in last hour")
 
         # Check for repeated errors
         summary = self.get_error_summary()
@@ -270,12 +500,33 @@ class ErrorTracker:
         )
 
 
+# Per-level aggregation policy for AlertManager.send_alert(): a persisting
+# problem is stored/logged once per suppress window, frequent warnings and
+# errors escalate one level, suppressed repeats are folded into the stored
+# alert's occurrence count at each digest.
+ALERT_RULES = {
+    "critical": AggregationRule(suppress_seconds=300, resolve_seconds=900),
+    "error": AggregationRule(suppress_seconds=900, window_seconds=900, escalate_count=30),
+    "warning": AggregationRule(suppress_seconds=900, window_seconds=900, escalate_count=30),
+    "info": AggregationRule(suppress_seconds=1800),
+}
+ALERT_DIGEST_SECONDS = 300
+_ESCALATION = {
+    AlertLevel.INFO: AlertLevel.WARNING,
+    AlertLevel.WARNING: AlertLevel.ERROR,
+    AlertLevel.ERROR: AlertLevel.CRITICAL,
+    AlertLevel.CRITICAL: AlertLevel.CRITICAL,
+}
+
+
 class AlertManager:
     """
     Manages system alerts and notifications.
 
-    Currently logs alerts to file. Can be extended to support
-    email, SMS, or push notifications.
+    Currently logs alerts to the monitoring store. Can be extended to support
+    email, SMS, or push notifications. Alerts pass through an
+    AlertAggregator, so the number of stored alerts follows the number of
+    distinct problems rather than how often they are re-detected.
     """
 
     def __init__(self, data_dir: Optional[Path] = None):
@@ -285,49 +536,44 @@ class AlertManager:
 
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.alerts_file = self.data_dir / "alerts.json"
-        self._load_alerts()
-
-    def _load_alerts(self) -> None:
-        """Load alerts from file."""
-        if self.alerts_file.exists():
-            try:
-                with open(self.alerts_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.alerts = [Alert(**a) for a in data]
-            except Exception as e:
-                logger.error(f"Failed to load alerts file: {e}")
-                self.alerts = []
-        else:
-            self.alerts = []
-
-    def _save_alerts(self) -> None:
-        """Save alerts to file."""
-        try:
-            with open(self.alerts_file, 'w', encoding='utf-8') as f:
-                json.dump([asdict(a) for a in self.alerts], f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save alerts file: {e}")
+        self.store = MonitoringStore(self.data_dir / "monitoring.db")
+        self._error_tracker: Optional[ErrorTracker] = None
+        self.aggregator = AlertAggregator(rules=ALERT_RULES, digest_interval=ALERT_DIGEST_SECONDS)
+        _migrate_json(self.store, "alerts", self.data_dir / "alerts.json")
 
     def send_alert(
         self,
         level: AlertLevel,
         message: str,
-        source: str = "system"
-    ) -> Alert:
+        source: str = "system",
+        key: Optional[str] = None
+    ) -> Optional[Alert]:
         """
         Send an alert.
 
-        Currently logs to file. Future: email, SMS, push.
+        Currently logs to the monitoring store. Future: email, SMS, push.
 
         Args:
             level: Alert severity level
             message: Alert message
             source: Source of the alert
+            key: Problem identity for aggregation (defaults to source + message
+                with numbers normalized)
 
         Returns:
-            The created Alert
+            The created Alert, or None if it repeated an active alert
         """
+        fp = fingerprint(source, key or message)
+        decision = self.aggregator.observe(fp, level.value, message)
+        if decision is Decision.SUPPRESS:
+            self.flush_digest()
+            return None
+        if decision is Decision.ESCALATE:
+            window_min = self.aggregator.rule_for(level.value).window_seconds / 60
+            count = self.aggregator.window_count(fp)
+            level = _ESCALATION[level]
+            message = f"{message} (repeated {count}x in {window_min:.0f} min)"
+
         alert = Alert(
             timestamp=datetime.now().isoformat(),
             level=level.value,
@@ -335,9 +581,12 @@ class AlertManager:
             source=source,
             acknowledged=False
         )
+        alert.last_seen = alert.timestamp
 
-        self.alerts.append(alert)
-        self._save_alerts()
+        try:
+            self.aggregator.attach(fp, self.store.append("alerts", asdict(alert)))
+        except Exception as e:
+            logger.error(f"Failed to store alert: {e}")
 
         # Log based on level
         if level == AlertLevel.CRITICAL:
@@ -349,8 +598,33 @@ class AlertManager:
         else:
             logger.info(f"[ALERT] {message}")
 
+        self.flush_digest()
         return alert
 
+    def flush_digest(self, force: bool = False) -> int:
+        """
+        Fold suppressed repeats into their stored alerts (one write per problem).
+
+        Runs at most every ALERT_DIGEST_SECONDS unless forced.
+
+        Returns:
+            Number of suppressed occurrences recorded
+        """
+        entries = self.aggregator.digest(force=force)
+        total = 0
+        for entry in entries:
+            if entry.ref is None:
+                continue
+            last_seen = datetime.fromtimestamp(entry.last_seen).isoformat()
+            try:
+                self.store.add_occurrences("alerts", entry.ref, entry.suppressed, last_seen)
+                total += entry.suppressed
+            except Exception as e:
+                logger.error(f"Failed to record alert repeats: {e}")
+        if total:
+            logger.info(f"[ALERT] Digest: {total} repeat(s) of {len(entries)} active alert(s) suppressed")
+        return total
+
     def check_critical_conditions(
         self,
         account: Optional[Dict[str, Any]] = None,
@@ -366,7 +640,7 @@ class AlertManager:
             config: Trading configuration
 
         Returns:
-            List of alerts generated
+            List of alerts generated (repeats of active alerts are not included)
         """
         alerts = []
 
@@ -380,14 +654,16 @@ class AlertManager:
                     "MT5 disconnected - cannot execute trades",
                     "mt5_monitor"
                 )
-                alerts.append(alert)
+                if alert:
+                    alerts.append(alert)
         except Exception as e:
             alert = self.send_alert(
                 AlertLevel.ERROR,
                 f"Cannot check MT5 status: {e}",
                 "mt5_monitor"
             )
-            alerts.append(alert)
+            if alert:
+                alerts.append(alert)
 
         # Check account conditions
         if account:
@@ -405,14 +681,16 @@ class AlertManager:
                             f"Daily loss limit exceeded: {current_drawdown:.1%} > {daily_limit:.1%}",
                             "risk_monitor"
                         )
-                        alerts.append(alert)
+                        if alert:
+                            alerts.append(alert)
                     elif current_drawdown > daily_limit * 0.8:
                         alert = self.send_alert(
                             AlertLevel.WARNING,
                             f"Approaching daily loss limit: {current_drawdown:.1%}",
                             "risk_monitor"
                         )
-                        alerts.append(alert)
+                        if alert:
+                            alerts.append(alert)
 
             # Margin level check
             margin_level = account.get('margin_level', 0)
@@ -423,14 +701,16 @@ class AlertManager:
                         f"Margin call warning! Level: {margin_level:.0f}%",
                         "risk_monitor"
                     )
-                    alerts.append(alert)
+                    if alert:
+                        alerts.append(alert)
                 elif margin_level < 150:
                     alert = self.send_alert(
                         AlertLevel.WARNING,
                         f"Low margin level: {margin_level:.0f}%",
                         "risk_monitor"
                     )
-                    alerts.append(alert)
+                    if alert:
+                        alerts.append(alert)
 
         # Check for positions in significant loss
         if positions:
@@ -442,75 +722,83 @@ class AlertManager:
                         f"Position {pos.get('instrument', 'Unknown')} in significant loss: {pnl:.2f}",
                         "position_monitor"
                     )
-                    alerts.append(alert)
+                    if alert:
+                        alerts.append(alert)
 
         # Check error rate
-        tracker = ErrorTracker(self.data_dir)
-        recent_errors = tracker.get_recent_errors(hours=1)
-        if len(recent_errors) > 10:
+        if self._error_tracker is None:
+            self._error_tracker = ErrorTracker(self.data_dir)
+        recent_errors = self._error_tracker.count_recent_errors(hours=1)
+        if recent_errors > 10:
             alert = self.send_alert(
                 AlertLevel.ERROR,
-                f"High error rate: {len(recent_errors)} errors in last hour",
+                f"High error rate: {recent_errors} errors in last hour",
                 "error_monitor"
             )
-            alerts.append(alert)
+            if alert:
+                alerts.append(alert)
 
         return alerts
 
-    def get_recent_alerts(self, hours: int = 24) -> List[Alert]:
-        """Get alerts from the last N hours."""
+    def get_recent_alerts(self, hours: int = 24, limit: Optional[int] = None) -> List[Alert]:
+        """Get alerts from the last N hours (oldest first)."""
         cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-        return [a for a in self.alerts if a.timestamp >= cutoff]
+        return [_record(Alert, r) for r in self.store.select("alerts", since=cutoff, limit=limit)]
 
-    def get_unacknowledged(self) -> List[Alert]:
-        """Get all unacknowledged alerts."""
-        return [a for a in self.alerts if not a.acknowledged]
+    def get_unacknowledged(self, limit: Optional[int] = None) -> List[Alert]:
+        """Get unacknowledged alerts (oldest first)."""
+        rows = self.store.select("alerts", where="acknowledged = 0", limit=limit)
+        return [_record(Alert, r) for r in rows]
 
     def acknowledge_alert(self, timestamp: str) -> bool:
         """Mark an alert as acknowledged."""
-        for a in self.alerts:
-            if a.timestamp == timestamp:
-                a.acknowledged = True
-                self._save_alerts()
-                return True
-        return False
+        return self.store.set_flag("alerts", "acknowledged", timestamp) > 0
 
     def acknowledge_all(self) -> int:
         """Acknowledge all unacknowledged alerts."""
-        count = 0
-        for a in self.alerts:
-            if not a.acknowledged:
-                a.acknowledged = True
-                count += 1
-        self._save_alerts()
-        return count
+        return self.store.set_flag("alerts", "acknowledged")
 
     def clear_old_alerts(self, days: int = 7) -> int:
         """Remove alerts older than N days."""
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        original_count = len(self.alerts)
-        self.alerts = [a for a in self.alerts if a.timestamp >= cutoff]
-        self._save_alerts()
-        return original_count - len(self.alerts)
+        return self.store.delete_before("alerts", cutoff)
 
 
 # Convenience functions for quick access
+# (shared instances so duplicate errors are folded across calls)
+_default_tracker: Optional[ErrorTracker] = None
+_default_manager: Optional[AlertManager] = None
+
+
+def get_error_tracker() -> ErrorTracker:
+    """Process-wide ErrorTracker for the default data directory."""
+    global _default_tracker
+    if _default_tracker is None:
+        _default_tracker = ErrorTracker()
+    return _default_tracker
+
+
+def get_alert_manager() -> AlertManager:
+    """Process-wide AlertManager for the default data directory."""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = AlertManager()
+    return _default_manager
+
+
 def log_error(error: Exception, context: Optional[Dict] = None, category: str = "unknown") -> None:
     """Quick function to log an error."""
-    tracker = ErrorTracker()
     cat = ErrorCategory(category) if category in [e.value for e in ErrorCategory] else ErrorCategory.UNKNOWN
-    tracker.log_error(error, context, cat)
+    get_error_tracker().log_error(error, context, cat)
 
 
-def send_alert(level: str, message: str, source: str = "system") -> None:
+def send_alert(level: str, message: str, source: str = "system", key: Optional[str] = None) -> None:
     """Quick function to send an alert."""
-    manager = AlertManager()
     lvl = AlertLevel(level) if level in [l.value for l in AlertLevel] else AlertLevel.INFO
-    manager.send_alert(lvl, message, source)
+    get_alert_manager().send_alert(lvl, message, source, key=key)
 
 
 def check_system_health() -> Dict[str, Any]:
     """Quick function to check system health."""
-    tracker = ErrorTracker()
-    health = tracker.check_health()
+    health = get_error_tracker().check_health()
     return asdict(health)
@@ -11,27 +11,85 @@ Usage:
     result = sync_mt5_history(days=30)
     print(f"Imported {result['imported']} trades")
 
+    # Poll only deals newer than the stored high-water mark
+    result = sync_mt5_history(incremental=True)
+
     # From CLI
     python -m src.utils.mt5_sync --days 30
 """
 
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 
 from src.trading.mt5_client import MT5Client, MT5Error
-from src.utils.database import db
+from src.utils.database import Database, db
 from src.utils.logger import logger
 
 
-def _run_post_trade_analysis(trade: dict) -> dict:
-    """Run post-trade analysis, feed learning engine, and optimize settings."""
+BOOTSTRAP_BATCH_SIZE = 500
+
+# Incremental history cursor (latest MT5 deal time already synced)
+HISTORY_CURSOR_KEY = "mt5_history_hwm"
+# Re-read this much before the cursor so late-visible deals aren't missed
+HISTORY_CURSOR_OVERLAP = timedelta(days=1)
+
+
+def fetch_history_incremental(
+    client: MT5Client,
+    database: Optional[Database] = None,
+    cursor_key: str = HISTORY_CURSOR_KEY,
+    initial_days: int = 30,
+    overlap: timedelta = HISTORY_CURSOR_OVERLAP,
+) -> list[dict]:
+    """
+    Fetch closed trades newer than the stored deal-time cursor.
+
+    The first call reads initial_days of history; later calls only read from
+    the cursor minus the overlap, then advance the cursor to the latest deal
+    MT5 returned. Re-read trades are harmless: sync_from_mt5 skips them.
+
+    Args:
+        client: Connected MT5Client
+        database: Database holding the cursor (default: shared db)
+        cursor_key: sync_state key of the cursor
+        initial_days: Window to read when no cursor is stored
+        overlap: How far before the cursor to start reading
+
+    Returns:
+        Closed trade dicts (see MT5Client.get_history)
+    """
+    database = database or db
+    stored = database.get_sync_state(cursor_key)
+    since = None
+    if stored:
+        try:
+            since = datetime.fromisoformat(stored) - overlap
+        except ValueError:
+            logger.warning(f"Ignoring invalid MT5 history cursor {cursor_key}={stored!r}")
+    if since is None:
+        since = datetime.now(timezone.utc) - timedelta(days=initial_days)
+
+    trades, last_deal_time = client.get_history_since(since)
+    if last_deal_time is not None and (not stored or last_deal_time.isoformat() > stored):
+        database.set_sync_state(cursor_key, last_deal_time.isoformat())
+    return trades
+
+
+def _run_post_trade_analysis(trade: dict, analysis=None) -> dict:
+    """
+    Run post-trade analysis, feed learning engine, and optimize settings.
+
+    Args:
+        trade: Closed trade dict
+        analysis: Precomputed PostTradeAnalysis (from analyze_trades); analyzed here if None
+    """
     try:
         from src.analysis.post_trade_analyzer import PostTradeAnalyzer
         from src.analysis.learning_engine import learning_engine
         from src.analysis.adaptive_settings import adaptive_settings
 
-        analyzer = PostTradeAnalyzer()
-        analysis = analyzer.analyze_trade(trade)
+        if analysis is None:
+            analysis = PostTradeAnalyzer().analyze_trade(trade)
 
         # Feed to learning engine
         result = learning_engine.learn_from_trade(trade, analysis)
@@ -61,11 +119,24 @@ def _run_post_trade_analysis(trade: dict) -> dict:
         return {"success": False, "error": str(e)}
 
 
+def _analyze_batch(trades: List[dict]) -> list:
+    """(trade, analysis) pairs with shared candle fetches; analysis None on failure."""
+    if not trades:
+        return []
+    try:
+        from src.analysis.post_trade_analyzer import PostTradeAnalyzer
+        return PostTradeAnalyzer().analyze_trades(trades)
+    except Exception as e:
+        logger.warning(f"Batch post-trade analysis failed: {e}")
+        return [(trade, None) for trade in trades]
+
+
 def sync_mt5_history(
     days: int = 30,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
-    client: Optional[MT5Client] = None
+    client: Optional[MT5Client] = None,
+    incremental: bool = False,
 ) -> dict:
     """
     Sync MT5 trade history to database.
@@ -78,6 +149,8 @@ def sync_mt5_history(
         from_date: Start date (overrides days)
         to_date: End date (defaults to now)
         client: Optional MT5Client instance (creates new if not provided)
+        incremental: Only fetch deals newer than the stored cursor
+            (see fetch_history_incremental); days/from_date/to_date are ignored
 
     Returns:
         Dict with sync results:
@@ -116,8 +189,11 @@ def sync_mt5_history(
         result["mt5_balance"] = account.get("balance")
 
         # Fetch history from MT5
-        logger.info(f"Fetching MT5 history for last {days} days...")
-        mt5_trades = client.get_history(days=days, from_date=from_date, to_date=to_date)
+        if incremental:
+            mt5_trades = fetch_history_incremental(client)
+        else:
+            logger.info(f"Fetching MT5 history for last {days} days...")
+            mt5_trades = client.get_history(days=days, from_date=from_date, to_date=to_date)
 
         if not mt5_trades:
             result["success"] = True
@@ -136,11 +212,14 @@ def sync_mt5_history(
         analyzed_count = 0
         if sync_result["imported"] > 0:
             logger.info(f"Running post-trade analysis on {sync_result['imported']} new trades...")
-            for trade in mt5_trades:
-                if trade.get("trade_id") in sync_result.get("trades_imported", []):
-                    analysis_result = _run_post_trade_analysis(trade)
-                    if analysis_result.get("success"):
-                        analyzed_count += 1
+            imported_ids = set(sync_result.get("trades_imported", []))
+            imported = [t for t in mt5_trades if t.get("trade_id") in imported_ids]
+            for trade, analysis in _analyze_batch(imported):
+                if analysis is None:
+                    continue
+                analysis_result = _run_post_trade_analysis(trade, analysis)
+                if analysis_result.get("success"):
+                    analyzed_count += 1
 
         result["analyzed"] = analyzed_count
 
@@ -307,38 +386,41 @@ def bootstrap_learning(days: int = 30) -> dict:
             cursor.execute("SELECT trade_id FROM trade_analyses")
             analyzed_ids = {row[0] for row in cursor.fetchall()}
 
-        analyzer = PostTradeAnalyzer()
-
-        for trade in trades:
+        # Oldest first so the learning index sees trades in close order
+        pending = []
+        for trade in reversed(trades):
             trade_id = trade.get("trade_id")
 
             if trade_id in analyzed_ids:
                 result["already_analyzed"] += 1
                 continue
 
-            try:
-                # Run analysis
-                analysis = analyzer.analyze_trade({
-                    "trade_id": trade_id,
-                    "instrument": trade.get("instrument"),
-                    "direction": trade.get("direction"),
-                    "entry_price": trade.get("entry_price"),
-                    "exit_price": trade.get("exit_price"),
-                    "opened_at": trade.get("timestamp"),
-                    "closed_at": trade.get("closed_at") or trade.get("timestamp"),
-                    "pnl": trade.get("pnl")
-                })
-
-                # Feed to learning engine
-                learn_result = learning_engine.learn_from_trade(trade, analysis)
-                result["trades_analyzed"] += 1
-                result["patterns_total"] += learn_result.get("patterns_updated", 0)
-
-                logger.info(f"Bootstrapped learning for {trade_id}: {analysis.outcome.value}")
-
-            except Exception as e:
-                logger.warning(f"Failed to analyze {trade_id}: {e}")
+            pending.append({
+                "trade_id": trade_id,
+                "instrument": trade.get("instrument"),
+                "direction": trade.get("direction"),
+                "entry_price": trade.get("entry_price"),
+                "exit_price": trade.get("exit_price"),
+                "opened_at": trade.get("timestamp"),
+                "closed_at": trade.get("closed_at") or trade.get("timestamp"),
+                "pnl": trade.get("pnl")
+            })
+
+        # One candle fetch per instrument/timeframe; analysis in a process pool
+        analyses = []
+        for trade, analysis in PostTradeAnalyzer().analyze_trades(pending):
+            if analysis is None:
                 result["errors"] += 1
+                continue
+            analyses.append(analysis)
+            logger.debug(f"Analyzed {trade['trade_id']} for bootstrap: {analysis.outcome.value}")
+
+        # Feed to learning engine in batches (one transaction each)
+        for start in range(0, len(analyses), BOOTSTRAP_BATCH_SIZE):
+            batch = analyses[start:start + BOOTSTRAP_BATCH_SIZE]
+            learn_result = learning_engine.learn_from_trades(batch)
+            result["trades_analyzed"] += learn_result["analyses_saved"]
+            result["patterns_total"] += learn_result["patterns_updated"]
 
         result["success"] = True
         result["message"] = (
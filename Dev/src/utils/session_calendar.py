@@ -0,0 +1,200 @@
+"""
+Session Calendar - Precomputed session and killzone lookups.
+
+Session/killzone gates used to parse session strings and ISO timestamps
+on every scan and every backtest bar. A SessionCalendar turns an
+instrument's windows into minute-of-week tables once, so a gate is a
+single index:
+
+    calendar = SessionCalendar.for_profile(profile)
+    calendar.in_session(minute_of_week(now))
+
+    minutes = bar_minutes(m5_candles)          # once per backtest
+    allowed = calendar.gate(minutes)           # per-bar bool list
+
+Timestamps are read by slicing the ISO string (the wall-clock fields, as
+datetime.fromisoformat(...).hour/.weekday() did) with the weekday cached
+per date, falling back to fromisoformat for other formats.
+
+All windows are UTC hours, end-exclusive; "21-06" wraps past midnight.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
+
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+WEEKEND_START = 5 * MINUTES_PER_DAY  # Saturday 00:00
+
+# High-probability windows shared by the live scanner and the backtest engine
+KILLZONES = {
+    "LONDON_OPEN": (7, 9),
+    "NY_OPEN": (12, 14),
+    "LONDON_CLOSE": (15, 17),
+}
+KILLZONE_NAMES = ("",) + tuple(KILLZONES)
+
+# Session ranges tracked by detect_session_levels()
+SESSION_RANGES = {
+    "asian": (0, 8),
+    "london": (7, 16),
+    "ny": (12, 21),
+}
+
+
+# ===================
+# Time Helpers
+# ===================
+
+@lru_cache(maxsize=16384)
+def _weekday(date_text: str) -> int:
+    return datetime.strptime(date_text, "%Y-%m-%d").weekday()
+
+
+def minute_of_week(dt: datetime) -> int:
+    """Monday 00:00 = 0 (wall-clock fields of dt)."""
+    return dt.weekday() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+
+
+def minute_of_week_from_iso(time_str: str) -> Optional[int]:
+    """
+    Minute of week of an ISO timestamp, or None if it can't be parsed.
+
+    Equivalent to minute_of_week(datetime.fromisoformat(time_str)) without
+    building a datetime per call.
+    """
+    try:
+        if len(time_str) >= 16 and time_str[4] == "-" and time_str[10] in "T " and time_str[13] == ":":
+            return _weekday(time_str[:10]) * MINUTES_PER_DAY + int(time_str[11:13]) * 60 + int(time_str[14:16])
+        return minute_of_week(datetime.fromisoformat(time_str.replace("Z", "+00:00")))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def hour_from_iso(time_str: str) -> Optional[int]:
+    """Hour field of an ISO timestamp, or None if it can't be parsed."""
+    minute = minute_of_week_from_iso(time_str)
+    return None if minute is None else (minute % MINUTES_PER_DAY) // 60
+
+
+def bar_minutes(candles: Sequence[dict]) -> list:
+    """Minute of week for each candle's 'time' (None where unparseable)."""
+    return [minute_of_week_from_iso(c.get("time", "")) for c in candles]
+
+
+def parse_windows(sessions: Iterable) -> list[tuple[int, int]]:
+    """'HH-HH' strings or (start, end) pairs -> hour windows; bad entries are skipped."""
+    windows = []
+    for s in sessions or []:
+        try:
+            if isinstance(s, str):
+                start, end = s.split("-")
+            else:
+                start, end = s
+            windows.append((int(start), int(end)))
+        except Exception:
+            continue
+    return windows
+
+
+def _hour_mask(windows: Sequence[tuple[int, int]]) -> list[bool]:
+    hours = [False] * 24
+    for start, end in windows:
+        for hour in range(24):
+            if start <= end:
+                if start <= hour < end:
+                    hours[hour] = True
+            elif hour >= start or hour < end:
+                hours[hour] = True
+    return hours
+
+
+# Hour -> killzone index / session names (shared tables)
+_KILLZONE_BY_HOUR = bytes(
+    next((i for i, (s, e) in enumerate(KILLZONES.values(), start=1) if s <= hour < e), 0)
+    for hour in range(24)
+)
+SESSIONS_BY_HOUR = tuple(
+    tuple(name for name, (s, e) in SESSION_RANGES.items() if s <= hour < e)
+    for hour in range(24)
+)
+
+
+def killzone_at(minute: Optional[int]) -> str:
+    """Killzone name at a minute of week ('' outside killzones)."""
+    if minute is None:
+        return ""
+    return KILLZONE_NAMES[_KILLZONE_BY_HOUR[(minute % MINUTES_PER_DAY) // 60]]
+
+
+# ===================
+# Calendar
+# ===================
+
+class SessionCalendar:
+    """Minute-of-week session bitmap plus killzone filter for one instrument."""
+
+    def __init__(
+        self,
+        windows: Sequence[tuple[int, int]] = (),
+        allow_weekends: bool = False,
+        killzones: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            windows: Allowed UTC hour windows (empty = every hour)
+            allow_weekends: Allow Saturday/Sunday
+            killzones: Killzones this instrument trades (empty = all)
+        """
+        self.windows = tuple(windows)
+        self.allow_weekends = allow_weekends
+        self.killzones = tuple(killzones or ())
+
+        hours = _hour_mask(self.windows) if self.windows else [True] * 24
+        day = b"".join((b"\x01" if allowed else b"\x00") * 60 for allowed in hours)
+        weekend = day if allow_weekends else bytes(MINUTES_PER_DAY)
+        self.session_mask = day * 5 + weekend * 2
+
+    @classmethod
+    def for_profile(cls, profile: dict) -> "SessionCalendar":
+        """Calendar for an instrument profile (cached per distinct settings)."""
+        return _calendar_for(
+            tuple(profile.get("sessions", []) or ()),
+            bool(profile.get("allow_weekends", False)),
+            tuple(profile.get("killzones", []) or ()),
+        )
+
+    def in_session(self, minute: int) -> bool:
+        return bool(self.session_mask[minute])
+
+    def gate(self, minutes: Sequence[Optional[int]], unparsed: bool = True) -> list[bool]:
+        """Per-bar session flags (unparsed timestamps get `unparsed`)."""
+        mask = self.session_mask
+        return [unparsed if m is None else bool(mask[m]) for m in minutes]
+
+    def in_killzone(self, minute: Optional[int]) -> tuple[bool, str]:
+        """(allowed, killzone name), honoring the instrument's killzone list."""
+        name = killzone_at(minute)
+        if not name:
+            return False, ""
+        if not self.killzones:
+            return True, name
+        return name in self.killzones, name
+
+
+@lru_cache(maxsize=256)
+def _calendar_for(sessions: tuple, allow_weekends: bool, killzones: tuple) -> SessionCalendar:
+    windows = parse_windows(sessions)
+    if not sessions:
+        # No session restriction at all (weekends included)
+        return SessionCalendar((), True, killzones)
+    if not windows:
+        # Only unparseable entries: nothing is allowed
+        calendar = SessionCalendar((), allow_weekends, killzones)
+        calendar.session_mask = bytes(MINUTES_PER_WEEK)
+        return calendar
+    return SessionCalendar(windows, allow_weekends, killzones)
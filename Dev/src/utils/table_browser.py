@@ -0,0 +1,417 @@
+"""
+Table Browser - bounded-memory access to arbitrary SQLite tables.
+
+Backs the Database page. Everything runs server-side in SQLite:
+- Keyset pagination on (sort column, rowid) - page N costs the same as
+  page 1, unlike LIMIT/OFFSET which scans and discards all earlier rows
+- Sorting and filtering restricted to indexed columns (the page offers
+  only those), so every page is an index range scan
+- Column projection - only selected columns leave the database
+- Chunked CSV/Parquet export straight to disk via a streaming cursor
+
+Usage:
+    from src.utils.table_browser import TableBrowser, ColumnFilter
+
+    browser = TableBrowser(DB_PATH)
+    page = browser.fetch_page("activity_log", sort_column="timestamp",
+                              filters=[ColumnFilter("instrument", "=", "EUR_USD")])
+    next_page = browser.fetch_page("activity_log", sort_column="timestamp",
+                                   after=page.next_cursor)
+"""
+
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import pandas as pd
+
+from src.utils.logger import logger
+
+
+ROWID = "rowid"
+ROWID_ALIAS = "__rowid__"  # Cursor key column, dropped before display
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_CHUNK_ROWS = 5000
+
+# Operator -> number of bound values
+FILTER_OPERATORS = {
+    "=": 1,
+    "!=": 1,
+    ">": 1,
+    ">=": 1,
+    "<": 1,
+    "<=": 1,
+    "LIKE": 1,
+    "IS NULL": 0,
+    "IS NOT NULL": 0,
+}
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a SQLite identifier (table/column name)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+@dataclass(frozen=True)
+class ColumnFilter:
+    """Server-side WHERE clause term."""
+    column: str
+    operator: str
+    value: Any = None
+
+    def to_sql(self) -> tuple[str, list]:
+        if self.operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {self.operator}")
+        sql = f"{quote_identifier(self.column)} {self.operator}"
+        if FILTER_OPERATORS[self.operator] == 0:
+            return sql, []
+        return sql + " ?", [self.value]
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Position after the last row of a page: (sort value, rowid)."""
+    sort_value: Any
+    rowid: int
+
+
+@dataclass
+class Page:
+    """One page of rows plus the cursor to fetch the next one."""
+    rows: pd.DataFrame
+    next_cursor: Optional[PageCursor]
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+class TableBrowser:
+    """Read-only paginated browser over one SQLite database file."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Read-only so a browsing session can never write or lock for writes
+        uri = self.db_path.resolve().as_uri() + "?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
+    def get_write_marker(self) -> tuple:
+        """Stat-based change marker (same scheme as Database.get_last_write_marker)."""
+        marker = []
+        for suffix in ("", "-wal", "-journal"):
+            try:
+                stat = Path(str(self.db_path) + suffix).stat()
+                marker.append((suffix, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+        return tuple(marker)
+
+    # ===================
+    # Schema
+    # ===================
+
+    def get_tables(self) -> list[str]:
+        """Names of all user tables."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def get_columns(self, table: str) -> list[dict]:
+        """Column info (name, type, notnull, default, pk) for a table."""
+        self._check_table(table)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+        return [
+            {"name": r[1], "type": r[2], "notnull": bool(r[3]), "default": r[4], "pk": r[5]}
+            for r in rows
+        ]
+
+    def get_indexed_columns(self, table: str) -> list[str]:
+        """
+        Columns that can drive an index range scan.
+
+        The rowid alias (INTEGER PRIMARY KEY) plus the leading column of
+        every index on the table.
+        """
+        columns = self.get_columns(table)
+        indexed = []
+
+        pk_cols = [c for c in columns if c["pk"]]
+        if len(pk_cols) == 1 and pk_cols[0]["type"].upper() == "INTEGER":
+            indexed.append(pk_cols[0]["name"])
+
+        with closing(self._connect()) as conn:
+            indexes = conn.execute(f"PRAGMA index_list({quote_identifier(table)})").fetchall()
+            for index in indexes:
+                info = conn.execute(f"PRAGMA index_info({quote_identifier(index[1])})").fetchall()
+                leading = [r[2] for r in info if r[0] == 0 and r[2]]
+                for name in leading:
+                    if name not in indexed:
+                        indexed.append(name)
+        return indexed
+
+    def _check_table(self, table: str) -> None:
+        if table not in self.get_tables():
+            raise ValueError(f"Unknown table: {table}")
+
+    def _check_columns(self, table: str, names: list[str]) -> None:
+        known = {c["name"] for c in self.get_columns(table)}
+        unknown = [n for n in names if n not in known and n != ROWID]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+
+    # ===================
+    # Query building
+    # ===================
+
+    def _build_select(
+        self,
+        table: str,
+        columns: Optional[list[str]],
+        sort_column: Optional[str],
+        descending: bool,
+        filters: Optional[list[ColumnFilter]],
+        after: Optional[PageCursor] = None,
+    ) -> tuple[str, list]:
+        sort_column = sort_column or ROWID
+        filters = filters or []
+        names = list(columns or []) + [sort_column] + [f.column for f in filters]
+        self._check_table(table)
+        self._check_columns(table, names)
+
+        if columns:
+            projection = ", ".join(quote_identifier(c) for c in columns)
+        else:
+            projection = "*"
+        select = f"{ROWID} AS {ROWID_ALIAS}, {projection}"
+        if sort_column != ROWID:
+            select += f", {quote_identifier(sort_column)} AS __sort__"
+
+        where, params = [], []
+        for f in filters:
+            sql, values = f.to_sql()
+            where.append(sql)
+            params.extend(values)
+
+        if after is not None:
+            sql, values = self._keyset_predicate(sort_column, descending, after)
+            where.append(sql)
+            params.extend(values)
+
+        direction = "DESC" if descending else "ASC"
+        query = f"SELECT {select} FROM {quote_identifier(table)}"
+        if where:
+            query += " WHERE " + " AND ".join(f"({w})" for w in where)
+        if sort_column == ROWID:
+            query += f" ORDER BY {ROWID} {direction}"
+        else:
+            query += f" ORDER BY {quote_identifier(sort_column)} {direction}, {ROWID} {direction}"
+        return query, params
+
+    @staticmethod
+    def _keyset_predicate(sort_column: str, descending: bool, after: PageCursor) -> tuple[str, list]:
+        """
+        Rows strictly after the cursor in (sort column, rowid) order.
+
+        SQLite sorts NULLs first ascending and last descending, so NULL
+        sort values need their own branches.
+        """
+        cmp = "<" if descending else ">"
+        if sort_column == ROWID:
+            return f"{ROWID} {cmp} ?", [after.rowid]
+
+        col = quote_identifier(sort_column)
+        if after.sort_value is None:
+            if descending:
+                # NULL block is last: only later rowids within it
+                return f"{col} IS NULL AND {ROWID} < ?", [after.rowid]
+            # NULL block is first: rest of it, then every non-NULL row
+            return f"({col} IS NULL AND {ROWID} > ?) OR {col} IS NOT NULL", [after.rowid]
+
+        sql = f"{col} {cmp} ? OR ({col} = ? AND {ROWID} {cmp} ?)"
+        if descending:
+            sql += f" OR {col} IS NULL"
+        return sql, [after.sort_value, after.sort_value, after.rowid]
+
+    # ===================
+    # Browsing
+    # ===================
+
+    def fetch_page(
+        self,
+        table: str,
+        columns: Optional[list[str]] = None,
+        sort_column: Optional[str] = None,
+        descending: bool = True,
+        filters: Optional[list[ColumnFilter]] = None,
+        after: Optional[PageCursor] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Page:
+        """
+        Fetch one page using keyset pagination.
+
+        Args:
+            table: Table name
+            columns: Columns to return (all if None)
+            sort_column: Sort column (rowid if None)
+            descending: Sort direction
+            filters: WHERE terms (ANDed)
+            after: Cursor from the previous page (first page if None)
+            page_size: Rows per page (capped at MAX_PAGE_SIZE)
+
+        Returns:
+            Page with rows (without cursor helper columns) and next cursor
+        """
+        page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+        query, params = self._build_select(table, columns, sort_column, descending, filters, after)
+        query += " LIMIT ?"
+        params.append(page_size + 1)  # One extra row tells us if there is a next page
+
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+
+        next_cursor = None
+        if len(df) > page_size:
+            df = df.iloc[:page_size]
+            last = df.iloc[-1]
+            sort_value = last["__sort__"] if "__sort__" in df.columns else None
+            if pd.isna(sort_value):
+                sort_value = None
+            elif hasattr(sort_value, "item"):
+                sort_value = sort_value.item()  # numpy scalar -> Python for sqlite3
+            next_cursor = PageCursor(sort_value=sort_value, rowid=int(last[ROWID_ALIAS]))
+
+        df = df.drop(columns=[c for c in (ROWID_ALIAS, "__sort__") if c in df.columns])
+        return Page(rows=df.reset_index(drop=True), next_cursor=next_cursor)
+
+    def count_rows(self, table: str, filters: Optional[list[ColumnFilter]] = None) -> int:
+        """Row count, optionally filtered."""
+        filters = filters or []
+        self._check_table(table)
+        self._check_columns(table, [f.column for f in filters])
+
+        query = f"SELECT COUNT(*) FROM {quote_identifier(table)}"
+        params: list = []
+        if filters:
+            terms = []
+            for f in filters:
+                sql, values = f.to_sql()
+                terms.append(f"({sql})")
+                params.extend(values)
+            query += " WHERE " + " AND ".join(terms)
+
+        with closing(self._connect()) as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    # ===================
+    # Export
+    # ===================
+
+    def iter_chunks(
+        self,
+        table: str,
+        columns: Optional[list[str]] = None,
+        sort_column: Optional[str] = None,
+        descending: bool = True,
+        filters: Optional[list[ColumnFilter]] = None,
+        chunk_rows: int = EXPORT_CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream query results as DataFrames of at most chunk_rows rows.
+
+        Uses a single cursor with fetchmany(), so memory is bounded by the
+        chunk size regardless of table size.
+        """
+        query, params = self._build_select(table, columns, sort_column, descending, filters)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(query, params)
+            names = [d[0] for d in cursor.description]
+            keep = [n for n in names if n not in (ROWID_ALIAS, "__sort__")]
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=names)[keep]
+        finally:
+            conn.close()
+
+    def export_csv(self, path: Path, table: str, **query) -> int:
+        """
+        Stream a (filtered, projected) table to a CSV file.
+
+        Returns:
+            Number of rows written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        total = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for i, chunk in enumerate(self.iter_chunks(table, **query)):
+                chunk.to_csv(f, index=False, header=(i == 0))
+                total += len(chunk)
+        if total == 0:
+            # Header-only file for empty results
+            names = query.get("columns") or [c["name"] for c in self.get_columns(table)]
+            pd.DataFrame(columns=names).to_csv(path, index=False)
+        logger.info(f"Exported {total} rows from {table} to {path}")
+        return total
+
+    def export_parquet(self, path: Path, table: str, **query) -> int:
+        """
+        Stream a (filtered, projected) table to a Parquet file.
+
+        Each chunk becomes a row group; the Arrow schema is derived from
+        the declared column types so chunks stay consistent even when a
+        chunk is all-NULL for some column. Requires pyarrow.
+
+        Returns:
+            Number of rows written
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        declared = {c["name"]: c["type"] for c in self.get_columns(table)}
+        names = query.get("columns") or list(declared)
+        schema = pa.schema([(n, _arrow_type(declared.get(n, ""))) for n in names])
+
+        total = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in self.iter_chunks(table, **query):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                total += len(chunk)
+        logger.info(f"Exported {total} rows from {table} to {path}")
+        return total
+
+
+def parquet_available() -> bool:
+    """True if pyarrow is installed (optional dependency)."""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _arrow_type(declared_type: str):
+    """Map a declared SQLite column type to an Arrow type (affinity rules)."""
+    import pyarrow as pa
+
+    t = declared_type.upper()
+    if "INT" in t or "BOOL" in t:
+        return pa.int64()
+    if any(k in t for k in ("REAL", "FLOA", "DOUB", "NUMERIC", "DECIMAL")):
+        return pa.float64()
+    return pa.string()
@@ -0,0 +1,155 @@
+"""Tests for alert fingerprinting, suppression, escalation and digests."""
+
+import sys
+import shutil
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.alert_aggregator import AggregationRule, AlertAggregator, Decision, fingerprint
+from src.utils.monitoring import AlertManager, AlertLevel
+
+
+TEST_DIR = Path(__file__).parent / "test_alert_aggregator_data"
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def test_fingerprint_normalizes_readings():
+    """Numbers, case and whitespace don't change a problem's identity."""
+    a = fingerprint("risk_monitor", "Spread too high: 3.1 pips")
+    b = fingerprint("risk_monitor", "spread  too high: 4.25 pips")
+    assert a == b
+    assert a != fingerprint("mt5_monitor", "Spread too high: 3.1 pips")
+    assert a != fingerprint("risk_monitor", "Daily loss limit exceeded")
+    print("  [PASS] Fingerprints normalize readings")
+
+
+def test_suppress_and_remind():
+    """Repeats are suppressed until suppress_seconds pass, then re-emitted once."""
+    clock = FakeClock()
+    agg = AlertAggregator(default_rule=AggregationRule(suppress_seconds=300, resolve_seconds=600),
+                          clock=clock)
+    assert agg.observe("k") is Decision.EMIT
+    decisions = []
+    for _ in range(10):
+        clock.advance(30)
+        decisions.append(agg.observe("k"))
+    assert decisions[:9] == [Decision.SUPPRESS] * 9 and decisions[9] is Decision.EMIT
+    assert agg.get("k").suppressed == 9 and agg.get("k").total == 11
+
+    # Gone for longer than resolve_seconds: a new problem
+    clock.advance(601)
+    assert agg.observe("k") is Decision.EMIT
+    print("  [PASS] Suppression and reminders")
+
+
+def test_escalation_in_sliding_window():
+    """Crossing escalate_count inside the window escalates once."""
+    clock = FakeClock()
+    rule = AggregationRule(suppress_seconds=10_000, window_seconds=600, escalate_count=5,
+                           resolve_seconds=10_000)
+    agg = AlertAggregator(default_rule=rule, clock=clock)
+
+    # Slow trickle: old occurrences fall out of the window
+    for _ in range(6):
+        assert agg.observe("slow") in (Decision.EMIT, Decision.SUPPRESS)
+        clock.advance(200)
+    assert agg.window_count("slow") < 5
+
+    decisions = [agg.observe("fast") for _ in range(8)]
+    assert decisions.count(Decision.ESCALATE) == 1 and decisions[4] is Decision.ESCALATE
+    print("  [PASS] Sliding-window escalation")
+
+
+def test_digest_and_bounded_state():
+    """Digests report suppressed counts once; state stays bounded."""
+    clock = FakeClock()
+    agg = AlertAggregator(default_rule=AggregationRule(suppress_seconds=900, resolve_seconds=120),
+                          digest_interval=60, max_fingerprints=50, clock=clock)
+    for i in range(200):
+        agg.observe(f"k{i}")
+    assert len(agg.active()) == 50
+    assert agg.get("k0") is None and agg.get("k199") is not None
+
+    agg.attach("k199", 42)
+    for _ in range(7):
+        agg.observe("k199", payload={"n": 1})
+    assert agg.digest() == []  # Not due yet
+    clock.advance(61)
+    entries = agg.digest()
+    assert [(e.fingerprint, e.suppressed, e.ref) for e in entries] == [("k199", 7, 42)]
+    assert agg.digest(force=True) == []
+
+    clock.advance(121)
+    agg.digest(force=True)
+    assert agg.active() == []  # Resolved problems are dropped
+    print("  [PASS] Digest counts and bounded state")
+
+
+def test_alert_manager_writes_per_problem():
+    """A condition detected every scan is stored once with its repeat count."""
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    manager = AlertManager(TEST_DIR)
+    clock = FakeClock()
+    manager.aggregator.clock = clock
+
+    emitted = []
+    for scan in range(100):
+        emitted.append(manager.send_alert(AlertLevel.CRITICAL, f"Low margin level: {80 - scan % 5}%",
+                                          "risk_monitor"))
+        emitted.append(manager.send_alert(AlertLevel.INFO, "Weekend - markets closed", "scheduler"))
+        clock.advance(1)
+    assert sum(a is not None for a in emitted) == 2
+    assert manager.flush_digest(force=True) == 198
+
+    alerts = manager.get_recent_alerts(hours=1)
+    assert len(alerts) == 2
+    assert sorted(a.occurrences for a in alerts) == [100, 100]
+    print("  [PASS] AlertManager stores one alert per problem")
+
+
+def cleanup():
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Alert Aggregator ===\n")
+
+    tests = [
+        test_fingerprint_normalizes_readings,
+        test_suppress_and_remind,
+        test_escalation_in_sliding_window,
+        test_digest_and_bounded_state,
+        test_alert_manager_writes_per_problem,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
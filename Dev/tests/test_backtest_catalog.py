@@ -0,0 +1,195 @@
+"""Tests for the indexed backtest result catalog."""
+
+import sys
+import json
+import time
+import shutil
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import Database
+from src.backtesting.catalog import ResultCatalog, to_columns, from_columns
+from src.backtesting.engine import BacktestConfig, BacktestResult, SimulatedTrade, TradeDirection
+from src.backtesting.report import ReportGenerator, BacktestReport
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_backtest_catalog.db"
+CATALOG_DIR = Path(__file__).parent / "test_backtest_catalog_runs"
+REPORTS_DIR = Path(__file__).parent / "test_backtest_catalog_reports"
+
+T0 = datetime(2026, 1, 5, 8, 0)
+
+
+def get_catalog():
+    """Fresh isolated catalog."""
+    cleanup()
+    return ResultCatalog(Database(TEST_DB_PATH), CATALOG_DIR)
+
+
+def make_result(instrument="EUR_USD", n_trades=20, min_confidence=68, seed=0):
+    config = BacktestConfig(
+        instrument=instrument, timeframe="M5", start_date=T0, end_date=T0 + timedelta(days=30),
+        min_confidence=min_confidence,
+    )
+    trades, equity, value = [], [], 10000.0
+    for i in range(n_trades):
+        entry = T0 + timedelta(hours=6 * i)
+        pnl = 50.0 if (i + seed) % 3 else -30.0
+        value += pnl
+        trades.append(SimulatedTrade(
+            entry_time=entry.isoformat(), entry_price=1.1, units=10000, confidence=70, setup_grade="B",
+            direction=TradeDirection.LONG if i % 2 else TradeDirection.SHORT,
+            stop_loss=1.09, take_profit=1.12, exit_time=(entry + timedelta(hours=2)).isoformat(),
+            exit_price=1.105, exit_reason="TP" if pnl > 0 else "SL", pnl=pnl, pnl_pips=pnl / 10,
+        ))
+        equity.append({"time": entry.isoformat(), "equity": value - pnl})
+        equity.append({"time": (entry + timedelta(hours=2)).isoformat(), "equity": value})
+    return BacktestResult(
+        config=config, trades=trades, equity_curve=equity, initial_equity=10000.0,
+        final_equity=value, total_bars=1000, bars_analyzed=900, signals_generated=n_trades,
+        signals_skipped=3, run_time_seconds=1.0, skip_reasons={"session": 3},
+    )
+
+
+def test_columns_round_trip():
+    """Columnar encoding restores rows, including sparse keys."""
+    rows = [{"a": 1, "b": "x"}, {"a": 2, "c": None}, {"b": "y"}]
+    restored = from_columns(json.loads(json.dumps(to_columns(rows))))
+    assert restored == [{"a": 1, "b": "x", "c": None}, {"a": 2, "b": None, "c": None},
+                        {"a": None, "b": "y", "c": None}]
+    assert from_columns(to_columns([])) == []
+    print("  [PASS] Columnar round trip")
+
+
+def test_add_report_and_load():
+    """A catalogued report reloads with the same trades, metrics and charts."""
+    catalog = get_catalog()
+    report = ReportGenerator().generate(make_result())
+    run_id = catalog.add_report(report, source="dashboard", label="baseline")
+
+    row = catalog.get_run(run_id)
+    assert row["instrument"] == "EUR_USD" and row["label"] == "baseline"
+    assert row["total_trades"] == 20
+    assert abs(row["total_return_pct"] - report.metrics.total_return_pct) < 1e-9
+    assert row["config"]["min_confidence"] == 68
+
+    loaded = catalog.load_report(run_id)
+    assert loaded.result["trades"] == [t.to_dict() for t in report.result.trades]
+    assert loaded.result["equity_curve"] == report.result.equity_curve
+    assert loaded.metrics == report.metrics.to_dict()
+    assert loaded.equity_chart == json.loads(json.dumps(report.equity_chart))
+    assert loaded.trade_distribution == json.loads(json.dumps(report.trade_distribution))
+    assert loaded.monthly_returns == report.monthly_returns
+
+    # Sidecar is much smaller than the pretty-printed report JSON
+    json_path = Path(report.save(directory=str(REPORTS_DIR)))
+    assert row["sidecar_bytes"] * 3 < json_path.stat().st_size
+    print(f"  [PASS] Report round trip ({row['sidecar_bytes']} B vs {json_path.stat().st_size} B JSON)")
+
+
+def test_list_filter_sort_without_sidecars():
+    """Listing and filtering read only the index."""
+    catalog = get_catalog()
+    for i, (inst, conf) in enumerate([("EUR_USD", 60), ("EUR_USD", 70), ("XAU_USD", 70)]):
+        catalog.add_result(make_result(inst, n_trades=10 + i, min_confidence=conf, seed=i),
+                           source="suite", label=f"{inst} c{conf}")
+    hashes = {r["config_hash"] for r in catalog.list_runs()}
+    assert len(hashes) == 3
+
+    for path in CATALOG_DIR.glob("*"):
+        path.unlink()  # Listing must not need the sidecars
+
+    eur = catalog.list_runs(instrument="EUR_USD", order_by="total_trades", descending=False)
+    assert [r["total_trades"] for r in eur] == [10, 11]
+    assert catalog.count_runs(source="suite") == 3
+    assert [r["label"] for r in catalog.list_runs(search="XAU")] == ["XAU_USD c70"]
+    assert len(catalog.list_runs(config_hash=eur[0]["config_hash"])) == 1
+    try:
+        catalog.list_runs(order_by="label; DROP TABLE trades")
+        assert False, "unsafe sort column accepted"
+    except ValueError:
+        pass
+    print("  [PASS] Index filters and sorts without sidecars")
+
+
+def test_compare_reads_only_selected():
+    """Comparing two runs opens only their sidecars."""
+    catalog = get_catalog()
+    ids = [catalog.add_result(make_result(seed=i), label=f"r{i}") for i in range(4)]
+    untouched = catalog.get_run(ids[3])["sidecar_path"]
+    Path(untouched).unlink()
+
+    comparison = catalog.compare(ids[:2])
+    assert set(comparison["equity"]) == set(ids[:2])
+    assert len(comparison["equity"][ids[0]]["y"]) == 40
+    assert set(comparison["metrics"]["win_rate"]) == set(ids[:2])
+    assert catalog.delete(ids[0]) and catalog.count_runs() == 3
+    print("  [PASS] Compare loads only selected runs")
+
+
+def test_legacy_reports_imported_once():
+    """list_saved_reports parses each JSON file only when it is new or changed."""
+    catalog = get_catalog()
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    for i in range(3):
+        report = ReportGenerator().generate(make_result(seed=i))
+        report.report_id = f"EUR_USD_M5_{i}"
+        report.save(directory=str(REPORTS_DIR))
+    (REPORTS_DIR / "broken.json").write_text("{not json")
+
+    assert catalog.import_directory(str(REPORTS_DIR)) == 3
+    assert catalog.import_directory(str(REPORTS_DIR)) == 0
+
+    target = REPORTS_DIR / "EUR_USD_M5_1.json"
+    time.sleep(0.01)
+    target.write_text(target.read_text())
+    assert catalog.import_directory(str(REPORTS_DIR)) == 1
+
+    runs = catalog.list_runs(source="file")
+    assert sorted(r["run_id"] for r in runs) == ["file_EUR_USD_M5_0", "file_EUR_USD_M5_1", "file_EUR_USD_M5_2"]
+    loaded = catalog.load_report("file_EUR_USD_M5_2")
+    assert len(loaded.result["trades"]) == 20
+    assert isinstance(BacktestReport.load(str(target)).result, dict)
+    print("  [PASS] Legacy report files imported once")
+
+
+def cleanup():
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    shutil.rmtree(CATALOG_DIR, ignore_errors=True)
+    shutil.rmtree(REPORTS_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Backtest Result Catalog ===\n")
+
+    tests = [
+        test_columns_round_trip,
+        test_add_report_and_load,
+        test_list_filter_sort_without_sidecars,
+        test_compare_reads_only_selected,
+        test_legacy_reports_imported_once,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,250 @@
+"""Tests for the background backtest job queue and runner."""
+
+import os
+import sys
+import json
+import time
+import shutil
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import Database
+from src.backtesting.jobs import (
+    BacktestJobQueue, BacktestJobRunner, JOB_KINDS, job_key,
+    QUEUED, RUNNING, DONE, FAILED, CANCELLED,
+)
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_backtest_jobs.db"
+RESULT_DIR = Path(__file__).parent / "test_backtest_jobs_results"
+
+JOB_KINDS["test.sleep"] = f"{Path(__file__).stem}:sleepy_job"
+JOB_KINDS["test.fail"] = f"{Path(__file__).stem}:failing_job"
+
+
+# Job functions run in spawned workers, so they live at module level
+
+def sleepy_job(params, ctx):
+    steps = params.get("steps", 5)
+    for i in range(steps):
+        ctx.progress(i / steps, f"step {i}", force=True)
+        time.sleep(params.get("delay", 0.05))
+    path = ctx.result_file("result.json")
+    path.write_text(json.dumps({"steps": steps}))
+    return path, {"steps": steps}
+
+
+def failing_job(params, ctx):
+    raise RuntimeError("boom")
+
+
+class StuckEngine:
+    """Backtest engine whose runs outlast any cancel grace period."""
+
+    def run(self, *args, **kwargs):
+        (Path(os.environ["TEST_SWEEP_PID_DIR"]) / str(os.getpid())).touch()
+        time.sleep(30)
+
+
+def stuck_sweep_job(params, ctx):
+    from src.backtesting.engine import BacktestConfig
+    from src.backtesting.optimizer import ParameterOptimizer
+
+    os.environ["TEST_SWEEP_PID_DIR"] = params["pid_dir"]
+    m5 = [{"timestamp": 1767571200 + 300 * i, "open": 1.1, "high": 1.1, "low": 1.1, "close": 1.1}
+          for i in range(200)]
+    config = BacktestConfig(instrument="EUR_USD", timeframe="M5",
+                            start_date=datetime(2026, 1, 5), end_date=datetime(2026, 1, 6))
+    optimizer = ParameterOptimizer(m5[::48], m5[::12], m5, config, workers=2, engine_class=StuckEngine)
+    optimizer.run(candidates=4, progress_callback=lambda done, total, msg: ctx.progress(done / total, msg))
+
+
+def get_queue():
+    """Fresh isolated queue."""
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    shutil.rmtree(RESULT_DIR, ignore_errors=True)
+    return BacktestJobQueue(Database(TEST_DB_PATH))
+
+
+def run_until_final(runner, job_ids, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        runner.tick()
+        jobs = [runner.queue.get(j) for j in job_ids]
+        if all(not j.is_active for j in jobs) and not set(job_ids) & set(runner.running_jobs):
+            return jobs
+        time.sleep(0.1)
+    raise AssertionError("jobs did not finish")
+
+
+def test_submit_dedupes_identical_jobs():
+    """Same kind + params share one job; labels don't matter."""
+    queue = get_queue()
+    a = queue.submit("test.sleep", {"steps": 3, "when": datetime(2026, 1, 5)}, label="first")
+    b = queue.submit("test.sleep", {"when": datetime(2026, 1, 5), "steps": 3}, label="second tab")
+    c = queue.submit("test.sleep", {"steps": 4, "when": datetime(2026, 1, 5)})
+    assert a.id == b.id and a.status == QUEUED
+    assert c.id != a.id
+    assert job_key("test.sleep", {"a": 1, "b": 2}) == job_key("test.sleep", {"b": 2, "a": 1})
+    assert len(queue.list_jobs()) == 2
+    print("  [PASS] Identical submissions are deduplicated")
+
+
+def test_claim_is_exclusive():
+    """Each queued job is claimed by exactly one runner."""
+    queue = get_queue()
+    for i in range(3):
+        queue.submit("test.sleep", {"steps": i})
+    other = Database(TEST_DB_PATH)
+    claimed = [queue.db.claim_backtest_job(), other.claim_backtest_job(),
+               queue.db.claim_backtest_job(), other.claim_backtest_job()]
+    ids = [r["id"] for r in claimed if r]
+    assert len(ids) == 3 and len(set(ids)) == 3
+    assert claimed[-1] is None
+    assert all(j.status == RUNNING for j in queue.list_jobs())
+    print("  [PASS] Claims are exclusive")
+
+
+def test_runner_executes_and_reuses_result():
+    """Jobs run in worker processes; finished results are reused on resubmit."""
+    queue = get_queue()
+    runner = BacktestJobRunner(queue, max_workers=2, result_dir=RESULT_DIR)
+    a = queue.submit("test.sleep", {"steps": 3})
+    b = queue.submit("test.fail", {})
+    done, failed = run_until_final(runner, [a.id, b.id])
+
+    assert done.status == DONE and done.progress == 1.0
+    assert done.summary == {"steps": 3}
+    assert json.loads(Path(done.result_path).read_text()) == {"steps": 3}
+    assert failed.status == FAILED and "boom" in failed.error
+
+    again = queue.submit("test.sleep", {"steps": 3})
+    assert again.id == a.id and again.status == DONE
+    Path(done.result_path).unlink()
+    fresh = queue.submit("test.sleep", {"steps": 3})
+    assert fresh.id != a.id and fresh.status == QUEUED
+    print("  [PASS] Runner executes jobs and records results")
+
+
+def test_cancel_queued_and_running():
+    """Queued jobs cancel immediately; running workers stop at the next progress call."""
+    queue = get_queue()
+    runner = BacktestJobRunner(queue, max_workers=1, result_dir=RESULT_DIR)
+    running = queue.submit("test.sleep", {"steps": 400, "delay": 0.05})
+    waiting = queue.submit("test.sleep", {"steps": 1})
+    runner.tick()
+    assert queue.cancel(waiting.id) == CANCELLED
+
+    deadline = time.monotonic() + 30
+    while queue.get(running.id).progress == 0 and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert queue.cancel(running.id) == RUNNING
+    job, = run_until_final(runner, [running.id], timeout=30)
+    assert job.status == CANCELLED
+    assert queue.get(waiting.id).status == CANCELLED
+    assert runner.running_jobs == []
+    # Resubmitting after a cancel queues a new job
+    assert queue.submit("test.sleep", {"steps": 1}).id != waiting.id
+    print("  [PASS] Queued and running jobs can be cancelled")
+
+
+def test_stale_jobs_are_failed():
+    """RUNNING jobs nobody heartbeats (dead dashboard) are failed."""
+    queue = get_queue()
+    job = queue.submit("test.sleep", {"steps": 1})
+    queue.db.claim_backtest_job()
+    future = (datetime.now(timezone.utc) + timedelta(seconds=1)).isoformat()
+    assert queue.db.fail_stale_backtest_jobs(future, (job.id,)) == 0
+    assert queue.db.fail_stale_backtest_jobs(future) == 1
+    assert queue.get(job.id).status == FAILED
+    assert not queue.db.finish_backtest_job(job.id, DONE)  # Late worker can't resurrect it
+    print("  [PASS] Stale jobs are failed")
+
+
+def process_alive(pid):
+    """True unless the process is gone or a zombie (reparented orphans may never be reaped)."""
+    try:
+        return Path(f"/proc/{pid}/stat").read_text().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+
+
+def test_cancel_optimize_job_stops_pool():
+    """Cancelling a sweep mid-run also stops its pool workers."""
+    queue = get_queue()
+    runner = BacktestJobRunner(queue, max_workers=1, result_dir=RESULT_DIR)
+    pid_dir = RESULT_DIR / "pool_pids"
+    pid_dir.mkdir(parents=True)
+    original = JOB_KINDS["optimize"]
+    JOB_KINDS["optimize"] = f"{Path(__file__).stem}:stuck_sweep_job"
+    try:
+        job = queue.submit("optimize", {"pid_dir": str(pid_dir)})
+        runner.tick()
+        assert not runner._workers[job.id].daemon  # Can start its own pool
+
+        deadline = time.monotonic() + 60
+        while len(list(pid_dir.iterdir())) < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        pids = [int(p.name) for p in pid_dir.iterdir()]
+        assert len(pids) == 2 and all(process_alive(pid) for pid in pids)
+
+        assert queue.cancel(job.id) == RUNNING
+        job, = run_until_final(runner, [job.id], timeout=30)
+        assert job.status == CANCELLED
+
+        deadline = time.monotonic() + 10
+        while any(process_alive(pid) for pid in pids) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert not any(process_alive(pid) for pid in pids)
+    finally:
+        JOB_KINDS["optimize"] = original
+    print("  [PASS] Cancelled optimize job leaves no pool workers")
+
+
+def cleanup():
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    shutil.rmtree(RESULT_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Backtest Job Queue ===\n")
+
+    tests = [
+        test_submit_dedupes_identical_jobs,
+        test_claim_is_exclusive,
+        test_runner_executes_and_reuses_result,
+        test_cancel_queued_and_running,
+        test_stale_jobs_are_failed,
+        test_cancel_optimize_job_stops_pool,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,159 @@
+"""Tests for the bar-close scan scheduler."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.bar_scheduler import BarCloseScheduler
+
+
+T0 = 1_767_600_000.0  # Divisible by 300: an M5 close
+
+
+class FakeClock:
+    def __init__(self, now=T0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMarket:
+    """Closed M5 bar per instrument, derived from the clock."""
+
+    def __init__(self, clock, frozen=()):
+        self.clock = clock
+        self.frozen = set(frozen)  # Instruments whose market is closed
+        self.calls = 0
+
+    def probe(self, instrument):
+        self.calls += 1
+        if instrument in self.frozen:
+            return "friday-close"
+        return str(int(self.clock() // 300) * 300 - 300)
+
+
+def test_wake_times_align_to_closes():
+    """Wakes land settle seconds after a close, or earlier on a short interval."""
+    clock = FakeClock(T0 + 100)
+    scheduler = BarCloseScheduler(settle_seconds=2, clock=clock)
+    assert scheduler.next_bar_close() == T0 + 302
+    assert scheduler.seconds_until_next(60) == 60
+    assert scheduler.seconds_until_next(300) == 502
+    clock.now = T0 + 280
+    assert scheduler.seconds_until_next(60) == 22
+    # Quiet/news intervals longer than a bar skip closes until they elapse
+    assert scheduler.seconds_until_next(420) == T0 + 902 - clock.now
+    # Inside the settle window the bar that just closed is still pending
+    clock.now = T0 + 1
+    assert scheduler.seconds_until_next(60) == 1
+    print("  [PASS] Wake times align to bar closes")
+
+
+def test_only_new_bars_are_scanned():
+    """Each instrument is scanned once per closed bar; probes only after closes."""
+    clock = FakeClock(T0 + 5)
+    market = FakeMarket(clock)
+    scheduler = BarCloseScheduler(settle_seconds=2, clock=clock)
+    instruments = ["EUR_USD", "GBP_USD", "XAU_USD"]
+
+    assert scheduler.due_instruments(instruments, market.probe) == instruments
+    for inst in instruments:
+        scheduler.record(inst, "HTF bias neutral")
+    clock.now += 60
+    assert scheduler.due_instruments(instruments, market.probe) == []
+    assert market.calls == 3  # No probes until the next close
+
+    clock.now = T0 + 302
+    assert scheduler.due_instruments(instruments, market.probe) == instruments
+    print("  [PASS] Unchanged instruments are skipped")
+
+
+def test_transient_skips_are_rechecked():
+    """Spread/session/news blocks are retried intra-bar; data skips are not."""
+    clock = FakeClock(T0 + 5)
+    market = FakeMarket(clock)
+    scheduler = BarCloseScheduler(settle_seconds=2, clock=clock)
+    scheduler.due_instruments(["EUR_USD", "XAU_USD"], market.probe)
+    scheduler.record("EUR_USD", "Spread too high: 3.2 pips")
+    scheduler.record("XAU_USD", "No liquidity sweep detected")
+
+    clock.now += 60
+    assert scheduler.due_instruments(["EUR_USD", "XAU_USD"], market.probe) == ["EUR_USD"]
+    scheduler.record("EUR_USD", None)
+    clock.now += 60
+    assert scheduler.due_instruments(["EUR_USD", "XAU_USD"], market.probe) == []
+    print("  [PASS] Live-condition skips are rechecked")
+
+
+def test_closed_market_is_not_rescanned():
+    """A symbol without new bars is re-probed cheaply but never fully rescanned."""
+    clock = FakeClock(T0 + 5)
+    market = FakeMarket(clock, frozen={"BTC_USD"})
+    scheduler = BarCloseScheduler(settle_seconds=2, clock=clock)
+    assert scheduler.due_instruments(["BTC_USD"], market.probe) == ["BTC_USD"]
+    scheduler.record("BTC_USD", None)
+    for _ in range(5):
+        clock.now += 300
+        assert scheduler.due_instruments(["BTC_USD"], market.probe) == []
+    assert market.calls == 6
+    scheduler.forget("BTC_USD")
+    assert scheduler.due_instruments(["BTC_USD"], market.probe) == ["BTC_USD"]
+    print("  [PASS] Closed markets are not rescanned")
+
+
+def test_hour_of_scanning_costs_less():
+    """Over an hour at a 60s interval, full scans drop from 60 to 12 per instrument."""
+    clock = FakeClock(T0 + 17)
+    market = FakeMarket(clock)
+    scheduler = BarCloseScheduler(settle_seconds=2, clock=clock)
+    instruments = ["EUR_USD", "GBP_USD", "XAU_USD", "US30"]
+
+    full_scans, wakes, on_close = 0, 0, []
+    end = clock.now + 3600
+    while clock.now < end:
+        due = scheduler.due_instruments(instruments, market.probe)
+        if due and (clock.now - 2) % 300 == 0:
+            on_close.append(clock.now)
+        full_scans += len(due)
+        for inst in due:
+            scheduler.record(inst, None)
+        clock.now += scheduler.seconds_until_next(60)
+        wakes += 1
+
+    assert full_scans == 13 * len(instruments)  # First scan + 12 closes
+    assert len(on_close) == 12  # Every close is scanned at close + settle
+    assert market.calls == full_scans
+    print(f"  [PASS] {full_scans} scans / {wakes} wakes per hour (was {60 * len(instruments)})")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Bar-Close Scheduler ===\n")
+
+    tests = [
+        test_wake_times_align_to_closes,
+        test_only_new_bars_are_scanned,
+        test_transient_skips_are_rechecked,
+        test_closed_market_is_not_rescanned,
+        test_hour_of_scanning_costs_less,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,158 @@
+"""Tests for the benchmark suite (fixtures, baselines, regression compare)."""
+
+import sys
+import shutil
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fixtures import (
+    synthetic_fixture,
+    generate_m5,
+    aggregate,
+    save_recorded,
+    load_recorded,
+)
+from benchmarks.suite import run_suite, save_baseline, load_baseline, compare
+
+
+TEST_DIR = Path(__file__).parent / "test_benchmarks_data"
+
+
+def test_synthetic_is_deterministic():
+    """Same seed gives identical candles; different seeds differ."""
+    a = synthetic_fixture("EUR_USD", 1500)
+    b = synthetic_fixture("EUR_USD", 1500)
+    assert a.digest == b.digest
+    assert a.m5 == b.m5
+    assert synthetic_fixture("EUR_USD", 1500, seed=7).digest != a.digest
+    assert all(c["low"] <= min(c["open"], c["close"]) for c in a.m5)
+    assert all(c["high"] >= max(c["open"], c["close"]) for c in a.m5)
+    print("  [PASS] Synthetic fixtures are deterministic and valid OHLC")
+
+
+def test_aggregation_matches_m5():
+    """H1 candles span their M5 bars exactly; weekends are skipped."""
+    m5 = generate_m5("XAU_USD", 2000)
+    h1 = aggregate(m5, "H1", digits=2)
+    first_hour = [c for c in m5 if c["timestamp"] < h1[0]["timestamp"] + 3600]
+    assert len(first_hour) == 12
+    assert h1[0]["high"] == max(c["high"] for c in first_hour)
+    assert h1[0]["low"] == min(c["low"] for c in first_hour)
+    assert h1[0]["close"] == first_hour[-1]["close"]
+    assert sum(len([c for c in m5 if h["timestamp"] <= c["timestamp"] < h["timestamp"] + 3600])
+               for h in h1) == len(m5)
+    assert not any(c["time"].startswith(("2025-01-11", "2025-01-12")) for c in m5)
+    print("  [PASS] HTF aggregation consistent with M5")
+
+
+def test_recorded_roundtrip():
+    """Recorded fixtures load back with the same content digest."""
+    fx = synthetic_fixture("GBP_USD", 600)
+    path = save_recorded(fx, data_dir=TEST_DIR)
+    loaded = load_recorded(path)
+    assert loaded.source == "recorded"
+    assert loaded.digest == fx.digest
+    print("  [PASS] Recorded fixture roundtrip")
+
+
+def test_run_and_baseline_roundtrip():
+    """A filtered run produces throughput and survives save/load."""
+    fx = synthetic_fixture("EUR_USD", 600)
+    run = run_suite(only=["smc.detect_swing_points"], fixtures=[fx], min_time=0.0)
+    result = run["results"][f"smc.detect_swing_points[{fx.name}]"]
+    assert result["status"] == "ok"
+    assert result["bars_per_sec"] > 0
+    assert run["fixtures"] == {fx.name: fx.digest}
+
+    save_baseline(run, "unit", baseline_dir=TEST_DIR)
+    assert load_baseline("unit", baseline_dir=TEST_DIR) == run
+    assert load_baseline("missing", baseline_dir=TEST_DIR) is None
+    print("  [PASS] Run + baseline roundtrip")
+
+
+def _run_doc(bps: dict, digest="abc", status=None):
+    status = status or {}
+    return {
+        "machine": {"python": "3.11"},
+        "fixtures": {"fx": digest},
+        "results": {
+            f"{name}[fx]": {
+                "name": name, "fixture": "fx", "bars_per_sec": v,
+                "status": status.get(name, "ok"),
+            }
+            for name, v in bps.items()
+        },
+    }
+
+
+def test_compare_flags_regressions():
+    """Drops beyond the threshold fail; noise, gains and new benchmarks don't."""
+    baseline = _run_doc({"a": 1000.0, "b": 1000.0, "c": 1000.0, "gone": 5.0})
+    current = _run_doc({"a": 700.0, "b": 920.0, "c": 1500.0, "new": 10.0})
+    report = compare(current, baseline, threshold=0.15)
+    by_key = {r.key: r for r in report.rows}
+
+    assert by_key["a[fx]"].status == "regression"
+    assert abs(by_key["a[fx]"].change + 0.3) < 1e-9
+    assert by_key["b[fx]"].status == "ok"
+    assert by_key["c[fx]"].status == "improved"
+    assert by_key["new[fx]"].status == "new"
+    assert by_key["gone[fx]"].status == "missing"
+    assert report.failed
+
+    assert not compare(current, baseline, threshold=0.5).failed
+    print("  [PASS] Compare flags regressions by threshold")
+
+
+def test_compare_errors_and_fixture_changes():
+    """Newly broken benchmarks fail; changed fixtures are not judged."""
+    baseline = _run_doc({"a": 1000.0})
+    broken = _run_doc({"a": 0.0}, status={"a": "error"})
+    assert compare(broken, baseline).rows[0].status == "error"
+    assert compare(broken, baseline).failed
+
+    changed = _run_doc({"a": 100.0}, digest="other")
+    report = compare(changed, baseline)
+    assert report.rows[0].status == "fixture_changed"
+    assert not report.failed
+    print("  [PASS] Compare handles errors and fixture changes")
+
+
+def cleanup():
+    if TEST_DIR.exists():
+        shutil.rmtree(TEST_DIR)
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Benchmark Suite ===\n")
+
+    tests = [
+        test_synthetic_is_deterministic,
+        test_aggregation_matches_m5,
+        test_recorded_roundtrip,
+        test_run_and_baseline_roundtrip,
+        test_compare_flags_regressions,
+        test_compare_errors_and_fixture_changes,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
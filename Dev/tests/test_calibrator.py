@@ -143,6 +143,99 @@ def test_get_stats():
     print("  [PASS] get_stats returns expected keys")
 
 
+def make_outcomes(n, a=6.0, b=-4.5, seed=11):
+    """Synthetic (confidence, pnl) pairs drawn from a known Platt curve."""
+    import random
+    rng = random.Random(seed)
+    outcomes = []
+    for _ in range(n):
+        conf = rng.randint(55, 95)
+        p_win = 1.0 / (1.0 + math.exp(-(a * conf / 100.0 + b)))
+        outcomes.append((conf, 25.0 if rng.random() < p_win else -20.0))
+    return outcomes
+
+
+def test_online_matches_batch_fit():
+    """Streaming Newton updates land close to the batch logistic fit."""
+    db = get_test_db()
+    outcomes = make_outcomes(600)
+
+    online = ConfidenceCalibrator(db, online=True)
+    for conf, pnl in outcomes:
+        online.update(conf, pnl)
+    assert online.is_fitted and online._last_trade_count == 600
+    assert not online.should_refit()
+
+    batch_db = get_test_db()
+    with batch_db._connection() as conn:
+        for i, (conf, pnl) in enumerate(outcomes):
+            conn.execute("""
+                INSERT INTO trades (trade_id, timestamp, instrument, direction,
+                    confidence_score, pnl, status, closed_at)
+                VALUES (?, ?, 'EUR_USD', 'LONG', ?, ?, 'CLOSED', ?)
+            """, (f"batch_{i}", "2026-01-01", conf, pnl, "2026-01-01"))
+    batch = ConfidenceCalibrator(batch_db)
+    assert batch.fit()["fitted"]
+
+    for raw in range(55, 96, 5):
+        assert abs(online.calibrate(raw) - batch.calibrate(raw)) <= 3, raw
+    print(f"  [PASS] Online matches batch: A={online.param_a:.2f}/{batch.param_a:.2f}, "
+          f"B={online.param_b:.2f}/{batch.param_b:.2f}")
+
+
+def test_online_persists_on_drift():
+    """Params are saved only past min trades and on drift; a reload resumes the state."""
+    db = get_test_db()
+    cal = ConfidenceCalibrator(db, online=True)
+    cal.min_trades_to_fit = 20
+
+    results = [cal.update(conf, pnl) for conf, pnl in make_outcomes(300)]
+    assert not any(r["persisted"] for r in results[:19])
+
+    with db._connection() as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM calibration_params").fetchone()[0]
+        active = conn.execute(
+            "SELECT param_a, param_b, training_trades FROM calibration_params WHERE active = 1"
+        ).fetchall()
+    saved = sum(r["persisted"] for r in results)
+    assert rows == saved and 0 < saved < len(results) // 2, saved
+    assert len(active) == 1
+    assert cal._drift() <= cal.drift_tolerance  # Unsaved drift stays within tolerance
+
+    # A restarted process picks up params, trade count and curvature
+    reloaded = ConfidenceCalibrator(db, online=True)
+    assert reloaded.is_fitted and reloaded._hessian is not None
+    assert reloaded._last_trade_count == active[0]["training_trades"]
+    assert abs(reloaded.calibrate(80) - cal.calibrate(80)) <= 1
+    reloaded.update(85, 25.0)
+    assert abs(reloaded.calibrate(80) - cal.calibrate(80)) <= 2
+    print(f"  [PASS] Online persists on drift: {saved} saves for 300 trades")
+
+
+def test_online_continues_batch_fit():
+    """Online updates start from a batch fit's params and curvature."""
+    db = get_test_db()
+    outcomes = make_outcomes(200, seed=4)
+    with db._connection() as conn:
+        for i, (conf, pnl) in enumerate(outcomes):
+            conn.execute("""
+                INSERT INTO trades (trade_id, timestamp, instrument, direction,
+                    confidence_score, pnl, status, closed_at)
+                VALUES (?, ?, 'EUR_USD', 'LONG', ?, ?, 'CLOSED', ?)
+            """, (f"online_{i}", "2026-01-01", conf, pnl, "2026-01-01"))
+
+    cal = ConfidenceCalibrator(db, online=True)
+    fit = cal.fit()
+    assert fit["fitted"] and cal._hessian[2] > 1.0
+
+    # A single extra trade barely moves a 200-trade fit
+    before = (cal.param_a, cal.param_b)
+    result = cal.update(90, -20.0)
+    assert result["training_trades"] == 201
+    assert abs(result["param_a"] - before[0]) < 0.5 and abs(result["param_b"] - before[1]) < 0.5
+    print("  [PASS] Online continues from batch fit")
+
+
 def cleanup():
     """Remove test database."""
     test_path = Path(__file__).parent / "test_calibrator.db"
@@ -160,6 +253,9 @@ if __name__ == "__main__":
         test_fit_with_data,
         test_refit_trigger,
         test_get_stats,
+        test_online_matches_batch_fit,
+        test_online_persists_on_drift,
+        test_online_continues_batch_fit,
     ]
 
     passed = 0
@@ -0,0 +1,134 @@
+"""Tests for the injectable clock and replaying production code on bar time."""
+
+import sys
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import clock
+from src.utils.clock import ReplayClock, SystemClock
+from src.trading.risk_manager import RiskManager
+from src.analysis.news_filter import NewsFilter
+from src.utils.instrument_profiles import is_in_session
+
+
+START = datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc)  # Monday
+
+
+def test_replay_clock():
+    """Replay time follows set/advance; naive now() matches datetime.now() semantics."""
+    replay = ReplayClock(START)
+    assert replay.now(timezone.utc) == START
+    assert replay.now() == datetime.fromtimestamp(START.timestamp())
+
+    replay.advance(timedelta(minutes=5))
+    replay.advance(60)
+    assert replay.now(timezone.utc) == START + timedelta(minutes=6)
+    replay.set(datetime(2026, 3, 2, 12, 0))  # Naive = UTC
+    assert replay.now(timezone.utc).hour == 12
+    replay.set_timestamp(START.timestamp())
+    assert replay.time() == START.timestamp()
+
+    assert isinstance(clock.get_clock(), SystemClock)
+    with clock.replay(START) as active:
+        assert clock.now(timezone.utc) == START and clock.time() == START.timestamp()
+        active.advance(3600)
+        assert clock.now(timezone.utc).hour == 7
+    assert isinstance(clock.get_clock(), SystemClock)
+    assert abs(clock.now(timezone.utc) - datetime.now(timezone.utc)) < timedelta(seconds=5)
+    print("  [PASS] ReplayClock set/advance and process-wide install")
+
+
+def test_thread_only_replay():
+    """A thread-only replay leaves other threads on the system clock."""
+    seen = {}
+
+    def other_thread():
+        seen["year"] = clock.now(timezone.utc).year
+
+    with clock.replay(datetime(2001, 1, 1, tzinfo=timezone.utc), thread_only=True):
+        assert clock.now(timezone.utc).year == 2001
+        worker = threading.Thread(target=other_thread)
+        worker.start()
+        worker.join()
+    assert seen["year"] == datetime.now(timezone.utc).year
+    assert clock.now(timezone.utc).year == datetime.now(timezone.utc).year
+    print("  [PASS] Thread-only replay is isolated")
+
+
+def test_production_code_on_replay_time():
+    """Risk resets, cooldowns, sessions and news windows follow the replay clock per bar."""
+    with tempfile.TemporaryDirectory() as tmp:
+        calendar = Path(tmp) / "news.json"
+        news_time = START + timedelta(hours=8, minutes=30)
+        calendar.write_text(json.dumps({"events": [{
+            "time": news_time.isoformat(), "currency": "USD", "impact": "HIGH", "name": "NFP",
+        }]}))
+        news = NewsFilter(calendar)
+        profile = {"sessions": ["07-16"], "allow_weekends": False}
+
+        bars = 3 * 288  # Three days of M5 bars
+        blocked_bars = 0
+        session_bars = 0
+        daily_resets = 0
+
+        started = time.perf_counter()
+        with clock.replay(START) as replay:
+            risk = RiskManager()
+            risk.set_cooldown_config(loss_streak_trigger=2, cooldown_minutes=30)
+            for bar in range(bars):
+                replay.set_timestamp(START.timestamp() + bar * 300)
+
+                if bar == 12:
+                    risk.record_trade_result(-10)
+                    risk.record_trade_result(-10)
+                    assert risk.is_in_cooldown()
+                if bar == 18:
+                    assert not risk.is_in_cooldown()  # 30 replayed minutes later
+
+                day_before = risk._last_daily_reset
+                risk._check_and_reset_if_needed()
+                daily_resets += risk._last_daily_reset != day_before
+
+                blocked_bars += news.should_avoid_trade("EUR_USD")[0]
+                session_bars += is_in_session(profile)
+        elapsed = time.perf_counter() - started
+
+        assert daily_resets == 3 and risk._daily_pnl == 0  # Tue, Wed, Thu 00:00 UTC
+        assert blocked_bars == 13  # +-30 min around the event, inclusive
+        assert session_bars == 3 * 9 * 12
+    print(f"  [PASS] Production code replayed at {bars / elapsed:,.0f} bars/s")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Clock ===\n")
+
+    tests = [
+        test_replay_clock,
+        test_thread_only_replay,
+        test_production_code_on_replay_time,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -8,7 +8,7 @@ from unittest.mock import MagicMock, patch
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.analysis.cross_asset_detector import (
-    CrossAssetDetector, DivergenceSignal,
+    CrossAssetDetector, CorrelationMatrix, DivergenceSignal,
     CORRELATION_PAIRS, DIVERGENCE_THRESHOLD_SIGMA,
 )
 from src.utils.database import Database
@@ -219,6 +219,99 @@ def test_db_logging():
     print("  [PASS] DB logging works")
 
 
+def make_timed_candles(instruments, n=60, seed=7, start_minute=0):
+    """Random-walk M5 candles with shared and individual noise, keyed by time."""
+    from datetime import datetime, timedelta, timezone
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 2, tzinfo=timezone.utc) + timedelta(minutes=start_minute)
+    prices = {inst: 1.0 + i for i, inst in enumerate(instruments)}
+    candles = {inst: [] for inst in instruments}
+    for bar in range(n):
+        common = rng.gauss(0, 0.001)
+        time_str = (start + timedelta(minutes=5 * bar)).isoformat()
+        for i, inst in enumerate(instruments):
+            prices[inst] *= 1 + common * (1 - 0.15 * i) + rng.gauss(0, 0.0006)
+            candles[inst].append({"time": time_str, "close": prices[inst]})
+    return candles
+
+
+def test_matrix_matches_pairwise():
+    """Matrix entries equal the per-pair correlation on the same aligned bars."""
+    db = get_test_db()
+    detector = CrossAssetDetector(MagicMock(), db)
+    instruments = [f"I{i}" for i in range(10)]
+    candles = make_timed_candles(instruments)
+
+    matrix = CorrelationMatrix()
+    matrix.load(candles)
+    values = matrix.matrix()
+    assert values.shape == (10, 10)
+    for a in instruments:
+        for b in instruments:
+            expected = detector._calculate_rolling_correlation(candles[a], candles[b])
+            assert math.isclose(matrix.correlation(a, b), expected, abs_tol=1e-9), (a, b)
+
+    # Misaligned histories are joined on timestamps, not positions
+    shifted = dict(candles)
+    shifted["I9"] = candles["I9"][:-3]
+    matrix.load(shifted)
+    assert matrix.last_time == candles["I9"][-4]["time"]
+    print("  [PASS] Correlation matrix matches pairwise correlation")
+
+
+def test_matrix_incremental_update():
+    """New bars update the matrix to the same values as a full rebuild."""
+    instruments = ["EUR_USD", "GBP_USD", "XAU_USD", "USD_JPY"]
+    full = make_timed_candles(instruments, n=80)
+    partial = {inst: c[:50] for inst, c in full.items()}
+
+    matrix = CorrelationMatrix()
+    assert matrix.sync(partial) == -1
+    for end in range(51, 81):
+        assert matrix.sync({inst: c[end - 50:end] for inst, c in full.items()}) == 1
+    assert matrix.sync({inst: c[30:] for inst, c in full.items()}) == 0
+
+    rebuilt = CorrelationMatrix()
+    rebuilt.load(full)
+    assert abs(matrix.matrix() - rebuilt.matrix()).max() < 1e-9
+
+    # A gap larger than the fetched candles forces a rebuild
+    later = make_timed_candles(instruments, n=50, start_minute=24 * 60)
+    assert matrix.sync(later) == -1
+    print("  [PASS] Incremental matrix updates match full rebuild")
+
+
+def test_matrix_mode_detector():
+    """Matrix mode gives the same signals and logs snapshots in one insert."""
+    eur_candles = make_correlated_candles(30, 1.1000, 0.002)
+    gbp_candles = make_divergent_candles(30, 1.3000, -0.002)
+    xau_candles = make_correlated_candles(30, 2650.0, 0.001, noise_seed=3)
+    by_name = {"EUR_USD": eur_candles, "GBP_USD": gbp_candles, "XAU_USD": xau_candles}
+
+    results = []
+    for matrix_mode in (False, True):
+        db = get_test_db()
+        client = MagicMock()
+        client.get_candles = MagicMock(side_effect=lambda inst, tf, count: by_name.get(inst, []))
+        detector = CrossAssetDetector(client, db, instruments=["USD_JPY"], matrix_mode=matrix_mode)
+        signals = detector.analyze("EUR_USD", "LONG")
+        with db._connection() as conn:
+            rows = conn.execute("SELECT pair2, divergence_sigma FROM correlation_snapshots").fetchall()
+        results.append(([s.to_dict() for s in signals], sorted(tuple(r) for r in rows)))
+
+    (pair_signals, pair_rows), (matrix_signals, matrix_rows) = results
+    assert matrix_signals == pair_signals and len(matrix_signals) == 2
+    assert [r[0] for r in matrix_rows] == [r[0] for r in pair_rows]
+    assert all(math.isclose(a[1], b[1], rel_tol=1e-9) for a, b in zip(matrix_rows, pair_rows))
+    assert detector.matrix.instruments == ["EUR_USD", "GBP_USD", "XAU_USD"]  # No USD_JPY candles
+
+    # Matrix is refreshed at most once per bar
+    calls = client.get_candles.call_count
+    detector.analyze("GBP_USD", "SHORT")
+    assert client.get_candles.call_count == calls
+    print(f"  [PASS] Matrix mode matches pairwise mode ({len(matrix_signals)} signals)")
+
+
 def cleanup():
     test_path = Path(__file__).parent / "test_cross_asset.db"
     if test_path.exists():
@@ -238,6 +331,9 @@ if __name__ == "__main__":
         test_caching,
         test_divergence_signal_to_dict,
         test_db_logging,
+        test_matrix_matches_pairwise,
+        test_matrix_incremental_update,
+        test_matrix_mode_detector,
     ]
 
     passed = 0
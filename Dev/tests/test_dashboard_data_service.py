@@ -0,0 +1,122 @@
+"""Tests for the cached dashboard data layer (incremental activity feed)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import Database
+from components.data_service import ActivityFeed
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_dashboard_data.db"
+
+
+def get_test_db():
+    """Create a fresh test database."""
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    return Database(TEST_DB_PATH)
+
+
+def log(db, activity_type, instrument="EUR_USD"):
+    return db.log_activity({
+        "activity_type": activity_type,
+        "instrument": instrument,
+        "details": {"n": 1},
+    })
+
+
+def test_write_marker_changes_on_write():
+    """Marker is stable without writes and changes after a commit."""
+    db = get_test_db()
+    before = db.get_last_write_marker()
+    assert db.get_last_write_marker() == before
+    log(db, "SCAN_START")
+    assert db.get_last_write_marker() != before
+    print("  [PASS] Write marker tracks commits")
+
+
+def test_activities_since():
+    """get_activities_since returns only newer rows, oldest first."""
+    db = get_test_db()
+    ids = [log(db, "ANALYZING") for _ in range(5)]
+
+    rows = db.get_activities_since(ids[1])
+    assert [r["id"] for r in rows] == ids[2:]
+    assert rows[0]["details"] == {"n": 1}
+
+    rows = db.get_activities_since(0, limit=2, activity_types=["ANALYZING"])
+    assert [r["id"] for r in rows] == ids[:2]
+    print("  [PASS] get_activities_since is incremental")
+
+
+def test_feed_tails_new_rows():
+    """Feed bootstraps once, then appends only new rows."""
+    db = get_test_db()
+    for _ in range(3):
+        log(db, "SCAN_START")
+
+    feed = ActivityFeed(db, maxlen=10)
+    assert feed.refresh() == 3
+    assert feed.refresh() == 0  # marker unchanged - no query
+
+    new_id = log(db, "TRADE_EXECUTED")
+    assert feed.refresh() == 1
+    assert feed.last_id == new_id
+
+    latest = feed.latest(limit=2)
+    assert latest[0]["id"] == new_id
+    assert len(latest) == 2
+    assert feed.latest(activity_types=["TRADE_EXECUTED"])[0]["id"] == new_id
+    print("  [PASS] Activity feed tails incrementally")
+
+
+def test_feed_catches_up_after_burst():
+    """A burst larger than the window keeps the newest rows only."""
+    db = get_test_db()
+    feed = ActivityFeed(db, maxlen=5)
+    log(db, "SCAN_START")
+    feed.refresh()
+
+    ids = [log(db, "ANALYZING") for _ in range(12)]
+    assert feed.refresh() == 12
+    assert [r["id"] for r in feed.latest(limit=5)] == list(reversed(ids[-5:]))
+    print("  [PASS] Activity feed catches up after burst")
+
+
+def cleanup():
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Dashboard Data Service ===\n")
+
+    tests = [
+        test_write_marker_changes_on_write,
+        test_activities_since,
+        test_feed_tails_new_rows,
+        test_feed_catches_up_after_burst,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,230 @@
+"""Tests for the service -> dashboard event stream."""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.event_stream import EventPublisher, EventSubscriber
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.01)
+
+
+def test_publish_and_subscribe():
+    """Subscribers receive events in order and fold them into a snapshot."""
+    with tempfile.TemporaryDirectory() as tmp:
+        stream_file = Path(tmp) / "stream.json"
+        publisher = EventPublisher(stream_file)
+        assert publisher.publish("status", {"state": "IGNORED"}) == 0  # Not started
+        assert publisher.start() and stream_file.exists()
+
+        subscriber = EventSubscriber(stream_file)
+        subscriber.start()
+        try:
+            wait_until(lambda: publisher.subscriber_count == 1)
+
+            started = time.monotonic()
+            assert subscriber.wait_for_events(since=0, timeout=0.2) == []
+            assert time.monotonic() - started >= 0.2
+
+            publisher.publish("status", {"state": "SCANNING"})
+            events = subscriber.wait_for_events(since=0, timeout=5)
+            assert [e["type"] for e in events] == ["status"]
+
+            for i in range(3):
+                publisher.publish("scan", {"instruments": ["EUR_USD"], "scans_today": i + 1})
+            publisher.publish("heartbeat", {"state": "WAITING", "uptime_seconds": 12})
+            wait_until(lambda: subscriber.last_seq == 5)
+
+            assert [e["seq"] for e in subscriber.events_since(1)] == [2, 3, 4, 5]
+            assert len(subscriber.events_since(1, types=("heartbeat",))) == 1
+
+            snapshot = subscriber.snapshot()
+            assert snapshot["connected"] and snapshot["last_seq"] == 5
+            assert snapshot["latest"]["status"]["data"] == {"state": "SCANNING"}
+            assert snapshot["latest"]["scan"]["data"]["scans_today"] == 3
+            assert len(snapshot["history"]["scan"]) == 3
+        finally:
+            subscriber.stop()
+            publisher.stop()
+        assert not stream_file.exists()
+    print("  [PASS] Publish/subscribe with snapshot and wait")
+
+
+def test_replay_and_publisher_restart():
+    """Late subscribers get buffered events; a restarted publisher is picked up."""
+    with tempfile.TemporaryDirectory() as tmp:
+        stream_file = Path(tmp) / "stream.json"
+        publisher = EventPublisher(stream_file, buffer_size=3)
+        publisher.start()
+        for i in range(5):
+            publisher.publish("position", {"type": "CLOSED", "trade_id": str(i)})
+
+        subscriber = EventSubscriber(stream_file)
+        subscriber.start()
+        try:
+            wait_until(lambda: subscriber.last_seq == 5)
+            assert [e["data"]["trade_id"] for e in subscriber.events_since(0)] == ["2", "3", "4"]
+
+            # Service restarts: new process, new port, sequence starts over
+            publisher.stop()
+            wait_until(lambda: not subscriber.connected)
+            restarted = EventPublisher(stream_file)
+            restarted.start()
+            try:
+                restarted.publish("status", {"state": "STARTING"})
+                events = subscriber.wait_for_events(since=5, timeout=10)
+                assert [e["data"] for e in events] == [{"state": "STARTING"}]
+                assert subscriber.connected and subscriber.last_seq == 1
+            finally:
+                restarted.stop()
+        finally:
+            subscriber.stop()
+    print("  [PASS] Replay on connect and publisher restart")
+
+
+def test_restart_past_last_seq_resets_state():
+    """A restarted publisher that already passed the dashboard's seq is replayed in full."""
+    with tempfile.TemporaryDirectory() as tmp:
+        stream_file = Path(tmp) / "stream.json"
+        publisher = EventPublisher(stream_file)
+        publisher.start()
+        subscriber = EventSubscriber(stream_file)
+        subscriber.start()
+        try:
+            publisher.publish("scan", {"run": "old"})
+            publisher.publish("execution", {"run": "old"})
+            wait_until(lambda: subscriber.last_seq == 2)
+            old_epoch = subscriber.epoch
+
+            publisher.stop()
+            wait_until(lambda: not subscriber.connected)
+            restarted = EventPublisher(stream_file)
+            restarted.start()
+            try:
+                for i in range(5):  # Before the dashboard reconnects
+                    restarted.publish("scan", {"run": "new", "i": i})
+                wait_until(lambda: subscriber.connected and subscriber.last_seq == 5, timeout=10)
+
+                assert subscriber.epoch not in (None, old_epoch)
+                assert [e["data"]["i"] for e in subscriber.events_since(0)] == [0, 1, 2, 3, 4]
+                assert len(subscriber.events_since(2, epoch=old_epoch)) == 5
+                snapshot = subscriber.snapshot()
+                assert set(snapshot["latest"]) == {"scan"}
+                assert [e["data"]["run"] for e in snapshot["history"]["scan"]] == ["new"] * 5
+                assert snapshot["history"]["execution"] == []
+            finally:
+                restarted.stop()
+        finally:
+            subscriber.stop()
+    print("  [PASS] Publisher restart past the last seq resets subscriber state")
+
+
+def test_stalled_subscriber_never_blocks_publish():
+    """A subscriber that stops reading is dropped; publish and other subscribers are unaffected."""
+    import socket
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stream_file = Path(tmp) / "stream.json"
+        publisher = EventPublisher(stream_file)
+        publisher.start()
+        for i in range(200):
+            publisher.publish("scan", {"scans_today": i})  # Replayed to the stalled client
+
+        stalled = socket.create_connection(("127.0.0.1", publisher.port))
+        stalled.sendall(b'{"since": 0}\n')  # ...then never reads
+        subscriber = EventSubscriber(stream_file)
+        subscriber.start()
+        try:
+            wait_until(lambda: publisher.subscriber_count == 2)
+            blob = "x" * 20000
+            slowest = 0.0
+            for i in range(1500):
+                started = time.perf_counter()
+                publisher.publish("heartbeat", {"blob": blob, "n": i})
+                slowest = max(slowest, time.perf_counter() - started)
+            assert slowest < 0.1, slowest
+
+            wait_until(lambda: publisher.subscriber_count == 1, timeout=10)
+            wait_until(lambda: subscriber.last_seq == 1700, timeout=10)
+        finally:
+            stalled.close()
+            subscriber.stop()
+            publisher.stop()
+    print(f"  [PASS] Stalled subscriber dropped (slowest publish {slowest * 1000:.1f} ms)")
+
+
+def test_service_publishes_events():
+    """The trading service pushes state changes and position events."""
+    import src.services.auto_trading_service as service_module
+    from src.services.auto_trading_service import AutoTradingService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stream_file = Path(tmp) / "stream.json"
+        publisher = EventPublisher(stream_file)
+        publisher.start()
+        original = service_module.event_publisher
+        service_module.event_publisher = publisher
+
+        subscriber = EventSubscriber(stream_file)
+        subscriber.start()
+        try:
+            wait_until(lambda: publisher.subscriber_count == 1)
+            service = AutoTradingService()
+            service._update_state("SCANNING")
+            service._update_state("SCANNING")  # Unchanged: not republished
+            service._update_state("WAITING")
+            service._handle_position_event({
+                "type": "CLOSED", "instrument": "EUR_USD", "direction": "LONG", "trade_id": "42",
+            })
+            wait_until(lambda: subscriber.last_seq == 3)
+
+            events = subscriber.events_since(0)
+            assert [e["type"] for e in events] == ["status", "status", "position"]
+            assert [e["data"]["state"] for e in events[:2]] == ["SCANNING", "WAITING"]
+            assert "scans_today" in events[0]["data"] and "config" in events[0]["data"]
+            assert events[2]["data"]["trade_id"] == "42"
+        finally:
+            service_module.event_publisher = original
+            subscriber.stop()
+            publisher.stop()
+    print("  [PASS] Service publishes status and position events")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Event Stream ===\n")
+
+    tests = [
+        test_publish_and_subscribe,
+        test_replay_and_publisher_restart,
+        test_restart_past_last_seq_resets_state,
+        test_stalled_subscriber_never_blocks_publish,
+        test_service_publishes_events,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,187 @@
+"""Tests for sandboxed execution of AI-generated filters."""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.upgrade.filter_registry import FilterRegistry
+from src.upgrade.filter_sandbox import FilterSandbox
+
+
+FILTER_TEMPLATE = '''import os
+import time
+from src.upgrade.base_filter import BaseFilter, FilterResult
+
+
+class {cls}(BaseFilter):
+    def __init__(self):
+        super().__init__(name="{name}", priority={priority})
+
+    def check(self, signal_data: dict) -> FilterResult:
+        {body}
+'''
+
+FILTERS = {
+    "fast_pass": (10, "return FilterResult(passed=True)"),
+    "gold_block": (45, 'return FilterResult(passed=signal_data["instrument"] != "XAU_USD", reason="no gold")'),
+    "hang": (30, "time.sleep(30)\n        return FilterResult(passed=True)"),
+    "crash": (40, "os._exit(1)"),
+    "sluggish": (50, "time.sleep(0.03)\n        return FilterResult(passed=True)"),
+    "raises": (60, 'raise ValueError("bad filter")'),
+}
+
+# Kills the worker process while it imports the file
+CRASH_ON_IMPORT = "import os\nos._exit(3)\n"
+
+
+def signal(instrument="EUR_USD"):
+    return {"instrument": instrument, "direction": "LONG", "confidence": 70,
+            "session": "london", "timestamp": datetime.now(timezone.utc), "technical": {}}
+
+
+def make_registry(tmp, names):
+    registry = FilterRegistry()
+    for name in list(registry._filters):
+        registry.unregister(name)
+    for name in names:
+        priority, body = FILTERS[name]
+        path = Path(tmp) / f"{name}.py"
+        path.write_text(FILTER_TEMPLATE.format(cls=name.title().replace("_", ""), name=name,
+                                               priority=priority, body=body))
+        registry._load_filter_from_file(path, "ai_generated")
+    return registry
+
+
+def test_sandbox_matches_in_process():
+    """Sandboxed chain results equal in-process results, including fail-fast."""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = make_registry(tmp, ["fast_pass", "gold_block", "raises"])
+        expected = [registry.run_all_filters(signal(inst)) for inst in ("EUR_USD", "XAU_USD")]
+
+        # Production deadline: spawn startup and the first load are not held to it
+        sandbox = FilterSandbox(workers=2, call_timeout_ms=250)
+        registry.use_sandbox(sandbox)
+        try:
+            assert sandbox.get_stats()["ready"] == 2
+            for inst, reference in zip(("EUR_USD", "XAU_USD"), expected):
+                result = registry.run_all_filters(signal(inst))
+                assert result.passed == reference.passed
+                assert result.blocking_filter == reference.blocking_filter
+                assert result.reason == reference.reason
+                assert [r.filter_name for r in result.filter_results] == \
+                    [r.filter_name for r in reference.filter_results]
+            assert registry.get("gold_block").stats.signals_blocked == 2
+            assert not sandbox.quarantined
+        finally:
+            registry.use_sandbox(None)
+    print("  [PASS] Sandboxed chain matches in-process chain")
+
+
+def test_deadline_quarantines_hanging_filter():
+    """A hanging or crashing filter costs one deadline, then is skipped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = make_registry(tmp, ["fast_pass", "hang", "crash", "gold_block"])
+        sandbox = FilterSandbox(workers=3, call_timeout_ms=300)
+        registry.use_sandbox(sandbox)
+        try:
+            start = time.perf_counter()
+            first = registry.run_all_filters(signal("XAU_USD"))
+            first_elapsed = time.perf_counter() - start
+
+            assert set(sandbox.quarantined) == {"hang", "crash"}
+            assert first.blocking_filter == "gold_block"  # Later filters still ran
+            assert first_elapsed < 1.5  # Replacements are spawned off the scan path
+
+            start = time.perf_counter()
+            second = registry.run_all_filters(signal("XAU_USD"))
+            assert time.perf_counter() - start < 0.25
+            assert second.blocking_filter == "gold_block"
+
+            deadline = time.monotonic() + 60
+            while sandbox.get_stats()["ready"] < 3 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert registry.get_stats()["sandbox"]["workers"] == 3
+            assert sandbox.get_stats()["ready"] == 3
+        finally:
+            registry.use_sandbox(None)
+    print(f"  [PASS] Hanging/crashing filters quarantined (first call {first_elapsed:.2f}s)")
+
+
+def test_crash_at_import_replaces_worker():
+    """A filter file that kills its worker on import is quarantined; the others keep running."""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = make_registry(tmp, ["gold_block"])
+        path = Path(tmp) / "import_crash.py"
+        path.write_text(CRASH_ON_IMPORT)
+        sandbox = FilterSandbox(workers=1, call_timeout_ms=300)
+        registry.use_sandbox(sandbox)
+        try:
+            sandbox.add_filter("import_crash", path)
+            calls = sandbox.check(["import_crash", "gold_block"], signal("XAU_USD"))
+            assert "import_crash" in sandbox.quarantined
+            assert [c.name for c in calls] == ["gold_block"]
+            assert all(c.error == "no sandbox worker available" for c in calls)
+
+            deadline = time.monotonic() + 60
+            while sandbox.get_stats()["ready"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            for _ in range(3):
+                calls = sandbox.check(["import_crash", "gold_block"], signal("XAU_USD"))
+                assert [(c.name, c.result.passed) for c in calls] == [("gold_block", False)]
+            assert sandbox.get_stats()["workers"] == 1
+        finally:
+            registry.use_sandbox(None)
+    print("  [PASS] Filter crashing at import quarantined, worker replaced")
+
+
+def test_latency_budget_overruns():
+    """Filters over budget on consecutive calls are quarantined."""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = make_registry(tmp, ["fast_pass", "sluggish"])
+        sandbox = FilterSandbox(workers=1, call_timeout_ms=2000, latency_budget_ms=10, max_budget_overruns=3)
+        registry.use_sandbox(sandbox)
+        try:
+            runs = [registry.run_all_filters(signal()) for _ in range(5)]
+            assert "sluggish" in sandbox.quarantined and "fast_pass" not in sandbox.quarantined
+            assert runs[0].filters_run == 2 and runs[-1].filters_run == 1
+
+            # Redeploying the filter lifts the quarantine
+            registry._load_filter_from_file(Path(tmp) / "sluggish.py", "ai_generated")
+            assert not sandbox.is_quarantined("sluggish")
+        finally:
+            registry.use_sandbox(None)
+    print("  [PASS] Latency budget overruns quarantine a filter")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Filter Sandbox ===\n")
+
+    tests = [
+        test_sandbox_matches_in_process,
+        test_deadline_quarantines_hanging_filter,
+        test_crash_at_import_replaces_worker,
+        test_latency_budget_overruns,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
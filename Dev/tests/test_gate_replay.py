@@ -0,0 +1,223 @@
+"""Tests for counterfactual gate/preset replay over setup labels."""
+
+import sys
+import time
+import random
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.gate_replay import GateReplay, GateVariant, gate_mask, ALL_GATES_MASK
+from src.utils.database import Database, SETUP_LABEL_GATES, setup_label_gates
+
+
+T0 = datetime(2026, 1, 5, tzinfo=timezone.utc)
+INSTRUMENTS = ["EUR_USD", "GBP_USD", "XAU_USD"]
+
+PRESETS = {
+    "CONSERVATIVE": {
+        "qt_a_plus_only": True, "qt_ai_validation": True, "qt_strict_sweep": True, "qt_strict_fvg": True,
+        "qt_htf_poi_gate": True, "qt_killzone_gate": True, "qt_min_rr_a_plus": 3.0, "qt_min_rr_a": 3.5,
+        "qt_min_rr_b": 4.0, "qt_max_daily_trades": 2, "qt_min_conf_a_plus": 70, "qt_min_conf_a": 80,
+        "qt_max_per_instrument": 1,
+    },
+    "AGGRESSIVE": {
+        "qt_a_plus_only": False, "qt_ai_validation": False, "qt_strict_sweep": False, "qt_strict_fvg": False,
+        "qt_htf_poi_gate": False, "qt_killzone_gate": False, "qt_min_rr_a_plus": 1.5, "qt_min_rr_a": 2.0,
+        "qt_min_rr_b": 2.5, "qt_max_daily_trades": 10, "qt_min_conf_a_plus": 40, "qt_min_conf_a": 50,
+        "qt_max_per_instrument": 3,
+    },
+}
+
+
+def make_labels(n, seed=3):
+    rng = random.Random(seed)
+    labels = []
+    for i in range(n):
+        row = {
+            "timestamp": (T0 + timedelta(minutes=5 * i)).isoformat(),
+            "instrument": INSTRUMENTS[i % 3],
+            "direction": rng.choice(["LONG", "SHORT"]),
+            "setup_grade": rng.choice(["A+", "A", "B", "NO_TRADE"]),
+            "confidence": rng.choice([None, rng.uniform(30, 95)]),
+            "risk_reward": rng.choice([None, rng.uniform(1.0, 5.0)]),
+        }
+        for gate in SETUP_LABEL_GATES:
+            row[gate] = rng.choice([1, 1, 1, 0, None])
+        labels.append(row)
+    return labels
+
+
+def make_trades(labels, every=7, seed=5):
+    rng = random.Random(seed)
+    trades = []
+    for row in labels[::every]:
+        entry = datetime.fromisoformat(row["timestamp"]) + timedelta(minutes=rng.randint(1, 10))
+        pnl = rng.choice([-10.0, 20.0])
+        trades.append({"timestamp": entry.isoformat(), "instrument": row["instrument"],
+                       "direction": row["direction"], "pnl": pnl, "risk_amount": 10.0})
+    return trades
+
+
+def reference_pass(row, variant):
+    """Per-row evaluation, as _evaluate_setup_v2 reads the recorded gates."""
+    enforced = variant.gates
+    if variant.min_rr:
+        enforced &= ~gate_mask(["rr_pass"])
+    for gate in SETUP_LABEL_GATES:
+        if enforced & gate_mask([gate]) and row[gate] == 0:
+            return False
+    grade = row["setup_grade"]
+    if grade not in variant.grades:
+        return False
+    rr_floor = variant.min_rr.get(grade, 0)
+    if rr_floor > 0 and (row["risk_reward"] is None or row["risk_reward"] < rr_floor):
+        return False
+    conf_floor = variant.min_confidence.get(grade, 0)
+    if conf_floor > 0 and (row["confidence"] is None or row["confidence"] < conf_floor):
+        return False
+    return True
+
+
+def test_pass_matrix_matches_reference():
+    """Vectorized pass matrix equals the per-row evaluation for every variant."""
+    labels = make_labels(600)
+    replay = GateReplay(labels, [])
+    base = GateVariant("BASE", min_confidence={"A+": 50, "A": 60})
+    variants = replay.gate_combinations(base, ["within_killzone", "htf_poi_gate", "sweep_valid", "fvg_valid"])
+    variants += [GateVariant.from_preset(name, values) for name, values in PRESETS.items()]
+    assert len(variants) == 16 + 2
+    assert variants[0].gates == ALL_GATES_MASK and variants[-1].name == "AGGRESSIVE"
+
+    passed = replay.passes(variants)
+    for v, variant in enumerate(variants):
+        expected = [reference_pass(row, variant) for row in labels]
+        assert list(passed[v]) == expected, variant.name
+    print(f"  [PASS] Pass matrix matches per-row reference ({len(variants)} variants)")
+
+
+def test_trade_matching_and_scores():
+    """Trades join to the latest same-side label in the window and score per variant."""
+    labels = make_labels(300)
+    trades = make_trades(labels)
+    trades.append({"timestamp": (T0 + timedelta(days=30)).isoformat(), "instrument": "EUR_USD",
+                   "direction": "LONG", "pnl": 99.0, "risk_amount": 10.0})  # No label within window
+    replay = GateReplay(labels, trades, match_window_minutes=15)
+    assert replay.matched_trades == len(trades) - 1
+
+    open_all = GateVariant("OPEN", gates=0, grades=("A+", "A", "B", "NO_TRADE"))
+    score = replay.evaluate([open_all])[0]
+    assert score.labels_passed == len(labels) and score.pass_rate == 100.0
+    assert score.trades == len(trades) - 1
+    assert score.total_pnl == round(sum(t["pnl"] for t in trades[:-1]), 2)
+    assert score.wins == sum(1 for t in trades[:-1] if t["pnl"] > 0)
+    assert score.avg_r == round(sum(t["pnl"] / 10.0 for t in trades[:-1]) / score.trades, 3)
+
+    strict = replay.evaluate([GateVariant("STRICT")])[0]
+    assert strict.trades < score.trades
+    assert strict.to_dict()["gates"] == list(SETUP_LABEL_GATES)
+    print(f"  [PASS] Trade join and scores ({score.trades} matched trades)")
+
+
+def test_daily_caps():
+    """Per-instrument and daily caps keep the earliest passing trades of each day."""
+    labels, trades = [], []
+    for day in range(2):
+        for i in range(9):
+            ts = T0 + timedelta(days=day, minutes=10 * i)
+            row = {"timestamp": ts.isoformat(), "instrument": INSTRUMENTS[i % 3], "direction": "LONG",
+                   "setup_grade": "A", "confidence": 80.0, "risk_reward": 3.0}
+            row.update({gate: 1 for gate in SETUP_LABEL_GATES})
+            labels.append(row)
+            trades.append({"timestamp": (ts + timedelta(minutes=1)).isoformat(), "instrument": row["instrument"],
+                           "direction": "LONG", "pnl": float(i + 1), "risk_amount": 1.0})
+    replay = GateReplay(labels, trades)
+
+    per_inst = replay.evaluate([GateVariant("I2", max_trades_per_instrument=2)])[0]
+    assert per_inst.trades == 2 * 6 and per_inst.total_pnl == 2 * sum(range(1, 7))
+    daily = replay.evaluate([GateVariant("D4", max_daily_trades=4)])[0]
+    assert daily.trades == 2 * 4 and daily.total_pnl == 2 * (1 + 2 + 3 + 4)
+    both = replay.evaluate([GateVariant("I1D2", max_daily_trades=2, max_trades_per_instrument=1)])[0]
+    assert both.trades == 2 * 2 and both.total_pnl == 2 * (1 + 2)
+    print("  [PASS] Per-instrument and daily caps")
+
+
+def test_many_variants_are_fast():
+    """All 2^9 gate subsets over 20k labels score in one quick pass."""
+    labels = make_labels(20000)
+    replay = GateReplay(labels, make_trades(labels))
+    variants = replay.gate_combinations(GateVariant("BASE", max_daily_trades=5))
+    assert len(variants) == 2 ** len(SETUP_LABEL_GATES)
+
+    start = time.perf_counter()
+    scores = replay.evaluate(variants)
+    elapsed = time.perf_counter() - start
+
+    assert len(scores) == len(variants)
+    assert scores[-1].labels_passed >= scores[0].labels_passed
+    assert elapsed < 5.0
+    print(f"  [PASS] {len(variants)} variants x {len(labels)} labels in {elapsed * 1000:.0f} ms")
+
+
+def test_database_labels():
+    """Labels from the database carry gates backfilled from details."""
+    db_path = Path(__file__).parent / "test_gate_replay.db"
+    if db_path.exists():
+        db_path.unlink()
+    try:
+        database = Database(db_path)
+        now = datetime.now(timezone.utc)
+        database.log_setup_label({
+            "timestamp": now.isoformat(), "instrument": "EUR_USD", "direction": "LONG",
+            "setup_grade": "A", "confidence": 70, "risk_reward": 3.0,
+            "within_killzone": True, "rr_pass": False,
+            "details": {"gates": {"news_clear": True, "htf_poi_gate": False}},
+        })
+        rows = database.get_setup_labels(days=1)
+        assert len(rows) == 1
+        assert rows[0]["within_killzone"] == 1 and rows[0]["rr_pass"] == 0
+        assert rows[0]["news_clear"] == 1 and rows[0]["htf_poi_gate"] == 0 and rows[0]["fvg_valid"] is None
+        assert setup_label_gates({"details": '{"raw_details": {"gates": {"sweep_valid": 1}}}'})["sweep_valid"] == 1
+
+        stats = database.get_smc_v2_gate_stats(hours=48)
+        assert stats["htf_poi_gate"]["fail_count"] == 1 and stats["fvg_valid"]["total"] == 0
+
+        replay = GateReplay.from_database(database, days=1)
+        assert replay.size == 1 and replay.matched_trades == 0
+        assert replay.evaluate([GateVariant("STRICT")])[0].labels_passed == 0
+        print("  [PASS] Database labels with backfilled gates")
+    finally:
+        if db_path.exists():
+            db_path.unlink()
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Gate Replay ===\n")
+
+    tests = [
+        test_pass_matrix_matches_reference,
+        test_trade_matching_and_scores,
+        test_daily_caps,
+        test_many_variants_are_fast,
+        test_database_labels,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,155 @@
+"""Tests for BM25 retrieval over knowledge and skill files."""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.knowledge_index import KnowledgeIndex, chunk_markdown, tokenize, estimate_tokens
+from src.core.settings_manager import SettingsManager
+
+
+FILES = {
+    "knowledge/liquidity.md": "# Liquidity\n\n## Sweeps\n\nA liquidity sweep takes out equal highs before reversal.\n\n"
+                              "## Session levels\n\nAsian range highs and lows attract London liquidity.",
+    "knowledge/fair_value_gap.md": "# Fair Value Gap\n\nAn FVG is a three candle imbalance.\n\n"
+                                   "## Entries\n\nEnter on the FVG retest after displacement.",
+    "knowledge/gold.md": "# Gold\n\nXAU_USD spreads widen at the NY open; use wider stops.",
+    "knowledge/README.md": "# Readme\n\nliquidity liquidity liquidity",
+    "skills/scalping.md": "# Scalping\n\nScalp liquidity sweeps on M5 with tight stops.",
+    "skills/swing_trading.md": "# Swing\n\nHold liquidity targets for days.",
+}
+
+
+def make_settings(tmp):
+    root = Path(tmp)
+    for rel, text in FILES.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    (root / "system_prompt.md").write_text("You are a trader.", encoding="utf-8")
+    (root / "config.json").write_text(json.dumps({
+        "skills": {"enabled": ["scalping"], "custom": []},
+        "knowledge": {"retrieval": True, "top_k": 3, "token_budget": 400},
+    }), encoding="utf-8")
+    return root
+
+
+def test_chunking_and_tokens():
+    """Markdown splits at headings; instrument names tokenize to their legs."""
+    chunks = chunk_markdown(FILES["knowledge/liquidity.md"])
+    assert [h for h, _ in chunks] == ["Sweeps", "Session levels"]
+    assert chunks[0][1].startswith("A liquidity sweep")
+    assert tokenize("XAU_USD sweep") == ["xau_usd", "xau", "usd", "sweep"]
+    assert tokenize("Naučene lekcije") == ["naučene", "lekcije"]
+
+    long_text = "# T\n\n" + "\n\n".join("word " * 50 for _ in range(10))
+    assert all(len(text) <= 600 for _, text in chunk_markdown(long_text, max_chars=600))
+    print("  [PASS] Chunking and tokenization")
+
+
+def test_search_ranks_relevant_chunks():
+    """BM25 returns matching chunks first and respects top-k, budget and filters."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_settings(tmp)
+        index = KnowledgeIndex({"knowledge": root / "knowledge", "skills": root / "skills"})
+
+        top = index.search("XAU_USD NY open stops", top_k=1)
+        assert [(c.name, c.heading) for c in top] == [("gold", "Gold")]
+        fvg = index.search("FVG retest entry")
+        assert fvg[0].name == "fair_value_gap" and fvg[0].heading == "Entries"
+        assert index.search("nothing matches zzz") == []
+
+        hits = index.search("liquidity", top_k=10, names={"skills": ["scalping"]})
+        assert {c.name for c in hits} == {"liquidity", "scalping"}
+        assert "README" not in {c.name for c in hits}
+        assert all(c.source == "knowledge" for c in index.search("liquidity", sources=["knowledge"]))
+
+        budget = estimate_tokens(hits[0].text)
+        assert sum(c.tokens for c in index.search("liquidity", top_k=10, token_budget=budget)) <= budget
+    print("  [PASS] Search ranking, filters and token budget")
+
+
+def test_incremental_refresh():
+    """Only changed files are re-chunked; edits and deletions show up in results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_settings(tmp)
+        index = KnowledgeIndex({"knowledge": root / "knowledge", "skills": root / "skills"})
+        assert index.refresh() == 5
+        assert index.refresh() == 0
+
+        lessons = root / "knowledge" / "lessons.md"
+        lessons.write_text("# Lessons\n\nAvoid GBP_JPY during rollover.", encoding="utf-8")
+        assert index.refresh() == 1
+        assert index.search("GBP_JPY rollover")[0].name == "lessons"
+
+        gold = root / "knowledge" / "gold.md"
+        gold.write_text("# Gold\n\nNothing about stops here, a longer text now.", encoding="utf-8")
+        os.utime(gold, (1, 1))
+        assert index.refresh() == 1
+        assert index.search("XAU_USD spreads") == []
+
+        gold.unlink()
+        assert index.refresh() == 1
+        stats = index.get_stats()
+        assert stats["files"] == 5 and stats["chunks"] == sum(len(c) for c in index._chunks.values())
+        assert all(count > 0 for count in index._df.values())
+    print("  [PASS] Incremental refresh by mtime")
+
+
+def test_settings_manager_prompt():
+    """Relevant prompt carries only matching chunks; retrieval off falls back to the full prompt."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_settings(tmp)
+        manager = SettingsManager(root)
+
+        full = manager.get_full_system_prompt()
+        relevant = manager.get_relevant_system_prompt("XAU_USD NY open")
+        assert relevant.startswith("You are a trader.")
+        assert "XAU_USD spreads widen" in relevant and "three candle imbalance" not in relevant
+        assert len(relevant) < len(full)
+        assert "Hold liquidity targets" not in manager.get_relevant_knowledge("liquidity targets days")
+
+        # Enabled skills are not mutated by repeated calls
+        manager.get_full_system_prompt()
+        assert manager.get_config("skills.enabled") == ["scalping"]
+
+        config = json.loads((root / "config.json").read_text())
+        config["knowledge"]["retrieval"] = False
+        (root / "config.json").write_text(json.dumps(config))
+        os.utime(root / "config.json", (2, 2))
+        assert manager.get_relevant_system_prompt("XAU_USD") == manager.get_full_system_prompt()
+    print("  [PASS] SettingsManager relevant prompt")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Knowledge Index ===\n")
+
+    tests = [
+        test_chunking_and_tokens,
+        test_search_ranks_relevant_chunks,
+        test_incremental_refresh,
+        test_settings_manager_prompt,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,178 @@
+"""Tests for hot-path latency instrumentation (histograms, spans, export)."""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import Database
+from src.utils.latency import (
+    LatencyHistogram,
+    LatencyRecorder,
+    Stopwatch,
+    timed,
+    merge_exported,
+)
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_latency.db"
+
+
+def get_test_db():
+    """Create a fresh test database."""
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    return Database(TEST_DB_PATH)
+
+
+def test_histogram_percentiles():
+    """Bucketed percentiles stay within bucket resolution of exact values."""
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(2.0, 1.0) for _ in range(5000))
+    hist = LatencyHistogram()
+    for v in values:
+        hist.record(v)
+
+    for q in (50, 95, 99):
+        exact = values[int(q / 100 * len(values)) - 1]
+        approx = hist.percentile(q)
+        assert exact * 0.95 <= approx <= exact * 1.25, (q, exact, approx)
+    assert hist.percentile(100) == max(values)
+    assert hist.count == 5000
+    print("  [PASS] Histogram percentiles within bucket error")
+
+
+def test_histogram_merge_roundtrip():
+    """Serialized histograms merge to the same result as one histogram."""
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 200):
+        (a if i % 2 else b).record(i * 0.7)
+        both.record(i * 0.7)
+
+    merged = LatencyHistogram.from_dict(a.to_dict())
+    merged.merge(LatencyHistogram.from_dict(b.to_dict()))
+    assert merged.summary() == both.summary()
+    print("  [PASS] Histogram merge/serialize roundtrip")
+
+
+def test_stopwatch_and_span():
+    """Laps record time since previous lap; spans record on exceptions too."""
+    rec = LatencyRecorder()
+    sw = Stopwatch("scan", recorder=rec)
+    time.sleep(0.02)
+    sw.lap("price")
+    sw.lap("spread")
+
+    try:
+        with rec.span("scan.news"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    snap = rec.snapshot(prefix="scan.")
+    assert set(snap) == {"scan.price", "scan.spread", "scan.news"}
+    assert snap["scan.price"]["p50_ms"] >= 15
+    assert snap["scan.spread"]["max_ms"] < 5
+    print("  [PASS] Stopwatch laps and spans")
+
+
+def test_timed_decorator():
+    """Decorator records every call and preserves the wrapped function."""
+    rec = LatencyRecorder()
+
+    @timed("orders.open_position", recorder=rec)
+    def open_position(units):
+        """Doc."""
+        return units * 2
+
+    assert open_position(3) == 6
+    open_position(4)
+    assert open_position.__name__ == "open_position"
+    assert rec.snapshot()["orders.open_position"]["count"] == 2
+    print("  [PASS] timed decorator")
+
+
+def test_export_and_merge():
+    """Windows are drained to stage_latency and merge back per stage."""
+    db = get_test_db()
+    rec = LatencyRecorder()
+    for ms in (1.0, 2.0, 3.0):
+        rec.record("smc.ltf.zones", ms)
+    assert rec.export(db) == 1
+
+    rec.record("smc.ltf.zones", 100.0)
+    rec.record("technical.indicators", 5.0)
+    assert rec.export(db) == 2
+    assert rec.export(db) == 0  # Empty window writes nothing
+
+    merged = merge_exported(db.get_stage_latency(hours=1))
+    assert merged["smc.ltf.zones"].count == 4
+    assert merged["smc.ltf.zones"].max_ms == 100.0
+    assert merged["technical.indicators"].count == 1
+    # Cumulative view is unaffected by draining
+    assert rec.snapshot()["smc.ltf.zones"]["count"] == 4
+    print("  [PASS] Export to stage_latency and merge")
+
+
+def test_maybe_export_interval():
+    """maybe_export only writes once the interval has elapsed."""
+    db = get_test_db()
+    rec = LatencyRecorder()
+    rec.record("scan.price", 1.0)
+    assert rec.maybe_export(interval_seconds=3600, database=db) == 0
+    assert rec.maybe_export(interval_seconds=0, database=db) == 1
+    print("  [PASS] maybe_export respects interval")
+
+
+def test_record_overhead():
+    """Recording must stay cheap enough for per-stage use."""
+    rec = LatencyRecorder()
+    n = 20000
+    start = time.perf_counter()
+    for i in range(n):
+        rec.record("scan.price", i % 50)
+    per_call_us = (time.perf_counter() - start) / n * 1e6
+    assert per_call_us < 50, f"record() too slow: {per_call_us:.1f}us"
+    print(f"  [PASS] record() overhead {per_call_us:.2f}us")
+
+
+def cleanup():
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Latency Instrumentation ===\n")
+
+    tests = [
+        test_histogram_percentiles,
+        test_histogram_merge_roundtrip,
+        test_stopwatch_and_span,
+        test_timed_decorator,
+        test_export_and_merge,
+        test_maybe_export_interval,
+        test_record_overhead,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
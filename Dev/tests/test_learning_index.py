@@ -0,0 +1,216 @@
+"""Tests for the LearningEngine in-memory pattern stats index."""
+
+import sys
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import Database
+from src.analysis.learning_engine import LearningEngine
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_learning_index.db"
+TEST_DB_PATH_2 = Path(__file__).parent / "test_learning_index_2.db"
+
+
+def get_engine(path=TEST_DB_PATH, fresh=True):
+    """Learning engine on an isolated database."""
+    if fresh and path.exists():
+        path.unlink()
+    return LearningEngine(Database(path))
+
+
+def make_analysis(i, instrument="EUR_USD", direction="LONG", pnl=10.0, regime="TRENDING", **kw):
+    """Minimal PostTradeAnalysis stand-in."""
+    return SimpleNamespace(
+        trade_id=f"T{i}",
+        instrument=instrument,
+        direction=direction,
+        pnl_pips=pnl,
+        pnl_amount=pnl * 10,
+        duration_hours=1.5,
+        market_regime=regime,
+        market_context=SimpleNamespace(
+            htf_trend="BULLISH", ltf_trend="BULLISH", trend_aligned=kw.get("aligned", True),
+            rsi_at_entry=55.0, atr_pips=8.0,
+        ),
+        entry_analysis=SimpleNamespace(
+            quality=SimpleNamespace(value="GOOD"), session=SimpleNamespace(value=kw.get("session", "LONDON")),
+            was_killzone=kw.get("killzone", True), day_of_week="Tuesday", with_trend=kw.get("with_trend", True),
+            at_fvg=True, at_order_block=False, at_support_resistance=False,
+        ),
+        excursion=SimpleNamespace(
+            mfe_pips=abs(pnl) + 5, mae_pips=4.0, mfe_as_multiple_of_risk=1.2, mae_as_multiple_of_risk=0.4,
+            reached_1r_profit=pnl > 0, reached_2r_profit=False, stop_hunt_detected=False,
+        ),
+        exit_analysis=SimpleNamespace(exit_type="TP" if pnl > 0 else "SL", was_optimal=True, reversed_after_exit=False),
+        outcome=SimpleNamespace(value="WIN" if pnl > 0 else "LOSS"),
+        was_good_trade=pnl > 0,
+        findings=[],
+        lessons=[],
+    )
+
+
+def random_analyses(n, seed=3):
+    rng = random.Random(seed)
+    return [
+        make_analysis(
+            i,
+            instrument=rng.choice(["EUR_USD", "XAU_USD"]),
+            direction=rng.choice(["LONG", "SHORT"]),
+            pnl=rng.choice([-12.0, -8.0, 6.0, 15.0, 22.0]),
+            regime=rng.choice(["TRENDING", "RANGING"]),
+            session=rng.choice(["LONDON", "NEW_YORK", "ASIAN"]),
+            killzone=rng.random() < 0.6,
+            with_trend=rng.random() < 0.7,
+        )
+        for i in range(n)
+    ]
+
+
+def db_rows(engine):
+    with engine.db._connection() as conn:
+        rows = conn.execute("""
+            SELECT pattern_type, pattern_value, instrument, direction, total_trades,
+                   winning_trades, losing_trades, ROUND(total_pnl_pips, 6),
+                   ROUND(avg_mfe_pips, 6), ROUND(avg_mae_pips, 6)
+            FROM pattern_stats
+        """).fetchall()
+    return sorted((tuple(r) for r in rows), key=repr)
+
+
+def test_index_matches_database():
+    """In-memory stats equal a fresh load from pattern_stats."""
+    engine = get_engine()
+    for a in random_analyses(60):
+        engine.learn_from_trade({}, a)
+
+    live = engine._get_relevant_stats("EUR_USD", "LONG", {})
+    reloaded = LearningEngine(engine.db)._get_relevant_stats("EUR_USD", "LONG", {})
+    assert set(live) == set(reloaded)
+    for key, s in live.items():
+        r = reloaded[key]
+        assert (s.total_trades, s.winning_trades, s.losing_trades) == (r.total_trades, r.winning_trades, r.losing_trades), key
+        assert abs(s.avg_win_pips - r.avg_win_pips) < 1e-9 and abs(s.total_pnl - r.total_pnl) < 1e-9, key
+    assert "instrument_EUR_USD" in live
+    assert not any("XAU_USD" in k for k in live if not k.startswith("instrument"))
+    print("  [PASS] Index matches database")
+
+
+def test_null_keys_not_duplicated():
+    """Global (NULL instrument/direction) rows are updated, not re-inserted."""
+    engine = get_engine()
+    for i in range(4):
+        engine.learn_from_trade({}, make_analysis(i, pnl=5.0 if i % 2 else -5.0))
+    with engine.db._connection() as conn:
+        rows = conn.execute(
+            "SELECT total_trades, winning_trades FROM pattern_stats WHERE pattern_type = 'instrument'"
+        ).fetchall()
+    assert [tuple(r) for r in rows] == [(4, 2)]
+    print("  [PASS] NULL-keyed patterns stay unique")
+
+
+def test_batch_equals_sequential():
+    """learn_from_trades writes exactly what per-trade learning writes."""
+    analyses = random_analyses(80, seed=11)
+    seq = get_engine(TEST_DB_PATH)
+    for a in analyses:
+        seq.learn_from_trade({}, a)
+    batch = get_engine(TEST_DB_PATH_2)
+    result = batch.learn_from_trades(analyses)
+
+    assert result["analyses_saved"] == 80
+    assert result["patterns_updated"] == 80 * 14
+    assert db_rows(seq) == db_rows(batch)
+    assert seq._get_recent_consecutive_losses("EUR_USD") == batch._get_recent_consecutive_losses("EUR_USD")
+    print("  [PASS] Batch learning equals sequential learning")
+
+
+def test_concurrent_writers_keep_increments():
+    """Two engines (processes) on one DB never lose each other's updates."""
+    a = get_engine()
+    b = get_engine(fresh=False)
+    a.learn_from_trade({}, make_analysis(1))
+    b.learn_from_trade({}, make_analysis(2))
+    a.learn_from_trade({}, make_analysis(3))  # a's index hasn't seen b's write
+    b._index.invalidate()
+    assert b._index.get(("instrument", "EUR_USD", None, None)).total_trades == 3
+    assert a._index.get(("instrument", "EUR_USD", None, None)).total_trades == 2  # Stale until refresh
+    a._index.invalidate()
+    assert a._index.get(("instrument", "EUR_USD", None, None)).total_trades == 3
+    print("  [PASS] Relative upserts survive concurrent engines")
+
+
+def test_insights_served_from_memory():
+    """After warmup, insight lookups make no database round trips."""
+    engine = get_engine()
+    for i in range(6):
+        engine.learn_from_trade({}, make_analysis(i, pnl=-10.0, with_trend=False))
+    engine.get_insights_for_trade("EUR_USD", "LONG", {"with_trend": False})
+
+    def no_db():
+        raise AssertionError("database touched during lookup")
+    engine.db._connection = no_db
+
+    insight = engine.get_insights_for_trade(
+        "EUR_USD", "LONG", {"with_trend": False, "market_regime": "TRENDING"}
+    )
+    assert not insight.should_trade
+    assert any("Counter-trend" in w for w in insight.warnings)
+    assert engine._get_recent_consecutive_losses("EUR_USD") == 6
+    assert engine.get_regime_adjustment("EUR_USD", "LONG", "TRENDING") == -20
+    print("  [PASS] Insights served from memory")
+
+
+def test_reanalyzed_trade_moves_to_front():
+    """Re-learning a trade (INSERT OR REPLACE) doesn't duplicate it in the streak."""
+    engine = get_engine()
+    engine.learn_from_trade({}, make_analysis(1, pnl=-5.0))
+    engine.learn_from_trade({}, make_analysis(2, pnl=8.0))
+    assert engine._get_recent_consecutive_losses("EUR_USD") == 0
+    engine.learn_from_trade({}, make_analysis(1, pnl=-5.0))
+    assert engine._index.recent_pnl("EUR_USD") == [-5.0, 8.0]
+    assert engine._get_recent_consecutive_losses("EUR_USD") == 1
+    print("  [PASS] Re-analyzed trade reorders recent P/L")
+
+
+def cleanup():
+    for path in (TEST_DB_PATH, TEST_DB_PATH_2):
+        if path.exists():
+            path.unlink()
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Learning Pattern Index ===\n")
+
+    tests = [
+        test_index_matches_database,
+        test_null_keys_not_duplicated,
+        test_batch_equals_sequential,
+        test_concurrent_writers_keep_increments,
+        test_insights_served_from_memory,
+        test_reanalyzed_trade_moves_to_front,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
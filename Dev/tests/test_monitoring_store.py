@@ -0,0 +1,164 @@
+"""Tests for the append-only monitoring store (errors and alerts)."""
+
+import sys
+import json
+import time
+import shutil
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import monitoring
+from src.utils.monitoring import ErrorTracker, AlertManager, ErrorCategory, AlertLevel
+
+
+TEST_DIR = Path(__file__).parent / "test_monitoring_data"
+
+
+def fresh_dir():
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    TEST_DIR.mkdir(parents=True)
+    return TEST_DIR
+
+
+def test_duplicates_are_folded():
+    """An error storm becomes one record with an occurrence count."""
+    tracker = ErrorTracker(fresh_dir())
+    for _ in range(50):
+        tracker.log_error(ConnectionError("MT5 disconnected"), {"scan": 1}, ErrorCategory.MT5_CONNECTION)
+    tracker.log_error(ValueError("bad config"), category=ErrorCategory.CONFIG)
+
+    recent = tracker.get_recent_errors(hours=1)
+    assert len(recent) == 2
+    assert recent[0].occurrences == 50 and recent[0].context == {"scan": 1}
+    assert tracker.count_recent_errors(hours=1) == 51
+
+    summary = tracker.get_error_summary()
+    assert summary["total"] == 51 and summary["last_hour"] == 51
+    assert summary["by_category"] == {"mt5_connection": 50, "config": 1}
+
+    # Outside the window a new record starts
+    tracker.dedup_seconds = 0
+    tracker.log_error(ConnectionError("MT5 disconnected"), category=ErrorCategory.MT5_CONNECTION)
+    assert len(tracker.get_recent_errors(hours=1)) == 3
+    print("  [PASS] Duplicate errors folded into one record")
+
+
+def test_append_cost_is_constant():
+    """Logging stays flat as history grows (no full-file rewrite)."""
+    tracker = ErrorTracker(fresh_dir(), dedup_seconds=0)
+
+    def batch(n):
+        start = time.perf_counter()
+        for i in range(n):
+            tracker.log_error(RuntimeError(f"e{i}"), category=ErrorCategory.ANALYSIS)
+        return time.perf_counter() - start
+
+    first = batch(200)
+    for i in range(0, 3000, 500):
+        tracker.store.append_many("errors", [
+            {"timestamp": datetime.now().isoformat(), "category": "analysis", "message": f"x{j}",
+             "context": {}, "resolved": 0}
+            for j in range(i, i + 500)
+        ])
+    second = batch(200)
+    assert second < first * 3 + 0.05, (first, second)
+    assert len(tracker.get_recent_errors(hours=1, limit=10)) == 10
+    print(f"  [PASS] Append cost flat ({first * 5:.2f} ms -> {second * 5:.2f} ms per error)")
+
+
+def test_rotation_caps_table():
+    """Rows beyond the cap are rotated out."""
+    tracker = ErrorTracker(fresh_dir(), dedup_seconds=0)
+    tracker.store.max_records = 100
+    original = monitoring.PRUNE_EVERY
+    monitoring.PRUNE_EVERY = 50
+    try:
+        for i in range(300):
+            tracker.log_error(RuntimeError(f"e{i}"))
+    finally:
+        monitoring.PRUNE_EVERY = original
+    errors = tracker.get_recent_errors(hours=1)
+    assert len(errors) <= 150
+    assert errors[-1].message == "e299"
+    print("  [PASS] Rotation caps stored rows")
+
+
+def test_time_window_and_retention():
+    """Queries use the time index; old rows are cleared by timestamp."""
+    tracker = ErrorTracker(fresh_dir())
+    old = (datetime.now() - timedelta(days=40)).isoformat()
+    tracker.store.append_many("errors", [
+        {"timestamp": old, "category": "database", "message": "old", "context": {}, "resolved": 0},
+    ])
+    tracker.log_error(RuntimeError("new"))
+    assert [e.message for e in tracker.get_recent_errors(hours=24)] == ["new"]
+    assert tracker.get_error_summary()["total"] == 2
+    assert tracker.clear_old_errors(days=30) == 1
+    assert tracker.resolve_all() == 1 and tracker.get_error_summary()["unresolved"] == 0
+    print("  [PASS] Time-window queries and retention")
+
+
+def test_alerts_and_legacy_migration():
+    """Legacy alerts.json is imported once; acknowledgements persist."""
+    data_dir = fresh_dir()
+    now = datetime.now()
+    legacy = [
+        {"timestamp": (now - timedelta(minutes=i)).isoformat(), "level": "warning",
+         "message": f"legacy {i}", "source": "risk_monitor", "acknowledged": i == 0}
+        for i in range(3)
+    ]
+    (data_dir / "alerts.json").write_text(json.dumps(legacy, indent=2))
+
+    manager = AlertManager(data_dir)
+    assert not (data_dir / "alerts.json").exists()
+    assert (data_dir / "alerts.json.migrated").exists()
+    assert len(manager.get_recent_alerts(hours=1)) == 3
+    assert len(manager.get_unacknowledged()) == 2
+
+    manager.send_alert(AlertLevel.CRITICAL, "MT5 disconnected", "mt5_monitor")
+    assert manager.get_recent_alerts(hours=1)[-1].message == "MT5 disconnected"
+    assert manager.acknowledge_all() == 3
+
+    reopened = AlertManager(data_dir)
+    assert reopened.get_unacknowledged() == []
+    assert len(reopened.get_recent_alerts(hours=1)) == 4
+    print("  [PASS] Alerts stored and legacy file migrated")
+
+
+def cleanup():
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Monitoring Store ===\n")
+
+    tests = [
+        test_duplicates_are_folded,
+        test_append_cost_is_constant,
+        test_rotation_caps_table,
+        test_time_window_and_retention,
+        test_alerts_and_legacy_migration,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
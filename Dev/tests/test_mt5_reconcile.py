@@ -0,0 +1,298 @@
+"""Tests for bulk MT5 history reconciliation and the incremental deal cursor."""
+
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import Database
+from src.utils.mt5_sync import fetch_history_incremental
+from src.trading import mt5_client as mt5_module
+from src.trading.mt5_client import MT5Client
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_mt5_reconcile.db"
+
+T0 = datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc)
+
+
+def get_db():
+    """Fresh isolated database."""
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    return Database(TEST_DB_PATH)
+
+
+def add_trade(database, trade_id, status="OPEN", close_reason=None, closed_at=None,
+              instrument="EUR_USD", direction="LONG", opened_at=T0, pnl=None):
+    with database._connection() as conn:
+        conn.execute("""
+            INSERT INTO trades (trade_id, timestamp, instrument, direction, entry_price,
+                                status, closed_at, close_reason, pnl)
+            VALUES (?, ?, ?, ?, 1.1, ?, ?, ?, ?)
+        """, (trade_id, opened_at.isoformat(), instrument, direction, status,
+              closed_at.isoformat() if closed_at else None, close_reason, pnl))
+
+
+def mt5_trade(trade_id, closed_at, instrument="EUR_USD", direction="LONG", pnl=12.5):
+    return {
+        "trade_id": trade_id, "instrument": instrument, "direction": direction,
+        "entry_price": 1.1, "exit_price": 1.101, "units": 1000, "pnl": pnl,
+        "pnl_percent": 0.1, "opened_at": (closed_at - timedelta(hours=1)).isoformat(),
+        "closed_at": closed_at.isoformat(), "commission": -0.5, "swap": 0.0,
+    }
+
+
+def rows(database):
+    with database._connection() as conn:
+        return {
+            r["trade_id"]: dict(r)
+            for r in conn.execute("SELECT trade_id, status, pnl, close_reason, notes FROM trades")
+        }
+
+
+def test_sync_from_mt5_bulk_semantics():
+    """Close OPEN, reconcile pending, fallback-match, insert, skip and dedupe."""
+    database = get_db()
+    add_trade(database, "100")                                                   # OPEN
+    add_trade(database, "101", "CLOSED", "SYNC_CLOSED_PENDING_RECON", T0)        # pending, same id
+    add_trade(database, "local-7", "CLOSED", "SYNC_CLOSED_NO_PNL", T0, direction="SHORT")
+    add_trade(database, "102", "CLOSED", "TP", T0, pnl=4.0)                      # already final
+
+    history = [
+        mt5_trade("100", T0 + timedelta(hours=2)),
+        mt5_trade("101", T0 + timedelta(hours=1)),
+        mt5_trade("555", T0 + timedelta(hours=3), direction="SHORT"),  # matches local-7
+        mt5_trade("556", T0 + timedelta(hours=4), direction="SHORT"),  # local-7 consumed -> insert
+        mt5_trade("102", T0),
+        mt5_trade("100", T0 + timedelta(hours=2)),                     # duplicate in input
+        mt5_trade("900", T0 - timedelta(days=3), instrument="XAU_USD"),
+    ]
+    result = database.sync_from_mt5(history)
+    after = rows(database)
+
+    assert result["total"] == 7
+    assert result["imported"] == 5 and result["skipped"] == 2 and result["errors"] == 0
+    assert set(result["trades_imported"]) == {"100", "101", "local-7", "556", "900"}
+    assert after["100"]["status"] == "CLOSED" and after["100"]["close_reason"] == "MT5_SYNC"
+    assert after["101"]["pnl"] == 12.5 and after["101"]["close_reason"] == "MT5_SYNC_RECON"
+    assert after["local-7"]["close_reason"] == "MT5_SYNC_RECON"
+    assert after["local-7"]["notes"].endswith("mt5_trade_id=555")
+    assert "555" not in after
+    assert after["556"]["close_reason"] == "MT5_SYNC"
+    assert after["102"]["pnl"] == 4.0
+    assert after["900"]["notes"].startswith("Synced from MT5. Commission: -0.5")
+
+    again = database.sync_from_mt5(history)
+    assert again["imported"] == 1 and again["trades_imported"] == ["555"]  # local-7 no longer pending
+    print("  [PASS] sync_from_mt5 bulk semantics")
+
+
+def test_fallback_respects_window():
+    """Pending rows more than 12h away are not matched."""
+    database = get_db()
+    add_trade(database, "local-1", "CLOSED", "SYNC_CLOSED_PENDING_RECON", T0)
+    result = database.sync_from_mt5([mt5_trade("777", T0 + timedelta(hours=13))])
+    assert result["trades_imported"] == ["777"]
+    assert rows(database)["local-1"]["pnl"] is None
+    print("  [PASS] Fallback match limited to 12h")
+
+
+class RacingDatabase(Database):
+    """Runs `race` (another writer) between sync_from_mt5's planning read and its writes."""
+
+    race = None
+
+    @contextmanager
+    def _connection(self):
+        race = self.race
+        if race and getattr(self, "_planned", False):
+            self.race = None
+            race(self)
+        self._planned = race is not None
+        with super()._connection() as conn:
+            yield conn
+
+
+def test_concurrent_writer_does_not_roll_back_batch():
+    """A trade_id inserted concurrently is skipped; the rest of the batch still lands."""
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    database = RacingDatabase(TEST_DB_PATH)
+    add_trade(database, "200")                                    # OPEN
+
+    def other_writer(db_):
+        add_trade(db_, "901", "CLOSED", "MT5_SYNC", T0, pnl=1.0)  # Same id as an insert
+        with db_._connection() as conn:                           # Closed by someone else
+            conn.execute("UPDATE trades SET status = 'CLOSED' WHERE trade_id = '200'")
+
+    database.race = other_writer
+    result = database.sync_from_mt5([
+        mt5_trade("200", T0 + timedelta(hours=1)),
+        mt5_trade("901", T0 + timedelta(hours=2)),
+        mt5_trade("902", T0 + timedelta(hours=3)),
+    ])
+    after = rows(database)
+
+    assert result["errors"] == 0
+    assert result["imported"] == 1 and result["trades_imported"] == ["902"]
+    assert result["skipped"] == 2
+    assert after["901"]["pnl"] == 1.0 and after["902"]["close_reason"] == "MT5_SYNC"
+    assert after["200"]["pnl"] is None
+    print("  [PASS] Concurrent writer: conflicts skipped, batch kept")
+
+
+def test_bulk_sync_is_fast():
+    """A 90-day import of a few thousand trades stays well under a second."""
+    database = get_db()
+    history = [mt5_trade(str(10_000 + i), T0 + timedelta(minutes=30 * i)) for i in range(4000)]
+    for i in range(0, 4000, 2):
+        add_trade(database, str(10_000 + i))
+    start = time.perf_counter()
+    result = database.sync_from_mt5(history)
+    elapsed = time.perf_counter() - start
+    assert result["imported"] == 4000
+    assert elapsed < 1.0, f"{elapsed:.2f}s"
+    print(f"  [PASS] Bulk sync of 4000 trades in {elapsed * 1000:.0f} ms")
+
+
+def test_reconcile_pending_single_fetch():
+    """Pending rows are reconciled from one history call with an explicit window."""
+    database = get_db()
+    add_trade(database, "201", "CLOSED", "SYNC_CLOSED_PENDING_RECON", T0 + timedelta(days=2),
+              opened_at=T0 + timedelta(days=2))
+    add_trade(database, "202", "CLOSED", "SYNC_CLOSED_ESTIMATED_SL", T0 + timedelta(days=3),
+              opened_at=T0 + timedelta(days=3))
+    add_trade(database, "203", "CLOSED", "SYNC_CLOSED_NO_PNL", T0 + timedelta(days=3))
+
+    calls = []
+
+    class FakeClient:
+        def get_history(self, days=30, from_date=None, to_date=None):
+            calls.append(from_date)
+            return [mt5_trade("201", T0 + timedelta(days=2)), mt5_trade("202", T0 + timedelta(days=3), pnl=-3.0)]
+
+        def get_closed_trade_by_position(self, *a, **kw):
+            raise AssertionError("per-position lookup used")
+
+    assert database.reconcile_pending_closed_with_mt5(FakeClient(), lookback_days=3650) == 2
+    assert len(calls) == 1
+    assert calls[0] == T0 - timedelta(days=1)  # Oldest pending open time minus a day
+    after = rows(database)
+    assert after["202"]["pnl"] == -3.0 and after["202"]["close_reason"] == "MT5_SYNC_RECON"
+    assert after["203"]["pnl"] is None
+
+    assert database.reconcile_pending_closed_with_mt5(FakeClient(), lookback_days=3650) == 0
+    print("  [PASS] Pending reconciliation uses one history fetch")
+
+
+def _deal(ticket, position, entry, t, price, profit=0.0, dtype=0):
+    return SimpleNamespace(
+        ticket=ticket, position_id=position, entry=entry, time=int(t.timestamp()),
+        price=price, volume=0.1, profit=profit, commission=-0.25, swap=0.0,
+        symbol="EURUSD", comment="", type=dtype,
+    )
+
+
+def fake_client(deals):
+    """MT5Client driven by an in-memory deal list."""
+    requests = []
+
+    def history_deals_get(*args, position=None):
+        requests.append((args, position))
+        if position is not None:
+            return [d for d in deals if d.position_id == position]
+        since, until = args
+        return [d for d in deals if since.timestamp() <= d.time <= until.timestamp()]
+
+    mt5_module.mt5 = SimpleNamespace(
+        history_deals_get=history_deals_get,
+        symbol_info=lambda s: SimpleNamespace(trade_contract_size=100000.0),
+    )
+    client = MT5Client.__new__(MT5Client)
+    client._connected = False
+    client._symbol_cache = {}
+    client._ensure_connected = lambda: True
+    return client, requests
+
+
+def test_incremental_cursor():
+    """History is read from the stored cursor; old entries are completed per position."""
+    original_mt5 = mt5_module.mt5
+    try:
+        database = get_db()
+        now = datetime.now(timezone.utc)
+        deals = [
+            _deal(1, 11, 0, now - timedelta(days=10), 1.10),
+            _deal(2, 11, 1, now - timedelta(days=9), 1.11, profit=10.0),
+            _deal(3, 12, 0, now - timedelta(days=5), 1.12),
+            _deal(5, 13, 0, now - timedelta(days=2), 1.12),
+        ]
+        client, requests = fake_client(deals)
+
+        first = fetch_history_incremental(client, database=database, initial_days=30)
+        assert [t["trade_id"] for t in first] == ["11"]
+        cursor = database.get_sync_state("mt5_history_hwm")
+        assert cursor == datetime.fromtimestamp(deals[3].time, tz=timezone.utc).isoformat()
+
+        # Position 12 closes; its entry is older than cursor - overlap
+        deals.append(_deal(4, 12, 1, now - timedelta(hours=1), 1.13, profit=-4.0))
+        requests.clear()
+        second = fetch_history_incremental(client, database=database, overlap=timedelta(hours=1))
+        assert [t["trade_id"] for t in second] == ["12"]
+        assert second[0]["opened_at"] == datetime.fromtimestamp(deals[2].time, tz=timezone.utc).isoformat()
+        assert second[0]["pnl"] == round(-4.0 - 0.5, 2)
+        assert requests[0][0][0] == datetime.fromisoformat(cursor) - timedelta(hours=1)
+        assert requests[1][1] == 12
+
+        # Nothing new: only the boundary deal is re-read and the cursor stays put
+        assert [t["trade_id"] for t in fetch_history_incremental(
+            client, database=database, overlap=timedelta(0))] == ["12"]
+        assert database.get_sync_state("mt5_history_hwm") == datetime.fromtimestamp(
+            deals[4].time, tz=timezone.utc).isoformat()
+    finally:
+        mt5_module.mt5 = original_mt5
+    print("  [PASS] Incremental cursor fetches only new deals")
+
+
+def cleanup():
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+
+
+if __name__ == "__main__":
+    print("\n=== Testing MT5 Bulk Reconciliation ===\n")
+
+    tests = [
+        test_sync_from_mt5_bulk_semantics,
+        test_fallback_respects_window,
+        test_concurrent_writer_does_not_roll_back_batch,
+        test_bulk_sync_is_fast,
+        test_reconcile_pending_single_fetch,
+        test_incremental_cursor,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
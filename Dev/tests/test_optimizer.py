@@ -0,0 +1,218 @@
+"""Tests for the successive-halving parameter optimizer."""
+
+import sys
+import json
+import math
+import random
+import tempfile
+from pathlib import Path
+from datetime import datetime, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtesting.engine import SMCBacktestEngine, BacktestConfig, TradeDirection
+from src.backtesting.optimizer import ParameterOptimizer, sample_params, SEARCH_SPACE
+from src.core.tuning_config import SettingBounds
+
+
+T0 = 1767571200  # 2026-01-05 00:00 UTC (Monday)
+
+
+def make_m5(n, seed=3, base=1.1, drift=0.00004, vol=0.0003):
+    rng = random.Random(seed)
+    candles, price = [], base
+    for i in range(n):
+        close = price + drift + rng.gauss(0, vol)
+        ts = T0 + 300 * i
+        candles.append({
+            "timestamp": ts,
+            "time": datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat(),
+            "open": price, "close": close,
+            "high": max(price, close) + vol / 2, "low": min(price, close) - vol / 2,
+        })
+        price = close
+    return candles
+
+
+def aggregate(m5, k):
+    return [{"timestamp": g[0]["timestamp"], "time": g[0]["time"], "open": g[0]["open"],
+             "close": g[-1]["close"], "high": max(c["high"] for c in g), "low": min(c["low"] for c in g)}
+            for g in (m5[j:j + k] for j in range(0, len(m5) - k + 1, k))]
+
+
+class ScriptedEngine(SMCBacktestEngine):
+    """Engine entering LONG every `signal_interval` bars with max_sl_pips / target_rr exits."""
+
+    def __init__(self):
+        pass
+
+    def _evaluate_bar(self, feed, bar, state, config):
+        if config.min_confidence > 85:
+            return None  # Never trades
+        price = feed.m5_candles[bar]["close"]
+        sl = config.max_sl_pips * 0.0001
+        state.signals_generated += 1
+        return {
+            "direction": TradeDirection.LONG, "entry_price": price,
+            "stop_loss": price - sl, "take_profit": price + sl * config.target_rr,
+            "confidence": 80, "setup_grade": "A", "htf_bias": "BULLISH", "sweep_type": "",
+            "has_choch": True, "has_bos": False, "has_displacement": False, "fvg_count": 0, "ob_count": 0,
+        }
+
+
+SPACE = {
+    "min_confidence": SettingBounds(60, 90, 68, "", "int"),
+    "target_rr": SettingBounds(1.3, 3.0, 2.0, ""),
+    "max_sl_pips": SettingBounds(5.0, 20.0, 10.0, ""),
+    "signal_interval": SettingBounds(6, 24, 12, "", "int"),
+}
+
+
+class StatefulEngine(ScriptedEngine):
+    """Records the ISI database each run sees, then leaves a row behind in it."""
+
+    runs = []
+
+    def run(self, h4, h1, m5, config, **kwargs):
+        import src.utils.database as db_module
+        database = db_module.Database()
+        with database._connection() as conn:
+            seen = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+            conn.execute("INSERT INTO trades (trade_id, timestamp, instrument, direction, status) "
+                         "VALUES (?, '2026-01-05', 'EUR_USD', 'LONG', 'CLOSED')", (f"isi_{len(self.runs)}",))
+        self.runs.append((Path(database.db_path), seen))
+        return super().run(h4, h1, m5, config, **kwargs)
+
+
+def make_optimizer(workers=1, cache_path=None):
+    m5 = make_m5(288 * 10)
+    config = BacktestConfig(
+        instrument="EUR_USD", timeframe="M5", start_date=datetime(2026, 1, 5), end_date=datetime(2026, 1, 15),
+        check_session=False, check_regime=False, limit_entry_enabled=False, breakeven_sl_enabled=False,
+        smc_v2_parity=False, enforce_strict_profile=False, max_sl_pips=10.0, target_rr=2.0, signal_interval=12,
+    )
+    return ParameterOptimizer(aggregate(m5, 48), aggregate(m5, 12), m5, config, space=SPACE,
+                              objective="return", min_trades=6, workers=workers,
+                              cache_path=cache_path, engine_class=ScriptedEngine)
+
+
+def test_sampling_within_bounds():
+    """Sampled parameters respect bounds and types."""
+    rng = random.Random(1)
+    for _ in range(50):
+        params = sample_params(SEARCH_SPACE, rng)
+        for name, bounds in SEARCH_SPACE.items():
+            if bounds.setting_type == "bool":
+                assert isinstance(params[name], bool)
+            else:
+                assert bounds.is_valid(params[name]), (name, params[name])
+                if bounds.setting_type == "int":
+                    assert isinstance(params[name], int)
+    print("  [PASS] Sampling within bounds")
+
+
+def test_successive_halving_prunes():
+    """27 candidates race on 1/9, 1/3 and the full period; the best finalist wins."""
+    optimizer = make_optimizer()
+    result = optimizer.run(candidates=27, eta=3, rungs=3, seed=5)
+
+    assert result.rungs == [1 / 9, 1 / 3, 1]
+    by_rung = [sum(1 for t in result.trials if t.rung >= r) for r in range(3)]
+    assert by_rung == [27, 9, 3], by_rung
+    assert result.evaluations == 39 and result.cache_hits == 0
+
+    # Never-trading candidates are pruned first
+    assert all(t.rung == 0 for t in result.trials if t.params["min_confidence"] > 85)
+    best = result.best
+    finalists = [t for t in result.trials if t.rung == 2]
+    assert best.score == max(t.score for t in finalists)
+
+    # The reported score is the full-period result of that config
+    config = optimizer.config_for(best.params)
+    m5, h1, h4 = optimizer.data[2], optimizer.data[1], optimizer.data[0]
+    direct = ScriptedEngine().run(h4, h1, m5, config)
+    from src.backtesting.metrics import MetricsCalculator
+    assert math.isclose(MetricsCalculator().calculate(direct).total_return_pct, best.score)
+    print(f"  [PASS] Successive halving: 27/9/3 candidates, best return {best.score:.2f}%")
+
+
+def test_cache_and_pool():
+    """A rerun is served from the on-disk cache; pooled runs match inline runs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "cache.json"
+        first = make_optimizer(workers=1, cache_path=cache_path).run(candidates=9, seed=8)
+        assert cache_path.exists() and first.evaluations == 9 + 3 + 1
+
+        again = make_optimizer(workers=1, cache_path=cache_path).run(candidates=9, seed=8)
+        assert again.evaluations == 0 and again.cache_hits == first.evaluations
+        assert again.best.params == first.best.params
+
+    pooled = make_optimizer(workers=2).run(candidates=9, seed=8)
+    assert pooled.best.params == first.best.params
+    assert pooled.best.score == first.best.score
+    print("  [PASS] Cache by config hash and process pool")
+
+
+def test_isi_db_per_evaluation():
+    """Each ISI-enabled run starts from an empty temp DB that is deleted afterwards."""
+    import src.utils.database as db_module
+    main_db_path = db_module._db_path
+
+    optimizer = make_optimizer()
+    optimizer.base_config.isi_calibrator = True
+    optimizer.engine_class = StatefulEngine
+    optimizer.run(candidates=4, eta=2, rungs=2, seed=5)
+
+    paths = [path for path, _ in StatefulEngine.runs]
+    assert len(StatefulEngine.runs) == 6
+    assert all(seen == 0 for _, seen in StatefulEngine.runs)
+    assert len(set(paths)) == len(paths) and not any(p.exists() for p in paths)
+    assert db_module._db_path == main_db_path
+    print("  [PASS] Fresh ISI database per evaluation")
+
+
+def test_concurrent_sweeps_merge_cache():
+    """Two sweeps sharing a cache file keep each other's evaluations."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "cache.json"
+        first = make_optimizer(cache_path=cache_path)
+        second = make_optimizer(cache_path=cache_path)  # Loaded before the first one saves
+
+        a = first.run(candidates=4, seed=1)
+        b = second.run(candidates=4, seed=2)
+        cached = json.loads(cache_path.read_text())
+        assert set(first.cache) | set(second.cache) == set(cached)
+        assert len(cached) > max(a.evaluations, b.evaluations)
+        assert [p.name for p in Path(tmp).iterdir()] == ["cache.json"]
+    print("  [PASS] Concurrent sweeps merge the shared cache")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Parameter Optimizer ===\n")
+
+    tests = [
+        test_sampling_within_bounds,
+        test_successive_halving_prunes,
+        test_cache_and_pool,
+        test_isi_db_per_evaluation,
+        test_concurrent_sweeps_merge_cache,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
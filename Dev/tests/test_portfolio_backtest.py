@@ -0,0 +1,229 @@
+"""Tests for the shared-timeline portfolio backtest."""
+
+import sys
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from datetime import datetime, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtesting.engine import SMCBacktestEngine, BacktestConfig, TradeDirection
+from src.backtesting.portfolio import (
+    PortfolioBacktester, PortfolioBacktestConfig, currency_legs,
+    LIMIT_MAX_POSITIONS, LIMIT_DAILY_TRADES, LIMIT_DAILY_DRAWDOWN, LIMIT_CURRENCY_EXPOSURE,
+)
+
+
+T0 = 1767571200  # 2026-01-05 00:00 UTC (Monday)
+DAY_BARS = 288
+
+
+def make_m5(n, seed=1, base=1.1, vol=0.0004):
+    rng = random.Random(seed)
+    candles, price = [], base
+    for i in range(n):
+        close = price + rng.gauss(0, vol)
+        ts = T0 + 300 * i
+        candles.append({
+            "timestamp": ts,
+            "time": datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat(),
+            "open": price, "close": close,
+            "high": max(price, close) + vol / 2, "low": min(price, close) - vol / 2,
+        })
+        price = close
+    return candles
+
+
+def aggregate(m5, k):
+    return [{"timestamp": g[0]["timestamp"], "time": g[0]["time"], "open": g[0]["open"],
+             "close": g[-1]["close"], "high": max(c["high"] for c in g), "low": min(c["low"] for c in g)}
+            for g in (m5[j:j + k] for j in range(0, len(m5) - k + 1, k))]
+
+
+def feed_data(m5):
+    return (aggregate(m5, 48), aggregate(m5, 12), m5)
+
+
+def bt_config(instrument, **kwargs):
+    settings = dict(instrument=instrument, timeframe="M5", start_date=datetime(2026, 1, 5),
+                    end_date=datetime(2026, 2, 1), check_session=False, check_regime=False,
+                    limit_entry_enabled=False, breakeven_sl_enabled=False)
+    settings.update(kwargs)
+    return BacktestConfig(**settings)
+
+
+class ScriptedEngine(SMCBacktestEngine):
+    """Engine whose SMC analysis is replaced by a fixed entry plan."""
+
+    def __init__(self, every=40, direction="LONG", sl_pips=10, tp_pips=20):
+        self.every = every
+        self.direction = direction
+        self.sl_pips = sl_pips
+        self.tp_pips = tp_pips
+        self.evaluated = 0
+
+    def _evaluate_bar(self, feed, bar, state, config):
+        self.evaluated += 1
+        if bar % self.every:
+            return None
+        price = feed.m5_candles[bar]["close"]
+        sign = 1 if self.direction == "LONG" else -1
+        state.signals_generated += 1
+        return {
+            "direction": TradeDirection(self.direction), "entry_price": price,
+            "stop_loss": price - sign * self.sl_pips * 0.0001,
+            "take_profit": price + sign * self.tp_pips * 0.0001,
+            "confidence": 80, "setup_grade": "A", "htf_bias": "BULLISH", "sweep_type": "",
+            "has_choch": True, "has_bos": False, "has_displacement": False, "fvg_count": 0, "ob_count": 0,
+        }
+
+
+def test_single_instrument_matches_engine():
+    """A one-instrument portfolio without limits reproduces SMCBacktestEngine.run()."""
+    m5 = make_m5(3000)
+    config = bt_config("EUR_USD")
+    single = ScriptedEngine().run(*feed_data(m5), config)
+    portfolio = PortfolioBacktester(ScriptedEngine()).run(
+        {"EUR_USD": feed_data(m5)},
+        PortfolioBacktestConfig([config], max_concurrent_positions=1, max_daily_drawdown=None),
+    )
+    assert len(single.trades) > 10
+    assert [t.to_dict() for t in portfolio.trades] == [t.to_dict() for t in single.trades]
+    assert abs(portfolio.final_equity - single.final_equity) < 1e-6
+    assert portfolio.results["EUR_USD"].signals_generated == single.signals_generated
+    print(f"  [PASS] Single-instrument portfolio matches engine ({len(single.trades)} trades)")
+
+
+def test_shared_limits():
+    """Concurrent positions and daily trades are capped across instruments on shared equity."""
+    instruments = ["EUR_USD", "GBP_USD", "XAU_USD", "USD_JPY"]
+    data = {inst: feed_data(make_m5(3 * DAY_BARS, seed=k)) for k, inst in enumerate(instruments)}
+    config = PortfolioBacktestConfig(
+        [bt_config(inst) for inst in instruments],
+        max_concurrent_positions=2, max_daily_trades=5, max_daily_drawdown=None,
+    )
+    result = PortfolioBacktester(ScriptedEngine(every=20, sl_pips=6, tp_pips=8)).run(data, config)
+
+    assert result.peak_positions == 2
+    assert max(p["positions"] for p in result.equity_curve) <= 2
+    assert result.limit_skips.get(LIMIT_MAX_POSITIONS, 0) > 0
+    assert result.limit_skips.get(LIMIT_DAILY_TRADES, 0) > 0
+    per_day = {}
+    for t in result.trades:
+        per_day[t.entry_time[:10]] = per_day.get(t.entry_time[:10], 0) + 1
+    assert max(per_day.values()) <= 5
+    assert abs(result.final_equity - (10000.0 + sum(t.pnl for t in result.trades))) < 1e-6
+    assert sum(len(r.trades) for r in result.results.values()) == len(result.trades)
+    metrics_input = result.to_backtest_result()
+    assert metrics_input.config.instrument == "PORTFOLIO" and metrics_input.trades is result.trades
+    print(f"  [PASS] Shared limits: {len(result.trades)} trades, skips {result.limit_skips}")
+
+
+def test_daily_drawdown_stops_entries():
+    """Realized losses past the daily limit block entries until the next UTC day."""
+    instruments = ["EUR_USD", "GBP_USD"]
+    # Prices grind down: every LONG stops out
+    data = {}
+    for k, inst in enumerate(instruments):
+        m5 = make_m5(2 * DAY_BARS, seed=10 + k, vol=0.00005)
+        for i, c in enumerate(m5):
+            drop = 0.0002 * i
+            for key in ("open", "close", "high", "low"):
+                c[key] -= drop
+        data[inst] = feed_data(m5)
+    config = PortfolioBacktestConfig(
+        [bt_config(inst) for inst in instruments],
+        max_concurrent_positions=5, max_daily_drawdown=0.025,
+    )
+    result = PortfolioBacktester(ScriptedEngine(every=10, sl_pips=5)).run(data, config)
+
+    assert result.limit_skips.get(LIMIT_DAILY_DRAWDOWN, 0) > 0
+    by_day = {}
+    for t in result.trades:
+        by_day.setdefault(t.entry_time[:10], []).append(t.pnl)
+    assert len(by_day) == 2  # Trading resumes the next day
+    for pnls in by_day.values():
+        assert all(p < 0 for p in pnls)
+        assert len(pnls) <= 4  # ~1% per loss: stopped after crossing 2.5%
+    print(f"  [PASS] Daily drawdown stop: {[len(p) for p in by_day.values()]} losses per day")
+
+
+def test_currency_exposure():
+    """Same-direction positions on a shared currency are capped."""
+    assert currency_legs("EUR_USD", TradeDirection.LONG) == [("EUR", 1), ("USD", -1)]
+    assert currency_legs("US30", TradeDirection.SHORT) == [("US30", -1)]
+
+    instruments = ["EUR_USD", "GBP_USD"]
+    data = {inst: feed_data(make_m5(DAY_BARS, seed=k)) for k, inst in enumerate(instruments)}
+    config = PortfolioBacktestConfig(
+        [bt_config(inst) for inst in instruments],
+        max_currency_exposure=1, max_daily_drawdown=None,
+    )
+    result = PortfolioBacktester(ScriptedEngine(every=30, sl_pips=40, tp_pips=40)).run(data, config)
+    assert result.peak_positions == 1  # Both LONG = both short USD
+    assert result.limit_skips.get(LIMIT_CURRENCY_EXPOSURE, 0) > 0
+    print("  [PASS] Currency exposure cap")
+
+
+class CountingAnalyzer:
+    """SMCAnalyzer stand-in: neutral HTF, counts analysis calls."""
+
+    def __init__(self):
+        self.htf_calls = 0
+        self.ltf_calls = 0
+
+    def analyze_htf(self, h4, h1, instrument):
+        self.htf_calls += 1
+        return {"htf_bias": "NEUTRAL"}
+
+    def analyze_ltf(self, m5, htf_result, instrument):
+        self.ltf_calls += 1
+        return SimpleNamespace(sweep_detected=None)
+
+
+def test_htf_analysis_reused_between_bars():
+    """HTF analysis runs once per new H4/H1 window, not once per M5 bar."""
+    engine = SMCBacktestEngine.__new__(SMCBacktestEngine)
+    engine.smc_analyzer = CountingAnalyzer()
+    engine.live_auto_config = None
+    data = {inst: feed_data(make_m5(3000, seed=k)) for k, inst in enumerate(["EUR_USD", "GBP_USD"])}
+    config = PortfolioBacktestConfig([bt_config(inst, htf_lookback=40) for inst in data])
+    result = PortfolioBacktester(engine).run(data, config)
+
+    analyzer = engine.smc_analyzer
+    assert result.results["EUR_USD"].skip_reasons["HTF_NEUTRAL"] > 1500
+    assert analyzer.ltf_calls > 3000
+    assert analyzer.htf_calls <= 2 * (3000 // 12 + 1)
+    print(f"  [PASS] HTF analysis: {analyzer.htf_calls} runs for {analyzer.ltf_calls} bars")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Portfolio Backtest ===\n")
+
+    tests = [
+        test_single_instrument_matches_engine,
+        test_shared_limits,
+        test_daily_drawdown_stops_entries,
+        test_currency_exposure,
+        test_htf_analysis_reused_between_bars,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
@@ -0,0 +1,289 @@
+"""Tests for the snapshot-diffing position/pending order monitor."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import database
+from src.utils.database import Database
+from src.core.auto_config import AutoTradingConfig
+from src.trading import auto_executor, position_monitor
+from src.trading.auto_executor import AutoExecutor
+from src.trading.position_monitor import PositionMonitor
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_position_monitor.db"
+
+
+class FakeAccount:
+    """Bulk MT5 reads over in-memory positions/orders, counting terminal calls."""
+
+    def __init__(self):
+        self.positions = {}
+        self.orders = {}
+        self.calls = 0
+        self.client = self
+
+    def is_connected(self):
+        return False  # No history fetches in tests
+
+    def get_positions(self, strict=False):
+        self.calls += 1
+        return list(self.positions.values())
+
+    def get_pending_orders(self, instrument=None, strict=False):
+        self.calls += 1
+        return list(self.orders.values())
+
+    def place_limit(self, ticket, instrument, direction="LONG", price=1.1):
+        self.orders[ticket] = {"order_ticket": ticket, "instrument": instrument, "price": price,
+                               "direction": direction}
+
+    def fill(self, ticket, price=1.1):
+        order = self.orders.pop(ticket)
+        long = order["direction"] == "LONG"
+        self.positions[ticket] = {
+            "ticket": ticket, "instrument": order["instrument"], "direction": order["direction"],
+            "price_open": price, "sl": 1.09, "tp": 1.13, "volume": 0.1,
+            "long_units": 10000 if long else 0, "short_units": 0 if long else 10000,
+        }
+
+
+def make_monitor():
+    """Monitor + minimal executor on an isolated database."""
+    cleanup()
+    test_db = Database(TEST_DB_PATH)
+    auto_executor.db = test_db
+    position_monitor.db = test_db
+
+    account = FakeAccount()
+    executor = AutoExecutor.__new__(AutoExecutor)
+    executor.config = AutoTradingConfig()
+    executor.order_manager = account
+    executor._pending_orders = {}
+    executor._stats = {"total_executed": 0}
+    executor._daily_trades = {}
+    executor._handle_learning_mode_increment = lambda: None
+
+    events = []
+    monitor = PositionMonitor(account, executor, on_event=events.append)
+    return monitor, executor, account, events, test_db
+
+
+def track(executor, account, ticket, instrument):
+    account.place_limit(ticket, instrument)
+    executor._pending_orders[instrument] = {
+        "order_ticket": ticket, "instrument": instrument, "direction": "LONG",
+        "limit_price": 1.1, "stop_loss": 1.09, "take_profit": 1.13, "units": 10000,
+        "confidence": 72,
+    }
+
+
+def test_fill_detected_on_next_poll():
+    """A limit fill is reported by the first snapshot that shows it."""
+    monitor, executor, account, events, test_db = make_monitor()
+    track(executor, account, 111, "EUR_USD")
+    monitor.poll()
+    assert events == []
+
+    account.fill(111, price=1.1002)
+    new = monitor.poll()
+    assert [e["type"] for e in new] == ["FILLED"]
+    assert new[0]["trade_id"] == "111" and new[0]["instrument"] == "EUR_USD"
+    assert executor._pending_orders == {}
+    trade = test_db.get_trade("111")
+    assert trade and abs(trade["entry_price"] - 1.1002) < 1e-9 and trade["units"] == 10000
+    assert executor._stats["total_executed"] == 1
+    cleanup()
+    print("  [PASS] Fill detected on the next poll")
+
+
+def test_expired_order():
+    """A tracked order that leaves the book without a position expires."""
+    monitor, executor, account, events, _ = make_monitor()
+    track(executor, account, 222, "GBP_USD")
+    monitor.poll()
+    account.orders.pop(222)
+    assert [e["type"] for e in monitor.poll()] == ["EXPIRED"]
+    assert executor._pending_orders == {}
+    cleanup()
+    print("  [PASS] Expired order detected")
+
+
+def test_close_syncs_database_once():
+    """A vanished position closes its DB trade; unchanged snapshots do no DB work."""
+    monitor, executor, account, events, test_db = make_monitor()
+    for ticket, inst in ((301, "EUR_USD"), (302, "XAU_USD")):
+        track(executor, account, ticket, inst)
+        account.fill(ticket)
+    monitor.poll()  # Both fills
+    assert [e["type"] for e in events] == ["FILLED", "FILLED"]
+    syncs = monitor.get_stats()["syncs"]
+
+    for _ in range(5):
+        assert monitor.poll() == []
+    assert monitor.get_stats()["syncs"] == syncs
+
+    account.positions.pop(301)
+    closed = monitor.poll()
+    assert [(e["type"], e["trade_id"], e["synced"]) for e in closed] == [("CLOSED", "301", True)]
+    assert test_db.get_trade("301")["status"] == "CLOSED"
+    assert test_db.get_trade("302")["status"] == "OPEN"
+    cleanup()
+    print("  [PASS] Closes sync the database once per change")
+
+
+def test_close_updates_calibrator():
+    """SL/TP closes picked up by the monitor feed their P/L to the online calibrator."""
+    from src.trading import trade_lifecycle
+
+    class HistoryAccount(FakeAccount):
+        def __init__(self):
+            super().__init__()
+            self.deals = []
+
+        def is_connected(self):
+            return True
+
+        def get_history_since(self, since):
+            return list(self.deals), None
+
+        def get_history(self, from_date=None):
+            return list(self.deals)
+
+    class FakeCalibrator:
+        updates = []
+
+        def update(self, raw_confidence, pnl):
+            self.updates.append((raw_confidence, pnl))
+
+    monitor, executor, _, events, test_db = make_monitor()
+    account = HistoryAccount()
+    executor.order_manager = account
+    monitor = PositionMonitor(account, executor, on_event=events.append)
+    original = trade_lifecycle.get_calibrator
+    trade_lifecycle.get_calibrator = FakeCalibrator
+    try:
+        track(executor, account, 501, "EUR_USD")
+        account.fill(501)
+        monitor.poll()
+        assert test_db.get_trade("501")["confidence_score"] == 72
+
+        # Stop loss hit: position gone, closing deal in MT5 history
+        account.positions.pop(501)
+        account.deals.append({"trade_id": "501", "instrument": "EUR_USD", "direction": "LONG",
+                              "exit_price": 1.09, "pnl": -35.0, "pnl_percent": -0.07,
+                              "closed_at": "2026-01-02T10:00:00"})
+        monitor.poll()
+        assert test_db.get_trade("501")["pnl"] == -35.0
+        assert FakeCalibrator.updates == [(72, -35.0)]
+
+        monitor.poll()  # Nothing new: no second update
+        assert FakeCalibrator.updates == [(72, -35.0)]
+
+        # A manual close landing after the sync doesn't count the outcome again...
+        assert test_db.close_trade("501", 1.0905, -34.0, -0.07, "MANUAL") is False
+
+        # ...and a sync after a manual close (which calibrated) skips the trade
+        track(executor, account, 502, "GBP_USD")
+        account.fill(502)
+        monitor.poll()
+        assert test_db.close_trade("502", 1.12, 50.0, 0.1, "MANUAL") is True
+        account.positions.pop(502)
+        account.deals.append({"trade_id": "502", "instrument": "GBP_USD", "direction": "LONG",
+                              "exit_price": 1.12, "pnl": 50.0, "pnl_percent": 0.1,
+                              "closed_at": "2026-01-02T11:00:00"})
+        monitor.poll()
+        assert FakeCalibrator.updates == [(72, -35.0)]
+    finally:
+        trade_lifecycle.get_calibrator = original
+        cleanup()
+    print("  [PASS] Monitored closes update the calibrator")
+
+
+def test_constant_calls_per_poll():
+    """Each poll costs two bulk reads regardless of how many orders are tracked."""
+    monitor, executor, account, events, _ = make_monitor()
+    for i, inst in enumerate(["EUR_USD", "GBP_USD", "XAU_USD", "US30", "BTC_USD"]):
+        track(executor, account, 400 + i, inst)
+    account.positions[999] = {"ticket": 999, "instrument": "USD_JPY", "direction": "SHORT"}
+    monitor.poll()
+    start = account.calls
+    for _ in range(10):
+        monitor.poll()
+    assert account.calls - start == 20
+    cleanup()
+    print("  [PASS] Two bulk reads per poll")
+
+
+def test_position_units_rounded():
+    """Snapshot units are rounded, not truncated (0.29 * 100000 is 28999.999...)."""
+    from src.trading import mt5_client as mt5_module
+    from src.trading.mt5_client import MT5Client
+
+    sizes = {"EURUSD": 100000.0, "XAUUSD": 100.0}
+    original_mt5 = mt5_module.mt5
+    mt5_module.mt5 = SimpleNamespace(
+        ORDER_TYPE_BUY=0,
+        positions_get=lambda: [
+            SimpleNamespace(symbol="EURUSD", type=0, volume=0.29, profit=0.0, ticket=1,
+                            price_open=1.1, price_current=1.1, sl=0.0, tp=0.0, time=0, magic=0, comment=""),
+            SimpleNamespace(symbol="XAUUSD", type=1, volume=0.58, profit=0.0, ticket=2,
+                            price_open=2650.0, price_current=2650.0, sl=0.0, tp=0.0, time=0, magic=0, comment=""),
+        ],
+        symbol_info=lambda s: SimpleNamespace(trade_contract_size=sizes[s]),
+    )
+    try:
+        client = MT5Client.__new__(MT5Client)
+        client._connected = False
+        client._symbol_cache = {}
+        client._contract_sizes = {}
+        client._ensure_connected = lambda: True
+        positions = client.get_positions()
+        assert positions[0]["long_units"] == 29000 and positions[0]["short_units"] == 0
+        assert positions[1]["short_units"] == 58 and positions[1]["long_units"] == 0
+    finally:
+        mt5_module.mt5 = original_mt5
+    print("  [PASS] Position units rounded")
+
+
+def cleanup():
+    auto_executor.db = position_monitor.db = database.db
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Position Monitor ===\n")
+
+    tests = [
+        test_fill_detected_on_next_poll,
+        test_expired_order,
+        test_close_syncs_database_once,
+        test_close_updates_calibrator,
+        test_constant_calls_per_poll,
+        test_position_units_rounded,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
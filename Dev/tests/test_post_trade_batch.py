@@ -0,0 +1,139 @@
+"""Tests for batched post-trade analysis with shared candle fetches."""
+
+import sys
+import math
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.post_trade_analyzer import PostTradeAnalyzer
+
+
+STEPS = {"M15": timedelta(minutes=15), "H1": timedelta(hours=1), "H4": timedelta(hours=4)}
+BASE = {"EUR_USD": 1.08, "XAU_USD": 2650.0}
+
+
+class FakeRatesAnalyzer(PostTradeAnalyzer):
+    """Analyzer serving deterministic synthetic candles, counting fetches."""
+
+    def __init__(self):
+        super().__init__()
+        self.fetches = []
+
+    def _select_symbol(self, instrument):
+        return instrument
+
+    def _copy_rates(self, symbol, timeframe, start, end):
+        self.fetches.append((symbol, timeframe))
+        step = STEPS[timeframe]
+        epoch = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        t = epoch + step * math.ceil((start - epoch) / step)
+        candles = []
+        while t <= end:
+            i = (t - epoch) / STEPS["M15"]
+            mid = BASE[symbol] * (1 + 0.002 * math.sin(i / 7))
+            spread = BASE[symbol] * 0.0004
+            candles.append({
+                "time": t.isoformat(), "open": mid, "high": mid + spread,
+                "low": mid - spread, "close": mid + spread / 3, "volume": 100,
+            })
+            t += step
+        return candles
+
+
+def make_trades():
+    trades = []
+    start = datetime(2026, 2, 2, 8, tzinfo=timezone.utc)
+    for i in range(6):
+        instrument = "EUR_USD" if i % 2 == 0 else "XAU_USD"
+        opened = start + timedelta(hours=9 * i, minutes=7)
+        entry = BASE[instrument]
+        move = entry * 0.001 * (1 if i % 3 else -1)
+        trades.append({
+            "trade_id": f"T{i}", "instrument": instrument,
+            "direction": "LONG" if i % 4 < 2 else "SHORT",
+            "entry_price": entry, "exit_price": entry + move,
+            "opened_at": opened.isoformat(),
+            "closed_at": (opened + timedelta(hours=3, minutes=20)).isoformat(),
+            "pnl": round(move * 1000, 2),
+        })
+    return trades
+
+
+def test_batch_windows_match_per_trade_fetch():
+    """Sliced candle windows equal what a per-trade fetch returns."""
+    trades = make_trades()
+    analyzer = FakeRatesAnalyzer()
+    batch = analyzer.fetch_market_data_batch(trades)
+    assert len(analyzer.fetches) == 6  # 3 timeframes x 2 instruments
+
+    for trade in trades:
+        single = analyzer._fetch_market_data(
+            trade["instrument"],
+            analyzer._parse_datetime(trade["opened_at"]),
+            analyzer._parse_datetime(trade["closed_at"]),
+        )
+        assert batch[trade["trade_id"]] == single, trade["trade_id"]
+    print("  [PASS] Batch candle windows match per-trade fetches")
+
+
+def test_analyze_trades_matches_analyze_trade():
+    """Batch analysis (inline and pooled) gives the same findings in input order."""
+    trades = make_trades()
+    reference = [FakeRatesAnalyzer().analyze_trade(trade) for trade in trades]
+
+    for workers in (1, 2):
+        analyzer = FakeRatesAnalyzer()
+        # Pool only kicks in above MIN_TRADES_FOR_POOL trades
+        results = analyzer.analyze_trades(trades * 2, workers=workers)
+        assert len(analyzer.fetches) == 6
+        assert [t["trade_id"] for t, _ in results] == [t["trade_id"] for t in trades * 2]
+        for (_, analysis), expected in zip(results, reference * 2):
+            assert analysis is not None
+            assert analysis.to_dict() == expected.to_dict()
+    print("  [PASS] analyze_trades matches analyze_trade (inline and pooled)")
+
+
+def test_empty_and_failed_fetches():
+    """No trades means no fetches; a failing fetch still yields analyses."""
+    analyzer = FakeRatesAnalyzer()
+    assert analyzer.analyze_trades([]) == []
+    assert analyzer.fetches == []
+
+    class BrokenAnalyzer(FakeRatesAnalyzer):
+        def _copy_rates(self, symbol, timeframe, start, end):
+            raise RuntimeError("terminal offline")
+
+    results = BrokenAnalyzer().analyze_trades(make_trades()[:2], workers=1)
+    assert all(analysis is not None for _, analysis in results)
+    print("  [PASS] Empty batches and failed fetches")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Batched Post-Trade Analysis ===\n")
+
+    tests = [
+        test_batch_windows_match_per_trade_fetch,
+        test_analyze_trades_matches_analyze_trade,
+        test_empty_and_failed_fetches,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
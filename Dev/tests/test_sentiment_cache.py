@@ -0,0 +1,213 @@
+"""Tests for concurrent sentiment fan-out and stale-while-revalidate cache."""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.aggregator import SentimentAggregator
+from src.sentiment.base_provider import BaseSentimentProvider, ProviderSentiment
+from src.sentiment.cache import SentimentCache
+
+
+class FakeProvider(BaseSentimentProvider):
+    """Provider with configurable latency, score and failure mode."""
+
+    def __init__(self, name, score=0.5, delay=0.0, ttl=60, deadline=1.0, fail=False):
+        self.name = name
+        self.score = score
+        self.delay = delay
+        self.ttl = ttl
+        self.deadline = deadline
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_sentiment(self, instrument):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            return self._create_error_result(instrument, "provider down")
+        return ProviderSentiment(
+            score=self.score, confidence=1.0, provider=self.name, instrument=instrument
+        )
+
+    def get_name(self):
+        return self.name
+
+    def get_weight(self):
+        return 0.2
+
+    def get_cache_ttl_seconds(self):
+        return self.ttl
+
+    def get_deadline_seconds(self):
+        return self.deadline
+
+
+def make_aggregator(providers, **kwargs):
+    agg = SentimentAggregator(
+        enable_news=False, enable_vix=False, enable_calendar=False,
+        cache=SentimentCache(), **kwargs
+    )
+    agg.providers = providers
+    return agg
+
+
+def test_providers_queried_concurrently():
+    """Cold fan-out should take ~max(provider latency), not the sum."""
+    providers = [FakeProvider(f"p{i}", delay=0.3) for i in range(3)]
+    agg = make_aggregator(providers)
+
+    start = time.monotonic()
+    result = agg.get_combined_sentiment("EUR_USD")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.75, f"Expected concurrent fetch, took {elapsed:.2f}s"
+    assert set(result.components) == {"p0", "p1", "p2"}
+    print(f"  [PASS] Concurrent fan-out: {elapsed * 1000:.0f}ms for 3x300ms providers")
+
+
+def test_deadline_skips_slow_provider():
+    """Slow provider is dropped after its deadline and fills cache later."""
+    fast = FakeProvider("fast", score=0.4)
+    slow = FakeProvider("slow", score=-0.8, delay=0.5, deadline=0.05)
+    agg = make_aggregator([fast, slow])
+
+    result = agg.get_combined_sentiment("EUR_USD")
+    assert "slow" not in result.components
+    assert any("slow" in w for w in result.warnings)
+
+    time.sleep(0.7)
+    result = agg.get_combined_sentiment("EUR_USD")
+    assert result.components["slow"]["score"] == -0.8
+    assert slow.calls == 1
+    print("  [PASS] Deadline: slow provider skipped, background result reused")
+
+
+def test_warm_cache_is_fast():
+    """Fresh cache entries should be served without provider calls."""
+    provider = FakeProvider("p", delay=0.2)
+    agg = make_aggregator([provider])
+    agg.get_combined_sentiment("EUR_USD")
+
+    start = time.monotonic()
+    for _ in range(50):
+        agg.get_combined_sentiment("EUR_USD")
+    per_call_ms = (time.monotonic() - start) * 1000 / 50
+
+    assert provider.calls == 1
+    assert per_call_ms < 5, f"Warm call too slow: {per_call_ms:.2f}ms"
+    print(f"  [PASS] Warm cache: {per_call_ms:.3f}ms per call")
+
+
+def test_stale_served_while_revalidating():
+    """Stale entry is returned immediately and refreshed in background."""
+    provider = FakeProvider("p", score=0.1, ttl=0)
+    agg = make_aggregator([provider])
+    agg.get_combined_sentiment("EUR_USD")
+
+    provider.score = 0.9
+    provider.delay = 0.3
+    start = time.monotonic()
+    result = agg.get_combined_sentiment("EUR_USD")
+    elapsed = time.monotonic() - start
+
+    assert result.components["p"]["score"] == 0.1
+    assert elapsed < 0.1
+    time.sleep(0.5)
+    assert agg.cache.get_value("p", "EUR_USD").score == 0.9
+    print("  [PASS] Stale-while-revalidate: old value served, refresh applied")
+
+
+def test_failed_refresh_keeps_last_good_value():
+    """Provider errors must not evict the last good value."""
+    provider = FakeProvider("p", score=0.3, ttl=0)
+    agg = make_aggregator([provider])
+    agg.get_combined_sentiment("EUR_USD")
+
+    provider.fail = True
+    agg.get_combined_sentiment("EUR_USD")
+    time.sleep(0.1)
+
+    result = agg.get_combined_sentiment("EUR_USD")
+    assert result.components["p"]["score"] == 0.3
+    print("  [PASS] Failed refresh keeps last good value")
+
+
+def test_error_backoff_limits_retries():
+    """A failing provider is not retried on every scan."""
+    provider = FakeProvider("p", fail=True)
+    agg = make_aggregator([provider])
+
+    for _ in range(5):
+        agg.get_combined_sentiment("EUR_USD")
+        time.sleep(0.02)
+
+    assert provider.calls == 1, f"Expected 1 call, got {provider.calls}"
+    print("  [PASS] Error back-off: failing provider called once")
+
+
+def test_refresh_deduplicated():
+    """Concurrent refresh requests share one in-flight provider call."""
+    cache = SentimentCache()
+    provider = FakeProvider("p", delay=0.2)
+
+    futures = [cache.refresh(provider, "EUR_USD") for _ in range(5)]
+    for f in futures:
+        f.result(timeout=1)
+
+    assert provider.calls == 1
+    assert len({id(f) for f in futures}) == 1
+    print("  [PASS] In-flight refreshes de-duplicated")
+
+
+def test_invalidate():
+    """Invalidate should drop matching entries only."""
+    cache = SentimentCache()
+    for name in ("news_claude", "calendar"):
+        for inst in ("EUR_USD", "GBP_USD"):
+            cache.put(name, inst, ProviderSentiment(0.0, 1.0, name, inst), 60)
+
+    assert cache.invalidate(provider_name="news_claude") == 2
+    assert cache.get("news_claude", "EUR_USD") is None
+    assert cache.get("calendar", "EUR_USD") is not None
+    assert cache.get_stats()["entries"] == 2
+    print("  [PASS] Invalidate by provider")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Sentiment Cache / Concurrent Fan-out ===\n")
+
+    tests = [
+        test_providers_queried_concurrently,
+        test_deadline_skips_slow_provider,
+        test_warm_cache_is_fast,
+        test_stale_served_while_revalidating,
+        test_failed_refresh_keeps_last_good_value,
+        test_error_backoff_limits_retries,
+        test_refresh_deduplicated,
+        test_invalidate,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
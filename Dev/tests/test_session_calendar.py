@@ -0,0 +1,144 @@
+"""Tests for the precomputed session/killzone calendar."""
+
+import sys
+import time
+import random
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.session_calendar import (
+    SessionCalendar, bar_minutes, killzone_at, minute_of_week, minute_of_week_from_iso,
+)
+from src.utils.instrument_profiles import is_in_session
+from src.smc.liquidity import detect_session_levels
+
+
+T0 = datetime(2026, 1, 5, tzinfo=timezone.utc)  # Monday
+
+
+def reference_in_session(profile, now):
+    """Previous string-parsing implementation."""
+    sessions = profile.get("sessions", [])
+    if not sessions:
+        return True
+    if not profile.get("allow_weekends", False) and now.weekday() >= 5:
+        return False
+    for s in sessions:
+        try:
+            start, end = (int(x) for x in s.split("-"))
+        except Exception:
+            continue
+        if (start <= end and start <= now.hour < end) or (start > end and (now.hour >= start or now.hour < end)):
+            return True
+    return False
+
+
+def make_candles(n, step_minutes=5, start=T0):
+    rng = random.Random(7)
+    candles, price = [], 1.1
+    for i in range(n):
+        price += rng.uniform(-0.001, 0.001)
+        t = start + timedelta(minutes=step_minutes * i)
+        candles.append({"time": t.isoformat(), "open": price, "close": price,
+                        "high": price + rng.uniform(0, 0.0005), "low": price - rng.uniform(0, 0.0005)})
+    return candles
+
+
+def test_parsing_matches_fromisoformat():
+    """Sliced parsing equals datetime parsing for the formats in use."""
+    for text in ["2026-01-05T08:07:00+00:00", "2026-01-10T23:59:00", "2026-01-11T00:00:00Z",
+                 "2026-01-07 13:30:00", "2026-01-07T13:30:00+02:00"]:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        assert minute_of_week_from_iso(text) == minute_of_week(dt), text
+    assert minute_of_week_from_iso("") is None and minute_of_week_from_iso("garbage") is None
+    print("  [PASS] Timestamp parsing matches fromisoformat")
+
+
+def test_session_gate_matches_previous_logic():
+    """Bitmap lookups agree with the old per-call parsing for every minute of two weeks."""
+    profiles = [{"sessions": ["07-17"]}, {"sessions": ["21-06"], "allow_weekends": True}, {},
+                {"sessions": ["bad"]}, {"sessions": ["00-24", "x"]}, {"sessions": ["08-12", "13-16"]}]
+    for minute in range(0, 14 * 24 * 60, 7):
+        now = T0 + timedelta(minutes=minute)
+        for profile in profiles:
+            assert is_in_session(profile, now) == reference_in_session(profile, now), (profile, now)
+    print("  [PASS] Session bitmap matches previous logic")
+
+
+def test_killzones():
+    """Killzone names and per-instrument filtering."""
+    assert killzone_at(minute_of_week(T0.replace(hour=7, minute=30))) == "LONDON_OPEN"
+    assert killzone_at(minute_of_week(T0.replace(hour=13))) == "NY_OPEN"
+    assert killzone_at(minute_of_week(T0.replace(hour=16, minute=59))) == "LONDON_CLOSE"
+    assert killzone_at(minute_of_week(T0.replace(hour=9))) == ""
+    assert killzone_at(None) == ""
+
+    gold = SessionCalendar.for_profile({"sessions": ["07-17"], "killzones": ["NY_OPEN"]})
+    assert gold.in_killzone(minute_of_week(T0.replace(hour=12))) == (True, "NY_OPEN")
+    assert gold.in_killzone(minute_of_week(T0.replace(hour=8))) == (False, "LONDON_OPEN")
+    assert gold.in_killzone(minute_of_week(T0.replace(hour=10))) == (False, "")
+    assert SessionCalendar.for_profile({"killzones": ["NY_OPEN"]}) is gold.for_profile({"killzones": ["NY_OPEN"]})
+    print("  [PASS] Killzone lookups")
+
+
+def test_backtest_gate_is_one_pass():
+    """Per-bar gate list matches per-bar checks and is cheap to build."""
+    candles = make_candles(20000)
+    calendar = SessionCalendar([(7, 17)], allow_weekends=False)
+
+    start = time.perf_counter()
+    allowed = calendar.gate(bar_minutes(candles))
+    elapsed = time.perf_counter() - start
+
+    for c, ok in zip(candles[::37], allowed[::37]):
+        dt = datetime.fromisoformat(c["time"])
+        assert ok == (dt.weekday() < 5 and 7 <= dt.hour < 17)
+    assert calendar.gate([None]) == [True] and calendar.gate([None], unparsed=False) == [False]
+    print(f"  [PASS] Backtest session gate for {len(candles)} bars in {elapsed * 1000:.1f} ms")
+
+
+def test_session_levels_unchanged():
+    """detect_session_levels keeps its output."""
+    candles = make_candles(100, step_minutes=60)
+    levels = detect_session_levels(candles)
+    for name, (start, end) in {"asian": (0, 8), "london": (7, 16), "ny": (12, 21)}.items():
+        idx = [i for i, c in enumerate(candles) if start <= datetime.fromisoformat(c["time"]).hour < end]
+        high_idx = max(idx, key=lambda i: (candles[i]["high"], -i))
+        low_idx = min(idx, key=lambda i: (candles[i]["low"], i))
+        assert levels[name] == {"high": candles[high_idx]["high"], "low": candles[low_idx]["low"],
+                                "high_idx": high_idx, "low_idx": low_idx}, name
+    assert detect_session_levels([{"time": "n/a", "high": 1, "low": 1}]) == {}
+    print("  [PASS] Session levels unchanged")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Session Calendar ===\n")
+
+    tests = [
+        test_parsing_matches_fromisoformat,
+        test_session_gate_matches_previous_logic,
+        test_killzones,
+        test_backtest_gate_is_one_pass,
+        test_session_levels_unchanged,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
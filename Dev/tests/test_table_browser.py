@@ -0,0 +1,201 @@
+"""Tests for the keyset-paginated table browser (Database page backend)."""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from src.utils.table_browser import TableBrowser, ColumnFilter, parquet_available
+
+
+TEST_DB_PATH = Path(__file__).parent / "test_table_browser.db"
+EXPORT_DIR = Path(__file__).parent / "test_table_browser_export"
+
+
+def get_browser(rows: int = 237) -> TableBrowser:
+    """Fresh database with an indexed activity-like table."""
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    conn = sqlite3.connect(TEST_DB_PATH)
+    conn.execute("""
+        CREATE TABLE activity_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            instrument TEXT,
+            confidence INTEGER,
+            details TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX idx_activity_time ON activity_log(timestamp)")
+    conn.execute("CREATE INDEX idx_activity_instrument ON activity_log(instrument)")
+    instruments = ["EUR_USD", "GBP_USD", "XAU_USD"]
+    conn.executemany(
+        "INSERT INTO activity_log (timestamp, instrument, confidence, details) VALUES (?, ?, ?, ?)",
+        [
+            (
+                # Duplicate timestamps and some NULLs exercise the rowid tiebreak
+                None if i % 17 == 0 else f"2026-01-01T00:{i // 5:03d}",
+                instruments[i % 3],
+                None if i % 11 == 0 else i,
+                "x" * 50,
+            )
+            for i in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return TableBrowser(TEST_DB_PATH)
+
+
+def read_all_pages(browser, **kwargs) -> list:
+    ids, cursor = [], None
+    while True:
+        page = browser.fetch_page("activity_log", after=cursor, page_size=20, **kwargs)
+        ids.extend(page.rows["id"].tolist())
+        if not page.has_more:
+            return ids
+        cursor = page.next_cursor
+
+
+def expected_ids(sort_column, descending, where="1=1"):
+    conn = sqlite3.connect(TEST_DB_PATH)
+    direction = "DESC" if descending else "ASC"
+    rows = conn.execute(
+        f"SELECT id FROM activity_log WHERE {where} ORDER BY {sort_column} {direction}, rowid {direction}"
+    ).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+
+def test_indexed_columns():
+    """Rowid alias and leading index columns are reported."""
+    browser = get_browser()
+    indexed = browser.get_indexed_columns("activity_log")
+    assert indexed[0] == "id"
+    assert set(indexed) == {"id", "timestamp", "instrument"}
+    print("  [PASS] Indexed columns detected")
+
+
+def test_keyset_pages_cover_table_exactly():
+    """Walking pages returns every row once, in order, both directions, with NULLs."""
+    browser = get_browser()
+    for sort_column in ("timestamp", "id"):
+        for descending in (True, False):
+            ids = read_all_pages(browser, sort_column=sort_column, descending=descending)
+            assert ids == expected_ids(sort_column, descending), (sort_column, descending)
+    print("  [PASS] Keyset pagination is complete and ordered")
+
+
+def test_filters_and_count():
+    """Filters are applied server-side and counted consistently."""
+    browser = get_browser()
+    filters = [ColumnFilter("instrument", "=", "XAU_USD")]
+    ids = read_all_pages(browser, sort_column="timestamp", filters=filters)
+    assert ids == expected_ids("timestamp", True, "instrument = 'XAU_USD'")
+    assert browser.count_rows("activity_log", filters) == len(ids)
+    assert browser.count_rows("activity_log") == 237
+    print("  [PASS] Server-side filters")
+
+
+def test_projection():
+    """Only selected columns are returned; helper columns are dropped."""
+    browser = get_browser()
+    page = browser.fetch_page("activity_log", columns=["instrument"], sort_column="timestamp")
+    assert list(page.rows.columns) == ["instrument"]
+    assert page.has_more
+    print("  [PASS] Column projection")
+
+
+def test_rejects_unknown_identifiers():
+    """Table/column names are validated against the schema."""
+    browser = get_browser()
+    for kwargs in (
+        {"table": "activity_log; DROP TABLE x"},
+        {"table": "activity_log", "sort_column": "nope"},
+        {"table": "activity_log", "filters": [ColumnFilter("id", "OR 1=1 --", 1)]},
+    ):
+        try:
+            browser.fetch_page(**kwargs)
+            assert False, f"Expected ValueError for {kwargs}"
+        except ValueError:
+            pass
+    print("  [PASS] Unknown identifiers rejected")
+
+
+def test_export_csv_streams_chunks():
+    """CSV export writes every matching row in chunks."""
+    browser = get_browser()
+    path = EXPORT_DIR / "activity.csv"
+    total = browser.export_csv(
+        path, "activity_log", columns=["id", "confidence"],
+        sort_column="id", descending=False, chunk_rows=50,
+    )
+    df = pd.read_csv(path)
+    assert total == 237
+    assert df["id"].tolist() == list(range(1, 238))
+    assert list(df.columns) == ["id", "confidence"]
+    print("  [PASS] Streaming CSV export")
+
+
+def test_export_parquet():
+    """Parquet export handles NULL-only chunks via declared types."""
+    if not parquet_available():
+        print("  [SKIP] pyarrow not installed")
+        return
+    browser = get_browser()
+    path = EXPORT_DIR / "activity.parquet"
+    total = browser.export_parquet(
+        path, "activity_log", columns=["id", "timestamp", "confidence"],
+        filters=[ColumnFilter("id", "<=", 12)], chunk_rows=1,
+    )
+    df = pd.read_parquet(path)
+    assert total == 12 and len(df) == 12
+    assert df["confidence"].isna().sum() == 2
+    print("  [PASS] Streaming Parquet export")
+
+
+def cleanup():
+    if TEST_DB_PATH.exists():
+        TEST_DB_PATH.unlink()
+    if EXPORT_DIR.exists():
+        for f in EXPORT_DIR.iterdir():
+            f.unlink()
+        EXPORT_DIR.rmdir()
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Table Browser ===\n")
+
+    tests = [
+        test_indexed_columns,
+        test_keyset_pages_cover_table_exactly,
+        test_filters_and_count,
+        test_projection,
+        test_rejects_unknown_identifiers,
+        test_export_csv_streams_chunks,
+        test_export_parquet,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    cleanup()
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)
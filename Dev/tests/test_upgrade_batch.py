@@ -0,0 +1,148 @@
+"""Tests for batched backtesting of candidate AI filters."""
+
+import sys
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.upgrade.upgrade_executor import UpgradeExecutor
+
+
+FILTER_TEMPLATE = '''
+class {cls}(BaseFilter):
+    def __init__(self):
+        super().__init__(name="{name}", filter_type="ai_generated")
+
+    def check(self, signal_data: dict) -> FilterResult:
+        if {condition}:
+            return FilterResult(passed=False, reason="blocked")
+        return FilterResult(passed=True)
+'''
+
+FILTERS = {
+    "low_confidence": FILTER_TEMPLATE.format(cls="LowConfFilter", name="low_confidence",
+                                             condition='signal_data["confidence"] < 55'),
+    "tokyo": FILTER_TEMPLATE.format(cls="TokyoFilter", name="tokyo",
+                                    condition='signal_data["session"] == "tokyo"'),
+    "gold_short": FILTER_TEMPLATE.format(cls="GoldShortFilter", name="gold_short",
+                                         condition='signal_data["instrument"] == "XAU_USD" '
+                                                   'and signal_data["direction"] == "SHORT"'),
+    "broken": FILTER_TEMPLATE.format(cls="BrokenFilter", name="broken",
+                                     condition='signal_data["missing_key"]'),
+}
+
+
+def make_signals(n=120, seed=11):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 5)
+    return [{
+        "instrument": rng.choice(["EUR_USD", "XAU_USD"]),
+        "direction": rng.choice(["LONG", "SHORT"]),
+        "confidence": rng.randint(40, 90),
+        "entry_price": 1.1, "stop_loss": 1.09, "take_profit": 1.12, "risk_reward": 2.0,
+        "timestamp": (start + timedelta(hours=i)).isoformat(),
+        "pnl": rng.choice([-25.0, 40.0, None]),
+        "close_reason": "TP", "market_regime": "TRENDING", "regime_strength": 0.5,
+    } for i in range(n)]
+
+
+class CountingExecutor(UpgradeExecutor):
+    """Executor reading signals from a list, counting history loads."""
+
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = signals
+        self.loads = 0
+
+    def _get_historical_signals(self, days=30):
+        self.loads += 1
+        return list(self.signals)
+
+
+def test_batch_matches_single_backtests():
+    """Per-filter batch results equal separate _run_backtest calls from one signal read."""
+    signals = make_signals()
+    executor = CountingExecutor(signals)
+    sources = {name: code for name, code in FILTERS.items() if name != "broken"}
+
+    batch = asyncio.run(executor.validate_batch(sources))
+    assert executor.loads == 1
+    assert batch.filter_names == list(sources) and batch.total_signals == len(signals)
+    assert len(batch.accept) == len(sources) and all(len(row) == len(signals) for row in batch.accept)
+
+    for i, (name, code) in enumerate(sources.items()):
+        single = asyncio.run(executor._run_backtest(code, name))
+        result = batch.results[name]
+        assert result.signals_blocked == single.signals_blocked > 0, name
+        assert result.would_have_lost == single.would_have_lost
+        assert result.estimated_pnl_impact == single.estimated_pnl_impact
+        assert result.robustness_score == single.robustness_score
+        assert result.signals_blocked == batch.accept[i].count(False)
+
+    low_conf = batch.accept[batch.filter_names.index("low_confidence")]
+    assert low_conf == [s["confidence"] >= 55 for s in signals]
+    print(f"  [PASS] Batch matches single backtests ({len(sources)} filters, 1 signal read)")
+
+
+def test_failing_filters_are_isolated():
+    """A filter that can't load or raises is rejected without affecting the others."""
+    executor = CountingExecutor(make_signals(40))
+    sources = dict(FILTERS)
+    sources["syntax"] = "class Nope(:\n    pass"
+
+    batch = asyncio.run(executor.validate_batch(sources))
+    assert set(batch.errors) == {"broken", "syntax"}
+    assert batch.results["broken"].robustness_score == 0 and batch.results["syntax"].robustness_score == 0
+    assert "syntax" not in batch.filter_names
+    assert batch.results["tokyo"].signals_blocked == batch.accept[batch.filter_names.index("tokyo")].count(False)
+    print("  [PASS] Failing filters isolated")
+
+
+def test_sources_from_directory():
+    """Candidate filters load from a filter directory, skipping private modules."""
+    executor = CountingExecutor(make_signals(30))
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("tokyo", "gold_short"):
+            (Path(tmp) / f"{name}.py").write_text(
+                "from src.upgrade.base_filter import BaseFilter, FilterResult\n" + FILTERS[name]
+            )
+        (Path(tmp) / "__init__.py").write_text("")
+        sources = executor.load_filter_sources(Path(tmp))
+    assert list(sources) == ["gold_short", "tokyo"]
+
+    batch = asyncio.run(executor.validate_batch(sources))
+    assert not batch.errors and batch.total_signals == 30
+    print("  [PASS] Filter sources from directory")
+
+
+if __name__ == "__main__":
+    print("\n=== Testing Batched Filter Backtests ===\n")
+
+    tests = [
+        test_batch_matches_single_backtests,
+        test_failing_filters_are_isolated,
+        test_sources_from_directory,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  [FAIL] {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\n{'='*50}")
+    print(f"Results: {passed} passed, {failed} failed out of {len(tests)}")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if failed > 0 else 0)